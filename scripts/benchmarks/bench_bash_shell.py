@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark Ag3ntumBash per-command overhead: new process per call vs persistent shell.
+
+Runs the same short commands the way Ag3ntumBash runs them today (a new
+`timeout ... bash -c` process per call, optionally inside bwrap) and through
+one PersistentShell, and reports latency per command. Output goes through
+OutputCapture in both cases, so the difference is process/sandbox startup.
+
+With --bwrap, both paths run inside a minimal bubblewrap sandbox (read-only
+root, new namespaces); this needs bwrap on PATH.
+
+Usage:
+    python scripts/benchmarks/bench_bash_shell.py [--iterations 200] [--bwrap]
+"""
+import argparse
+import asyncio
+import shlex
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.output_capture import OutputCapture  # noqa: E402
+from src.core.persistent_shell import (  # noqa: E402
+    SHELL_COMMAND,
+    PersistentShell,
+    default_shell_env,
+)
+
+COMMANDS = [
+    ("true", "true"),
+    ("echo", "echo hello"),
+    ("ls", "ls -la"),
+    ("pipeline", "seq 1 1000 | sort -n | tail -n 1"),
+]
+
+TIMEOUT = 300
+KILL_AFTER = 10
+
+
+def bwrap_prefix(workspace: Path) -> list[str]:
+    """A minimal sandbox comparable in startup cost to the production profile."""
+    return [
+        "bwrap", "--ro-bind", "/", "/", "--dev", "/dev", "--proc", "/proc",
+        "--bind", str(workspace), str(workspace), "--chdir", str(workspace),
+        "--unshare-all", "--die-with-parent", "--new-session", "--",
+    ]
+
+
+async def spawn(command: str, workspace: Path, prefix: list[str]) -> None:
+    """One call as the current tool does it: a new process (and sandbox) per command."""
+    argv = ["timeout", f"--kill-after={KILL_AFTER}", str(TIMEOUT)]
+    argv += prefix + ["bash", "-c", command]
+    process = await asyncio.create_subprocess_exec(
+        *argv,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        cwd=str(workspace),
+        env=default_shell_env(),
+    )
+    await OutputCapture().pump(process.stdout)
+    await process.wait()
+
+
+async def measure(run, iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await run()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summary(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    return f"{statistics.median(samples):>9.2f} {p95:>9.2f}"
+
+
+async def run_benchmark(iterations: int, use_bwrap: bool) -> None:
+    workspace = Path(tempfile.mkdtemp(prefix="bench_bash_"))
+    prefix = bwrap_prefix(workspace) if use_bwrap else []
+    shell = PersistentShell(
+        prefix + SHELL_COMMAND, cwd=str(workspace), env=default_shell_env()
+    )
+    try:
+        started = time.perf_counter()
+        await shell.run("true", TIMEOUT, OutputCapture())
+        print(f"Persistent shell startup: {(time.perf_counter() - started) * 1000:.2f} ms")
+        print(f"Shell command: {shlex.join(prefix + SHELL_COMMAND)}\n")
+
+        print(f"{'command':<10} {'spawn p50':>9} {'p95 ms':>9} {'shell p50':>9} {'p95 ms':>9} {'speedup':>8}")
+        for name, command in COMMANDS:
+            spawned = await measure(lambda: spawn(command, workspace, prefix), iterations)
+            persistent = await measure(
+                lambda: shell.run(command, TIMEOUT, OutputCapture()), iterations
+            )
+            speedup = statistics.median(spawned) / statistics.median(persistent)
+            print(f"{name:<10} {summary(spawned)} {summary(persistent)} {speedup:>7.1f}x")
+    finally:
+        await shell.close()
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--bwrap", action="store_true", help="Run both paths inside bwrap")
+    args = parser.parse_args()
+
+    if args.bwrap and shutil.which("bwrap") is None:
+        parser.error("bwrap not found on PATH")
+    asyncio.run(run_benchmark(args.iterations, args.bwrap))
+
+
+if __name__ == "__main__":
+    main()
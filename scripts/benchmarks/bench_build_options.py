@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark agent run preparation latency (system prompt + _build_options).
+
+Measures what ClaudeAgent._execute does before spawning the SDK client:
+loading the permission profile, setting the session context, rendering
+system.j2 (role file, mounts manifest, include tree) and building
+ClaudeAgentOptions (MCP servers, skill tools, PathValidator). Runs the same
+session repeatedly, as a resumed conversation would, once with the
+preparation cache cleared before every iteration (cold) and once warm,
+then a new session per iteration with a warm cache (the rendered prompt is
+shared across sessions; only the session values are spliced in).
+
+Usage:
+    python scripts/benchmarks/bench_build_options.py [--iterations 50]
+"""
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.agent_core import ClaudeAgent  # noqa: E402
+from src.core.permission_profiles import PermissionManager  # noqa: E402
+from src.core.prep_cache import get_preparation_cache  # noqa: E402
+from src.core.schemas import AgentConfig, SessionContext  # noqa: E402
+
+SESSION_ID = "20260101_000000_bench000"
+
+
+def prepare_once(sessions_dir: Path, session_id: str = SESSION_ID) -> None:
+    """One run's preparation, as in ClaudeAgent._execute."""
+    permission_manager = PermissionManager()
+    profile = permission_manager.profile
+    config = AgentConfig(
+        model="claude-haiku-4-5-20251001",
+        max_turns=10,
+        timeout_seconds=60,
+        enable_skills=True,
+        enable_file_checkpointing=False,
+        role="default",
+        allowed_tools=list(set(profile.tools.enabled) - set(profile.tools.disabled)),
+    )
+    agent = ClaudeAgent(
+        config,
+        sessions_dir=sessions_dir,
+        logs_dir=sessions_dir / "logs",
+        tracer=False,
+        permission_manager=permission_manager,
+    )
+    context = SessionContext(session_id=session_id, working_dir=str(sessions_dir))
+    agent._session_manager.create_session_directory(session_id)
+    permission_manager.set_session_context(
+        session_id=session_id,
+        workspace_path=".",
+        workspace_absolute_path=agent._session_manager.get_workspace_dir(session_id),
+    )
+    system_prompt = agent._render_system_prompt(context)
+    agent._build_options(context, system_prompt)
+    agent._cleanup_session(session_id)
+
+
+def measure(sessions_dir: Path, iterations: int, cold: bool, new_sessions: bool = False) -> list[float]:
+    timings = []
+    for n in range(iterations):
+        if cold:
+            get_preparation_cache().clear()
+        session_id = f"20260101_000000_bench{n + 1:03d}" if new_sessions else SESSION_ID
+        started = time.perf_counter()
+        prepare_once(sessions_dir, session_id)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sessions_dir = Path(tmp)
+        prepare_once(sessions_dir)  # warm imports and Jinja compilation
+        for label, cold, new_sessions in (
+            ("cold", True, False),
+            ("warm", False, False),
+            ("new sessions", False, True),
+        ):
+            timings = measure(sessions_dir, args.iterations, cold, new_sessions)
+            print(
+                f"{label:<12}: median={statistics.median(timings):7.2f}ms  "
+                f"p95={sorted(timings)[int(len(timings) * 0.95) - 1]:7.2f}ms"
+            )
+        print(f"cache: {get_preparation_cache().stats()}")
+
+
+if __name__ == "__main__":
+    main()
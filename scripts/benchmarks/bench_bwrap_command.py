@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark bwrap command construction: full rebuild vs compiled template.
+
+Builds a sandbox profile with many mounts (real directories, so every
+mount source is checked) and sandboxed environment variables, then times
+SandboxExecutor.build_bwrap_command() when the template is rebuilt for
+every command (the previous behaviour) and when the compiled template is
+reused.
+
+Usage:
+    python scripts/benchmarks/bench_bwrap_command.py [--mounts 200] [--envs 20] [--iterations 2000]
+"""
+import argparse
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.sandbox import SandboxConfig, SandboxExecutor, SandboxMount  # noqa: E402
+
+
+def build_config(root: Path, mounts: int, envs: int) -> SandboxConfig:
+    """Profile with static, session and dynamic mounts plus custom env vars."""
+    def mount(i: int, mode: str = "ro", optional: bool = False) -> SandboxMount:
+        source = root / f"mount{i}"
+        source.mkdir()
+        return SandboxMount(source=str(source), target=f"/mnt/m{i}", mode=mode, optional=optional)
+
+    third = max(mounts // 3, 1)
+    config = SandboxConfig(
+        static_mounts={f"static{i}": mount(i) for i in range(third)},
+        session_mounts={f"session{i}": mount(i, "rw") for i in range(third, 2 * third)},
+        dynamic_mounts=[mount(i, optional=True) for i in range(2 * third, mounts)],
+    )
+    config.environment.custom_env = {f"SECRET_{i}": f"value-{i}" for i in range(envs)}
+    return config
+
+
+def measure(build, iterations: int) -> float:
+    """Microseconds per call."""
+    started = time.perf_counter()
+    for i in range(iterations):
+        build(["bash", "-c", f"echo {i}"])
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mounts", type=int, default=200)
+    parser.add_argument("--envs", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    # Per-command INFO logs are part of the previous cost but would flood stdout
+    logging.basicConfig(level=logging.WARNING)
+
+    root = Path(tempfile.mkdtemp(prefix="bench_bwrap_"))
+    try:
+        config = build_config(root, args.mounts, args.envs)
+        executor = SandboxExecutor(config, linux_uid=50000, linux_gid=50000)
+
+        def rebuild(command: list[str]) -> list[str]:
+            executor.invalidate_bwrap_template()
+            return executor.build_bwrap_command(command, allow_network=False)
+
+        def cached(command: list[str]) -> list[str]:
+            return executor.build_bwrap_command(command, allow_network=False)
+
+        argv = cached(["true"])
+        assert rebuild(["true"]) == argv
+        print(f"Profile: {args.mounts} mounts, {args.envs} env vars, {len(argv)} bwrap args")
+        rebuild_us = measure(rebuild, args.iterations)
+        cached_us = measure(cached, args.iterations)
+        print(f"{'rebuild per command':<22} {rebuild_us:>10.1f} us")
+        print(f"{'compiled template':<22} {cached_us:>10.1f} us")
+        print(f"{'speedup':<22} {rebuild_us / cached_us:>10.1f}x")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark time-to-first-event with and without the SDK client pool.
+
+Runs a short conversation of follow-up messages against the fake Claude CLI
+(tests/backend/fake_claude_cli.py) with a simulated cold-start delay, once
+with the pool disabled (every run spawns a CLI process) and once enabled
+(follow-up runs are bound to the parked process).
+
+Then starts --sessions new sessions, each with its own system prompt,
+workspace and CLAUDE_CONFIG_DIR like Ag3ntum sessions, while the clients of
+the earlier sessions are parked. Their first messages pay the cold start
+with or without the pool: a parked process holds another session's
+conversation and spawn-time options (see src/core/client_pool.py).
+
+Usage:
+    python scripts/benchmarks/bench_client_pool.py [--runs 10] [--sessions 5] [--startup-delay 0.5]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from claude_agent_sdk import ClaudeAgentOptions, ResultMessage  # noqa: E402
+
+from src.core.client_pool import SDKClientPool  # noqa: E402
+
+FAKE_CLI = PROJECT_ROOT / "tests" / "backend" / "fake_claude_cli.py"
+
+
+def session_options(cli: Path, workdir: Path, name: str, resume: str | None) -> ClaudeAgentOptions:
+    """Options shaped like Ag3ntum's: per-session prompt, cwd and config directory."""
+    session_dir = workdir / name
+    (session_dir / "workspace").mkdir(parents=True, exist_ok=True)
+    return ClaudeAgentOptions(
+        system_prompt=f"benchmark (session {name})",
+        model="fake-model",
+        cwd=str(session_dir / "workspace"),
+        cli_path=str(cli),
+        env={"CLAUDE_CONFIG_DIR": str(session_dir)},
+        resume=resume,
+    )
+
+
+async def timed_run(pool: SDKClientPool, options: ClaudeAgentOptions, prompt: str) -> tuple[float, str]:
+    """One run; returns (time to first message in ms, Claude session id)."""
+    started = time.perf_counter()
+    async with pool.lease(options) as pooled:
+        await pooled.client.query(prompt)
+        first = None
+        result = None
+        async for message in pooled.client.receive_response():
+            if first is None:
+                first = (time.perf_counter() - started) * 1000
+            if isinstance(message, ResultMessage):
+                result = message
+        pooled.keep(result.session_id)
+    return first, result.session_id
+
+
+async def run_conversation(pool: SDKClientPool, cli: Path, workdir: Path, runs: int) -> list[float]:
+    """Send `runs` follow-up messages; return time to first message per run (ms)."""
+    timings: list[float] = []
+    claude_session_id = None
+    for i in range(runs):
+        options = session_options(cli, workdir, "conversation", claude_session_id)
+        first, claude_session_id = await timed_run(pool, options, f"message {i}")
+        timings.append(first)
+    return timings
+
+
+async def run_new_sessions(pool: SDKClientPool, cli: Path, workdir: Path, sessions: int) -> list[float]:
+    """Start `sessions` new sessions; return time to first message per session (ms)."""
+    timings: list[float] = []
+    for i in range(sessions):
+        first, _ = await timed_run(pool, session_options(cli, workdir, f"new-{i}", None), "hello")
+        timings.append(first)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    print(
+        f"{label:<10} first={timings[0]:8.1f}ms  "
+        f"follow-up median={statistics.median(timings[1:]):8.1f}ms  "
+        f"max={max(timings[1:]):8.1f}ms"
+    )
+
+
+def report_sessions(label: str, timings: list[float], pool: SDKClientPool) -> None:
+    stats = pool.stats()
+    print(
+        f"{label:<10} new session median={statistics.median(timings):8.1f}ms  "
+        f"max={max(timings):8.1f}ms  (pool hits={stats['hits']}, misses={stats['misses']})"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10, help="Messages per conversation")
+    parser.add_argument("--sessions", type=int, default=5, help="New sessions started afterwards")
+    parser.add_argument("--startup-delay", type=float, default=0.5,
+                        help="Simulated CLI cold start in seconds")
+    args = parser.parse_args()
+
+    os.environ["FAKE_CLAUDE_STARTUP_DELAY"] = str(args.startup_delay)
+    os.environ["CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK"] = "1"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        cli = workdir / "claude"
+        cli.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_CLI}" "$@"\n')
+        cli.chmod(0o755)
+
+        print(f"{args.runs} runs, simulated cold start {args.startup_delay * 1000:.0f}ms")
+        no_pool = SDKClientPool(max_size=0)
+        report("no pool", await run_conversation(no_pool, cli, workdir / "no-pool", args.runs))
+        report_sessions(
+            "no pool", await run_new_sessions(no_pool, cli, workdir / "no-pool", args.sessions), no_pool
+        )
+        pool = SDKClientPool(max_size=args.sessions + 1, max_runs_per_client=args.runs + 1)
+        try:
+            report("pool", await run_conversation(pool, cli, workdir / "pool", args.runs))
+            report_sessions(
+                "pool", await run_new_sessions(pool, cli, workdir / "pool", args.sessions), pool
+            )
+        finally:
+            await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark CommandSecurityFilter throughput: per-rule scan vs prefiltered matcher.
+
+Checks a mix of typical agent commands and the rules' exploit examples with
+the previous evaluation (every rule's regex in order until one matches),
+with the literal-prefiltered matcher, and through check_command() with its
+verdict cache (where repeated commands are answered from the cache).
+
+Usage:
+    python scripts/benchmarks/bench_command_filter.py [--commands 20000] [--unique 0.3]
+"""
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.command_security import CommandSecurityFilter  # noqa: E402
+
+TYPICAL = [
+    "ls -la",
+    "cd /workspace && git status",
+    "git diff HEAD~1 -- src/ | head -100",
+    "python3 -m pytest -q tests/ -k 'not slow'",
+    "npm install && npm run build",
+    "cat README.md | grep -n TODO",
+    "find . -name '*.py' -newer setup.py | xargs wc -l",
+    "pip install -r requirements.txt",
+    "sed -n '1,80p' src/main.py",
+    "tar czf backup.tar.gz data/ && ls -lh backup.tar.gz",
+]
+
+
+def full_scan(security_filter: CommandSecurityFilter, command: str):
+    """Previous evaluation: try every rule in order."""
+    for rule in security_filter._rules:
+        if rule.compiled_pattern.search(command):
+            return rule
+    return None
+
+
+def build_workload(security_filter: CommandSecurityFilter, count: int, unique: float) -> list[str]:
+    """Mostly benign commands, 10% exploits; a `unique` share made distinct."""
+    rng = random.Random(42)
+    exploits = [exploit for exploit, _ in security_filter.get_exploits_for_testing()]
+    commands = []
+    for i in range(count):
+        command = rng.choice(exploits) if rng.random() < 0.1 else rng.choice(TYPICAL)
+        if rng.random() < unique:
+            command = f"{command} # {i}"
+        commands.append(command)
+    return commands
+
+
+def measure(check, commands: list[str]) -> float:
+    """Commands per second."""
+    started = time.perf_counter()
+    for command in commands:
+        check(command)
+    return len(commands) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commands", type=int, default=20000)
+    parser.add_argument("--unique", type=float, default=0.3,
+                        help="Share of commands that are distinct (cache misses)")
+    args = parser.parse_args()
+
+    # Blocked exploits log a warning each; keep the output readable
+    logging.disable(logging.WARNING)
+
+    security_filter = CommandSecurityFilter()
+    commands = build_workload(security_filter, args.commands, args.unique)
+    matcher = security_filter._matcher
+    mismatches = sum(full_scan(security_filter, c) is not matcher.first_match(c) for c in commands)
+
+    print(f"{security_filter.rule_count} rules, {matcher.prefiltered_count} prefiltered; "
+          f"{len(commands)} commands ({args.unique:.0%} distinct), {mismatches} mismatches")
+    baseline = measure(lambda c: full_scan(security_filter, c), commands)
+    results = [
+        ("per-rule scan", baseline),
+        ("prefiltered matcher", measure(matcher.first_match, commands)),
+        ("check_command + cache", measure(security_filter.check_command, commands)),
+    ]
+    for name, rate in results:
+        print(f"{name:<24} {rate:>12,.0f} cmd/s {rate / baseline:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark Ag3ntumGrep search: previous implementation vs GrepEngine.
+
+Generates a synthetic workspace (source files, a node_modules tree, a .git
+directory and binary blobs) and runs the same searches with the previous
+algorithm (path.glob + read_text + line-by-line regex, no early stop
+across files) and with walk_files() + GrepEngine as used by the tool.
+
+Usage:
+    python scripts/benchmarks/bench_grep.py [--size-mb 1024] [--workspace DIR]
+"""
+import argparse
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.file_search import GrepEngine, walk_files  # noqa: E402
+
+MAX_RESULTS = 1000
+FILE_SIZE = 256 * 1024
+WORDS = "alpha beta gamma delta epsilon zeta theta lambda kappa sigma omega".split()
+
+SEARCHES = [
+    ("rare literal", "UNIQUE_MARKER_42", 0),
+    ("regex", r"def handle_\w+\(", 0),
+    ("common (early stop)", "gamma", 0),
+    ("ignore case", "unique_marker_42", re.IGNORECASE),
+]
+
+
+def build_workspace(root: Path, size_mb: int) -> None:
+    """Create ~size_mb of files: 70% source, 20% node_modules/.git, 10% binary."""
+    rng = random.Random(42)
+    total = size_mb * 1024 * 1024
+    written = 0
+    index = 0
+    while written < total:
+        kind = rng.random()
+        if kind < 0.7:
+            path = root / f"src/pkg{index % 50}/mod{index}.py"
+        elif kind < 0.8:
+            path = root / f"node_modules/dep{index % 30}/lib{index}.js"
+        elif kind < 0.9:
+            path = root / f".git/objects/{index % 256:02x}/obj{index}"
+        else:
+            path = root / f"assets/blob{index}.bin"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".bin":
+            path.write_bytes(b"\x00" + rng.randbytes(FILE_SIZE - 1))
+        else:
+            lines = []
+            size = 0
+            while size < FILE_SIZE:
+                line = " ".join(rng.choice(WORDS) for _ in range(8))
+                if rng.random() < 0.01:
+                    line = f"def handle_{rng.choice(WORDS)}(request):"
+                lines.append(line)
+                size += len(line) + 1
+            if index % 997 == 0:
+                lines.insert(len(lines) // 2, "UNIQUE_MARKER_42 found here")
+            path.write_text("\n".join(lines) + "\n")
+        written += FILE_SIZE
+        index += 1
+
+
+def legacy_grep(root: Path, regex: re.Pattern) -> int:
+    """The previous Ag3ntumGrep loop (without output formatting)."""
+    total = 0
+    for file_path in [f for f in root.glob("**/*") if f.is_file()]:
+        if total >= MAX_RESULTS:
+            break
+        try:
+            lines = file_path.read_text(encoding="utf-8", errors="replace").splitlines()
+        except Exception:
+            continue
+        for line in lines:
+            if regex.search(line):
+                total += 1
+                if total >= MAX_RESULTS:
+                    break
+    return total
+
+
+def engine_grep(root: Path, regex: re.Pattern) -> int:
+    engine = GrepEngine(regex, context=3, max_results=MAX_RESULTS)
+    return sum(len(f.matches) for f in engine.search(walk_files(root)))
+
+
+def timed(fn, *args) -> tuple[float, int]:
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--workspace", type=Path, help="Reuse/generate workspace here")
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    tmp = None
+    root = args.workspace
+    if root is None:
+        tmp = tempfile.mkdtemp(prefix="bench_grep_")
+        root = Path(tmp)
+    try:
+        if not any(root.iterdir()) if root.exists() else True:
+            root.mkdir(parents=True, exist_ok=True)
+            print(f"Generating {args.size_mb} MB workspace in {root} ...")
+            build_workspace(root, args.size_mb)
+
+        print(f"{'search':<22} {'legacy s':>10} {'matches':>8} {'engine s':>10} {'matches':>8}")
+        for name, pattern, flags in SEARCHES:
+            regex = re.compile(pattern, flags)
+            engine_s, engine_n = timed(engine_grep, root, regex)
+            if args.skip_legacy:
+                legacy = f"{'-':>10} {'-':>8}"
+            else:
+                legacy_s, legacy_n = timed(legacy_grep, root, regex)
+                legacy = f"{legacy_s:>10.2f} {legacy_n:>8}"
+            print(f"{name:<22} {legacy} {engine_s:>10.2f} {engine_n:>8}")
+        print("(legacy also searches node_modules, .git and binary files)")
+    finally:
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark WebFetch HTML to Markdown conversion: regex passes vs single pass.
+
+Converts corpora of HTML pages - generated documentation-style pages of
+several sizes (navigation, scripts, code blocks, tables, nested lists),
+pages with unclosed inline tags, or the .html files of --corpus - with the
+previous converter (a sequence of DOTALL regex substitutions over the whole
+document, copied below as the baseline), with the single-pass converter on
+the whole document, and with the tool's display budget (conversion stops
+once the budget is reached; this is how WebFetch converts).
+
+Usage:
+    python scripts/benchmarks/bench_html_markdown.py [--pages 5] [--sections 20,200,2000] [--corpus DIR]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import src.core  # noqa: E402,F401  (import order: src.core before tools)
+from tools.ag3ntum.ag3ntum_webfetch.markdown import convert_html  # noqa: E402
+from tools.ag3ntum.ag3ntum_webfetch.tool import DISPLAY_CHARS  # noqa: E402
+
+WORDS = (
+    "sandbox session workspace agent tool request response permission mount "
+    "stream output cache token budget parser module config handler event"
+).split()
+
+
+def regex_convert(html: str) -> str:
+    """
+    Previous WebFetch converter (regex passes over the whole document).
+
+    Preserves:
+    - Links and images
+    - Headings, lists, tables
+    - Code blocks
+    - Semantic structure
+
+    Removes:
+    - Scripts, styles
+    - Non-printable characters
+    - Extra whitespace
+    """
+    # Remove script and style tags
+    html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
+
+    # Convert common HTML tags to Markdown
+
+    # Headings
+    html = re.sub(r'<h1[^>]*>(.*?)</h1>', r'\n# \1\n', html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r'<h2[^>]*>(.*?)</h2>', r'\n## \1\n', html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r'<h3[^>]*>(.*?)</h3>', r'\n### \1\n', html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r'<h4[^>]*>(.*?)</h4>', r'\n#### \1\n', html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r'<h5[^>]*>(.*?)</h5>', r'\n##### \1\n', html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r'<h6[^>]*>(.*?)</h6>', r'\n###### \1\n', html, flags=re.DOTALL | re.IGNORECASE)
+
+    # Bold and italic
+    html = re.sub(r'<(?:strong|b)[^>]*>(.*?)</(?:strong|b)>', r'**\1**', html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r'<(?:em|i)[^>]*>(.*?)</(?:em|i)>', r'*\1*', html, flags=re.DOTALL | re.IGNORECASE)
+
+    # Code
+    html = re.sub(r'<code[^>]*>(.*?)</code>', r'`\1`', html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r'<pre[^>]*>(.*?)</pre>', r'\n```\n\1\n```\n', html, flags=re.DOTALL | re.IGNORECASE)
+
+    # Links - extract href and text
+    def replace_link(match):
+        full_tag = match.group(0)
+        href_match = re.search(r'href=["\'](.*?)["\']', full_tag, re.IGNORECASE)
+        text_match = re.search(r'>(.*?)<', full_tag, re.DOTALL)
+        href = href_match.group(1) if href_match else '#'
+        text = text_match.group(1) if text_match else href
+        return f'[{text.strip()}]({href})'
+
+    html = re.sub(r'<a[^>]*>.*?</a>', replace_link, html, flags=re.DOTALL | re.IGNORECASE)
+
+    # Images - extract src and alt
+    def replace_img(match):
+        full_tag = match.group(0)
+        src_match = re.search(r'src=["\'](.*?)["\']', full_tag, re.IGNORECASE)
+        alt_match = re.search(r'alt=["\'](.*?)["\']', full_tag, re.IGNORECASE)
+        img_src = src_match.group(1) if src_match else ''
+        alt = alt_match.group(1) if alt_match else 'image'
+        return f'![{alt}]({img_src})'
+
+    html = re.sub(r'<img[^>]*/?>', replace_img, html, flags=re.IGNORECASE)
+
+    # Lists
+    html = re.sub(r'<li[^>]*>(.*?)</li>', r'\n- \1', html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r'</?(?:ul|ol)[^>]*>', '', html, flags=re.IGNORECASE)
+
+    # Paragraphs and line breaks
+    html = re.sub(r'<br\s*/?>', '\n', html, flags=re.IGNORECASE)
+    html = re.sub(r'</?p[^>]*>', '\n\n', html, flags=re.IGNORECASE)
+    html = re.sub(r'</?div[^>]*>', '\n', html, flags=re.IGNORECASE)
+
+    # Horizontal rules
+    html = re.sub(r'<hr[^>]*/?>', '\n---\n', html, flags=re.IGNORECASE)
+
+    # Blockquotes
+    html = re.sub(r'<blockquote[^>]*>(.*?)</blockquote>', r'\n> \1\n', html, flags=re.DOTALL | re.IGNORECASE)
+
+    # Remove all other HTML tags
+    html = re.sub(r'<[^>]+>', '', html)
+
+    # Decode HTML entities
+    html = html.replace('&nbsp;', ' ')
+    html = html.replace('&lt;', '<')
+    html = html.replace('&gt;', '>')
+    html = html.replace('&amp;', '&')
+    html = html.replace('&quot;', '"')
+    html = html.replace('&#39;', "'")
+    html = html.replace('&apos;', "'")
+
+    # Remove non-printable characters (except newlines and tabs)
+    html = re.sub(r'[^\x20-\x7E\n\t\u0080-\uFFFF]', '', html)
+
+    # Clean up whitespace
+    # Remove trailing whitespace from lines
+    html = re.sub(r'[ \t]+$', '', html, flags=re.MULTILINE)
+    # Remove leading whitespace from lines (but preserve indentation for code)
+    html = re.sub(r'^[ \t]+', '', html, flags=re.MULTILINE)
+    # Collapse multiple blank lines into max 2
+    html = re.sub(r'\n{3,}', '\n\n', html)
+    # Remove spaces around newlines
+    html = re.sub(r' *\n *', '\n', html)
+
+    return html.strip()
+
+
+def sentence(rng: random.Random, words: int = 14) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def build_page(rng: random.Random, sections: int) -> str:
+    """Documentation-style page with boilerplate around the content."""
+    parts = [
+        "<!DOCTYPE html><html><head><title>Docs</title>",
+        "<style>body { font-family: sans-serif } .nav a { color: #333 }</style>",
+        "<script>window.analytics = { track: function (e) { return e; } };</script>",
+        "</head><body><nav class='nav'><ul>",
+        "".join(f"<li><a href='/docs/{w}'>{w}</a></li>" for w in WORDS),
+        "</ul></nav><main>",
+    ]
+    for i in range(sections):
+        kind = i % 5
+        parts.append(f"<h2 id='s{i}'>Section {i}</h2>")
+        parts.append(
+            f"<p>{sentence(rng)} <strong>{rng.choice(WORDS)}</strong> "
+            f"<a href='https://example.com/{i}'>{rng.choice(WORDS)}</a> <em>{sentence(rng, 5)}</em></p>"
+        )
+        if kind == 1:
+            parts.append("<pre><code>" + "\n".join(f"    call_{j}(x, y)" for j in range(8)) + "</code></pre>")
+        elif kind == 2:
+            rows = "".join(
+                f"<tr><td>{rng.choice(WORDS)}</td><td>{j}</td><td>{sentence(rng, 4)}</td></tr>"
+                for j in range(6)
+            )
+            parts.append(f"<table><tr><th>Name</th><th>Id</th><th>Notes</th></tr>{rows}</table>")
+        elif kind == 3:
+            parts.append("<ul>" + "".join(
+                f"<li>{sentence(rng, 6)}<ul><li>{sentence(rng, 4)}</li></ul></li>" for _ in range(4)
+            ) + "</ul>")
+        elif kind == 4:
+            parts.append(
+                f"<div class='note'><div><p>{sentence(rng)}</p>"
+                f"<img src='/i/{i}.png' alt='fig {i}'></div></div>"
+            )
+    parts.append("</main><footer><p>Copyright</p><a href='/privacy'>Privacy</a></footer></body></html>")
+    return "".join(parts)
+
+
+def build_unbalanced_page(items: int) -> str:
+    """List whose items leave links and emphasis unclosed."""
+    return "<ul>" + "".join(
+        f"<li><a href='/item/{i}'>item {i} <b>bold <i>italic" for i in range(items)
+    ) + "</ul>"
+
+
+def measure(convert, pages: list[str]) -> float:
+    """Seconds to convert the corpus."""
+    started = time.perf_counter()
+    for page in pages:
+        convert(page)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=5, help="Pages per generated corpus")
+    parser.add_argument("--sections", default="20,200,2000",
+                        help="Sections per generated page, one corpus per value")
+    parser.add_argument("--unbalanced-items", type=int, default=1000)
+    parser.add_argument("--corpus", type=Path, default=None, help="Directory of .html files to use instead")
+    args = parser.parse_args()
+
+    corpora: dict[str, list[str]] = {}
+    if args.corpus:
+        corpora[str(args.corpus)] = [
+            p.read_text(errors="replace") for p in sorted(args.corpus.glob("*.html"))
+        ]
+    else:
+        rng = random.Random(3)
+        for sections in (int(value) for value in args.sections.split(",")):
+            pages = [build_page(rng, sections) for _ in range(args.pages)]
+            corpora[f"docs, {len(pages[0]) // 1024} KB pages"] = pages
+        pages = [build_unbalanced_page(args.unbalanced_items) for _ in range(args.pages)]
+        corpora[f"unclosed tags, {len(pages[0]) // 1024} KB"] = pages
+
+    converters = [
+        ("regex passes", regex_convert),
+        ("single pass", convert_html),
+        (f"budget {DISPLAY_CHARS}", lambda page: convert_html(page, DISPLAY_CHARS)),
+    ]
+    print(f"{'corpus':<26}" + "".join(f"{name:>22}" for name, _ in converters) + "   (ms/page, speedup)")
+    for label, pages in corpora.items():
+        timings = [measure(convert, pages) / len(pages) * 1000 for _, convert in converters]
+        row = "".join(f"{ms:>12.1f} {timings[0] / ms:>7.1f}x  " for ms in timings)
+        print(f"{label:<26}{row}")
+
+
+if __name__ == "__main__":
+    main()
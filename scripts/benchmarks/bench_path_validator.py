@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark path validation: uncached resolution vs resolution cache.
+
+Configures a validator with external and per-user mounts on a temporary
+tree and validates a mix of workspace, mount and repeated paths (as the
+file tools issue them during a session) with the resolution cache
+suspended (every call resolves the path on disk, like the previous
+implementation) and with the cache active.
+
+Usage:
+    python scripts/benchmarks/bench_path_validator.py [--paths 5000] [--rounds 5] [--mounts 20]
+"""
+import argparse
+import logging
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.path_validator import (  # noqa: E402
+    Ag3ntumPathValidator,
+    PathValidationError,
+    PathValidatorConfig,
+)
+
+
+def build_tree(root: Path, mounts: int) -> PathValidatorConfig:
+    """Workspace with nested sources plus external and per-user mounts."""
+    workspace = root / "workspace"
+    (workspace / "src" / "pkg" / "sub").mkdir(parents=True)
+    (workspace / "docs").mkdir()
+    for name in ("ro", "rw", "persistent"):
+        (root / name / "data").mkdir(parents=True)
+    user_ro, user_rw = {}, {}
+    for i in range(mounts):
+        target = user_ro if i % 2 else user_rw
+        path = root / "users" / f"mount{i}"
+        path.mkdir(parents=True)
+        target[f"mount{i}"] = path
+    return PathValidatorConfig(
+        workspace_path=workspace,
+        external_ro_base=root / "ro",
+        external_rw_base=root / "rw",
+        persistent_path=root / "persistent",
+        user_mounts_ro=user_ro,
+        user_mounts_rw=user_rw,
+    )
+
+
+def build_paths(count: int, mounts: int) -> list[tuple[str, str]]:
+    """(path, operation) pairs: mostly repeated, some distinct."""
+    rng = random.Random(11)
+    hot = [
+        "src/main.py", "/workspace/src/pkg/sub/mod.py", "./docs/README.md",
+        "/workspace/external/ro/data/input.csv", "external/rw/data/out.json",
+        "/workspace/external/persistent/data/state.db",
+    ]
+    hot += [
+        f"/workspace/external/user-{'ro' if i % 2 else 'rw'}/mount{i}/file.txt"
+        for i in range(mounts)
+    ]
+    paths = []
+    for i in range(count):
+        if rng.random() < 0.1:
+            paths.append((f"src/pkg/gen_{i}.py", "write"))
+        elif rng.random() < 0.02:
+            paths.append(("/workspace/../etc/passwd", "read"))
+        else:
+            paths.append((rng.choice(hot), "read"))
+    return paths
+
+
+def validate(validator: Ag3ntumPathValidator, path: str, operation: str):
+    try:
+        return validator.validate_path(path, operation).normalized
+    except PathValidationError:
+        return None
+
+
+def replay(validator: Ag3ntumPathValidator, paths: list[tuple[str, str]]) -> list[float]:
+    """Per-call latency in microseconds."""
+    samples = []
+    for path, operation in paths:
+        started = time.perf_counter()
+        validate(validator, path, operation)
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def summary(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    return f"{statistics.mean(samples):>10.1f} {statistics.median(samples):>10.1f} {p99:>10.1f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--paths", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--mounts", type=int, default=20, help="Per-user mounts")
+    args = parser.parse_args()
+
+    # Blocked paths log a warning each; keep the output readable
+    logging.disable(logging.WARNING)
+
+    root = Path(tempfile.mkdtemp(prefix="bench_path_validator_"))
+    try:
+        validator = Ag3ntumPathValidator(build_tree(root, args.mounts))
+        paths = build_paths(args.paths, args.mounts)
+
+        validator.suspend_cache()
+        expected = [validate(validator, p, op) for p, op in paths]
+        validator.resume_cache()
+        mismatches = sum(validate(validator, p, op) != e for (p, op), e in zip(paths, expected))
+        print(f"{args.mounts} user mounts; {len(paths)} paths, {mismatches} mismatches\n")
+
+        old, new = [], []
+        for _ in range(args.rounds):
+            validator.suspend_cache()
+            old += replay(validator, paths)
+            validator.resume_cache()
+            new += replay(validator, paths)
+        print(f"{'':<22} {'mean us':>10} {'p50 us':>10} {'p99 us':>10}")
+        print(f"{'resolve every call':<22} {summary(old)}")
+        print(f"{'resolution cache':<22} {summary(new)}")
+        print(f"{'speedup (mean)':<22} {statistics.mean(old) / statistics.mean(new):>10.1f}x")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark permission-hook latency: per-pattern matching vs compiled engine.
+
+Loads the shipped permission profile with a session context on a temporary
+workspace, then replays a recorded-style mix of tool calls (mostly Ag3ntum
+MCP tools, repeated file paths and commands, some denied native tools)
+through the previous evaluation (config file probe for hot reload, then
+every deny and allow pattern via _matches_pattern) and through
+PermissionManager.is_allowed() with the compiled engine and its verdict
+cache.
+
+Usage:
+    python scripts/benchmarks/bench_permissions.py [--calls 1000] [--rounds 5] [--profile PATH]
+"""
+import argparse
+import logging
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.permission_config import PermissionMode  # noqa: E402
+from src.core.permission_profiles import PermissionManager  # noqa: E402
+
+FILES = ["./main.py", "./src/app.py", "./README.md", "./data/input.csv", "./tests/test_app.py"]
+COMMANDS = ["ls -la", "python3 main.py", "git status", "pytest -q", "cat README.md"]
+
+
+def build_replay(count: int) -> list[str]:
+    """Tool call strings as the permission hooks build them."""
+    rng = random.Random(7)
+    calls = []
+    for i in range(count):
+        roll = rng.random()
+        path = rng.choice(FILES)
+        if roll < 0.35:
+            calls.append(f"mcp__ag3ntum__{rng.choice(['Read', 'Write', 'Edit', 'Glob', 'Grep'])}({path})")
+        elif roll < 0.6:
+            calls.append(f"mcp__ag3ntum__Bash({rng.choice(COMMANDS)})")
+        elif roll < 0.7:
+            # Distinct arguments (cache misses)
+            calls.append(f"mcp__ag3ntum__Read(./notes/{i}.md)")
+        elif roll < 0.85:
+            calls.append(f"{rng.choice(['Read', 'Write', 'Edit', 'Glob'])}({path})")
+        elif roll < 0.95:
+            calls.append(f"Bash({rng.choice(COMMANDS)})")
+        else:
+            calls.append(rng.choice(["Task", "Skill", "WebFetch(https://example.com)", "TodoWrite"]))
+    return calls
+
+
+def per_pattern(manager: PermissionManager, tool_call: str) -> bool:
+    """Previous evaluation: config file probe, every deny, then every allow pattern."""
+    config_manager = manager._config_manager
+    config_manager._needs_reload()
+    config = config_manager.load()
+    for pattern in config.permissions.deny:
+        if config_manager._matches_pattern(tool_call, pattern):
+            return False
+    for pattern in config.permissions.allow:
+        if config_manager._matches_pattern(tool_call, pattern):
+            return True
+    return config.defaultMode == PermissionMode.BYPASS
+
+
+def replay(check, calls: list[str]) -> list[float]:
+    """Per-call latency in microseconds."""
+    samples = []
+    for call in calls:
+        started = time.perf_counter()
+        check(call)
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def summary(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    return f"{statistics.mean(samples):>10.1f} {statistics.median(samples):>10.1f} {p99:>10.1f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--profile", type=Path, default=None,
+                        help="Permission profile (default: config/security/permissions.yaml)")
+    args = parser.parse_args()
+
+    # Per-check INFO logs are part of the previous cost but would flood stdout
+    logging.basicConfig(level=logging.WARNING)
+
+    workspace = Path(tempfile.mkdtemp(prefix="bench_permissions_"))
+    try:
+        for sub in ("src", "data", "tests", "notes"):
+            (workspace / sub).mkdir()
+        manager = PermissionManager(profile_path=args.profile)
+        manager.set_session_context(
+            session_id="bench",
+            workspace_path="./sessions/bench/workspace",
+            workspace_absolute_path=workspace,
+        )
+        manager.activate()
+        calls = build_replay(args.calls)
+
+        mismatches = sum(per_pattern(manager, c) != manager.is_allowed(c) for c in calls)
+        rules = manager._config_manager.load().permissions
+        print(f"{len(rules.deny)} deny / {len(rules.allow)} allow patterns; "
+              f"{len(calls)} calls, {mismatches} mismatches\n")
+
+        old, new = [], []
+        for _ in range(args.rounds):
+            old += replay(lambda c: per_pattern(manager, c), calls)
+            new += replay(manager.is_allowed, calls)
+        print(f"{'':<22} {'mean us':>10} {'p50 us':>10} {'p99 us':>10}")
+        print(f"{'per-pattern':<22} {summary(old)}")
+        print(f"{'compiled + cache':<22} {summary(new)}")
+        print(f"{'speedup (mean)':<22} {statistics.mean(old) / statistics.mean(new):>10.1f}x")
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
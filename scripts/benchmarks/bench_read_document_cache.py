@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark ReadDocument cache inserts: JSON index vs SQLite index.
+
+Stores --entries extraction results with the cache manager (SQLite index,
+size tracked incrementally, LRU eviction), optionally with several
+processes writing into the same cache directory, and reads a sample back.
+The previous manager - it rewrote index.json and walked the whole cache
+directory on every put, so each insert cost O(cache size) - is replayed
+below as the baseline for --baseline-entries inserts (100k inserts would
+take hours).
+
+Usage:
+    python scripts/benchmarks/bench_read_document_cache.py [--entries 100000] [--processes 1] [--baseline-entries 1000]
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import src.core  # noqa: E402,F401  (import order: src.core before tools)
+from tools.ag3ntum.ag3ntum_read_document.cache import CacheManager  # noqa: E402
+from tools.ag3ntum.ag3ntum_read_document.config import CacheConfig  # noqa: E402
+
+CONTENT = "Extracted page text. " * 20  # ~420 bytes per entry
+
+
+def legacy_put(cache_dir: Path, index: dict, category: str, cache_key: str, content: str) -> None:
+    """Previous CacheManager.put(): entry file, full index.json rewrite, directory walk."""
+    cache_path = cache_dir / category / cache_key[:2] / f"{cache_key}.json"
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"content": content, "metadata": {}, "created_at": time.time(),
+            "file_hash": cache_key[:32], "params_hash": cache_key[32:]}
+    with open(cache_path, "w") as f:
+        json.dump(data, f)
+
+    index[cache_key] = {"category": category, "created_at": data["created_at"], "size": len(content)}
+    with open(cache_dir / "index.json", "w") as f:
+        json.dump(index, f)
+
+    # _maybe_cleanup(): total size over every file in the cache
+    sum(f.stat().st_size for f in cache_dir.rglob("*.json") if f.is_file())
+
+
+def key(n: int) -> str:
+    return f"{n:064x}"
+
+
+def insert_range(directory: str, start: int, stop: int, max_size_mb: int) -> None:
+    """Store entries start..stop-1 (one process)."""
+    manager = CacheManager(CacheConfig(directory=directory, max_size_mb=max_size_mb))
+    for n in range(start, stop):
+        manager.put("pdf", key(n), CONTENT)
+    manager.close()
+
+
+def run_inserts(directory: Path, entries: int, processes: int, max_size_mb: int) -> float:
+    """Insert entries split across processes; returns the wall time."""
+    started = time.perf_counter()
+    if processes == 1:
+        insert_range(str(directory), 0, entries, max_size_mb)
+    else:
+        step = -(-entries // processes)
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(
+                target=insert_range,
+                args=(str(directory), start, min(start + step, entries), max_size_mb),
+            )
+            for start in range(0, entries, step)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--processes", type=int, default=1, help="Processes sharing the cache")
+    parser.add_argument("--baseline-entries", type=int, default=1000, help="0 skips the baseline")
+    parser.add_argument("--max-size-mb", type=int, default=1024, help="Cache size limit (small values evict)")
+    parser.add_argument("--reads", type=int, default=10_000)
+    args = parser.parse_args()
+
+    # Evictions log at INFO; keep the output readable
+    logging.disable(logging.INFO)
+
+    root = Path(tempfile.mkdtemp(prefix="bench_doc_cache_"))
+    try:
+        if args.baseline_entries:
+            legacy_dir = root / "legacy"
+            index: dict = {}
+            tail = max(1, args.baseline_entries // 10)
+            started = time.perf_counter()
+            for n in range(args.baseline_entries):
+                if n == args.baseline_entries - tail:
+                    tail_started = time.perf_counter()
+                legacy_put(legacy_dir, index, "pdf", key(n), CONTENT)
+            finished = time.perf_counter()
+            legacy = finished - started
+            print(
+                f"{'json index':<14} {args.baseline_entries:>8} inserts  {legacy:8.2f}s  "
+                f"{legacy / args.baseline_entries * 1e6:10.0f} us/insert "
+                f"(last {tail}: {(finished - tail_started) / tail * 1e6:.0f} us/insert)"
+            )
+
+        cache_dir = root / "sqlite"
+        elapsed = run_inserts(cache_dir, args.entries, args.processes, args.max_size_mb)
+        print(
+            f"{'sqlite index':<14} {args.entries:>8} inserts  {elapsed:8.2f}s  "
+            f"{elapsed / args.entries * 1e6:10.0f} us/insert ({args.processes} process(es))"
+        )
+
+        manager = CacheManager(CacheConfig(directory=str(cache_dir), max_size_mb=args.max_size_mb))
+        rng = random.Random(0)
+        sample = [key(rng.randrange(args.entries)) for _ in range(args.reads)]
+        started = time.perf_counter()
+        found = sum(manager.get("pdf", k) is not None for k in sample)
+        reads = time.perf_counter() - started
+        stats = manager.get_stats()
+        files = sum(1 for _ in cache_dir.glob("*/*/*.json"))
+        print(
+            f"{'reads':<14} {args.reads:>8} gets     {reads:8.2f}s  "
+            f"{reads / args.reads * 1e6:10.0f} us/get ({found} hits)"
+        )
+        print(
+            f"index: {stats.total_entries} entries, {stats.total_size_bytes / 1e6:.1f} MB; "
+            f"{files} entry files on disk"
+        )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+def add(a, b):
+    """
+    Add two numbers and return the result.
+    
+    Args:
+        a: First number
+        b: Second number
+    
+    Returns:
+        The sum of a and b
+    """
+    return a + b
+
+
+if __name__ == "__main__":
+    # Example usage
+    result = add(5, 3)
+    print(f"5 + 3 = {result}")
@@ -26,7 +26,7 @@ from ..services.session_service import InvalidSessionIdError, SessionNotFoundErr
 from ..core.logging_config import setup_backend_logging
 from ..core.subagent_manager import get_subagent_manager
 from ..db.database import init_db, DATABASE_PATH
-from .routes import auth_router, config_router, files_router, health_router, llm_proxy_router, queue_router, sessions_router, skills_router
+from .routes import auth_router, config_router, files_router, health_router, llm_proxy_router, metrics_router, queue_router, sessions_router, skills_router
 from .waf_filter import validate_request_size
 from .security_middleware import (
     build_allowed_origins,
@@ -270,6 +270,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         await queue_processor.stop()
         logger.info("Queue processor stopped")
 
+    # Close warm Claude CLI processes kept by the SDK client pool
+    from ..core.client_pool import shutdown_client_pool
+    await shutdown_client_pool()
+
+    # Close pooled WebFetch connections
+    from tools.ag3ntum.ag3ntum_webfetch.network import close_shared_clients
+    await close_shared_clients()
+
     logger.info("Shutting down Ag3ntum API...")
 
 
@@ -360,6 +368,7 @@ def create_app() -> FastAPI:
     app.include_router(llm_proxy_router, prefix="/api")
     app.include_router(skills_router, prefix="/api/v1")
     app.include_router(config_router, prefix="/api/v1")
+    app.include_router(metrics_router, prefix="/api/v1")
 
     # Exception handlers for session-related errors
     @app.exception_handler(InvalidSessionIdError)
@@ -259,6 +259,52 @@ class StartTaskRequest(BaseModel):
         return truncate_text_content(v, "task")
 
 
+class BatchTaskItem(BaseModel):
+    """A single task inside a POST /sessions/run-batch request."""
+    task: str = Field(
+        description="Task description to execute"
+    )
+    additional_dirs: list[str] = Field(
+        default_factory=list,
+        description="Additional directories the agent can access (appended to batch-level dirs)"
+    )
+
+    @field_validator("task")
+    @classmethod
+    def truncate_task(cls, v: str) -> str:
+        """Reject blank tasks and apply WAF filter to task field."""
+        if not v or not v.strip():
+            raise ValueError("task must not be empty")
+        return truncate_text_content(v, "task") or ""
+
+
+class RunBatchRequest(BaseModel):
+    """
+    Request body for POST /sessions/run-batch - run many independent tasks at once.
+
+    Each task gets its own session. Sessions are created in one transaction,
+    their initial events are written in bulk, and tasks that cannot start
+    immediately are enqueued with a single pipelined Redis call.
+    The maximum number of tasks is configured in agent.yaml (batch.max_tasks).
+    """
+    tasks: list[BatchTaskItem] = Field(
+        min_length=1,
+        description="Tasks to execute, one session per task"
+    )
+
+    # Additional directories shared by every task in the batch
+    additional_dirs: list[str] = Field(
+        default_factory=list,
+        description="Additional directories the agent can access (all tasks)"
+    )
+
+    # Agent config overrides shared by every task in the batch
+    config: AgentConfigOverrides = Field(
+        default_factory=AgentConfigOverrides,
+        description="Agent configuration overrides applied to all tasks"
+    )
+
+
 # =============================================================================
 # Session Responses
 # =============================================================================
@@ -327,6 +373,12 @@ class SessionResponse(BaseModel):
         description="Parent session ID if this session was forked"
     )
 
+    # Batch submission
+    batch_id: Optional[str] = Field(
+        default=None,
+        description="Batch ID if this session was created by POST /sessions/run-batch"
+    )
+
     # Queue management fields
     queue_position: Optional[int] = Field(
         default=None,
@@ -366,6 +418,49 @@ class TaskStartedResponse(BaseModel):
     )
 
 
+class BatchStartedResponse(BaseModel):
+    """Response from POST /sessions/run-batch."""
+    batch_id: str = Field(description="Batch ID for GET /sessions/batches/{batch_id}")
+    session_ids: list[str] = Field(
+        description="Created session IDs, in the same order as the submitted tasks"
+    )
+    sessions: list[TaskStartedResponse] = Field(
+        default_factory=list,
+        description="Per-session start status (running or queued)"
+    )
+    running: int = Field(default=0, description="Number of tasks started immediately")
+    queued: int = Field(default=0, description="Number of tasks placed in the queue")
+
+
+class BatchStatusResponse(BaseModel):
+    """Response from GET /sessions/batches/{batch_id} (aggregated progress)."""
+    batch_id: str = Field(description="Batch ID")
+    total: int = Field(description="Total number of sessions in the batch")
+    finished: int = Field(
+        default=0,
+        description="Sessions in a terminal state (complete, partial, failed, cancelled)"
+    )
+    status_counts: dict[str, int] = Field(
+        default_factory=dict,
+        description="Number of sessions per status"
+    )
+    is_finished: bool = Field(
+        default=False,
+        description="Whether every session in the batch has reached a terminal state"
+    )
+    total_turns: int = Field(default=0, description="Sum of turns across all resumptions")
+    total_duration_ms: int = Field(
+        default=0,
+        description="Sum of durations across all resumptions in milliseconds"
+    )
+    total_cost_usd: float = Field(
+        default=0.0,
+        description="Sum of cost across all resumptions in USD"
+    )
+    total_input_tokens: int = Field(default=0, description="Sum of input tokens")
+    total_output_tokens: int = Field(default=0, description="Sum of output tokens")
+
+
 class CancelResponse(BaseModel):
     """Response from POST /sessions/{id}/cancel."""
     session_id: str = Field(description="Session ID")
@@ -476,3 +571,10 @@ class SubmitAnswerResponse(BaseModel):
         default=False,
         description="Whether the session can be resumed now that the answer is submitted"
     )
+    resumed: bool = Field(
+        default=False,
+        description=(
+            "Whether the answer was delivered to the suspended agent process and "
+            "execution already continued (no separate resume call needed)"
+        ),
+    )
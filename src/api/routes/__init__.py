@@ -8,6 +8,7 @@ from .config import router as config_router
 from .files import router as files_router
 from .health import router as health_router
 from .llm_proxy import router as llm_proxy_router
+from .metrics import router as metrics_router
 from .queue import router as queue_router
 from .sessions import router as sessions_router
 from .skills import router as skills_router
@@ -18,6 +19,7 @@ __all__ = [
     "files_router",
     "health_router",
     "llm_proxy_router",
+    "metrics_router",
     "queue_router",
     "sessions_router",
     "skills_router",
@@ -13,6 +13,7 @@ Sensitive Data: Text files are scanned for API keys, tokens, passwords in both:
 - File previews: Secrets redacted before displaying in File Explorer
 Detected secrets are redacted with same-length placeholders to preserve formatting.
 """
+import asyncio
 import logging
 import mimetypes
 import re
@@ -39,6 +40,9 @@ from ...services.mount_service import (
     is_path_writable_for_session,
     translate_docker_path_to_sandbox,
 )
+from ...core import line_index
+from ...core.line_index import LINE_INDEX_DIR
+from ...core.workspace_index import IndexEntry, WorkspaceIndex, get_workspace_index
 from ...core.sandbox_path_resolver import (
     has_sandbox_path_resolver,
     PathResolutionError,
@@ -64,6 +68,7 @@ MAX_FILES_PER_DIRECTORY = 1000
 
 # Maximum file size for content preview (5MB)
 MAX_PREVIEW_SIZE = 5 * 1024 * 1024
+MAX_PREVIEW_LINES = 10000
 
 # File extensions that can be previewed as text
 TEXT_EXTENSIONS = {
@@ -121,6 +126,8 @@ class FileContentResponse(BaseModel):
     content: Optional[str] = None  # Text content (if viewable)
     is_binary: bool = False
     is_truncated: bool = False
+    start_line: Optional[int] = None  # First line number for line-range previews
+    total_lines: Optional[int] = None  # Known line count for line-range previews
     error: Optional[str] = None
 
 
@@ -600,6 +607,51 @@ def get_file_info(
         return None
 
 
+def _file_info_from_entry(
+    entry: IndexEntry,
+    workspace_root: Path,
+    include_hidden: bool = False,
+    relative_path_prefix: Optional[str] = None,
+) -> Optional[FileInfo]:
+    """
+    Build FileInfo from a workspace index entry (no stat call).
+
+    Same output as get_file_info() for the entry's path.
+    """
+    # Normalize filename to NFC (macOS uses NFD by default)
+    name = unicodedata.normalize('NFC', entry.name)
+    is_hidden = name.startswith('.')
+    if is_hidden and not include_hidden:
+        return None
+
+    file_path = Path(entry.path)
+    if relative_path_prefix:
+        relative_path = f"{relative_path_prefix}/{name}"
+    else:
+        try:
+            relative_path = str(file_path.relative_to(workspace_root))
+        except ValueError:
+            relative_path = name
+
+    is_dir = entry.is_dir
+    is_external, is_readonly, mount_type = get_mount_info(relative_path)
+
+    return FileInfo(
+        name=name,
+        path=relative_path,
+        is_directory=is_dir,
+        size=0 if is_dir else entry.size,
+        created_at=datetime.fromtimestamp(entry.ctime, tz=timezone.utc).isoformat(),
+        modified_at=datetime.fromtimestamp(entry.mtime, tz=timezone.utc).isoformat(),
+        mime_type=None if is_dir else get_mime_type(file_path),
+        is_hidden=is_hidden,
+        is_viewable=False if is_dir else is_viewable_file(file_path),
+        is_readonly=is_readonly,
+        is_external=is_external,
+        mount_type=mount_type,
+    )
+
+
 def list_directory(
     directory: Path,
     workspace_root: Path,
@@ -608,6 +660,7 @@ def list_directory(
     sort_order: str = "desc",
     limit: int = MAX_FILES_PER_DIRECTORY,
     relative_path_prefix: Optional[str] = None,
+    index: Optional[WorkspaceIndex] = None,
 ) -> tuple[list[FileInfo], int, bool]:
     """
     List contents of a directory.
@@ -622,23 +675,32 @@ def list_directory(
         relative_path_prefix: If provided, use this prefix for relative paths
             instead of computing from workspace_root. Used for external mounts
             where the actual directory is outside the workspace.
+        index: Session workspace index to take the listing from (optional).
 
     Returns:
         Tuple of (file_list, total_count, truncated)
     """
     files: list[FileInfo] = []
 
-    try:
-        entries = list(directory.iterdir())
-    except (OSError, PermissionError) as e:
-        logger.warning(f"Failed to list directory {directory}: {e}")
-        return [], 0, False
+    if index is not None:
+        for indexed in index.list_dir(directory):
+            info = _file_info_from_entry(
+                indexed, workspace_root, include_hidden, relative_path_prefix
+            )
+            if info:
+                files.append(info)
+    else:
+        try:
+            entries = list(directory.iterdir())
+        except (OSError, PermissionError) as e:
+            logger.warning(f"Failed to list directory {directory}: {e}")
+            return [], 0, False
 
-    # Get file info for each entry
-    for entry in entries:
-        info = get_file_info(entry, workspace_root, include_hidden, relative_path_prefix)
-        if info:
-            files.append(info)
+        # Get file info for each entry
+        for entry in entries:
+            info = get_file_info(entry, workspace_root, include_hidden, relative_path_prefix)
+            if info:
+                files.append(info)
 
     total_count = len(files)
 
@@ -773,14 +835,17 @@ async def browse_files(
         )
 
     # List directory contents (use resolved workspace root for consistency)
-    files, total_count, truncated = list_directory(
+    resolved_root = workspace_root.resolve()
+    files, total_count, truncated = await asyncio.to_thread(
+        list_directory,
         directory=actual_dir,
-        workspace_root=workspace_root.resolve(),
+        workspace_root=resolved_root,
         include_hidden=include_hidden,
         sort_by=sort_by,
         sort_order=sort_order,
         limit=limit,
         relative_path_prefix=normalized_path if is_external_path else None,
+        index=get_workspace_index(session_id, resolved_root),
     )
 
     return DirectoryListing(
@@ -799,6 +864,13 @@ async def browse_files(
 async def get_file_content(
     session_id: str,
     path: str = Query(..., description="Relative path to the file"),
+    offset: Optional[int] = Query(default=None, ge=1, description="First line (1-indexed)"),
+    limit: Optional[int] = Query(
+        default=None, ge=1, le=MAX_PREVIEW_LINES, description="Number of lines from offset"
+    ),
+    tail: Optional[int] = Query(
+        default=None, ge=1, le=MAX_PREVIEW_LINES, description="Last N lines of the file"
+    ),
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ) -> FileContentResponse:
@@ -807,6 +879,11 @@ async def get_file_content(
 
     Returns file content as text if the file is viewable (text-based).
     For binary files, returns metadata only with is_binary=True.
+
+    With offset/limit or tail, returns that line range instead of the first
+    MAX_PREVIEW_SIZE bytes. Ranges are located through the line-offset index
+    (src/core/line_index.py), so paging through a large log does not re-read
+    it from the start.
     """
     # Validate and get session
     try:
@@ -874,7 +951,27 @@ async def get_file_content(
     # Read content if viewable
     if not is_binary:
         try:
-            if file_stat.st_size > MAX_PREVIEW_SIZE:
+            if offset is not None or limit is not None or tail is not None:
+                cache_dir = Path(session.working_dir) / LINE_INDEX_DIR
+                if tail is not None:
+                    line_range = await asyncio.to_thread(
+                        line_index.tail, actual_file, tail, cache_dir
+                    )
+                else:
+                    line_range = await asyncio.to_thread(
+                        line_index.read_lines,
+                        actual_file,
+                        offset or 1,
+                        limit or MAX_PREVIEW_LINES,
+                        cache_dir,
+                    )
+                response.content = "\n".join(line_range.lines)
+                response.start_line = line_range.start
+                response.total_lines = line_range.total_lines
+                response.is_truncated = line_range.has_more or (
+                    tail is None and (offset or 1) > 1
+                )
+            elif file_stat.st_size > MAX_PREVIEW_SIZE:
                 # Read only first portion
                 with open(actual_file, 'r', encoding='utf-8', errors='replace') as f:
                     response.content = f.read(MAX_PREVIEW_SIZE)
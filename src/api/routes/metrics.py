@@ -0,0 +1,52 @@
+"""
+Metrics endpoints for Ag3ntum API.
+
+Provides admin-only endpoints for run latency analysis:
+- GET /metrics/phases - p50/p95 per run phase (see core/spans.py)
+"""
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+
+from ...core.spans import get_phase_stats
+from ..deps import require_admin
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+class PhaseLatency(BaseModel):
+    """Latency percentiles of one run phase."""
+
+    count: int = Field(description="Number of runs that included this phase")
+    p50_ms: float = Field(description="Median time spent in the phase per run")
+    p95_ms: float = Field(description="95th percentile time spent in the phase per run")
+    max_ms: float = Field(description="Maximum time spent in the phase per run")
+
+
+class PhaseLatencyResponse(BaseModel):
+    """Response from GET /metrics/phases."""
+
+    runs: int = Field(description="Runs recorded by this API process")
+    phases: dict[str, PhaseLatency] = Field(
+        description="Per-phase latency; 'agent_run' is the whole run"
+    )
+
+
+@router.get("/phases", response_model=PhaseLatencyResponse)
+async def get_phase_latency(
+    _admin=Depends(require_admin),  # Require admin access
+) -> PhaseLatencyResponse:
+    """
+    Get per-phase latency percentiles of recent agent runs.
+
+    **Admin only** - requires admin role.
+
+    Each sample is the total time one run spent in a phase (queue wait,
+    DB lookups, option building, SDK connect, time to first message,
+    tool calls, permission checks, event persistence). The most recent
+    spans.sample_size runs of this API process are kept.
+    """
+    stats = get_phase_stats()
+    return PhaseLatencyResponse(
+        runs=stats.runs,
+        phases={name: PhaseLatency(**values) for name, values in stats.percentiles().items()},
+    )
@@ -3,6 +3,8 @@ Session management endpoints for Ag3ntum API.
 
 Provides endpoints for:
 - POST /sessions/run - Unified endpoint to create session and start task
+- POST /sessions/run-batch - Create and start many sessions in one call
+- GET /sessions/batches/{batch_id} - Aggregated batch progress and cost
 - POST /sessions - Create session without starting
 - GET /sessions - List sessions
 - GET /sessions/{id} - Get session details
@@ -13,7 +15,7 @@ Provides endpoints for:
 import asyncio
 import json
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
@@ -26,19 +28,29 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...config import USERS_DIR, get_config_loader
+from ...core.client_pool import get_client_pool
+from ...core.persistent_shell import close_persistent_shell
+from ...core.workspace_index import drop_workspace_index
 from ...db.database import get_db
 from ...db.models import User
 from ...services.agent_runner import agent_runner, TaskParams
 from ...services import event_service
 from ...services.auth_service import auth_service
-from ...services.session_service import session_service
+from ...services.session_service import (
+    generate_batch_id,
+    is_valid_batch_id,
+    session_service,
+)
 from ..deps import get_current_user_id
 from ..models import (
     AgentConfigOverrides,
+    BatchStartedResponse,
+    BatchStatusResponse,
     CancelResponse,
     CreateSessionRequest,
     ResultMetrics,
     ResultResponse,
+    RunBatchRequest,
     RunTaskRequest,
     SessionListResponse,
     SessionResponse,
@@ -65,6 +77,18 @@ def _get_large_input_config() -> dict:
     return loader.get_section("large_input", _LARGE_INPUT_DEFAULTS)
 
 
+# Default values for batch submission (overridden by agent.yaml)
+_BATCH_DEFAULTS = {
+    "max_tasks": 20,
+}
+
+
+def _get_batch_config() -> dict:
+    """Get batch submission configuration from agent.yaml with defaults."""
+    loader = get_config_loader()
+    return loader.get_section("batch", _BATCH_DEFAULTS)
+
+
 def process_large_user_input(task: str, workspace_dir: Path) -> str:
     """
     Process user input and store to file if it exceeds the configured size threshold.
@@ -162,20 +186,28 @@ def session_to_response(session, resumable: bool | None = None) -> SessionRespon
         cumulative_input_tokens=session.cumulative_input_tokens or 0,
         cumulative_output_tokens=session.cumulative_output_tokens or 0,
         parent_session_id=session.parent_session_id,
+        batch_id=session.batch_id,
     )
 
-async def record_user_message_event(session_id: str, text: str, processed_text: str | None = None) -> None:
+def build_user_message_event(
+    session_id: str,
+    text: str,
+    sequence: int,
+    processed_text: str | None = None,
+) -> dict:
     """
-    Record a user message event.
+    Build a user message event.
 
     Args:
         session_id: The session ID.
         text: The original user message (for display, may be truncated).
+        sequence: Sequence number for the event.
         processed_text: The processed message sent to LLM (if different from text).
                        When large input is stored to file, this contains the redirect message.
-    """
-    last_sequence = await event_service.get_last_sequence(session_id)
 
+    Returns:
+        The event dictionary, ready to persist and publish.
+    """
     # Get large input config for threshold
     config = _get_large_input_config()
     threshold_bytes = config.get("threshold_bytes", _LARGE_INPUT_DEFAULTS["threshold_bytes"])
@@ -203,17 +235,37 @@ async def record_user_message_event(session_id: str, text: str, processed_text:
         if processed_text and processed_text != text:
             event_data["processed_text"] = processed_text
 
-    event = {
+    return {
         "type": "user_message",
         "data": event_data,
         "timestamp": datetime.now(timezone.utc).isoformat(),
-        "sequence": last_sequence + 1,
+        "sequence": sequence,
         "session_id": session_id,
     }
+
+
+async def record_user_message_event(session_id: str, text: str, processed_text: str | None = None) -> None:
+    """
+    Record a user message event.
+
+    Args:
+        session_id: The session ID.
+        text: The original user message (for display, may be truncated).
+        processed_text: The processed message sent to LLM (if different from text).
+                       When large input is stored to file, this contains the redirect message.
+    """
+    last_sequence = await event_service.get_last_sequence(session_id)
+    event = build_user_message_event(
+        session_id, text, last_sequence + 1, processed_text=processed_text
+    )
     await event_service.record_event(event)
     await agent_runner.publish_event(session_id, event)
 
 
+# Follow-up message recorded for runs resumed after an answer (matches the web UI)
+HOT_RESUME_MESSAGE = "Continue with the user's answer."
+
+
 async def build_resume_context(session_id: str, is_waiting_for_input: bool = False) -> tuple[str | None, bool]:
     """
     Build resume context for a cancelled or waiting_for_input session.
@@ -301,6 +353,28 @@ async def build_resume_context(session_id: str, is_waiting_for_input: bool = Fal
     return "\n".join(context_lines), True
 
 
+def build_answer_prompt(answer: str) -> str:
+    """
+    Build the follow-up prompt for a hot-resumed AskUserQuestion run.
+
+    The suspended conversation still holds the question, so only the
+    answer is sent.
+
+    Args:
+        answer: The user's answer.
+
+    Returns:
+        Prompt text with the answer in resume-context tags.
+    """
+    return (
+        "<resume-context>\n"
+        "User answered your question(s):\n"
+        f"  A: {answer}\n"
+        "</resume-context>\n"
+        f"{HOT_RESUME_MESSAGE}"
+    )
+
+
 def build_task_params(
     session_id: str,
     user_id: str,
@@ -497,6 +571,238 @@ async def run_task(
     )
 
 
+# =============================================================================
+# POST /sessions/run-batch - Batch submission
+# =============================================================================
+
+@router.post("/run-batch", response_model=BatchStartedResponse, status_code=status.HTTP_201_CREATED)
+async def run_batch(
+    request: RunBatchRequest,
+    fastapi_request: Request,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> BatchStartedResponse:
+    """
+    Create one session per task and start or queue all of them in one call.
+
+    Intended for clients that fan out work (document batches, per-server audits).
+    Compared to calling POST /sessions/run once per task:
+    1. All sessions are created in a single database transaction
+    2. The initial user_message events are written in bulk
+    3. Quotas are evaluated once for the whole batch
+    4. Tasks that cannot start immediately are enqueued with one pipelined Redis call
+
+    Use GET /sessions/batches/{batch_id} for aggregated progress and cost.
+    """
+    max_tasks = int(_get_batch_config().get("max_tasks", _BATCH_DEFAULTS["max_tasks"]))
+    if len(request.tasks) > max_tasks:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many tasks in batch ({len(request.tasks)}). Maximum is {max_tasks}.",
+        )
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User not found: {user_id}",
+        )
+
+    user_sessions_dir = USERS_DIR / user.username / "sessions"
+    user_sessions_dir.mkdir(parents=True, exist_ok=True)
+
+    batch_id = generate_batch_id()
+    sessions = await session_service.create_sessions_batch(
+        db=db,
+        user_id=user_id,
+        tasks=[item.task for item in request.tasks],
+        sessions_dir=user_sessions_dir,
+        batch_id=batch_id,
+        model=request.config.model,
+    )
+
+    # Build task parameters and the initial user_message event of every session.
+    # Sessions are brand new, so their first event always has sequence 1.
+    all_params: list[TaskParams] = []
+    user_events: list[dict] = []
+    for session, item in zip(sessions, request.tasks):
+        workspace_dir = user_sessions_dir / session.id / "workspace"
+        task_for_agent = process_large_user_input(item.task, workspace_dir)
+        all_params.append(build_task_params(
+            session_id=session.id,
+            user_id=user_id,
+            task=task_for_agent,
+            additional_dirs=request.additional_dirs + item.additional_dirs,
+            resume_session_id=None,
+            fork_session=False,
+            config=request.config,
+            sessions_dir=user_sessions_dir,
+        ))
+        user_events.append(build_user_message_event(
+            session.id,
+            item.task,
+            1,
+            processed_text=task_for_agent if task_for_agent != item.task else None,
+        ))
+
+    await event_service.record_events(user_events)
+    await agent_runner.publish_events(user_events)
+
+    # Check if queue system is enabled
+    task_queue = getattr(fastapi_request.app.state, "task_queue", None)
+    quota_manager = getattr(fastapi_request.app.state, "quota_manager", None)
+    queue_enabled = task_queue is not None and quota_manager is not None
+
+    # Evaluate quotas once for the whole batch
+    start_count = len(sessions)
+    if queue_enabled:
+        start_count = min(start_count, await quota_manager.available_slots(user_id, db))
+
+    now = datetime.now(timezone.utc)
+    responses: list[TaskStartedResponse] = []
+
+    started_ids: list[str] = []
+    to_start = list(zip(sessions[:start_count], all_params[:start_count]))
+    to_queue = list(zip(sessions[start_count:], all_params[start_count:]))
+    for index, (session, params) in enumerate(to_start):
+        try:
+            await agent_runner.start_task(params)
+        except Exception as e:
+            logger.error(f"Failed to start session {session.id} of batch {batch_id}: {e}")
+            session.status = "failed"
+            session.completed_at = now
+            responses.append(TaskStartedResponse(
+                session_id=session.id,
+                status="failed",
+                message=f"Failed to start task: {e}",
+            ))
+            if queue_enabled:
+                # Starting is failing: queue the rest instead of trying each one
+                to_queue[:0] = to_start[index + 1:]
+                break
+            continue
+        session.status = "running"
+        session.updated_at = now
+        started_ids.append(session.id)
+        responses.append(TaskStartedResponse(
+            session_id=session.id,
+            status="running",
+            message="Task execution started",
+        ))
+
+    if queue_enabled and started_ids:
+        for _ in started_ids:
+            quota_manager.increment_global()
+        await task_queue.mark_user_active_many(user_id, started_ids)
+
+    queued_count = 0
+    if to_queue:
+        from ...services.task_queue import QueuedTask, QueueUnavailableError, QueueOverflowError
+
+        # Offset queued_at by a microsecond per task so tasks with equal
+        # priority are dequeued in submission order
+        queued_tasks = [
+            QueuedTask(
+                session_id=session.id,
+                user_id=user_id,
+                task=params.task,
+                priority=user.queue_priority,
+                queued_at=now + timedelta(microseconds=index),
+                is_auto_resume=False,
+                resume_from=None,
+            )
+            for index, (session, params) in enumerate(to_queue)
+        ]
+
+        try:
+            positions = await task_queue.enqueue_many(queued_tasks)
+        except (QueueOverflowError, QueueUnavailableError) as e:
+            logger.warning(f"Failed to queue {len(to_queue)} tasks of batch {batch_id}: {e}")
+            if isinstance(e, QueueOverflowError):
+                message = (
+                    f"Task queue is full ({e.current_size}/{e.max_size} tasks). "
+                    "Please try again later."
+                )
+            else:
+                message = "Task queue temporarily unavailable. Please try again later."
+            for session, _ in to_queue:
+                session.status = "failed"
+                session.completed_at = now
+                responses.append(TaskStartedResponse(
+                    session_id=session.id,
+                    status="failed",
+                    message=message,
+                ))
+        else:
+            for (session, _), position in zip(to_queue, positions):
+                session.status = "queued"
+                session.queue_position = position
+                session.queued_at = now
+                session.priority = user.queue_priority
+                responses.append(TaskStartedResponse(
+                    session_id=session.id,
+                    status="queued",
+                    message=f"Task queued (position: {position})",
+                    queue_position=position,
+                ))
+            queued_count = len(to_queue)
+
+    # Single commit for all status transitions
+    await db.commit()
+
+    logger.info(
+        f"Batch {batch_id}: {len(sessions)} sessions, "
+        f"{len(started_ids)} running, {queued_count} queued"
+    )
+
+    return BatchStartedResponse(
+        batch_id=batch_id,
+        session_ids=[session.id for session in sessions],
+        sessions=responses,
+        running=len(started_ids),
+        queued=queued_count,
+    )
+
+
+# =============================================================================
+# GET /sessions/batches/{batch_id} - Aggregated batch status
+# =============================================================================
+
+@router.get("/batches/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch_status(
+    batch_id: str,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> BatchStatusResponse:
+    """
+    Get aggregated progress and cost for a batch.
+
+    Counts sessions per status and sums turns, duration, cost and tokens
+    across the batch with a single grouped query.
+    """
+    stats = None
+    if is_valid_batch_id(batch_id):
+        stats = await session_service.get_batch_stats(
+            db=db,
+            batch_id=batch_id,
+            user_id=user_id,
+        )
+
+    if stats is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Batch not found: {batch_id}",
+        )
+
+    return BatchStatusResponse(
+        batch_id=batch_id,
+        is_finished=stats["finished"] == stats["total"],
+        **stats,
+    )
+
+
 # =============================================================================
 # POST /sessions - Create session without starting
 # =============================================================================
@@ -625,6 +931,7 @@ async def delete_session(
         SessionNotFoundError,
         SessionServiceError,
     )
+    from tools.ag3ntum.ag3ntum_write import discard_chunked_writes
 
     # Get user to determine sessions directory
     result = await db.execute(select(User).where(User.id == user_id))
@@ -656,6 +963,10 @@ async def delete_session(
             detail=str(e),
         )
 
+    drop_workspace_index(session_id)
+    close_persistent_shell(session_id)
+    discard_chunked_writes(session_id)
+
 
 # =============================================================================
 # POST /sessions/{id}/task - Start task on existing session
@@ -974,9 +1285,11 @@ async def stream_events(
                 if seq > 0 and (seq in sent_sequences or seq <= start_sequence):
                     continue
 
-                # Send the event
+                # Send the event. Ephemeral events (tool_progress) have
+                # sequence 0 and no SSE id, so they never move Last-Event-ID
                 payload = json.dumps(event, default=str)
-                yield f"id: {seq}\n"
+                if seq > 0:
+                    yield f"id: {seq}\n"
                 yield f"data: {payload}\n\n"
 
                 if seq > 0:
@@ -1278,6 +1591,7 @@ async def get_session_file(
 async def submit_answer(
     session_id: str,
     request: SubmitAnswerRequest,
+    fastapi_request: Request,
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ) -> SubmitAnswerResponse:
@@ -1290,6 +1604,12 @@ async def submit_answer(
     The answer is stored as a question_answered event in the session's
     event stream. After submitting, the session can be resumed to continue
     agent execution with the user's answer in context.
+
+    If the run's CLI process is still suspended in the client pool
+    (client_pool.suspend_on_question), the answer is delivered to it as a
+    follow-up query right away and the response has resumed=True. Otherwise
+    (suspension disabled or expired, another worker, quota exhausted) the
+    client resumes the session cold via POST /sessions/{id}/task.
     """
     # Verify session exists and belongs to user
     session = await session_service.get_session(
@@ -1323,6 +1643,14 @@ async def submit_answer(
         f"Answer submitted for session {session_id}, question {request.question_id}"
     )
 
+    if await _hot_resume_with_answer(session, request.answer, fastapi_request, db):
+        return SubmitAnswerResponse(
+            success=True,
+            message="Answer delivered. The session is running.",
+            can_resume=False,
+            resumed=True,
+        )
+
     # Session can be resumed now that the answer is submitted
     return SubmitAnswerResponse(
         success=True,
@@ -1331,6 +1659,51 @@ async def submit_answer(
     )
 
 
+async def _hot_resume_with_answer(
+    session,
+    answer: str,
+    fastapi_request: Request,
+    db: AsyncSession,
+) -> bool:
+    """
+    Continue a suspended AskUserQuestion run with the answer, if possible.
+
+    Returns:
+        True if the follow-up run was started.
+    """
+    if session.status != "waiting_for_input" or agent_runner.is_running(session.id):
+        return False
+    if not (
+        agent_runner.has_paused_run(session.id)
+        and get_client_pool().has_suspended(session.claude_session_id)
+    ):
+        return False
+
+    task_queue = getattr(fastapi_request.app.state, "task_queue", None)
+    quota_manager = getattr(fastapi_request.app.state, "quota_manager", None)
+    queue_enabled = task_queue is not None and quota_manager is not None
+    if queue_enabled:
+        can_start, reason = await quota_manager.can_start_task(session.user_id, db)
+        if not can_start:
+            logger.info(f"Hot resume of {session.id} skipped: {reason}")
+            return False
+
+    # Recorded by the follow-up run itself, so a resume that does not start
+    # (e.g. another start won the race) leaves no stray message behind
+    if not await agent_runner.resume_with_answer(
+        session.id,
+        build_answer_prompt(answer),
+        before_run=lambda: record_user_message_event(session.id, HOT_RESUME_MESSAGE),
+    ):
+        return False
+
+    if queue_enabled:
+        quota_manager.increment_global()
+        await task_queue.mark_user_active(session.user_id, session.id)
+    await session_service.update_session(db=db, session=session, status="running")
+    return True
+
+
 # =============================================================================
 # GET /sessions/{id}/pending-question - Get pending question for session
 # =============================================================================
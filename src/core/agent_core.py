@@ -4,10 +4,9 @@ Core agent implementation for Ag3ntum.
 This module contains the main agent execution logic using the Claude Agent SDK.
 """
 import asyncio
-import json
 import logging
 import os
-from dataclasses import asdict
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional, Union
@@ -30,7 +29,6 @@ from ..config import (
     USERS_DIR,
     load_sandboxed_envs,
 )
-import shutil
 from .exceptions import (
     AgentError,
     MaxTurnsExceededError,
@@ -47,11 +45,15 @@ from .schemas import (
     TaskStatus,
     TokenUsage,
 )
+from .client_pool import get_client_pool
+from .prep_cache import get_preparation_cache
 from .sessions import SessionManager
-from .skills import SkillManager, discover_merged_skills
+from .skills import SkillManager, discover_merged_skills, sync_skill_links
 from .skill_tools import SkillToolsManager
+from .spans import record_span, run_trace, span, timed, timing_summary
 from .tracer import ExecutionTracer, TracerBase, NullTracer
 from .trace_processor import TraceProcessor
+from .transcript import open_transcript
 from .permissions import (
     create_permission_callback,
     PermissionDenialTracker,
@@ -71,6 +73,8 @@ if _tools_dir not in sys.path:
 from tools.ag3ntum import (
     create_ag3ntum_tools_mcp_server,
     AG3NTUM_BASH_TOOL,
+    discard_chunked_writes,
+    pop_asked_question,
 )
 
 # Import PathValidator configuration functions
@@ -78,6 +82,7 @@ from .path_validator import (
     configure_path_validator,
     cleanup_path_validator,
 )
+from .persistent_shell import close_persistent_shell
 
 logger = logging.getLogger(__name__)
 
@@ -233,6 +238,32 @@ _jinja_env.filters["select_startswith"] = _filter_startswith
 _jinja_env.filters["contains"] = _filter_contains
 
 
+def _parse_mounts_manifest(raw: bytes) -> dict[str, list[dict[str, str]]]:
+    """
+    Parse the auto-generated mounts manifest into template-ready lists.
+
+    Args:
+        raw: Content of auto-generated-mounts.yaml.
+
+    Returns:
+        Dict with "ro" and "rw" lists of {"name", "description"} entries.
+    """
+    import yaml
+
+    manifest = yaml.safe_load(raw) or {}
+    mounts_data = manifest.get("mounts", {}) or {}
+    parsed: dict[str, list[dict[str, str]]] = {"ro": [], "rw": []}
+    for mode in ("ro", "rw"):
+        if isinstance(mounts_data.get(mode), list):
+            for mount in mounts_data[mode]:
+                if isinstance(mount, dict) and mount.get("name"):
+                    parsed[mode].append({
+                        "name": mount["name"],
+                        "description": mount.get("description", ""),
+                    })
+    return parsed
+
+
 class ClaudeAgent:
     """
     Ag3ntum - Self-Improving Agent.
@@ -352,8 +383,6 @@ class ClaudeAgent:
         Returns:
             External mounts configuration dict.
         """
-        import yaml
-
         mounts_config = {
             "ro": [],
             "rw": [],
@@ -361,31 +390,15 @@ class ClaudeAgent:
         }
 
         # Load mounts manifest if it exists (auto-generated by run.sh)
+        # The parsed manifest is cached and re-read only when the file changes
         mounts_file = Path("/data/auto-generated/auto-generated-mounts.yaml")
         if mounts_file.exists():
             try:
-                with open(mounts_file, "r", encoding="utf-8") as f:
-                    manifest = yaml.safe_load(f) or {}
-
-                mounts_data = manifest.get("mounts", {})
-
-                # Read-only mounts
-                if isinstance(mounts_data.get("ro"), list):
-                    for mount in mounts_data["ro"]:
-                        if isinstance(mount, dict) and mount.get("name"):
-                            mounts_config["ro"].append({
-                                "name": mount["name"],
-                                "description": mount.get("description", ""),
-                            })
-
-                # Read-write mounts
-                if isinstance(mounts_data.get("rw"), list):
-                    for mount in mounts_data["rw"]:
-                        if isinstance(mount, dict) and mount.get("name"):
-                            mounts_config["rw"].append({
-                                "name": mount["name"],
-                                "description": mount.get("description", ""),
-                            })
+                manifest_mounts = get_preparation_cache().load_file(
+                    mounts_file, _parse_mounts_manifest, namespace="mounts"
+                )
+                mounts_config["ro"] = list(manifest_mounts["ro"])
+                mounts_config["rw"] = list(manifest_mounts["rw"])
 
                 # Log successful mount config loading
                 ro_count = len(mounts_config["ro"])
@@ -464,59 +477,54 @@ class ClaudeAgent:
         These work in both MCP tools and Bash.
         SECURITY: User skills are per-user mounts to prevent cross-user access.
 
+        Links persist across runs of a session and are synced incrementally:
+        unchanged links are kept, stale or tampered entries are replaced.
+
         Args:
             session_id: The session ID for workspace access.
             username: Optional username for user-specific skills.
         """
         if not self._config.enable_skills:
+            # Drop links left by an earlier run that had skills enabled
+            self._session_manager.cleanup_workspace_skills(session_id)
             return
 
         workspace_dir = self._session_manager.get_workspace_dir(session_id)
         skills_target = workspace_dir / ".claude" / "skills"
 
-        # Clean existing and recreate
-        if skills_target.exists():
-            shutil.rmtree(skills_target)
-        skills_target.mkdir(parents=True, exist_ok=True)
-
         # Discover merged skills using shared function (global + user, with user overriding)
         skill_sources = discover_merged_skills(username=username)
 
         # Paths used to determine skill source type
-        global_skills_base = SKILLS_DIR / ".claude" / "skills"
         user_skills_base = USERS_DIR / username / ".claude" / "skills" if username else None
 
-        # Create symlinks pointing to DOCKER paths (not bwrap sandbox paths)
+        # Symlinks point to DOCKER paths (not bwrap sandbox paths)
         # MCP tools run outside bwrap and see Docker's filesystem:
         #   - Global skills: /skills/.claude/skills/<skill_name>
         #   - User skills: /user-skills/<skill_name> (mounted from /users/<username>/.claude/skills)
+        links: dict[str, Path] = {}
         for skill_name, source_path in skill_sources.items():
-            link_path = skills_target / skill_name
-
             # User skills override global, so check user first
             if user_skills_base and str(source_path).startswith(str(user_skills_base)):
-                docker_path = Path("/user-skills") / skill_name
+                links[skill_name] = Path("/user-skills") / skill_name
             else:
-                docker_path = Path("/skills") / ".claude" / "skills" / skill_name
+                links[skill_name] = Path("/skills") / ".claude" / "skills" / skill_name
 
-            try:
-                link_path.symlink_to(docker_path)
-                logger.debug(f"Linked skill: {skill_name} -> {docker_path} (source: {source_path})")
-            except Exception as e:
-                logger.warning(f"Failed to create skill symlink {skill_name}: {e}")
+        # Only add/remove links that changed since the previous run
+        created, removed = sync_skill_links(skills_target, links)
 
         skill_names = sorted(skill_sources.keys())
         logger.info(
-            f"Refreshed skills ({len(skill_sources)}): {', '.join(skill_names) if skill_names else 'none'} "
-            f"-> {skills_target}"
+            f"Refreshed skills ({len(skill_sources)}, +{created}/-{removed}): "
+            f"{', '.join(skill_names) if skill_names else 'none'} -> {skills_target}"
         )
 
     def _cleanup_session(self, session_id: str, owner_uid: Optional[int] = None) -> None:
         """
         Clean up session resources after agent run completes.
 
-        Removes copied skills from workspace to save disk space.
-        Session metadata is preserved. Also hardens file permissions
+        Skill symlinks are kept for the next run of the session, which
+        syncs them incrementally. Session metadata is preserved. Also hardens file permissions
         to ensure session isolation.
 
         Args:
@@ -524,9 +532,6 @@ class ClaudeAgent:
             owner_uid: Optional owner UID for permission hardening.
                        If not provided, gets owner from directory ownership.
         """
-        # Remove skills folder from workspace
-        self._session_manager.cleanup_workspace_skills(session_id)
-
         # Clear session context from permission manager
         if self._permission_manager is not None:
             self._permission_manager.clear_session_context()
@@ -534,6 +539,12 @@ class ClaudeAgent:
         # Clean up PathValidator for this session
         cleanup_path_validator(session_id)
 
+        # Stop the session's persistent Bash shell (if enabled)
+        close_persistent_shell(session_id)
+
+        # Close and delete staging files of unfinished chunked writes
+        discard_chunked_writes(session_id)
+
         # SECURITY: Harden session file permissions after agent run
         # This ensures all files created during execution have proper 700/600 permissions
         # with owner-only access (true session isolation)
@@ -735,12 +746,16 @@ class ClaudeAgent:
         )
         # Clear any previous denials before starting new run
         self._denial_tracker.clear()
-        can_use_tool = create_permission_callback(
-            permission_manager=self._permission_manager,
-            on_permission_check=on_permission_check,
-            denial_tracker=self._denial_tracker,
-            trace_processor=trace_processor,
-            system_message_builder=self._sandbox_system_message_builder,
+        can_use_tool = timed(
+            session_context.session_id,
+            "permission.check",
+            create_permission_callback(
+                permission_manager=self._permission_manager,
+                on_permission_check=on_permission_check,
+                denial_tracker=self._denial_tracker,
+                trace_processor=trace_processor,
+                system_message_builder=self._sandbox_system_message_builder,
+            ),
         )
 
         all_tools = available_tools
@@ -1142,6 +1157,133 @@ class ClaudeAgent:
                 f"Exceeded {self._config.max_turns} turns"
             )
 
+    def _render_system_prompt(
+        self,
+        session_context: SessionContext,
+        parameters: Optional[dict] = None,
+        username: Optional[str] = None,
+    ) -> str:
+        """
+        Render the system prompt from prompts/system.j2.
+
+        Must be called after set_session_context() so permissions reflect
+        session-specific rules.
+
+        Args:
+            session_context: Session context with session_id.
+            parameters: Additional template parameters (``role`` overrides config).
+            username: Optional username for per-user mounts.
+
+        Returns:
+            Rendered system prompt.
+
+        Raises:
+            AgentError: If the template or role file is missing or invalid.
+        """
+        system_template_path = PROMPTS_DIR / "system.j2"
+        if not system_template_path.exists():
+            raise AgentError(
+                f"System prompt template not found: {system_template_path}\n"
+                f"Create the template file in AGENT/prompts/system.j2"
+            )
+
+        # Build permission profile data for the template
+        # Now includes session-specific paths after set_session_context()
+        permissions_data = None
+        if self._permission_manager is not None:
+            active_profile = self._permission_manager.active_profile
+            # Get allow/deny/allowed_dirs from permissions if available
+            allow_rules: list[str] = []
+            deny_rules: list[str] = []
+            allowed_dirs: list[str] = []
+            if active_profile.permissions is not None:
+                allow_rules = active_profile.permissions.allow
+                deny_rules = active_profile.permissions.deny
+                allowed_dirs = active_profile.permissions.allowed_dirs
+
+            permissions_data = {
+                "name": active_profile.name,
+                "description": active_profile.description,
+                "allow": allow_rules,
+                "deny": deny_rules,
+                "enabled_tools": active_profile.tools.enabled,
+                "disabled_tools": active_profile.tools.disabled,
+                "allowed_dirs": allowed_dirs,
+            }
+            sandbox_config = self._permission_manager.get_sandbox_config()
+            if sandbox_config is not None:
+                permissions_data["sandbox"] = {
+                    "enabled": sandbox_config.enabled,
+                    "file_sandboxing": sandbox_config.file_sandboxing,
+                    "network_sandboxing": sandbox_config.network_sandboxing,
+                    "writable_paths": sandbox_config.writable_paths,
+                    "readonly_paths": sandbox_config.readonly_paths,
+                    "network": {
+                        "enabled": sandbox_config.network.enabled,
+                        "allowed_domains": sandbox_config.network.allowed_domains,
+                        "allow_localhost": sandbox_config.network.allow_localhost,
+                    },
+                }
+
+        # Get workspace directory for template
+        workspace_dir = self._session_manager.get_workspace_dir(
+            session_context.session_id
+        )
+
+        # Load role content from role template file (fail-fast if missing)
+        # Custom role can be specified via parameters["role"] to override config
+        params = parameters or {}
+        role_name = params.get("role", self._config.role)
+        role_file = PROMPTS_DIR / "roles" / f"{role_name}.md"
+        if not role_file.exists():
+            raise AgentError(
+                f"Role file not found: {role_file}\n"
+                f"Create the role file in AGENT/prompts/roles/{role_name}.md"
+            )
+        try:
+            role_content = get_preparation_cache().load_file(
+                role_file, lambda raw: raw.decode("utf-8").strip(), namespace="role"
+            )
+        except (IOError, UnicodeDecodeError) as e:
+            raise AgentError(f"Failed to read role file {role_file}: {e}") from e
+
+        # Build template context with all dynamic values
+        current_date = datetime.now().strftime("%A, %B %d, %Y")
+        template_context = {
+            # Environment info
+            "current_date": current_date,
+            "model": self._config.model,
+            "session_id": session_context.session_id,
+            "workspace_path": str(workspace_dir),
+            "working_dir": self._config.working_dir or str(workspace_dir),
+            # Role
+            "role_content": role_content,
+            # Permissions
+            "permissions": permissions_data,
+            # Skills (SDK handles discovery via setting_sources)
+            "enable_skills": self._config.enable_skills,
+            # External mounts configuration
+            "external_mounts": self._load_external_mounts_config(username),
+        }
+
+        # Rendered prompt is reused when the context and every template
+        # in the system.j2 include tree are unchanged. Session-specific
+        # values (also embedded in permission paths) are spliced in after
+        # rendering, so sessions with the same profile share one render.
+        try:
+            return get_preparation_cache().render_template(
+                _jinja_env,
+                "system.j2",
+                template_context,
+                substitutions={
+                    "workspace_path": str(workspace_dir),
+                    "session_id": session_context.session_id,
+                    "current_date": current_date,
+                },
+            )
+        except Exception as e:
+            raise AgentError(f"Failed to render system prompt template: {e}") from e
+
     async def run(
         self,
         task: str,
@@ -1239,6 +1381,38 @@ class ClaudeAgent:
             # Ensure session directory exists
             self._session_manager.create_session_directory(session_context.session_id)
 
+        # Per-phase latency spans; joins the trace opened by AgentRunner if any
+        async with run_trace(session_context.session_id, model=self._config.model):
+            return await self._execute_session(
+                task, session_context, system_prompt, parameters,
+                fork_session=fork_session, username=username,
+            )
+
+    async def _execute_session(
+        self,
+        task: str,
+        session_context: SessionContext,
+        system_prompt: Optional[str] = None,
+        parameters: Optional[dict] = None,
+        fork_session: bool = False,
+        username: Optional[str] = None,
+    ) -> AgentResult:
+        """
+        Run the agent for a resolved session context (called by _execute()).
+
+        Args:
+            task: The task description.
+            session_context: Session context with an existing session directory.
+            system_prompt: Custom system prompt. If None, loads from prompts/system.j2.
+            parameters: Additional template parameters (optional).
+            fork_session: If True, fork to new session when resuming (optional).
+            username: Optional username for user-specific features.
+
+        Returns:
+            AgentResult with execution outcome.
+        """
+        session_id = session_context.session_id
+
         # Extract resume_id from session_context for SDK resumption
         resume_id: Optional[str] = None
         if session_context.claude_session_id:
@@ -1267,100 +1441,16 @@ class ClaudeAgent:
 
         # Setup skills access in workspace
         # Creates merged .claude/skills/ directory with symlinks to global and user skills
-        self._setup_workspace_skills(session_context.session_id, username=username)
+        with span(session_id, "prepare.skills"):
+            self._setup_workspace_skills(session_context.session_id, username=username)
 
         # Load system prompt from template if not provided
         # Done after session creation so permissions reflect session-specific rules
         if system_prompt is None:
-            system_template_path = PROMPTS_DIR / "system.j2"
-            if not system_template_path.exists():
-                raise AgentError(
-                    f"System prompt template not found: {system_template_path}\n"
-                    f"Create the template file in AGENT/prompts/system.j2"
-                )
-
-            # Build permission profile data for the template
-            # Now includes session-specific paths after set_session_context()
-            permissions_data = None
-            if self._permission_manager is not None:
-                active_profile = self._permission_manager.active_profile
-                # Get allow/deny/allowed_dirs from permissions if available
-                allow_rules: list[str] = []
-                deny_rules: list[str] = []
-                allowed_dirs: list[str] = []
-                if active_profile.permissions is not None:
-                    allow_rules = active_profile.permissions.allow
-                    deny_rules = active_profile.permissions.deny
-                    allowed_dirs = active_profile.permissions.allowed_dirs
-
-                permissions_data = {
-                    "name": active_profile.name,
-                    "description": active_profile.description,
-                    "allow": allow_rules,
-                    "deny": deny_rules,
-                    "enabled_tools": active_profile.tools.enabled,
-                    "disabled_tools": active_profile.tools.disabled,
-                    "allowed_dirs": allowed_dirs,
-                }
-                sandbox_config = self._permission_manager.get_sandbox_config()
-                if sandbox_config is not None:
-                    permissions_data["sandbox"] = {
-                        "enabled": sandbox_config.enabled,
-                        "file_sandboxing": sandbox_config.file_sandboxing,
-                        "network_sandboxing": sandbox_config.network_sandboxing,
-                        "writable_paths": sandbox_config.writable_paths,
-                        "readonly_paths": sandbox_config.readonly_paths,
-                        "network": {
-                            "enabled": sandbox_config.network.enabled,
-                            "allowed_domains": sandbox_config.network.allowed_domains,
-                            "allow_localhost": sandbox_config.network.allow_localhost,
-                        },
-                    }
-
-            # Get workspace directory for template
-            workspace_dir = self._session_manager.get_workspace_dir(
-                session_context.session_id
-            )
-
-            # Load role content from role template file (fail-fast if missing)
-            # Custom role can be specified via parameters["role"] to override config
-            params = parameters or {}
-            role_name = params.get("role", self._config.role)
-            role_file = PROMPTS_DIR / "roles" / f"{role_name}.md"
-            if not role_file.exists():
-                raise AgentError(
-                    f"Role file not found: {role_file}\n"
-                    f"Create the role file in AGENT/prompts/roles/{role_name}.md"
-                )
-            try:
-                role_content = role_file.read_text(encoding="utf-8").strip()
-            except IOError as e:
-                raise AgentError(f"Failed to read role file {role_file}: {e}") from e
-
-            # Build template context with all dynamic values
-            template_context = {
-                # Environment info
-                "current_date": datetime.now().strftime("%A, %B %d, %Y"),
-                "model": self._config.model,
-                "session_id": session_context.session_id,
-                "workspace_path": str(workspace_dir),
-                "working_dir": self._config.working_dir or str(workspace_dir),
-                # Role
-                "role_content": role_content,
-                # Permissions
-                "permissions": permissions_data,
-                # Skills (SDK handles discovery via setting_sources)
-                "enable_skills": self._config.enable_skills,
-                # External mounts configuration
-                "external_mounts": self._load_external_mounts_config(username),
-            }
-
-            try:
-                system_prompt = _jinja_env.get_template("system.j2").render(
-                    **template_context
+            with span(session_id, "prepare.system_prompt"):
+                system_prompt = self._render_system_prompt(
+                    session_context, parameters, username=username
                 )
-            except Exception as e:
-                raise AgentError(f"Failed to render system prompt template: {e}") from e
 
         # Validate system prompt is not empty
         if not system_prompt or not system_prompt.strip():
@@ -1368,7 +1458,7 @@ class ClaudeAgent:
 
         # Create trace processor BEFORE options so it can be passed to
         # permission callback for correct failure status display
-        trace_processor = TraceProcessor(self._tracer)
+        trace_processor = TraceProcessor(self._tracer, session_id=session_id)
         trace_processor.set_task(task)
         trace_processor.set_model(self._config.model)
 
@@ -1380,12 +1470,13 @@ class ClaudeAgent:
                 tokens=session_context.cumulative_total_tokens,
             )
 
-        options = self._build_options(
-            session_context, system_prompt, trace_processor,
-            resume_id=resume_id,
-            fork_session=fork_session,
-            username=username
-        )
+        with span(session_id, "prepare.options"):
+            options = self._build_options(
+                session_context, system_prompt, trace_processor,
+                resume_id=resume_id,
+                fork_session=fork_session,
+                username=username
+            )
         user_prompt = self._build_user_prompt(task, session_context, parameters)
 
         log_file = self._session_manager.get_log_file(session_context.session_id)
@@ -1400,13 +1491,38 @@ class ClaudeAgent:
         )
 
         try:
-            async with ClaudeSDKClient(options=options) as client:
+            # Lease a CLI process from the warm pool. A follow-up run of the same
+            # conversation is bound to the parked process and skips the cold start;
+            # with the pool disabled this is a plain ClaudeSDKClient context.
+            lease_started = time.perf_counter()
+            lease_started_ns = time.time_ns()
+            async with get_client_pool().lease(options) as pooled:
+                client = pooled.client
+                query_started_ns = time.time_ns()
+                record_span(
+                    session_id, "sdk.connect", lease_started_ns, query_started_ns,
+                    warm_client=pooled.reused,
+                )
+                pop_asked_question(session_id)  # Drop a marker left by a failed run
                 await client.query(user_prompt)
+                first_message_ms: Optional[float] = None
 
-                with log_file.open("w", encoding="utf-8") as f:
+                async with open_transcript(
+                    log_file, resume_id=resume_id, fork_session=fork_session
+                ) as transcript:
                     async for message in client.receive_response():
-                        # Write to log file
-                        f.write(json.dumps(asdict(message)) + "\n")
+                        if first_message_ms is None:
+                            first_message_ms = (time.perf_counter() - lease_started) * 1000
+                            record_span(
+                                session_id, "sdk.first_message", query_started_ns, time.time_ns()
+                            )
+                            logger.info(
+                                f"Time to first SDK message: {first_message_ms:.0f}ms "
+                                f"(warm_client={pooled.reused}, connect={pooled.connect_ms:.0f}ms)"
+                            )
+
+                        # Buffered append to agent.jsonl, flushed off the event loop
+                        transcript.write(message)
 
                         # Process for console tracing
                         trace_processor.process_message(message)
@@ -1416,6 +1532,22 @@ class ClaudeAgent:
 
                         if isinstance(message, ResultMessage):
                             result = message
+                record_span(session_id, "sdk.stream", query_started_ns, time.time_ns())
+                asked_question = pop_asked_question(session_id)
+
+                # Park the process for the next run of this conversation unless
+                # the run ended abnormally (its CLI state is then unknown).
+                # Runs that stopped on AskUserQuestion are suspended so the
+                # answer can go straight to the live process.
+                if (
+                    result is not None
+                    and not result.is_error
+                    and not self._denial_tracker.was_interrupted
+                ):
+                    if asked_question:
+                        pooled.suspend(result.session_id)
+                    else:
+                        pooled.keep(result.session_id)
 
             self._validate_response(result)
 
@@ -1450,6 +1582,7 @@ class ClaudeAgent:
                         cumulative_cost_usd=session_context.cumulative_cost_usd,
                         cumulative_turns=session_context.cumulative_turns,
                         cumulative_tokens=session_context.cumulative_total_tokens,
+                        timing_summary=timing_summary(session_id),
                     )
 
                 return AgentResult(
@@ -1501,6 +1634,7 @@ class ClaudeAgent:
                     cumulative_cost_usd=session_context.cumulative_cost_usd,
                     cumulative_turns=session_context.cumulative_turns,
                     cumulative_tokens=session_context.cumulative_total_tokens,
+                    timing_summary=timing_summary(session_id),
                 )
 
             return AgentResult(
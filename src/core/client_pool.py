@@ -0,0 +1,680 @@
+"""
+Warm pool of connected Claude Agent SDK clients.
+
+Entering a ClaudeSDKClient spawns the Claude Code CLI, waits for the control
+protocol handshake and registers every SDK MCP server before the first
+message can be sent. For short tasks and follow-up messages this cold start
+dominates the time to the first event.
+
+The pool keeps connected clients alive between runs:
+
+- After a run finishes cleanly the client is parked, keyed by a fingerprint
+  of the options that shaped the CLI process (system prompt, model, tools,
+  cwd, environment, MCP server names, hook layout, ...).
+- A later run whose options have the same fingerprint is bound to the parked
+  process instead of spawning a new one. A parked client already holds its
+  Claude conversation, so it only serves runs that resume that conversation
+  (``options.resume`` equal to the parked session id, without forking).
+
+The pool therefore speeds up follow-up messages, not new sessions. Every
+field in the fingerprint is a CLI flag or environment variable fixed at
+spawn time, and the CLI has no control request to change them afterwards.
+Ag3ntum's options are per session: the system prompt carries the session id
+and date, cwd is the session workspace and CLAUDE_CONFIG_DIR (where the CLI
+keeps the transcripts that --resume reads) is the session directory. A
+process spawned for one session can never serve another one.
+
+Binding a parked client to a new run replaces the permission callback, hook
+callbacks and SDK MCP server instances held by the SDK's internal Query
+object. Those are private attributes, so rebinding is only done for the
+claude-agent-sdk versions it was checked against (REBIND_SDK_VERSIONS,
+matching requirements.txt); with any other version, clients are never
+reused and every run spawns its own process.
+
+Clients are recycled after ``max_runs_per_client`` runs, after
+``idle_ttl_seconds`` of idleness, when the options change (the fingerprint no
+longer matches), or on ``invalidate()``. The pool is disabled by default.
+
+Suspended conversations (hot resume): a run that stops on AskUserQuestion
+can ``suspend()`` its client instead of parking it. Suspended clients are
+kept per Claude session outside the idle pool and its size limit, for
+``suspend_ttl_seconds``, so the answer is delivered to the live CLI process
+as a follow-up query instead of a cold ``--resume``. This works with the
+idle pool disabled; when ``suspend_on_question`` is off nothing is suspended.
+
+Each client is connected and disconnected by a dedicated owner task: the SDK
+keeps an anyio task group open from connect() until disconnect(), and that
+task group must be exited from the task that entered it. Runs use the
+client from their own task, which the SDK supports.
+
+Configuration (agent.yaml):
+    client_pool:
+      enabled: false
+      max_size: null            # null = derive from the host CPU count
+      max_runs_per_client: 20
+      idle_ttl_seconds: 300
+      suspend_on_question: false
+      suspend_ttl_seconds: 600
+      max_suspended: 8
+
+Usage:
+    pool = get_client_pool()
+    async with pool.lease(options) as pooled:
+        await pooled.client.query(prompt)
+        async for message in pooled.client.receive_response():
+            ...
+        pooled.keep(result.session_id)  # park for the follow-up run
+"""
+import asyncio
+import dataclasses
+import functools
+import hashlib
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional
+
+import claude_agent_sdk
+from claude_agent_sdk import ClaudeAgentOptions, ClaudeSDKClient
+
+logger = logging.getLogger(__name__)
+
+# Default values for the client pool (overridden by agent.yaml)
+_CLIENT_POOL_DEFAULTS = {
+    "enabled": False,
+    "max_size": None,
+    "max_runs_per_client": 20,
+    "idle_ttl_seconds": 300,
+    "suspend_on_question": False,
+    "suspend_ttl_seconds": 600,
+    "max_suspended": 8,
+}
+
+# claude-agent-sdk versions whose private Query attributes PooledClient._bind()
+# rewrites (first and last checked version, inclusive)
+REBIND_SDK_VERSIONS = ((0, 1, 20), (0, 1, 23))
+_REBIND_QUERY_ATTRIBUTES = ("can_use_tool", "hook_callbacks", "sdk_mcp_servers")
+
+# Options that are bound per run and do not change the spawned CLI process.
+# Callbacks and SDK MCP server instances are re-bound on every lease (the
+# layout of hooks is registered at connect time and stays in the key).
+_PER_RUN_FIELDS = frozenset({
+    "resume",
+    "fork_session",
+    "can_use_tool",
+    "hooks",
+    "stderr",
+    "debug_stderr",
+})
+
+
+def _fingerprint_value(value: Any) -> Any:
+    """Convert an option value into a JSON-stable structure."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            f.name: _fingerprint_value(getattr(value, f.name))
+            for f in dataclasses.fields(value)
+        }
+    if isinstance(value, dict):
+        return {
+            str(k): _fingerprint_value(v)
+            for k, v in value.items()
+            # SDK MCP servers carry a live server instance; only the name matters
+            if k != "instance"
+        }
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_fingerprint_value(v) for v in value]
+        return sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if hasattr(value, "__fspath__"):
+        return os.fspath(value)
+    # Callables and other live objects: identity is irrelevant, presence is not
+    return type(value).__qualname__
+
+
+def options_fingerprint(options: ClaudeAgentOptions) -> str:
+    """
+    Compute the pool key for a set of SDK options.
+
+    Fields that only affect a single run (resume target, permission callback,
+    hooks) are excluded; everything that is baked into the CLI process at
+    spawn time is included.
+
+    Args:
+        options: SDK options for the run.
+
+    Returns:
+        Hex digest identifying compatible client processes.
+    """
+    data = {
+        f.name: _fingerprint_value(getattr(options, f.name))
+        for f in dataclasses.fields(options)
+        if f.name not in _PER_RUN_FIELDS
+    }
+    # can_use_tool switches the CLI to the stdio permission prompt tool
+    data["can_use_tool"] = options.can_use_tool is not None
+    data["hooks"] = _hook_layout(options.hooks)
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _hook_layout(hooks: Optional[dict]) -> list:
+    """Events, matchers and callback counts registered with the CLI at connect."""
+    layout = []
+    for event, matchers in (hooks or {}).items():
+        for matcher in matchers or ():
+            layout.append([
+                str(event), matcher.matcher, len(matcher.hooks), matcher.timeout,
+            ])
+    return layout
+
+
+def _hook_callbacks(hooks: Optional[dict]) -> dict[str, Any]:
+    """
+    Hook callbacks keyed by the ids the SDK assigns when connecting.
+
+    Query.initialize() numbers callbacks hook_0, hook_1, ... in iteration
+    order; options with the same _hook_layout() get the same ids.
+    """
+    callbacks: dict[str, Any] = {}
+    for matchers in (hooks or {}).values():
+        for matcher in matchers or ():
+            for callback in matcher.hooks:
+                callbacks[f"hook_{len(callbacks)}"] = callback
+    return callbacks
+
+
+@functools.lru_cache(maxsize=None)
+def rebinding_supported() -> bool:
+    """
+    Whether the installed claude-agent-sdk is one _bind() was checked against.
+
+    Logs a warning (once) when parked clients cannot be reused.
+    """
+    version = getattr(claude_agent_sdk, "__version__", "")
+    try:
+        parsed = tuple(int(part) for part in version.split(".")[:3])
+    except ValueError:
+        parsed = ()
+    low, high = REBIND_SDK_VERSIONS
+    if low <= parsed <= high:
+        return True
+    logger.warning(
+        f"CLIENT POOL: claude-agent-sdk {version or '?'} is not a version client "
+        f"rebinding was checked with ({'.'.join(map(str, low))} - "
+        f"{'.'.join(map(str, high))}); parked clients will not be reused"
+    )
+    return False
+
+
+def _sdk_mcp_instances(options: ClaudeAgentOptions) -> dict[str, Any]:
+    """Extract in-process SDK MCP server instances from options."""
+    servers: dict[str, Any] = {}
+    if isinstance(options.mcp_servers, dict):
+        for name, config in options.mcp_servers.items():
+            if isinstance(config, dict) and config.get("type") == "sdk":
+                servers[name] = config["instance"]
+    return servers
+
+
+class PooledClient:
+    """
+    A connected SDK client owned by the pool.
+
+    Runs receive a PooledClient from SDKClientPool.lease(); the underlying
+    ClaudeSDKClient is available as ``client``.
+    """
+
+    def __init__(self, key: str, client: ClaudeSDKClient) -> None:
+        self.key = key
+        self.client = client
+        self.runs = 0
+        self.claude_session_id: Optional[str] = None
+        self.generation = 0
+        self.reused = False
+        self.connect_ms = 0.0
+        self.last_used = time.monotonic()
+        self._keep = False
+        self._suspend = False
+        self._ready = asyncio.Event()
+        self._close_requested = asyncio.Event()
+        self._error: Optional[BaseException] = None
+        self._task: Optional[asyncio.Task] = None
+        self._expiry: Optional[asyncio.TimerHandle] = None
+
+    def keep(self, claude_session_id: Optional[str]) -> None:
+        """
+        Mark the current run as finished cleanly so the client can be parked.
+
+        Args:
+            claude_session_id: Claude session ID from the run's ResultMessage.
+        """
+        self._keep = True
+        self.claude_session_id = claude_session_id
+
+    def suspend(self, claude_session_id: Optional[str]) -> None:
+        """
+        Mark the run as paused for user input so the client is kept for its answer.
+
+        Falls back to keep() semantics if suspension is disabled in the pool.
+
+        Args:
+            claude_session_id: Claude session ID from the run's ResultMessage.
+        """
+        self.keep(claude_session_id)
+        self._suspend = True
+
+    @property
+    def is_alive(self) -> bool:
+        """Whether the owner task is still holding a connected client."""
+        return (
+            self._task is not None
+            and not self._task.done()
+            and self._error is None
+            and not self._close_requested.is_set()
+        )
+
+    async def _own(self) -> None:
+        """Owner task: connect, wait for the close request, disconnect."""
+        started = time.perf_counter()
+        try:
+            await self.client.connect()
+        except BaseException as e:
+            self._error = e
+            self._ready.set()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return
+        self.connect_ms = (time.perf_counter() - started) * 1000
+        self._ready.set()
+        try:
+            await self._close_requested.wait()
+        finally:
+            try:
+                await self.client.disconnect()
+            except Exception as e:
+                logger.debug(f"CLIENT POOL: Error disconnecting client: {e}")
+
+    def _bind(self, options: ClaudeAgentOptions) -> bool:
+        """
+        Re-bind per-run callbacks and MCP server instances to the client.
+
+        Rewrites private SDK state (see REBIND_SDK_VERSIONS).
+
+        Returns:
+            True if the client could be bound, False if it must be discarded.
+        """
+        if not rebinding_supported():
+            return False
+        query = getattr(self.client, "_query", None)
+        if query is None or not all(hasattr(query, a) for a in _REBIND_QUERY_ATTRIBUTES):
+            logger.warning("CLIENT POOL: SDK client internals changed; not reusing client")
+            return False
+        query.can_use_tool = options.can_use_tool
+        query.hook_callbacks = _hook_callbacks(options.hooks)
+        query.sdk_mcp_servers = _sdk_mcp_instances(options)
+        self.client.options = options
+        return True
+
+
+class SDKClientPool:
+    """
+    Pool of pre-initialized ClaudeSDKClient processes.
+
+    A pool with max_size 0 is disabled: lease() then connects a fresh client
+    in the caller's task and disconnects it afterwards, exactly like a plain
+    ``async with ClaudeSDKClient(options)``.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 0,
+        max_runs_per_client: int = 20,
+        idle_ttl_seconds: float = 300,
+        suspend_ttl_seconds: float = 0,
+        max_suspended: int = 8,
+        client_factory: Callable[[ClaudeAgentOptions], ClaudeSDKClient] = (
+            lambda options: ClaudeSDKClient(options=options)
+        ),
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            max_size: Maximum number of idle clients kept alive (0 disables the pool).
+            max_runs_per_client: Runs served by one process before it is recycled.
+            idle_ttl_seconds: Idle time after which a parked client is closed.
+            suspend_ttl_seconds: How long a suspended conversation waits for its
+                answer (0 disables suspension).
+            max_suspended: Maximum number of suspended conversations kept.
+            client_factory: Creates an unconnected client for the given options.
+        """
+        self._max_size = max(0, max_size)
+        self._max_runs = max(1, max_runs_per_client)
+        self._idle_ttl = idle_ttl_seconds
+        self._client_factory = client_factory
+        self._idle: dict[str, list[PooledClient]] = {}
+        self._suspend_ttl = suspend_ttl_seconds
+        self._max_suspended = max(1, max_suspended)
+        self._suspended: dict[str, PooledClient] = {}
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether clients are kept alive between runs."""
+        return self._max_size > 0
+
+    @property
+    def suspend_enabled(self) -> bool:
+        """Whether runs paused on a question keep their client for the answer."""
+        return self._suspend_ttl > 0
+
+    @property
+    def suspended_count(self) -> int:
+        """Number of suspended conversations."""
+        return len(self._suspended)
+
+    def has_suspended(self, claude_session_id: Optional[str]) -> bool:
+        """
+        Whether a live client is suspended for a Claude session.
+
+        Args:
+            claude_session_id: Claude session ID of the paused conversation.
+        """
+        entry = self._suspended.get(claude_session_id) if claude_session_id else None
+        return entry is not None and entry.is_alive
+
+    @property
+    def idle_count(self) -> int:
+        """Number of parked clients."""
+        return sum(len(entries) for entries in self._idle.values())
+
+    def stats(self) -> dict[str, Any]:
+        """Return pool counters for logging and diagnostics."""
+        return {
+            "enabled": self.enabled,
+            "max_size": self._max_size,
+            "idle": self.idle_count,
+            "suspended": self.suspended_count,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+    @asynccontextmanager
+    async def lease(self, options: ClaudeAgentOptions) -> AsyncIterator[PooledClient]:
+        """
+        Lease a connected client for one run.
+
+        The client is parked again only if the run calls PooledClient.keep()
+        and exits without an exception; otherwise it is disconnected.
+
+        Args:
+            options: SDK options for the run.
+
+        Yields:
+            PooledClient whose ``client`` is connected and bound to the options.
+        """
+        if not self.enabled and not self.suspend_enabled:
+            client = self._client_factory(options)
+            pooled = PooledClient("", client)
+            started = time.perf_counter()
+            async with client:
+                pooled.connect_ms = (time.perf_counter() - started) * 1000
+                yield pooled
+            return
+
+        pooled = await self._acquire(options)
+        pooled._keep = False
+        pooled._suspend = False
+        try:
+            yield pooled
+        except BaseException:
+            await self._discard(pooled)
+            raise
+        await self._release(pooled)
+
+    async def invalidate(self) -> int:
+        """
+        Close every parked client and retire leased ones on release.
+
+        Call after configuration changes that are not reflected in the
+        options fingerprint.
+
+        Returns:
+            Number of parked clients closed.
+        """
+        self._generation += 1
+        entries = [e for bucket in self._idle.values() for e in bucket]
+        entries.extend(self._suspended.values())
+        self._idle.clear()
+        self._suspended.clear()
+        for entry in entries:
+            await self._close(entry)
+        if entries:
+            logger.info(f"CLIENT POOL: Invalidated {len(entries)} parked clients")
+        return len(entries)
+
+    async def close(self) -> None:
+        """Close all parked clients (application shutdown)."""
+        await self.invalidate()
+
+    async def _acquire(self, options: ClaudeAgentOptions) -> PooledClient:
+        """Take a matching parked client or spawn a new one."""
+        key = options_fingerprint(options)
+        wanted_session = None if options.fork_session else options.resume
+        if wanted_session is None:
+            # New conversation: no parked client holds it (see module docstring)
+            self._misses += 1
+            return await self._spawn(key, options)
+
+        suspended = self._suspended.pop(wanted_session, None) if wanted_session else None
+        if suspended is not None:
+            self._cancel_expiry(suspended)
+            if suspended.key == key and suspended.is_alive and suspended._bind(options):
+                self._hits += 1
+                suspended.reused = True
+                logger.info(
+                    f"CLIENT POOL: Resuming suspended conversation (session={wanted_session})"
+                )
+                return suspended
+            logger.info(
+                f"CLIENT POOL: Suspended client for {wanted_session} no longer matches; "
+                f"cold resume"
+            )
+            await self._close(suspended)
+
+        bucket = self._idle.get(key, [])
+        for entry in reversed(bucket):
+            if entry.claude_session_id != wanted_session or not entry.is_alive:
+                continue
+            bucket.remove(entry)
+            self._cancel_expiry(entry)
+            if entry._bind(options):
+                self._hits += 1
+                entry.reused = True
+                logger.info(
+                    f"CLIENT POOL: Reusing warm client (runs={entry.runs}, "
+                    f"session={wanted_session or 'new'})"
+                )
+                return entry
+            await self._close(entry)
+        if not bucket:
+            self._idle.pop(key, None)
+
+        self._misses += 1
+        return await self._spawn(key, options)
+
+    async def _spawn(self, key: str, options: ClaudeAgentOptions) -> PooledClient:
+        """
+        Create a client and connect it in its owner task.
+
+        Raises:
+            Exception: Whatever ClaudeSDKClient.connect() raised.
+        """
+        entry = PooledClient(key, self._client_factory(options))
+        entry.generation = self._generation
+        entry._task = asyncio.create_task(entry._own())
+        await entry._ready.wait()
+        if entry._error is not None:
+            raise entry._error
+        logger.debug(f"CLIENT POOL: Started client in {entry.connect_ms:.0f}ms")
+        return entry
+
+    async def _release(self, entry: PooledClient) -> None:
+        """Return a client after a run, parking it if it can serve another."""
+        entry.runs += 1
+        entry.reused = False
+        if not entry._keep:
+            await self._close(entry)
+            return
+        if entry.runs >= self._max_runs:
+            logger.info(f"CLIENT POOL: Recycling client after {entry.runs} runs")
+            await self._close(entry)
+            return
+        if entry.generation != self._generation:
+            await self._close(entry)
+            return
+        if entry._suspend and self.suspend_enabled and entry.claude_session_id:
+            self._suspend_entry(entry)
+            return
+        self._park(entry)
+
+    async def _discard(self, entry: PooledClient) -> None:
+        """Drop a client whose run failed; its state is unknown."""
+        entry.runs += 1
+        await self._close(entry)
+
+    def _park(self, entry: PooledClient) -> None:
+        """Add a client to the idle set, evicting the least recently used."""
+        entry.last_used = time.monotonic()
+        self._idle.setdefault(entry.key, []).append(entry)
+        while self.idle_count > self._max_size:
+            oldest = min(
+                (e for bucket in self._idle.values() for e in bucket),
+                key=lambda e: e.last_used,
+            )
+            self._unpark(oldest)
+            oldest._close_requested.set()
+        if entry in self._idle.get(entry.key, []):
+            loop = asyncio.get_running_loop()
+            entry._expiry = loop.call_later(self._idle_ttl, self._expire, entry)
+
+    def _suspend_entry(self, entry: PooledClient) -> None:
+        """Keep a client for its conversation's answer, evicting the oldest."""
+        entry.last_used = time.monotonic()
+        previous = self._suspended.pop(entry.claude_session_id, None)
+        if previous is not None and previous is not entry:
+            self._cancel_expiry(previous)
+            previous._close_requested.set()
+        self._suspended[entry.claude_session_id] = entry
+        while len(self._suspended) > self._max_suspended:
+            oldest = min(self._suspended.values(), key=lambda e: e.last_used)
+            self._unpark(oldest)
+            oldest._close_requested.set()
+            logger.info("CLIENT POOL: Evicted oldest suspended conversation")
+        loop = asyncio.get_running_loop()
+        entry._expiry = loop.call_later(self._suspend_ttl, self._expire, entry)
+        logger.info(
+            f"CLIENT POOL: Suspended client for session {entry.claude_session_id} "
+            f"(ttl={self._suspend_ttl:.0f}s)"
+        )
+
+    def _unpark(self, entry: PooledClient) -> None:
+        """Remove a client from the idle set or the suspended map."""
+        if entry.claude_session_id and self._suspended.get(entry.claude_session_id) is entry:
+            del self._suspended[entry.claude_session_id]
+        bucket = self._idle.get(entry.key)
+        if bucket and entry in bucket:
+            bucket.remove(entry)
+            if not bucket:
+                del self._idle[entry.key]
+        self._cancel_expiry(entry)
+
+    def _expire(self, entry: PooledClient) -> None:
+        """Idle TTL callback: close a client that was not reused in time."""
+        entry._expiry = None
+        self._unpark(entry)
+        entry._close_requested.set()
+        logger.debug("CLIENT POOL: Closed idle client after TTL")
+
+    @staticmethod
+    def _cancel_expiry(entry: PooledClient) -> None:
+        if entry._expiry is not None:
+            entry._expiry.cancel()
+            entry._expiry = None
+
+    async def _close(self, entry: PooledClient) -> None:
+        """Ask the owner task to disconnect and wait for it."""
+        self._unpark(entry)
+        entry._close_requested.set()
+        if entry._task is not None:
+            try:
+                await entry._task
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"CLIENT POOL: Client owner task failed: {e}")
+
+
+_client_pool: Optional[SDKClientPool] = None
+
+
+def _default_pool_size() -> int:
+    """Size the pool for this host: one warm CLI process per two CPUs."""
+    return max(1, (os.cpu_count() or 1) // 2)
+
+
+def get_client_pool() -> SDKClientPool:
+    """
+    Get the process-wide client pool, configured from agent.yaml.
+
+    Returns:
+        The shared SDKClientPool (disabled unless client_pool.enabled is set).
+    """
+    global _client_pool
+    if _client_pool is None:
+        config = dict(_CLIENT_POOL_DEFAULTS)
+        try:
+            from ..config import get_config_loader
+            config.update(get_config_loader().get_section("client_pool", _CLIENT_POOL_DEFAULTS))
+        except Exception as e:
+            logger.debug(f"CLIENT POOL: Using defaults ({e})")
+
+        max_size = 0
+        if config.get("enabled"):
+            max_size = config.get("max_size") or _default_pool_size()
+        _client_pool = SDKClientPool(
+            max_size=int(max_size),
+            max_runs_per_client=int(config.get("max_runs_per_client", 20)),
+            idle_ttl_seconds=float(config.get("idle_ttl_seconds", 300)),
+            suspend_ttl_seconds=(
+                float(config.get("suspend_ttl_seconds", 600))
+                if config.get("suspend_on_question") else 0
+            ),
+            max_suspended=int(config.get("max_suspended", 8)),
+        )
+        if _client_pool.suspend_enabled:
+            logger.info(
+                f"CLIENT POOL: Suspending clients on AskUserQuestion "
+                f"(suspend_ttl_seconds={config.get('suspend_ttl_seconds')})"
+            )
+        if _client_pool.enabled:
+            logger.info(
+                f"CLIENT POOL: Enabled (max_size={max_size}, "
+                f"max_runs_per_client={config.get('max_runs_per_client')}, "
+                f"idle_ttl_seconds={config.get('idle_ttl_seconds')})"
+            )
+    return _client_pool
+
+
+async def shutdown_client_pool() -> None:
+    """Close the shared pool if it was created."""
+    global _client_pool
+    if _client_pool is not None:
+        await _client_pool.close()
+        _client_pool = None
@@ -14,16 +14,30 @@ Security Philosophy:
 2. Fail-closed on any error
 3. Log all matches for audit trail
 4. Allow trusted skill scripts from designated directories
+
+Matching: rules are evaluated in file order and the first match wins. Most
+rules can only match when the command contains some literal text (a command
+name, a path), so each rule is indexed by the literals it requires; one
+pass over the lowercased command selects the few candidate rules, and only
+those regexes run. Recent verdicts are kept in a small LRU cache.
 """
 import logging
 import re
 import shlex
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Literal, Optional
 
 import yaml
 
+try:
+    from re import _constants as _sre_constants, _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants as _sre_constants  # type: ignore[no-redef]
+    import sre_parse as _sre_parse  # type: ignore[no-redef]
+
 logger = logging.getLogger(__name__)
 
 # Default path to security rules
@@ -42,6 +56,11 @@ TRUSTED_SKILL_PATHS = (
 # Interpreters that can execute skill scripts
 TRUSTED_INTERPRETERS = ("python", "python3", "bash", "sh")
 
+# Recent command verdicts kept per filter (commands longer than the limit
+# are not cached, so large heredocs do not pin memory)
+VERDICT_CACHE_SIZE = 1024
+MAX_CACHED_COMMAND_LENGTH = 4096
+
 
 def _is_trusted_skill_command(command: str) -> bool:
     """
@@ -57,6 +76,10 @@ def _is_trusted_skill_command(command: str) -> bool:
     Returns:
         True if the command executes a script from a trusted skill path.
     """
+    # Fast path: a skill script argument contains one of the trusted paths
+    if not any(skill_path in command for skill_path in TRUSTED_SKILL_PATHS):
+        return False
+
     try:
         # Parse command safely
         parts = shlex.split(command)
@@ -126,6 +149,8 @@ class SecurityCheckResult:
     allowed: bool
     matched_rule: Optional[SecurityRule] = None
     message: str = ""
+    # False for verdicts caused by errors, which must not be cached
+    cacheable: bool = field(default=True, repr=False)
     
     @property
     def should_block(self) -> bool:
@@ -140,6 +165,93 @@ class SecurityCheckResult:
         return "allow"
 
 
+def _required_literals(items) -> Optional[set[str]]:
+    """
+    Literals of which every match of a parsed pattern contains at least one.
+
+    Returns the alternative set with the longest shortest member, or None
+    when the pattern has no required literal text.
+    """
+    best: Optional[set[str]] = None
+
+    def consider(candidate: Optional[set[str]]) -> None:
+        nonlocal best
+        if candidate and (best is None or min(map(len, candidate)) > min(map(len, best))):
+            best = candidate
+
+    run = ""
+    for op, av in items:
+        if op is _sre_constants.LITERAL:
+            run += chr(av)
+            continue
+        consider({run} if run else None)
+        run = ""
+        if op is _sre_constants.SUBPATTERN:
+            consider(_required_literals(av[-1]))
+        elif op in (_sre_constants.MAX_REPEAT, _sre_constants.MIN_REPEAT) and av[0] >= 1:
+            consider(_required_literals(av[2]))
+        elif op is _sre_constants.BRANCH:
+            alternatives = [_required_literals(branch) for branch in av[1]]
+            if all(alternatives):
+                consider(set().union(*alternatives))
+    consider({run} if run else None)
+    return best
+
+
+class _RuleMatcher:
+    """
+    First-match evaluation of an ordered rule list with a literal prefilter.
+
+    A rule whose pattern requires one of a set of ASCII literals can only
+    match if the (case-insensitively compared) command contains one of them;
+    rules without such literals are always candidates. Candidates are then
+    searched in rule order, so the result is the same as trying every rule.
+    Non-ASCII commands skip the prefilter, because case-insensitive regex
+    matching of non-ASCII text does not follow str.lower().
+    """
+
+    def __init__(self, rules: list[SecurityRule]) -> None:
+        self._rules = rules
+        self._always: list[int] = []
+        self._by_literal: dict[str, list[int]] = {}
+        for index, rule in enumerate(rules):
+            literals = None
+            try:
+                compiled = rule.compiled_pattern
+                literals = _required_literals(_sre_parse.parse(compiled.pattern, compiled.flags))
+            except Exception as e:
+                logger.debug(f"CommandSecurityFilter: No prefilter for rule {rule.pattern}: {e}")
+            if not literals or not all(literal.isascii() for literal in literals):
+                self._always.append(index)
+                continue
+            for literal in {literal.lower() for literal in literals}:
+                self._by_literal.setdefault(literal, []).append(index)
+
+    @property
+    def prefiltered_count(self) -> int:
+        """Number of rules skipped unless one of their literals occurs."""
+        return len(self._rules) - len(self._always)
+
+    def candidates(self, command: str) -> list[int]:
+        """Indexes of rules that may match command, in rule order."""
+        if not command.isascii():
+            return list(range(len(self._rules)))
+        lowered = command.lower()
+        selected = set(self._always)
+        for literal, indexes in self._by_literal.items():
+            if literal in lowered:
+                selected.update(indexes)
+        return sorted(selected)
+
+    def first_match(self, command: str) -> Optional[SecurityRule]:
+        """The first rule (in rule order) whose pattern matches command."""
+        for index in self.candidates(command):
+            rule = self._rules[index]
+            if rule.compiled_pattern.search(command):
+                return rule
+        return None
+
+
 class CommandSecurityFilter:
     """
     Command security filter that validates commands against security rules.
@@ -171,8 +283,11 @@ class CommandSecurityFilter:
         self._rules_path = rules_path or DEFAULT_RULES_PATH
         self._fail_closed = fail_closed
         self._rules: list[SecurityRule] = []
+        self._matcher = _RuleMatcher([])
         self._rules_loaded = False
         self._load_error: Optional[str] = None
+        self._verdicts: OrderedDict[str, SecurityCheckResult] = OrderedDict()
+        self._verdicts_lock = threading.Lock()
         
         self._load_rules()
     
@@ -225,10 +340,11 @@ class CommandSecurityFilter:
                     rules.append(rule)
             
             self._rules = rules
+            self._matcher = _RuleMatcher(rules)
             self._rules_loaded = True
             logger.info(
                 f"CommandSecurityFilter: Loaded {len(rules)} rules "
-                f"from {self._rules_path}"
+                f"from {self._rules_path} ({self._matcher.prefiltered_count} prefiltered)"
             )
             
         except yaml.YAMLError as e:
@@ -246,8 +362,10 @@ class CommandSecurityFilter:
             True if rules loaded successfully, False otherwise.
         """
         self._rules = []
+        self._matcher = _RuleMatcher([])
         self._rules_loaded = False
         self._load_error = None
+        self.clear_verdict_cache()
         self._load_rules()
         return self._rules_loaded
     
@@ -289,6 +407,31 @@ class CommandSecurityFilter:
                     message="Rules not loaded, allowing (fail-open mode)"
                 )
 
+        # Verdicts only depend on the command and the loaded rules
+        with self._verdicts_lock:
+            cached = self._verdicts.get(command)
+            if cached is not None:
+                self._verdicts.move_to_end(command)
+        if cached is not None:
+            self._log_verdict(cached, command)
+            return cached
+
+        result = self._evaluate(command)
+        self._log_verdict(result, command)
+        if result.cacheable and len(command) <= MAX_CACHED_COMMAND_LENGTH:
+            with self._verdicts_lock:
+                self._verdicts[command] = result
+                if len(self._verdicts) > VERDICT_CACHE_SIZE:
+                    self._verdicts.popitem(last=False)
+        return result
+
+    def clear_verdict_cache(self) -> None:
+        """Forget cached verdicts (done automatically on reload_rules)."""
+        with self._verdicts_lock:
+            self._verdicts.clear()
+
+    def _evaluate(self, command: str) -> SecurityCheckResult:
+        """Check a command against the rules (no caching, no audit logging)."""
         # SECURITY EXCEPTION: Allow trusted skill scripts
         # Skill scripts are located in read-only mounted directories and are trusted.
         # This check runs BEFORE pattern matching to prevent false positives from
@@ -299,50 +442,56 @@ class CommandSecurityFilter:
                 message="Trusted skill script execution allowed",
             )
 
-        # Check command against all rules
-        for rule in self._rules:
-            try:
-                if rule.compiled_pattern.search(command):
-                    # Found a match
-                    if rule.action == "block":
-                        message = (
-                            f"Command blocked by security rule [{rule.category}]: "
-                            f"pattern='{rule.pattern[:50]}...'"
-                        )
-                        logger.warning(
-                            f"CommandSecurityFilter: BLOCKED - "
-                            f"category={rule.category}, command={command[:100]}..."
-                        )
-                        return SecurityCheckResult(
-                            allowed=False,
-                            matched_rule=rule,
-                            message=message,
-                        )
-                    else:  # record
-                        logger.info(
-                            f"CommandSecurityFilter: RECORDED - "
-                            f"category={rule.category}, command={command[:100]}..."
-                        )
-                        return SecurityCheckResult(
-                            allowed=True,
-                            matched_rule=rule,
-                            message=f"Command recorded for audit [{rule.category}]",
-                        )
-            except Exception as e:
-                logger.error(
-                    f"CommandSecurityFilter: Error checking rule {rule.pattern}: {e}"
+        # Check command against the rules; the first match wins
+        try:
+            rule = self._matcher.first_match(command)
+        except Exception as e:
+            logger.error(f"CommandSecurityFilter: Error checking rules: {e}")
+            if self._fail_closed:
+                return SecurityCheckResult(
+                    allowed=False,
+                    message=f"Security check error: {e}. Blocking for safety.",
+                    cacheable=False,
                 )
-                if self._fail_closed:
-                    return SecurityCheckResult(
-                        allowed=False,
-                        message=f"Security check error: {e}. Blocking for safety."
-                    )
-        
-        # No rules matched - command is allowed
+            rule = None
+
+        if rule is None:
+            # No rules matched - command is allowed
+            return SecurityCheckResult(
+                allowed=True,
+                message="No security rules matched",
+            )
+        if rule.action == "block":
+            return SecurityCheckResult(
+                allowed=False,
+                matched_rule=rule,
+                message=(
+                    f"Command blocked by security rule [{rule.category}]: "
+                    f"pattern='{rule.pattern[:50]}...'"
+                ),
+            )
         return SecurityCheckResult(
             allowed=True,
-            message="No security rules matched",
+            matched_rule=rule,
+            message=f"Command recorded for audit [{rule.category}]",
         )
+
+    @staticmethod
+    def _log_verdict(result: SecurityCheckResult, command: str) -> None:
+        """Audit log for matched rules (also for cached verdicts)."""
+        rule = result.matched_rule
+        if rule is None:
+            return
+        if rule.action == "block":
+            logger.warning(
+                f"CommandSecurityFilter: BLOCKED - "
+                f"category={rule.category}, command={command[:100]}..."
+            )
+        else:
+            logger.info(
+                f"CommandSecurityFilter: RECORDED - "
+                f"category={rule.category}, command={command[:100]}..."
+            )
     
     def get_rules_by_category(self, category: str) -> list[SecurityRule]:
         """Get all rules in a specific category."""
@@ -0,0 +1,466 @@
+"""
+Atomic search/replace edits for the Edit and MultiEdit tools.
+
+Edits are never written in place:
+
+- The new content is written to a temporary file next to the target
+  (same directory, so same filesystem), fsynced, given the target's mode
+  and owner, and moved over the target with os.replace(). A crash leaves
+  either the old or the new file, and concurrent readers never see a
+  partial write.
+- All replacements for a file are found in a single scan: the old strings
+  are combined into one regex alternation (longest first), and the output
+  is assembled once instead of copying the whole string per edit.
+  When the edits overlap or depend on each other (an old string shares
+  text with another one, or with the new string of an earlier edit), they
+  are always applied one after the other instead, as the tools did before
+  the single scan. The mode depends only on the edit list, never on the
+  file's content.
+- Files above STREAM_THRESHOLD_BYTES are streamed through the temp file in
+  chunks, carrying over enough text between chunks that matches spanning a
+  chunk boundary are found; memory stays bounded by the chunk size.
+- The SHA-256 of the content read is checked against an optional
+  expected_sha256 (the hash returned by the previous edit), so an agent can
+  detect that someone else modified the file. The target's (inode, size,
+  mtime) is checked again just before the replace to catch writes that
+  happened while the edit was being prepared.
+
+Content is decoded as UTF-8 with universal newlines and written with "\\n"
+line endings, as Path.read_text()/write_text() did before.
+
+prepare_edits() returns a PreparedEdit whose commit() performs the replace,
+so MultiEdit can prepare every file before committing any of them.
+"""
+import codecs
+import hashlib
+import io
+import logging
+import os
+import re
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+STREAM_THRESHOLD_BYTES = 8 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+
+class FileEditError(Exception):
+    """Raised when an edit cannot be applied."""
+
+    def __init__(
+        self,
+        reason: str,
+        edit_index: Optional[int] = None,
+        count: int = 0,
+        overlaps: Optional[int] = None,
+    ):
+        super().__init__(reason)
+        self.reason = reason
+        self.edit_index = edit_index  # Index into the edits list, if specific to one
+        self.count = count  # Occurrences found for that edit
+        self.overlaps = overlaps  # Earlier edit that consumed the string, if known
+
+
+@dataclass
+class Replacement:
+    """One search/replace operation."""
+    old: str
+    new: str
+    replace_all: bool = False
+    # Fail when old occurs more than once (unless replace_all); otherwise
+    # only the first occurrence is replaced
+    require_unique: bool = True
+
+
+@dataclass
+class PreparedEdit:
+    """New content written to a temp file, ready to replace the target."""
+    path: Path
+    tmp_path: Optional[Path]
+    counts: list[int]
+    previous_sha256: str
+    sha256: str
+    streamed: bool
+    _identity: tuple[int, int, int] = field(repr=False, default=(0, 0, 0))
+    _fallback_content: Optional[bytes] = field(repr=False, default=None)
+
+    def commit(self) -> None:
+        """Move the new content over the target (atomic)."""
+        if _identity(os.stat(self.path)) != self._identity:
+            self.discard()
+            raise FileEditError("File was modified while the edit was being applied; retry")
+        if self.tmp_path is None:
+            # Directory not writable: no temp file possible, write in place
+            with open(self.path, "r+b") as f:
+                f.write(self._fallback_content)
+                f.truncate()
+            return
+        os.replace(self.tmp_path, self.path)
+        self.tmp_path = None
+
+    def discard(self) -> None:
+        """Remove the temp file without touching the target."""
+        if self.tmp_path is not None:
+            try:
+                os.unlink(self.tmp_path)
+            except OSError:
+                pass
+            self.tmp_path = None
+
+
+def file_sha256(path: Union[Path, str]) -> str:
+    """SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def prepare_edits(
+    path: Union[Path, str],
+    edits: list[Replacement],
+    expected_sha256: Optional[str] = None,
+    stream_threshold: Optional[int] = None,
+) -> PreparedEdit:
+    """
+    Apply edits to a file's content and write the result to a temp file.
+
+    Independent edits are all matched against the current file content in
+    one pass (they do not see each other's output). When any edit overlaps
+    or depends on another one, all edits are applied in order instead, each
+    to the previous one's output. The target is not modified until commit().
+
+    Args:
+        path: File to edit (symlinks are resolved; the link is kept).
+        edits: Replacements to apply.
+        expected_sha256: Fail unless the current content has this hash.
+        stream_threshold: Stream files larger than this many bytes
+            (default STREAM_THRESHOLD_BYTES).
+
+    Returns:
+        PreparedEdit with per-edit replacement counts and content hashes.
+
+    Raises:
+        FileEditError: An old string is missing or ambiguous, the hash does
+            not match, or the file is not valid UTF-8.
+        OSError: The file cannot be read or the temp file cannot be written.
+    """
+    if not edits:
+        raise FileEditError("No edits given")
+    if any(not edit.old for edit in edits):
+        raise FileEditError("old_string must not be empty")
+
+    target = Path(os.path.realpath(path))
+    threshold = STREAM_THRESHOLD_BYTES if stream_threshold is None else stream_threshold
+    if _has_dependencies(edits):
+        passes = _in_order(edits)
+    else:
+        passes = [list(range(len(edits)))]
+
+    with open(target, "rb") as src:
+        st = os.fstat(src.fileno())
+        streamed = st.st_size > threshold
+        if not streamed:
+            data = src.read()
+            previous = hashlib.sha256(data).hexdigest()
+            _check_expected(previous, expected_sha256)
+            text = _decode(data)
+            output, counts = _apply_in_memory(text, edits, passes)
+            new_data = output.encode("utf-8")
+            return _write_prepared(target, st, new_data, counts, previous, streamed)
+
+        return _stream_edits(target, src, st, edits, passes, expected_sha256)
+
+
+def apply_edits(
+    path: Union[Path, str],
+    edits: list[Replacement],
+    expected_sha256: Optional[str] = None,
+    stream_threshold: Optional[int] = None,
+) -> PreparedEdit:
+    """prepare_edits() followed by commit(); see prepare_edits()."""
+    prepared = prepare_edits(path, edits, expected_sha256, stream_threshold)
+    prepared.commit()
+    return prepared
+
+
+def _in_order(edits: list[Replacement]) -> list[list[int]]:
+    """Passes applying one edit each, in order."""
+    return [[index] for index in range(len(edits))]
+
+
+def _has_dependencies(edits: list[Replacement]) -> bool:
+    """Whether any edit overlaps or depends on another (edits are then applied in order)."""
+    return any(_dependency(edits, index) is not None for index in range(len(edits)))
+
+
+def _shares_text(a: str, b: str) -> bool:
+    """Whether matches of a and b can overlap: one contains the other, or they chain."""
+    if a in b or b in a:
+        return True
+    return _chains(a, b) or _chains(b, a)
+
+
+def _chains(a: str, b: str) -> bool:
+    """Whether a proper suffix of a is a prefix of b."""
+    start = max(1, len(a) - len(b) + 1)
+    while True:
+        start = a.find(b[0], start)
+        if start < 0:
+            return False
+        if b.startswith(a[start:]):
+            return True
+        start += 1
+
+
+def _dependency(edits: list[Replacement], index: int) -> Optional[int]:
+    """
+    Earliest other edit that edit index overlaps or depends on.
+
+    Its old string shares text with another edit's old string, or with the
+    new string of an earlier edit.
+
+    Returns:
+        Index of that edit, or None if edit index is independent.
+    """
+    old = edits[index].old
+    for other, edit in enumerate(edits):
+        if other == index:
+            continue
+        if _shares_text(old, edit.old) or (other < index and edit.new and _shares_text(old, edit.new)):
+            return other
+    return None
+
+
+def _apply_in_memory(
+    text: str, edits: list[Replacement], passes: list[list[int]]
+) -> tuple[str, list[int]]:
+    """Apply edits in passes (lists of edit indexes); returns (text, counts)."""
+    counts = [0] * len(edits)
+    for indexes in passes:
+        matcher = _Matcher([edits[i] for i in indexes])
+        text = matcher.apply(text, final=True)
+        for index, count in zip(indexes, matcher.counts):
+            counts[index] = count
+        _check_counts(edits, counts, indexes, in_order=len(passes) > 1)
+    return text, counts
+
+
+def _stream_edits(
+    target: Path,
+    src,
+    st: os.stat_result,
+    edits: list[Replacement],
+    passes: list[list[int]],
+    expected_sha256: Optional[str],
+) -> PreparedEdit:
+    """
+    Stream a file through the edit passes into a temp file.
+
+    Every pass after the first reads the previous pass's temp file.
+    """
+    counts = [0] * len(edits)
+    source, source_tmp = src, None  # source_tmp: previous pass's temp file
+    tmp_path: Optional[Path] = None
+    try:
+        for number, indexes in enumerate(passes):
+            last = number == len(passes) - 1
+            matcher = _Matcher([edits[i] for i in indexes])
+            tmp_path = _make_temp(target)
+            digest_in = hashlib.sha256()
+            digest_out = hashlib.sha256()
+            decoder = io.IncrementalNewlineDecoder(
+                codecs.getincrementaldecoder("utf-8")(), translate=True
+            )
+            with open(tmp_path, "wb") as out:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                    digest_in.update(chunk)
+                    piece = matcher.apply(_decode_chunk(decoder, chunk, final=False), final=False)
+                    _write_out(out, digest_out, piece)
+                tail = matcher.apply(_decode_chunk(decoder, b"", final=True), final=True)
+                _write_out(out, digest_out, tail)
+                if number == 0:
+                    previous = digest_in.hexdigest()
+                    _check_expected(previous, expected_sha256)
+                for index, count in zip(indexes, matcher.counts):
+                    counts[index] = count
+                _check_counts(edits, counts, indexes, in_order=len(passes) > 1)
+                if last:
+                    out.flush()
+                    os.fsync(out.fileno())
+            if source_tmp is not None:
+                source.close()
+                os.unlink(source_tmp)
+                source, source_tmp = src, None
+            if not last:
+                source, source_tmp = open(tmp_path, "rb"), tmp_path
+                tmp_path = None
+        _copy_owner_and_mode(tmp_path, st)
+    except BaseException:
+        if source_tmp is not None:
+            source.close()
+            os.unlink(source_tmp)
+        if tmp_path is not None:
+            os.unlink(tmp_path)
+        raise
+
+    return PreparedEdit(
+        path=target,
+        tmp_path=tmp_path,
+        counts=counts,
+        previous_sha256=previous,
+        sha256=digest_out.hexdigest(),
+        streamed=True,
+        _identity=_identity(st),
+    )
+
+
+class _Matcher:
+    """Single-pass replacement of several literals, usable chunk by chunk."""
+
+    def __init__(self, edits: list[Replacement]) -> None:
+        self.edits = edits
+        self.counts = [0] * len(edits)
+        # Longest alternative first so a longer old string wins at a position
+        order = sorted(range(len(edits)), key=lambda i: -len(edits[i].old))
+        self._group_edit = order
+        self._regex = re.compile("|".join(f"({re.escape(edits[i].old)})" for i in order))
+        self._lookahead = max(len(edit.old) for edit in edits) - 1
+        self._carry = ""
+
+    def apply(self, text: str, final: bool) -> str:
+        """
+        Replace matches in text (appended to the carried-over remainder).
+
+        Unless final, text that could still be the start of a match is kept
+        for the next call.
+        """
+        buffer = self._carry + text
+        # Matches starting before safe_end are fully inside the buffer
+        safe_end = len(buffer) if final else max(0, len(buffer) - self._lookahead)
+        out: list[str] = []
+        position = 0
+        for match in self._regex.finditer(buffer):
+            if match.start() >= safe_end:
+                break
+            index = self._group_edit[match.lastindex - 1]
+            edit = self.edits[index]
+            self.counts[index] += 1
+            out.append(buffer[position:match.start()])
+            replace = edit.replace_all or edit.require_unique or self.counts[index] == 1
+            out.append(edit.new if replace else match.group())
+            position = match.end()
+        emit_to = max(position, safe_end)
+        out.append(buffer[position:emit_to])
+        self._carry = buffer[emit_to:]
+        return "".join(out)
+
+
+def _check_counts(
+    edits: list[Replacement],
+    counts: list[int],
+    indexes: list[int],
+    in_order: bool = False,
+) -> None:
+    for index in indexes:
+        edit, count = edits[index], counts[index]
+        if count == 0 and in_order and index > 0:
+            earlier = _dependency(edits[:index + 1], index)
+            if earlier is not None:
+                raise FileEditError(
+                    f"String not found after applying the earlier edits: "
+                    f"edit {index} overlaps edit {earlier}",
+                    edit_index=index,
+                    overlaps=earlier,
+                )
+        if count == 0:
+            raise FileEditError("String not found in file", edit_index=index)
+        if count > 1 and edit.require_unique and not edit.replace_all:
+            raise FileEditError(
+                f"Found {count} occurrences of the string", edit_index=index, count=count
+            )
+
+
+def _check_expected(actual: str, expected: Optional[str]) -> None:
+    if expected and actual != expected.strip().lower():
+        raise FileEditError(
+            f"File content changed (sha256 is {actual}, expected {expected}); "
+            f"re-read the file before editing"
+        )
+
+
+def _decode(data: bytes) -> str:
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise FileEditError(f"File is not valid UTF-8: {e}") from e
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _decode_chunk(decoder: io.IncrementalNewlineDecoder, chunk: bytes, final: bool) -> str:
+    try:
+        return decoder.decode(chunk, final=final)
+    except UnicodeDecodeError as e:
+        raise FileEditError(f"File is not valid UTF-8: {e}") from e
+
+
+def _write_out(out, digest, text: str) -> None:
+    if text:
+        data = text.encode("utf-8")
+        digest.update(data)
+        out.write(data)
+
+
+def _identity(st: os.stat_result) -> tuple[int, int, int]:
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _make_temp(target: Path) -> Path:
+    fd, name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    os.close(fd)
+    return Path(name)
+
+
+def _copy_owner_and_mode(tmp_path: Path, st: os.stat_result) -> None:
+    os.chmod(tmp_path, st.st_mode & 0o7777)
+    try:
+        os.chown(tmp_path, st.st_uid, st.st_gid)
+    except OSError:
+        pass  # Not permitted (not root): keep our own ownership
+
+
+def _write_prepared(
+    target: Path,
+    st: os.stat_result,
+    data: bytes,
+    counts: list[int],
+    previous: str,
+    streamed: bool,
+) -> PreparedEdit:
+    sha256 = hashlib.sha256(data).hexdigest()
+    try:
+        tmp_path = _make_temp(target)
+    except PermissionError:
+        logger.debug(f"FILE EDIT: {target.parent} not writable, editing {target.name} in place")
+        return PreparedEdit(
+            path=target, tmp_path=None, counts=counts, previous_sha256=previous,
+            sha256=sha256, streamed=streamed, _identity=_identity(st), _fallback_content=data,
+        )
+    try:
+        with open(tmp_path, "wb") as out:
+            out.write(data)
+            out.flush()
+            os.fsync(out.fileno())
+        _copy_owner_and_mode(tmp_path, st)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return PreparedEdit(
+        path=target, tmp_path=tmp_path, counts=counts, previous_sha256=previous,
+        sha256=sha256, streamed=streamed, _identity=_identity(st),
+    )
@@ -0,0 +1,680 @@
+"""
+Workspace file search: ignore-aware directory walking and a grep engine.
+
+Used by Ag3ntumGrep (and shared with the other file discovery tools):
+
+- walk_entries()/walk_files() walk a directory in sorted order, pruning
+  VCS/dependency directories (.git, node_modules, ...) and anything matched
+  by .gitignore files (nested files and ancestors up to the workspace root
+  are honoured, including negation). Symlinks are followed only when the
+  caller's follow_symlink predicate accepts them (the tools accept targets
+  inside the workspace or a mount, which are symlinks in the workspace);
+  directories are walked once, so cycles are skipped. Listings come
+  from os.scandir or, via list_dir, from the session's WorkspaceIndex
+  (src/core/workspace_index.py).
+- GrepEngine searches files in a thread pool. Files are sniffed for NUL
+  bytes and skipped as binary, then read in chunks; chunks that do not
+  contain the pattern's required literal are skipped without splitting
+  them into lines. Results are yielded in walk order and the search stops
+  (cancelling outstanding work) once max_results matches are found, so the
+  output is identical to a sequential search.
+
+Lines are split on "\\n" (a trailing "\\r" is removed), as in grep/ripgrep.
+"""
+import fnmatch
+import logging
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Directories never descended into below the search root
+DEFAULT_IGNORED_DIRS: frozenset[str] = frozenset({
+    ".git", ".hg", ".svn", "node_modules", "__pycache__",
+})
+
+GITIGNORE_FILE = ".gitignore"
+BINARY_SNIFF_BYTES = 8192
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+
+# =============================================================================
+# Glob / .gitignore pattern translation
+# =============================================================================
+
+def _glob_to_regex(pattern: str) -> str:
+    """
+    Translate a path glob to a regex body.
+
+    "**" spans directories, "*" and "?" stay within one path component and
+    "[...]" classes are kept ("[!...]" is negation).
+    """
+    out: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                at_start = i == 0 or pattern[i - 1] == "/"
+                if at_start and pattern.startswith("**/", i):
+                    out.append("(?:.*/)?")
+                    i += 3
+                    continue
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2 if pattern.startswith("[!", i) else i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def compile_glob(pattern: str) -> re.Pattern:
+    """
+    Compile a pathlib-style glob matched against paths relative to its base.
+
+    "*.py" matches only direct children, "**/*.py" matches at any depth.
+    """
+    return re.compile(_glob_to_regex(pattern.lstrip("/")) + r"\Z")
+
+
+class GlobMatcher:
+    """
+    Pathlib-style glob compiled once, with subtree pruning.
+
+    matches() tests a relative file path; can_descend() tells whether any
+    path below a relative directory can still match, so walks skip e.g.
+    everything outside "src/" for "src/**/*.py".
+    """
+
+    def __init__(self, pattern: str) -> None:
+        pattern = pattern.lstrip("/")
+        self.pattern = pattern
+        self.regex = compile_glob(pattern)
+        # One matcher per path component; None stands for "any number of
+        # components" ("**", or a component containing "**")
+        self._segments: list[Optional[re.Pattern]] = [
+            None if "**" in part else re.compile(_glob_to_regex(part) + r"\Z")
+            for part in pattern.split("/")
+            if part and part != "."
+        ]
+        self._states: dict[str, frozenset[int]] = {"": self._closure({0})}
+
+    def matches(self, rel: str) -> bool:
+        """Whether a relative POSIX file path matches the pattern."""
+        return self.regex.match(rel) is not None
+
+    def can_descend(self, rel_dir: str) -> bool:
+        """Whether files below a relative directory path can match."""
+        parent, _, name = rel_dir.rpartition("/")
+        states = self._states.get(parent)
+        if states is None:
+            states = self._states[""]
+            for part in rel_dir.split("/")[:-1]:
+                states = self._advance(states, part)
+        states = self._advance(states, name)
+        # A file needs at least one more component after the directory
+        if not any(i < len(self._segments) for i in states):
+            return False
+        self._states[rel_dir] = states
+        return True
+
+    def _closure(self, states: set[int]) -> frozenset[int]:
+        for i in sorted(states):
+            while i < len(self._segments) and self._segments[i] is None:
+                i += 1
+                states.add(i)
+        return frozenset(states)
+
+    def _advance(self, states: frozenset[int], part: str) -> frozenset[int]:
+        following: set[int] = set()
+        for i in states:
+            if i >= len(self._segments):
+                continue
+            segment = self._segments[i]
+            if segment is None:
+                following.add(i)
+            elif segment.match(part):
+                following.add(i + 1)
+        return self._closure(following)
+
+
+def compile_include(include: Optional[str]) -> Optional[Callable[[str], bool]]:
+    """
+    Compile a file filter glob.
+
+    A glob without "/" matches file names at any depth ("*.py"); a glob with
+    "/" matches the path relative to the search root ("src/**/*.py").
+
+    Args:
+        include: Glob, or None/empty/"**/*" for all files.
+
+    Returns:
+        Predicate over relative POSIX paths, or None if everything matches.
+    """
+    if not include or include in ("*", "**", "**/*"):
+        return None
+    if "/" not in include:
+        regex = re.compile(fnmatch.translate(include))
+        return lambda rel: regex.match(rel.rsplit("/", 1)[-1]) is not None
+    regex = compile_glob(include)
+    return lambda rel: regex.match(rel) is not None
+
+
+@dataclass
+class _IgnoreRule:
+    regex: re.Pattern
+    negate: bool
+    dir_only: bool
+
+
+class GitIgnore:
+    """Rules of one .gitignore file, matched relative to its directory."""
+
+    def __init__(self, rules: list[_IgnoreRule]) -> None:
+        self.rules = rules
+
+    @classmethod
+    def parse(cls, text: str) -> "GitIgnore":
+        """Parse .gitignore content."""
+        rules = []
+        for raw in text.splitlines():
+            line = raw.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            elif line.startswith("\\"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            body = _glob_to_regex(line.lstrip("/"))
+            if not anchored:
+                body = "(?:.*/)?" + body
+            rules.append(_IgnoreRule(re.compile(body + r"\Z"), negate, dir_only))
+        return cls(rules)
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["GitIgnore"]:
+        """Load directory/.gitignore if it exists and has rules."""
+        try:
+            with open(os.path.join(directory, GITIGNORE_FILE), encoding="utf-8",
+                      errors="replace") as f:
+                ignore = cls.parse(f.read())
+        except OSError:
+            return None
+        return ignore if ignore.rules else None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Match a path relative to this file's directory.
+
+        Returns:
+            True if ignored, False if re-included by a negated rule, None if
+            no rule matches. The last matching rule wins.
+        """
+        for rule in reversed(self.rules):
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.match(rel_path):
+                return not rule.negate
+        return None
+
+
+class _IgnoreStack:
+    """Active .gitignore files during a walk (deepest file has precedence)."""
+
+    def __init__(self) -> None:
+        self._entries: list[tuple[str, GitIgnore]] = []  # (dir prefix, rules)
+
+    def push(self, prefix: str, ignore: GitIgnore) -> None:
+        self._entries.append((prefix, ignore))
+
+    def pop_to(self, depth: int) -> None:
+        del self._entries[depth:]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ignored(self, path: str, is_dir: bool) -> bool:
+        """Check a path relative to the outermost .gitignore directory."""
+        for prefix, ignore in reversed(self._entries):
+            if prefix and not path.startswith(prefix):
+                continue
+            verdict = ignore.match(path[len(prefix):], is_dir)
+            if verdict is not None:
+                return verdict
+        return False
+
+
+# =============================================================================
+# Directory walk
+# =============================================================================
+
+class WalkEntry(NamedTuple):
+    """A directory entry as seen by walk_entries()."""
+    name: str
+    path: str
+    is_dir: bool  # Follows symlinks
+    is_file: bool  # Follows symlinks
+    key: Optional[tuple[int, int]] = None  # (st_dev, st_ino) of directories, if known
+    is_symlink: bool = False
+
+
+def scan_directory(path: str) -> list[WalkEntry]:
+    """List a directory with os.scandir, sorted by name (no stat calls)."""
+    entries = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                    is_file = not is_dir and entry.is_file()
+                    is_symlink = entry.is_symlink()
+                except OSError:
+                    continue
+                entries.append(WalkEntry(
+                    entry.name, entry.path, is_dir, is_file, is_symlink=is_symlink
+                ))
+    except OSError:
+        return []
+    entries.sort(key=lambda e: e.name)
+    return entries
+
+
+def walk_entries(
+    root: Path,
+    include: Optional[str] = None,
+    respect_gitignore: bool = True,
+    gitignore_root: Optional[Path] = None,
+    ignored_dirs: frozenset[str] = DEFAULT_IGNORED_DIRS,
+    include_hidden: bool = True,
+    include_dirs: bool = False,
+    list_dir: Callable[[str], list] = scan_directory,
+    load_ignore: Callable[[str], Optional[GitIgnore]] = GitIgnore.load,
+    descend: Optional[Callable[[str], bool]] = None,
+    follow_symlink: Optional[Callable[[str], bool]] = None,
+) -> Iterator[tuple[str, str, bool]]:
+    """
+    Walk entries below root in sorted, depth-first order.
+
+    Args:
+        root: Directory to walk.
+        include: Optional glob filter for files (see compile_include()).
+        respect_gitignore: Skip paths matched by .gitignore files.
+        gitignore_root: Directory whose .gitignore files between it and
+            root also apply (usually the workspace root).
+        ignored_dirs: Directory names never descended into.
+        include_hidden: Include (and descend into) dot-entries.
+        include_dirs: Also yield directories (before their contents).
+        list_dir: Directory lister returning sorted WalkEntry-like objects
+            (the workspace index passes its cached listings).
+        load_ignore: .gitignore loader for a directory.
+        descend: Optional predicate over relative directory paths; directories
+            it rejects are neither yielded nor walked (see GlobMatcher).
+        follow_symlink: Optional predicate over symlink paths, usually
+            Ag3ntumPathValidator.is_link_target_allowed(). Symlinks are only
+            followed when it accepts them: other linked files are skipped and
+            other linked directories are yielded (with include_dirs) but not
+            walked. Without it no symlink is followed.
+
+    Yields:
+        (relative POSIX path from root, path string, is_dir) per entry.
+    """
+    matches_include = compile_include(include)
+    ignores = _IgnoreStack()
+    root_str = os.fspath(root)
+
+    # Ancestor .gitignore files apply to the search root's subtree
+    base_prefix = ""
+    if respect_gitignore and gitignore_root is not None:
+        try:
+            rel_root = Path(root_str).relative_to(gitignore_root)
+        except ValueError:
+            rel_root = None
+        if rel_root is not None and rel_root.parts:
+            directory = os.fspath(gitignore_root)
+            prefix = ""
+            for part in rel_root.parts:
+                ignore = load_ignore(directory)
+                if ignore is not None:
+                    ignores.push(prefix, ignore)
+                directory = os.path.join(directory, part)
+                prefix += part + "/"
+            base_prefix = prefix
+
+    visited: set[tuple[int, int]] = set()
+    try:
+        st = os.stat(root_str)
+        visited.add((st.st_dev, st.st_ino))
+    except OSError:
+        return
+
+    # Open directories: (sorted entries iterator, ignore stack depth before it)
+    stack: list[tuple[Iterator, int]] = []
+
+    def open_dir(path: str, rel_prefix: str) -> None:
+        depth = len(ignores)
+        if respect_gitignore:
+            ignore = load_ignore(path)
+            if ignore is not None:
+                ignores.push(base_prefix + rel_prefix, ignore)
+        stack.append((iter(list_dir(path)), depth))
+
+    prefixes: list[str] = [""]
+    open_dir(root_str, "")
+    while stack:
+        entries, depth = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            prefixes.pop()
+            ignores.pop_to(depth)
+            continue
+
+        if not include_hidden and entry.name.startswith("."):
+            continue
+        rel = prefixes[-1] + entry.name
+
+        followed = not getattr(entry, "is_symlink", False) or (
+            follow_symlink is not None and follow_symlink(entry.path)
+        )
+
+        if entry.is_dir:
+            if entry.name in ignored_dirs:
+                continue
+            if respect_gitignore and ignores.ignored(base_prefix + rel, True):
+                continue
+            if descend is not None and not descend(rel):
+                continue
+            if not followed:
+                if include_dirs:
+                    yield rel, entry.path, True  # Listed, but its target is not walked
+                continue
+            key = entry.key
+            if key is None:
+                try:
+                    st = os.stat(entry.path)
+                except OSError:
+                    continue
+                key = (st.st_dev, st.st_ino)
+            if key in visited:
+                continue  # Symlink cycle or directory seen through another link
+            visited.add(key)
+            if include_dirs:
+                yield rel, entry.path, True
+            prefixes.append(rel + "/")
+            open_dir(entry.path, rel + "/")
+            continue
+
+        if not entry.is_file or not followed:
+            continue
+        if respect_gitignore and ignores.ignored(base_prefix + rel, False):
+            continue
+        if matches_include is not None and not matches_include(rel):
+            continue
+        yield rel, entry.path, False
+
+
+def walk_files(root: Path, **kwargs) -> Iterator[tuple[str, str]]:
+    """
+    Walk regular files below root in sorted, depth-first order.
+
+    Args:
+        root: Directory to walk.
+        **kwargs: Options of walk_entries() (include, respect_gitignore,
+            gitignore_root, ignored_dirs, include_hidden, list_dir, ...).
+
+    Yields:
+        (relative POSIX path from root, path string) per file.
+    """
+    for rel, path, _ in walk_entries(root, include_dirs=False, **kwargs):
+        yield rel, path
+
+
+# =============================================================================
+# Grep engine
+# =============================================================================
+
+def _required_literal(regex: re.Pattern) -> Optional[str]:
+    """
+    Longest literal every match of a compiled regex must contain.
+
+    Only top-level literal runs are considered, which is enough for typical
+    search patterns ("def main", "TODO:", r"foo\\(\\w+\\)").
+    """
+    try:
+        from re import _parser as sre_parse  # Python 3.11+
+    except ImportError:  # pragma: no cover - older interpreters
+        import sre_parse  # type: ignore[no-redef]
+    try:
+        parsed = sre_parse.parse(regex.pattern, regex.flags)
+    except Exception:
+        return None
+    literal_op = sre_parse.LITERAL
+    best, run = "", []
+    for op, av in parsed:
+        if op is literal_op:
+            run.append(chr(av))
+            continue
+        if len(run) > len(best):
+            best = "".join(run)
+        run = []
+    if len(run) > len(best):
+        best = "".join(run)
+    return best or None
+
+
+@dataclass
+class GrepMatch:
+    """A matching line with its context (1-based line numbers)."""
+    line_number: int
+    line: str
+    before: list[str] = field(default_factory=list)
+    after: list[str] = field(default_factory=list)
+
+
+@dataclass
+class FileMatches:
+    """Matches found in one file."""
+    rel_path: str
+    path: str
+    matches: list[GrepMatch]
+
+
+class GrepEngine:
+    """Regex search over files with binary skipping and a literal prefilter."""
+
+    def __init__(
+        self,
+        regex: re.Pattern,
+        context: int = 0,
+        max_results: int = 1000,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """
+        Initialize the engine.
+
+        Args:
+            regex: Compiled pattern, matched against single lines.
+            context: Lines of context before and after each match.
+            max_results: Stop after this many matching lines in total.
+            max_workers: Files searched concurrently.
+            chunk_size: Characters read per chunk.
+        """
+        self.regex = regex
+        self.context = max(0, context)
+        self.max_results = max_results
+        self.max_workers = max(1, max_workers)
+        self.chunk_size = chunk_size
+        self.literal = _required_literal(regex)
+        self._has_literal = self._literal_check(self.literal, regex.flags)
+        self._stop = threading.Event()
+
+    @staticmethod
+    def _literal_check(literal: Optional[str], flags: int) -> Optional[Callable[[str], bool]]:
+        if not literal:
+            return None
+        if flags & re.IGNORECASE:
+            literal_re = re.compile(re.escape(literal), flags & (re.IGNORECASE | re.ASCII))
+            folded = literal.lower()
+            if not literal.isascii():
+                return lambda text: literal_re.search(text) is not None
+            # lower() is exact for ASCII text; non-ASCII text may case-fold
+            # onto ASCII letters (e.g. KELVIN SIGN), so it uses the regex
+            return lambda text: (
+                folded in text.lower() if text.isascii()
+                else literal_re.search(text) is not None
+            )
+        return lambda text: literal in text
+
+    def search(self, files: Iterable[tuple[str, str]]) -> Iterator[FileMatches]:
+        """
+        Search files concurrently, yielding matches in input order.
+
+        Stops once max_results matching lines were yielded; the last file is
+        truncated to the limit.
+
+        Args:
+            files: (display path, absolute path) pairs, e.g. from walk_files().
+
+        Yields:
+            FileMatches for files with at least one match.
+        """
+        remaining = self.max_results
+        if remaining <= 0:
+            return
+        self._stop.clear()
+        window = self.max_workers * 4
+        files_iter = iter(files)
+        pending: deque[tuple[str, str, Future]] = deque()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="grep") as pool:
+            try:
+                while True:
+                    while len(pending) < window:
+                        item = next(files_iter, None)
+                        if item is None:
+                            break
+                        rel, path = item
+                        pending.append((rel, path, pool.submit(self.search_file, path)))
+                    if not pending:
+                        return
+                    rel, path, future = pending.popleft()
+                    matches = future.result()
+                    if not matches:
+                        continue
+                    if len(matches) >= remaining:
+                        yield FileMatches(rel, path, matches[:remaining])
+                        return
+                    remaining -= len(matches)
+                    yield FileMatches(rel, path, matches)
+            finally:
+                self._stop.set()
+                for _, _, future in pending:
+                    future.cancel()
+
+    def search_file(self, path: str) -> list[GrepMatch]:
+        """
+        Search one file, returning at most max_results matches.
+
+        Binary files (NUL byte in the first 8 KB) and unreadable files
+        yield no matches.
+        """
+        try:
+            with open(path, "rb") as f:
+                if b"\0" in f.read(BINARY_SNIFF_BYTES):
+                    return []
+            with open(path, encoding="utf-8", errors="replace", newline="") as f:
+                return self._scan(f)
+        except OSError:
+            return []
+
+    def _scan(self, f) -> list[GrepMatch]:
+        regex_search = self.regex.search
+        has_literal = self._has_literal
+        context = self.context
+        limit = self.max_results
+        matches: list[GrepMatch] = []
+        awaiting: list[GrepMatch] = []  # Matches still collecting after-context
+        before: deque[str] = deque(maxlen=context)
+        line_number = 0
+        carry = ""
+        full = False  # Limit reached; only the last after-contexts are completed
+
+        while not self._stop.is_set():
+            data = f.read(self.chunk_size)
+            if data:
+                text = carry + data
+                cut = text.rfind("\n")
+                if cut == -1:
+                    carry = text
+                    continue
+                carry = text[cut + 1:]
+                text = text[:cut]
+            else:
+                if not carry:
+                    break
+                text, carry = carry, ""
+
+            if full and not awaiting:
+                break
+            if has_literal is not None and not awaiting and not has_literal(text):
+                # No match possible in this chunk: only track position and context
+                line_number += text.count("\n") + 1
+                if context:
+                    for line in text.rsplit("\n", context)[-context:]:
+                        before.append(line.rstrip("\r"))
+            else:
+                for line in text.split("\n"):
+                    line_number += 1
+                    if line.endswith("\r"):
+                        line = line[:-1]
+                    if awaiting:
+                        for match in awaiting:
+                            match.after.append(line)
+                        awaiting = [m for m in awaiting if len(m.after) < context]
+                    if full:
+                        if not awaiting:
+                            break
+                        continue
+                    if (has_literal is None or has_literal(line)) and regex_search(line):
+                        match = GrepMatch(line_number, line, list(before))
+                        matches.append(match)
+                        if context:
+                            awaiting.append(match)
+                        full = len(matches) >= limit
+                    if context:
+                        before.append(line)
+            if not data:
+                break
+        return matches
@@ -0,0 +1,411 @@
+"""
+Line-offset index service for paging through large text files.
+
+Agents and the UI page through the same multi-gigabyte logs and CSVs via
+Read, ReadDocument and the files preview endpoint. Reading lines 1-50 must
+not load (or secret-scan) the whole file, and paging further into it must
+not rescan everything before the page:
+
+- LineIndex records, every CHECKPOINT_BYTES bytes, how many newlines come
+  before that byte. Chunks are read into one reusable buffer and counted
+  with bytearray.count() (a C fastsearch loop), so building the index
+  never splits the file into lines or allocates per chunk.
+- To reach line N, read_lines() seeks to the last checkpoint before the
+  N-th newline and skips the remaining lines within one chunk, so a page
+  costs at most one chunk of scanning wherever it is in the file.
+- tail() scans backwards from the end of the file and never needs the
+  index; line numbers are attached once the file is small enough to count
+  or already fully indexed.
+- Indexes are kept per file version, keyed by (st_ino, st_mtime_ns,
+  st_size): any change to the file starts a new index. With a cache_dir
+  (the session directory's .line_index/), indexes of files of at least
+  PERSIST_MIN_BYTES are also stored on disk and reused by later requests
+  and after restarts.
+
+Files are read with plain reads rather than mmap: a file truncated while
+mapped raises SIGBUS in the reading process, and previewed files (logs,
+command output) are routinely rewritten while being read.
+
+Lines are split on "\\n" (a trailing "\\r" is removed). The total line count
+of a file is only computed when the file is at most COUNT_LINES_MAX_BYTES
+or already fully indexed.
+"""
+import array
+import bisect
+import hashlib
+import logging
+import os
+import struct
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_BYTES = 1024 * 1024
+COUNT_LINES_MAX_BYTES = 64 * 1024 * 1024
+PERSIST_MIN_BYTES = 8 * 1024 * 1024
+MAX_CACHED_INDEXES = 64
+
+# Directory (inside the session directory) holding persisted indexes
+LINE_INDEX_DIR = ".line_index"
+
+FileKey = tuple[int, int, int]
+
+_INDEX_MAGIC = b"AGLIDX01"
+_INDEX_HEADER = struct.Struct("<8sQQQqQ")  # magic, ino, mtime_ns, size, total, stride
+
+
+def file_key(st: os.stat_result) -> FileKey:
+    """Identity of one file version: (st_ino, st_mtime_ns, st_size)."""
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class LineIndex:
+    """
+    Sparse newline index of one file version.
+
+    checkpoints[i] is the number of newlines in the first i * stride bytes.
+    The index is extended on demand, so a read near the start of a file
+    only indexes the chunks it passes.
+    """
+
+    def __init__(self, key: FileKey, stride: int = CHECKPOINT_BYTES) -> None:
+        self.key = key
+        self.size = key[2]
+        self.stride = stride
+        self.checkpoints = array.array("Q", [0])
+        self.total_lines: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def complete(self) -> bool:
+        """Whether the whole file has been indexed."""
+        return self.total_lines is not None
+
+    def line_offset(self, f: BinaryIO, line: int) -> Optional[int]:
+        """
+        Byte offset where a 0-based line starts.
+
+        Args:
+            f: The file, opened in binary mode.
+            line: 0-based line number.
+
+        Returns:
+            Offset, or None if the file has fewer lines.
+        """
+        if line == 0:
+            return 0 if self.size > 0 else None
+        with self._lock:
+            self._extend(f, line)
+            if self.total_lines is not None and line >= self.total_lines:
+                return None
+            # Last checkpoint before the line's preceding newline
+            i = bisect.bisect_left(self.checkpoints, line) - 1
+            position = i * self.stride
+            remaining = line - self.checkpoints[i]
+
+        f.seek(position)
+        while True:
+            chunk = f.read(self.stride)
+            if not chunk:
+                return None
+            found = -1
+            for _ in range(remaining):
+                found = chunk.find(b"\n", found + 1)
+                if found == -1:
+                    break
+                remaining -= 1
+            if remaining == 0:
+                offset = position + found + 1
+                return offset if offset < self.size else None
+            position += len(chunk)
+
+    def count_lines(self, f: BinaryIO) -> int:
+        """Total number of lines (indexes the rest of the file)."""
+        with self._lock:
+            self._extend(f, None)
+            return self.total_lines
+
+    def to_bytes(self) -> bytes:
+        """Serialize for the on-disk cache."""
+        with self._lock:
+            total = -1 if self.total_lines is None else self.total_lines
+            header = _INDEX_HEADER.pack(_INDEX_MAGIC, *self.key, total, self.stride)
+            return header + self.checkpoints.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, key: FileKey) -> Optional["LineIndex"]:
+        """Load a serialized index; None if it belongs to another file version."""
+        if len(data) < _INDEX_HEADER.size:
+            return None
+        magic, ino, mtime_ns, size, total, stride = _INDEX_HEADER.unpack_from(data)
+        if magic != _INDEX_MAGIC or (ino, mtime_ns, size) != key or stride <= 0:
+            return None
+        checkpoints = array.array("Q")
+        body = data[_INDEX_HEADER.size:]
+        if len(body) % checkpoints.itemsize:
+            return None
+        checkpoints.frombytes(body)
+        if not checkpoints or checkpoints[0] != 0:
+            return None
+        index = cls(key, stride)
+        index.checkpoints = checkpoints
+        index.total_lines = None if total < 0 else total
+        return index
+
+    def _extend(self, f: BinaryIO, line: Optional[int]) -> None:
+        """Add checkpoints until one lies past the line's start (lock held)."""
+        if self.total_lines is not None:
+            return
+        f.seek((len(self.checkpoints) - 1) * self.stride)
+        count = self.checkpoints[-1]
+        buffer = bytearray(self.stride)
+        while line is None or self.checkpoints[-1] < line:
+            length = f.readinto(buffer)
+            count += buffer.count(b"\n", 0, length)
+            if length < self.stride:
+                self.total_lines = count + (1 if self._unterminated(f) else 0)
+                return
+            self.checkpoints.append(count)
+
+    def _unterminated(self, f: BinaryIO) -> bool:
+        """Whether the last line lacks a trailing newline."""
+        if self.size == 0:
+            return False
+        f.seek(self.size - 1)
+        return f.read(1) != b"\n"
+
+
+@dataclass
+class LineRange:
+    """Lines read from a file."""
+    lines: list[str]
+    start: Optional[int]  # 1-based number of the first line (None if unknown)
+    total_lines: Optional[int]  # None if not counted (large file)
+    has_more: bool  # Lines follow (read_lines) or precede (tail) the range
+
+
+class LineIndexService:
+    """
+    Process-wide cache of LineIndex objects with optional on-disk copies.
+
+    Thread-safe: tools call it from worker threads.
+    """
+
+    def __init__(self, max_indexes: int = MAX_CACHED_INDEXES) -> None:
+        self.max_indexes = max_indexes
+        self._indexes: "OrderedDict[str, LineIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def index_for(
+        self,
+        path: Union[Path, str],
+        st: os.stat_result,
+        cache_dir: Optional[Path] = None,
+    ) -> LineIndex:
+        """
+        LineIndex of the current file version (memory, then disk, then new).
+
+        Args:
+            path: File path.
+            st: Current os.stat() result of the file.
+            cache_dir: Directory with persisted indexes (optional).
+        """
+        path = os.fspath(path)
+        key = file_key(st)
+        with self._lock:
+            index = self._indexes.get(path)
+            if index is not None and index.key == key:
+                self._indexes.move_to_end(path)
+                return index
+
+        index = None
+        if cache_dir is not None and st.st_size >= PERSIST_MIN_BYTES:
+            index = self._load(path, key, cache_dir)
+        if index is None:
+            index = LineIndex(key, CHECKPOINT_BYTES)
+
+        with self._lock:
+            self._indexes[path] = index
+            self._indexes.move_to_end(path)
+            while len(self._indexes) > self.max_indexes:
+                self._indexes.popitem(last=False)
+        return index
+
+    def read_lines(
+        self,
+        path: Union[Path, str],
+        start: int = 1,
+        count: Optional[int] = None,
+        cache_dir: Optional[Path] = None,
+    ) -> LineRange:
+        """
+        Read up to count lines starting at a 1-based line number.
+
+        Only the requested lines are decoded; the position of the first one
+        is found through the file's LineIndex.
+
+        Args:
+            path: File path.
+            start: 1-based first line.
+            count: Maximum number of lines (None reads to the end).
+            cache_dir: Directory with persisted indexes (optional).
+
+        Returns:
+            LineRange with the lines (without line terminators).
+        """
+        start = max(1, start)
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            index = self.index_for(path, st, cache_dir)
+            known = (len(index.checkpoints), index.complete)
+
+            lines: list[str] = []
+            has_more = False
+            position = index.line_offset(f, start - 1)
+            if position is not None:
+                f.seek(position)
+                while count is None or len(lines) < count:
+                    raw = f.readline()
+                    if not raw:
+                        break
+                    lines.append(_decode_line(raw))
+                has_more = f.read(1) != b""
+
+            total_lines = index.total_lines
+            if total_lines is None and (st.st_size <= COUNT_LINES_MAX_BYTES or not has_more):
+                total_lines = index.count_lines(f)
+
+        if (len(index.checkpoints), index.complete) != known:
+            self._save(path, index, cache_dir)
+        return LineRange(lines=lines, start=start, total_lines=total_lines, has_more=has_more)
+
+    def tail(
+        self,
+        path: Union[Path, str],
+        n: int,
+        cache_dir: Optional[Path] = None,
+    ) -> LineRange:
+        """
+        Last n lines of a file, read backwards from its end.
+
+        Args:
+            path: File path.
+            n: Number of lines.
+            cache_dir: Directory with persisted indexes (optional).
+
+        Returns:
+            LineRange; start/total_lines are known only if the file is small
+            or already fully indexed.
+        """
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            size = st.st_size
+            index = self.index_for(path, st, cache_dir)
+            known = index.complete
+
+            # Collect whole lines backwards, one chunk at a time
+            end = size
+            if size and _read_at(f, size - 1, 1) == b"\n":
+                end = size - 1  # A trailing newline does not start a line
+            blocks: list[bytes] = []
+            newlines = 0
+            position = end
+            while position > 0 and newlines < n:
+                read_from = max(0, position - CHECKPOINT_BYTES)
+                block = _read_at(f, read_from, position - read_from)
+                newlines += block.count(b"\n")
+                blocks.append(block)
+                position = read_from
+
+            lines: list[str] = []
+            has_more = position > 0
+            if size and n > 0:
+                raw_lines = b"".join(reversed(blocks)).split(b"\n")
+                # The first piece is partial unless the scan reached the file start
+                if position > 0:
+                    raw_lines = raw_lines[1:]
+                has_more = has_more or len(raw_lines) > n
+                lines = [_decode_line(raw) for raw in raw_lines[-n:]]
+
+            total_lines = index.total_lines
+            if total_lines is None and size <= COUNT_LINES_MAX_BYTES:
+                total_lines = index.count_lines(f)
+            if total_lines is not None:
+                has_more = total_lines > len(lines)
+
+        if index.complete != known:
+            self._save(path, index, cache_dir)
+        first = total_lines - len(lines) + 1 if total_lines is not None else None
+        return LineRange(lines=lines, start=first, total_lines=total_lines, has_more=has_more)
+
+    def _cache_file(self, path: str, cache_dir: Path) -> Path:
+        digest = hashlib.sha1(os.fsencode(path)).hexdigest()
+        return cache_dir / f"{digest}.idx"
+
+    def _load(self, path: str, key: FileKey, cache_dir: Path) -> Optional[LineIndex]:
+        try:
+            data = self._cache_file(path, cache_dir).read_bytes()
+        except OSError:
+            return None
+        index = LineIndex.from_bytes(data, key)
+        if index is not None:
+            logger.debug(f"LINE INDEX: Loaded {len(index.checkpoints)} checkpoints for {path}")
+        return index
+
+    def _save(self, path: Union[Path, str], index: LineIndex, cache_dir: Optional[Path]) -> None:
+        if cache_dir is None or index.size < PERSIST_MIN_BYTES:
+            return
+        target = self._cache_file(os.fspath(path), cache_dir)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(index.to_bytes())
+            os.replace(tmp, target)
+        except OSError as e:
+            logger.debug(f"LINE INDEX: Could not persist index for {path}: {e}")
+            tmp.unlink(missing_ok=True)
+
+
+def _read_at(f: BinaryIO, offset: int, length: int) -> bytes:
+    f.seek(offset)
+    return f.read(length)
+
+
+def _decode_line(raw: bytes) -> str:
+    if raw.endswith(b"\n"):
+        raw = raw[:-1]
+    if raw.endswith(b"\r"):
+        raw = raw[:-1]
+    return raw.decode("utf-8", errors="replace")
+
+
+_service: Optional[LineIndexService] = None
+_service_lock = threading.Lock()
+
+
+def get_line_index_service() -> LineIndexService:
+    """Get the process-wide LineIndexService."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = LineIndexService()
+        return _service
+
+
+def read_lines(
+    path: Union[Path, str],
+    start: int = 1,
+    count: Optional[int] = None,
+    cache_dir: Optional[Path] = None,
+) -> LineRange:
+    """Read lines start..start + count - 1 (see LineIndexService.read_lines)."""
+    return get_line_index_service().read_lines(path, start, count, cache_dir)
+
+
+def tail(path: Union[Path, str], n: int, cache_dir: Optional[Path] = None) -> LineRange:
+    """Read the last n lines (see LineIndexService.tail)."""
+    return get_line_index_service().tail(path, n, cache_dir)
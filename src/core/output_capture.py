@@ -0,0 +1,199 @@
+"""
+Streaming capture of subprocess output.
+
+OutputCapture reads a pipe in chunks as the process produces it, instead of
+process.communicate() buffering everything until exit:
+
+- every chunk is appended to an output file (when given), so the full
+  output is on disk however large it gets;
+- only the first head_bytes and the last tail_bytes stay in memory, which is
+  enough for head/tail previews and bounds memory per command;
+- bytes and lines are counted on the fly;
+- an optional async progress callback receives the byte/line counts and the
+  most recent lines, at most once per progress_interval seconds.
+
+Line counts follow str.splitlines() for output that fits in memory and count
+"\\n" terminators otherwise.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+HEAD_BYTES = 64 * 1024
+TAIL_BYTES = 64 * 1024
+DEFAULT_PROGRESS_INTERVAL = 1.0
+PROGRESS_LINES = 10
+# Longest line (in characters) sent in a progress update
+PROGRESS_LINE_CHARS = 500
+
+
+@dataclass
+class OutputProgress:
+    """Snapshot of a running capture, passed to progress callbacks."""
+    bytes: int
+    lines: int
+    recent_lines: list[str]
+    elapsed: float
+
+
+ProgressCallback = Callable[[OutputProgress], Awaitable[None]]
+
+
+class OutputCapture:
+    """Stream a pipe to a file, keeping a bounded head and tail in memory."""
+
+    def __init__(
+        self,
+        output_file: Optional[Path] = None,
+        head_bytes: int = HEAD_BYTES,
+        tail_bytes: int = TAIL_BYTES,
+        on_progress: Optional[ProgressCallback] = None,
+        progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+        progress_lines: int = PROGRESS_LINES,
+    ) -> None:
+        self.output_file = output_file
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.progress_lines = progress_lines
+        self.total_bytes = 0
+        self._newlines = 0
+        self._last_byte = b""
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._started = time.monotonic()
+        self._last_progress = self._started
+        self._progress_bytes = 0
+        self._out = None
+
+    async def pump(self, stream: asyncio.StreamReader) -> None:
+        """Read stream to EOF, writing and sampling every chunk."""
+        self.open()
+        try:
+            while True:
+                chunk = await stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                await self.write(chunk)
+        finally:
+            self.close()
+
+    def open(self) -> None:
+        """Create the output file (if any); call before write()."""
+        if self.output_file is not None and self._out is None:
+            self._out = open(self.output_file, "wb")
+
+    async def write(self, chunk: bytes) -> None:
+        """Write one chunk to the file, account for it and report progress."""
+        if not chunk:
+            return
+        if self._out is not None:
+            self._out.write(chunk)
+        self.feed(chunk)
+        if self.on_progress is not None:
+            await self._maybe_report()
+
+    def close(self) -> None:
+        """Close the output file."""
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+    def feed(self, chunk: bytes) -> None:
+        """Account for one chunk of output."""
+        if not chunk:
+            return
+        self.total_bytes += len(chunk)
+        self._newlines += chunk.count(b"\n")
+        self._last_byte = chunk[-1:]
+        room = self.head_bytes - len(self._head)
+        if room > 0:
+            self._head += chunk[:room]
+        self._tail += chunk
+        if len(self._tail) > 2 * self.tail_bytes:
+            del self._tail[:-self.tail_bytes]
+
+    @property
+    def complete(self) -> bool:
+        """True if head and tail together hold the whole output."""
+        return self.total_bytes <= self.head_bytes + self.tail_bytes
+
+    def data(self) -> bytes:
+        """The whole output; only valid when complete."""
+        if self.total_bytes <= self.head_bytes:
+            return bytes(self._head)
+        rest = self.total_bytes - self.head_bytes
+        return bytes(self._head) + bytes(self._tail[-rest:])
+
+    @property
+    def total_lines(self) -> int:
+        """Number of lines in the output."""
+        if self.complete:
+            return len(self.data().decode("utf-8", errors="replace").splitlines())
+        return self._newlines + (1 if self._last_byte != b"\n" else 0)
+
+    def text(self, marker: str = "\n[... {omitted:,} bytes omitted ...]\n") -> str:
+        """The output, or its head and tail joined by marker when too large."""
+        if self.complete:
+            return self.data().decode("utf-8", errors="replace")
+        tail = bytes(self._tail[-self.tail_bytes:])
+        omitted = self.total_bytes - self.head_bytes - len(tail)
+        return (
+            bytes(self._head).decode("utf-8", errors="replace")
+            + marker.format(omitted=omitted)
+            + tail.decode("utf-8", errors="replace")
+        )
+
+    def head_lines(self, n: int) -> list[str]:
+        """First n lines of the output."""
+        if self.complete:
+            return self.data().decode("utf-8", errors="replace").splitlines()[:n]
+        lines = bytes(self._head).decode("utf-8", errors="replace").splitlines()
+        if not self._head.endswith(b"\n"):
+            lines = lines[:-1]  # Cut mid-line
+        return lines[:n]
+
+    def tail_lines(self, n: int) -> list[str]:
+        """Last n lines of the output."""
+        if n <= 0:
+            return []
+        if self.complete:
+            return self.data().decode("utf-8", errors="replace").splitlines()[-n:]
+        return self._tail_lines(n)
+
+    def _tail_lines(self, n: int) -> list[str]:
+        tail = bytes(self._tail[-self.tail_bytes:])
+        lines = tail.decode("utf-8", errors="replace").splitlines()
+        if len(tail) < self.total_bytes:
+            lines = lines[1:]  # First line may start before the buffer
+        return lines[-n:]
+
+    def progress(self) -> OutputProgress:
+        """Current counts and the most recent lines."""
+        recent = self._tail_lines(self.progress_lines) if self.progress_lines > 0 else []
+        return OutputProgress(
+            bytes=self.total_bytes,
+            lines=self._newlines + (1 if self._last_byte not in (b"", b"\n") else 0),
+            recent_lines=[line[:PROGRESS_LINE_CHARS] for line in recent],
+            elapsed=time.monotonic() - self._started,
+        )
+
+    async def _maybe_report(self) -> None:
+        now = time.monotonic()
+        if now - self._last_progress < self.progress_interval:
+            return
+        if self.total_bytes == self._progress_bytes:
+            return
+        self._last_progress = now
+        self._progress_bytes = self.total_bytes
+        try:
+            await self.on_progress(self.progress())
+        except Exception as e:
+            logger.debug(f"OUTPUT CAPTURE: Progress callback failed - {e}")
@@ -45,8 +45,13 @@ For external mounts:
 """
 import fnmatch
 import logging
+import os
 import re
+import stat
+import threading
+import time
 import unicodedata
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path, PurePosixPath
 from typing import Literal, Optional
@@ -55,6 +60,7 @@ from pydantic import BaseModel, Field
 
 # Import sandbox path resolver for integrated path handling
 from src.core.sandbox_path_resolver import (
+    PathPrefixTrie,
     SandboxPathResolver,
     SandboxPathContext,
     configure_sandbox_path_resolver,
@@ -62,6 +68,7 @@ from src.core.sandbox_path_resolver import (
     get_sandbox_path_resolver,
     has_sandbox_path_resolver,
     PathResolutionError,
+    path_components,
 )
 
 logger = logging.getLogger(__name__)
@@ -87,6 +94,12 @@ DEFAULT_READONLY_PREFIXES: list[str] = [
     "external/user-ro/", # Per-user read-only mounts
 ]
 
+# Resolved real paths are reused for this long (seconds). Symlinks created
+# by the agent (via Bash) invalidate the cache immediately; the TTL bounds
+# staleness for changes made outside the session.
+RESOLUTION_CACHE_TTL_SECONDS = 2.0
+RESOLUTION_CACHE_SIZE = 1024
+
 
 # =============================================================================
 # Path Sanitizer - Security hardening for external mount filenames
@@ -319,6 +332,21 @@ class ValidatedPath:
     is_readonly: bool = False
 
 
+@dataclass(frozen=True)
+class _Route:
+    """Where agent paths under a sandbox prefix live in the Docker filesystem."""
+
+    base: Path
+    # Leading components of the agent path that base replaces
+    strip: int
+    # Resolved path must stay within this (None: not checked)
+    boundary: Optional[Path]
+    # Boundary name in PATH_TRAVERSAL errors
+    label: str = ""
+    # Only applies when the agent path continues below the prefix
+    needs_remainder: bool = False
+
+
 class PathValidationError(Exception):
     """Raised when path validation fails."""
 
@@ -392,6 +420,81 @@ class Ag3ntumPathValidator:
             if len(parts) >= 5 and parts[3] == "sessions":
                 self._session_id = parts[4]
 
+        self._routes = self._compile_routes()
+        self._areas = self._compile_areas()
+
+        # Resolved real paths by agent path. Validators are per session, so
+        # entries are effectively keyed by (session, path).
+        self._resolved_cache: OrderedDict[str, tuple[float, Path]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_generation = 0
+        self._cache_suspended = 0
+
+    def _compile_routes(self) -> PathPrefixTrie:
+        """
+        Index the sandbox path prefixes _normalize_path() translates.
+
+        Under /workspace/external/, a prefix whose mount is not configured
+        falls back to the workspace path without a boundary check (the
+        boundary step in validate_path() then decides).
+        """
+        routes = PathPrefixTrie()
+        workspace = self.workspace
+        external = "/workspace/external"
+
+        def fallback(prefix: str) -> None:
+            routes.insert(prefix, _Route(workspace, 1, None, needs_remainder=True))
+
+        def named_mounts(prefix: str, mounts: dict[str, Path], label: str) -> None:
+            for name, mount_path in mounts.items():
+                # A name spanning several components can never match
+                if path_components(name) == [name]:
+                    routes.insert(f"{prefix}/{name}", _Route(mount_path, 4, mount_path, label))
+
+        routes.insert("/workspace", _Route(workspace, 1, workspace, "workspace"))
+        for kind, base, user_mounts in (
+            ("ro", self.external_ro, self.user_mounts_ro),
+            ("rw", self.external_rw, self.user_mounts_rw),
+        ):
+            if base:
+                routes.insert(
+                    f"{external}/{kind}",
+                    _Route(base, 3, base, f"external {kind} mount", needs_remainder=True),
+                )
+            else:
+                # No base path (non-Docker mode): {mount_name}/... in per-user mounts
+                fallback(f"{external}/{kind}")
+                named_mounts(f"{external}/{kind}", user_mounts, f"user-{kind} mount")
+        if self.persistent:
+            routes.insert(
+                f"{external}/persistent",
+                _Route(self.persistent, 3, self.persistent, "persistent storage", needs_remainder=True),
+            )
+        else:
+            fallback(f"{external}/persistent")
+        for kind, user_mounts in (("user-ro", self.user_mounts_ro), ("user-rw", self.user_mounts_rw)):
+            fallback(f"{external}/{kind}")
+            named_mounts(f"{external}/{kind}", user_mounts, f"{kind} mount")
+        return routes
+
+    def _compile_areas(self) -> PathPrefixTrie:
+        """Index the allowed directories; the lowest position wins on overlap."""
+        areas = PathPrefixTrie()
+        ordered = [
+            ("workspace", self.workspace),
+            ("global_skills", self.global_skills),
+            ("user_skills", self.user_skills),
+            ("external_ro", self.external_ro),
+            ("external_rw", self.external_rw),
+            ("persistent", self.persistent),
+        ]
+        ordered += [("user_ro", path) for path in self.user_mounts_ro.values()]
+        ordered += [("user_rw", path) for path in self.user_mounts_rw.values()]
+        for position, (area, base) in enumerate(ordered):
+            if base is not None:
+                areas.insert(str(base), (position, area, base))
+        return areas
+
     def validate_path(
         self,
         path: str,
@@ -416,7 +519,7 @@ class Ag3ntumPathValidator:
 
         # Step 1: Normalize the path
         try:
-            normalized = self._normalize_path(path)
+            normalized = self._resolve_cached(path)
         except Exception as e:
             self._log_blocked(path, operation, f"Normalization failed: {e}")
             raise PathValidationError(
@@ -470,87 +573,21 @@ class Ag3ntumPathValidator:
         # - Persistent storage (read-write)
         # - Per-user RO mounts (read-only)
         # - Per-user RW mounts (read-write)
-        in_workspace = False
-        in_global_skills = False
-        in_user_skills = False
-        in_external_ro = False
-        in_external_rw = False
-        in_persistent = False
-        in_user_ro = False
-        in_user_rw = False
+        area = None
         rel_path = ""
-
-        try:
-            rel_path = str(normalized.relative_to(self.workspace))
-            in_workspace = True
-        except ValueError:
-            pass
-
-        if not in_workspace and self.global_skills:
-            try:
-                rel_path = str(normalized.relative_to(self.global_skills))
-                in_global_skills = True
-            except ValueError:
-                pass
-
-        if not in_workspace and not in_global_skills and self.user_skills:
-            try:
-                rel_path = str(normalized.relative_to(self.user_skills))
-                in_user_skills = True
-            except ValueError:
-                pass
-
-        # Check external mount boundaries
-        if not in_workspace and not in_global_skills and not in_user_skills:
-            if self.external_ro:
-                try:
-                    rel_path = str(normalized.relative_to(self.external_ro))
-                    in_external_ro = True
-                except ValueError:
-                    pass
-
-        if not in_workspace and not in_global_skills and not in_user_skills and not in_external_ro:
-            if self.external_rw:
-                try:
-                    rel_path = str(normalized.relative_to(self.external_rw))
-                    in_external_rw = True
-                except ValueError:
-                    pass
-
-        if not in_workspace and not in_global_skills and not in_user_skills and not in_external_ro and not in_external_rw:
-            if self.persistent:
-                try:
-                    rel_path = str(normalized.relative_to(self.persistent))
-                    in_persistent = True
-                except ValueError:
-                    pass
-
-        # Check per-user mount boundaries
-        if not in_workspace and not in_global_skills and not in_user_skills and not in_external_ro and not in_external_rw and not in_persistent:
-            # Check per-user RO mounts
-            for mount_name, mount_path in self.user_mounts_ro.items():
-                try:
-                    rel_path = str(normalized.relative_to(mount_path))
-                    in_user_ro = True
-                    break
-                except ValueError:
-                    pass
-
-        if not in_workspace and not in_global_skills and not in_user_skills and not in_external_ro and not in_external_rw and not in_persistent and not in_user_ro:
-            # Check per-user RW mounts
-            for mount_name, mount_path in self.user_mounts_rw.items():
-                try:
-                    rel_path = str(normalized.relative_to(mount_path))
-                    in_user_rw = True
-                    break
-                except ValueError:
-                    pass
-
-        in_any_allowed = (
-            in_workspace or in_global_skills or in_user_skills or
-            in_external_ro or in_external_rw or in_persistent or
-            in_user_ro or in_user_rw
-        )
+        candidates = self._areas.matches(str(normalized))
+        if candidates:
+            _, area, base = min(value for _, value in candidates)
+            rel_path = str(normalized.relative_to(base))
+        in_workspace = area == "workspace"
+        in_global_skills = area == "global_skills"
+        in_user_skills = area == "user_skills"
+        in_external_ro = area == "external_ro"
+        in_external_rw = area == "external_rw"
+        in_persistent = area == "persistent"
+        in_user_ro = area == "user_ro"
+        in_user_rw = area == "user_rw"
+        in_any_allowed = area is not None
 
         if not in_any_allowed:
             self._log_blocked(path, operation, "Outside allowed directories")
@@ -666,191 +703,17 @@ class Ag3ntumPathValidator:
                 path_str = "/workspace/" + path_str.lstrip("./")
                 p = PurePosixPath(path_str)
 
-        # Handle agent paths that reference external mounts
-        if path_str.startswith("/workspace/external/"):
-            # Extract the part after /workspace/external/
-            external_part = path_str[len("/workspace/external/"):]
-
-            # Route to correct external mount
-            if external_part.startswith("ro/"):
-                # Read-only external mount: /workspace/external/ro/* -> /mounts/ro/*
-                relative = external_part[3:]  # Remove "ro/"
-
-                if self.external_ro:
-                    # Base path exists (Docker mode) - use it
-                    resolved = (self.external_ro / relative).resolve()
-                    # Security: verify resolved path stays within boundary
-                    if not self._is_within_boundary(resolved, self.external_ro):
-                        raise PathValidationError(
-                            f"Path traversal detected: {path}",
-                            path=path,
-                            reason="PATH_TRAVERSAL: Resolved path escapes external ro mount boundary",
-                        )
-                    return resolved
-                else:
-                    # No base path - try to find mount in user_mounts_ro (non-Docker mode)
-                    # Path format: {mount_name}/... (e.g., "greg_downloads/file.txt")
-                    if "/" in relative:
-                        mount_name, mount_relative = relative.split("/", 1)
-                    else:
-                        mount_name = relative
-                        mount_relative = ""
-
-                    if mount_name in self.user_mounts_ro:
-                        mount_path = self.user_mounts_ro[mount_name]
-                        if mount_relative:
-                            resolved = (mount_path / mount_relative).resolve()
-                        else:
-                            resolved = mount_path.resolve()
-                        # Security: verify resolved path stays within boundary
-                        if not self._is_within_boundary(resolved, mount_path):
-                            raise PathValidationError(
-                                f"Path traversal detected: {path}",
-                                path=path,
-                                reason="PATH_TRAVERSAL: Resolved path escapes user-ro mount boundary",
-                            )
-                        return resolved
-                    else:
-                        # Mount not found, treat as workspace path (will likely fail boundary check)
-                        relative_to_workspace = path_str[len("/workspace"):].lstrip("/")
-                        resolved = (self.workspace / relative_to_workspace).resolve()
-                        return resolved
-
-            elif external_part.startswith("rw/"):
-                # Read-write external mount: /workspace/external/rw/* -> /mounts/rw/*
-                relative = external_part[3:]  # Remove "rw/"
-
-                if self.external_rw:
-                    # Base path exists (Docker mode) - use it
-                    resolved = (self.external_rw / relative).resolve()
-                    # Security: verify resolved path stays within boundary
-                    if not self._is_within_boundary(resolved, self.external_rw):
-                        raise PathValidationError(
-                            f"Path traversal detected: {path}",
-                            path=path,
-                            reason="PATH_TRAVERSAL: Resolved path escapes external rw mount boundary",
-                        )
-                    return resolved
-                else:
-                    # No base path - try to find mount in user_mounts_rw (non-Docker mode)
-                    if "/" in relative:
-                        mount_name, mount_relative = relative.split("/", 1)
-                    else:
-                        mount_name = relative
-                        mount_relative = ""
-
-                    if mount_name in self.user_mounts_rw:
-                        mount_path = self.user_mounts_rw[mount_name]
-                        if mount_relative:
-                            resolved = (mount_path / mount_relative).resolve()
-                        else:
-                            resolved = mount_path.resolve()
-                        # Security: verify resolved path stays within boundary
-                        if not self._is_within_boundary(resolved, mount_path):
-                            raise PathValidationError(
-                                f"Path traversal detected: {path}",
-                                path=path,
-                                reason="PATH_TRAVERSAL: Resolved path escapes user-rw mount boundary",
-                            )
-                        return resolved
-                    else:
-                        # Mount not found, treat as workspace path
-                        relative_to_workspace = path_str[len("/workspace"):].lstrip("/")
-                        resolved = (self.workspace / relative_to_workspace).resolve()
-                        return resolved
-
-            elif external_part.startswith("persistent/"):
-                # Persistent storage: /workspace/external/persistent/* -> /users/{username}/ag3ntum/persistent/*
-                if self.persistent:
-                    relative = external_part[11:]  # Remove "persistent/"
-                    resolved = (self.persistent / relative).resolve()
-                    # Security: verify resolved path stays within boundary
-                    if not self._is_within_boundary(resolved, self.persistent):
-                        raise PathValidationError(
-                            f"Path traversal detected: {path}",
-                            path=path,
-                            reason="PATH_TRAVERSAL: Resolved path escapes persistent storage boundary",
-                        )
-                    return resolved
-                else:
-                    # Persistent not configured, treat as workspace path
-                    relative_to_workspace = path_str[len("/workspace"):].lstrip("/")
-                    resolved = (self.workspace / relative_to_workspace).resolve()
-                    return resolved
-
-            elif external_part.startswith("user-ro/"):
-                # Per-user read-only mount: /workspace/external/user-ro/{name}/* -> real path/*
-                remaining = external_part[8:]  # Remove "user-ro/"
-                # Extract mount name (first path component)
-                if "/" in remaining:
-                    mount_name, relative = remaining.split("/", 1)
-                else:
-                    mount_name = remaining
-                    relative = ""
-
-                if mount_name in self.user_mounts_ro:
-                    mount_path = self.user_mounts_ro[mount_name]
-                    if relative:
-                        resolved = (mount_path / relative).resolve()
-                    else:
-                        resolved = mount_path.resolve()
-                    # Security: verify resolved path stays within boundary
-                    if not self._is_within_boundary(resolved, mount_path):
-                        raise PathValidationError(
-                            f"Path traversal detected: {path}",
-                            path=path,
-                            reason="PATH_TRAVERSAL: Resolved path escapes user-ro mount boundary",
-                        )
-                    return resolved
-                else:
-                    # Mount not configured, treat as workspace path
-                    relative_to_workspace = path_str[len("/workspace"):].lstrip("/")
-                    resolved = (self.workspace / relative_to_workspace).resolve()
-                    return resolved
-
-            elif external_part.startswith("user-rw/"):
-                # Per-user read-write mount: /workspace/external/user-rw/{name}/* -> real path/*
-                remaining = external_part[8:]  # Remove "user-rw/"
-                # Extract mount name (first path component)
-                if "/" in remaining:
-                    mount_name, relative = remaining.split("/", 1)
-                else:
-                    mount_name = remaining
-                    relative = ""
-
-                if mount_name in self.user_mounts_rw:
-                    mount_path = self.user_mounts_rw[mount_name]
-                    if relative:
-                        resolved = (mount_path / relative).resolve()
-                    else:
-                        resolved = mount_path.resolve()
-                    # Security: verify resolved path stays within boundary
-                    if not self._is_within_boundary(resolved, mount_path):
-                        raise PathValidationError(
-                            f"Path traversal detected: {path}",
-                            path=path,
-                            reason="PATH_TRAVERSAL: Resolved path escapes user-rw mount boundary",
-                        )
-                    return resolved
-                else:
-                    # Mount not configured, treat as workspace path
-                    relative_to_workspace = path_str[len("/workspace"):].lstrip("/")
-                    resolved = (self.workspace / relative_to_workspace).resolve()
-                    return resolved
-
-            # Unrecognized external path - fall through to workspace handling
-
-        # Handle standard workspace paths
         if path_str.startswith("/workspace"):
-            # Agent provided bwrap-style path: /workspace/foo -> workspace/foo
-            relative_to_workspace = path_str[len("/workspace"):].lstrip("/")
-            resolved = (self.workspace / relative_to_workspace).resolve()
-            # Security: verify resolved path stays within workspace boundary
-            if not self._is_within_boundary(resolved, self.workspace):
+            # Agent provided bwrap-style path: /workspace/foo -> workspace/foo,
+            # /workspace/external/... -> the mount's real path
+            route, relative = self._find_route(path_str)
+            resolved = (route.base / relative).resolve()
+            # Security: verify resolved path stays within the mount boundary
+            if route.boundary is not None and not resolved.is_relative_to(route.boundary):
                 raise PathValidationError(
                     f"Path traversal detected: {path}",
                     path=path,
-                    reason="PATH_TRAVERSAL: Resolved path escapes workspace boundary",
+                    reason=f"PATH_TRAVERSAL: Resolved path escapes {route.label} boundary",
                 )
         elif not p.is_absolute():
             # Relative path: ./foo or foo -> workspace/foo
@@ -862,6 +725,71 @@ class Ag3ntumPathValidator:
 
         return resolved
 
+    def _find_route(self, path_str: str) -> tuple[_Route, str]:
+        """
+        Most specific route for a path starting with "/workspace".
+
+        Returns:
+            (route, path relative to route.base)
+        """
+        parts = path_components(path_str)
+        best: Optional[_Route] = None
+        for depth, route in self._routes.matches(path_str):
+            if route.needs_remainder and depth == len(parts):
+                continue
+            best = route  # matches are ordered shortest prefix first
+        if best is None:
+            # e.g. "/workspacefoo" - string prefix of /workspace, kept as before
+            relative = path_str[len("/workspace"):].lstrip("/")
+            return _Route(self.workspace, 0, self.workspace, "workspace"), relative
+        return best, "/".join(parts[best.strip:])
+
+    def _resolve_cached(self, path: str) -> Path:
+        """_normalize_path() with a short-lived cache of successful results."""
+        if self._cache_suspended:
+            return self._normalize_path(path)
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._resolved_cache.get(path)
+            if entry is not None and entry[0] > now:
+                self._resolved_cache.move_to_end(path)
+                return entry[1]
+            generation = self._cache_generation
+        resolved = self._normalize_path(path)
+        with self._cache_lock:
+            # Not stored if the cache was invalidated while resolving
+            if generation == self._cache_generation and not self._cache_suspended:
+                self._resolved_cache[path] = (now + RESOLUTION_CACHE_TTL_SECONDS, resolved)
+                self._resolved_cache.move_to_end(path)
+                if len(self._resolved_cache) > RESOLUTION_CACHE_SIZE:
+                    self._resolved_cache.popitem(last=False)
+        return resolved
+
+    def invalidate_cache(self) -> None:
+        """Drop cached path resolutions (e.g. after symlinks were created)."""
+        with self._cache_lock:
+            self._resolved_cache.clear()
+            self._cache_generation += 1
+
+    def suspend_cache(self) -> None:
+        """
+        Bypass the resolution cache until resume_cache().
+
+        Used while a command that can create or re-point symlinks in the
+        workspace is running. Calls nest.
+        """
+        with self._cache_lock:
+            self._cache_suspended += 1
+            self._resolved_cache.clear()
+            self._cache_generation += 1
+
+    def resume_cache(self) -> None:
+        """End a suspend_cache() period; entries from before it are gone."""
+        with self._cache_lock:
+            self._cache_suspended = max(0, self._cache_suspended - 1)
+            self._resolved_cache.clear()
+            self._cache_generation += 1
+
     def validate_no_symlink_escape(
         self, path: Path, boundary: Path, check_intermediate: bool = True
     ) -> Path:
@@ -899,7 +827,12 @@ class Ag3ntumPathValidator:
             current = Path("/")
             for part in path.parts[1:]:  # Skip root
                 current = current / part
-                if current.exists() and current.is_symlink():
+                # One lstat per component; exists() only for symlinks
+                try:
+                    is_link = stat.S_ISLNK(os.lstat(current).st_mode)
+                except OSError:
+                    continue
+                if is_link and current.exists():
                     try:
                         link_target = current.resolve()
                         link_target.relative_to(boundary)
@@ -929,6 +862,27 @@ class Ag3ntumPathValidator:
 
         return resolved
 
+    def is_link_target_allowed(self, path: str) -> bool:
+        """
+        Whether a symlink found while walking a directory may be followed.
+
+        Used as the follow_symlink predicate of file_search.walk_entries():
+        the link's fully resolved target must pass validate_path() (workspace,
+        skills or mount directories, blocklist), so a link such as
+        "escape -> /etc" created from Bash is listed but never walked.
+
+        Args:
+            path: Real path of the symlink
+
+        Returns:
+            True if the target is inside an allowed directory
+        """
+        try:
+            self.validate_path(os.path.realpath(path), operation="read", allow_directory=True)
+        except PathValidationError:
+            return False
+        return True
+
     def _log_allowed(self, original: str, normalized: Path, operation: str) -> None:
         """Log allowed path access."""
         if self.config.log_all_access:
@@ -992,6 +946,9 @@ class Ag3ntumPathValidator:
 # Session-scoped validators (NOT singleton - each session has its own)
 _session_validators: dict[str, Ag3ntumPathValidator] = {}
 
+# Sessions whose resolution cache is bypassed (see disable_path_cache())
+_cache_disabled_sessions: set[str] = set()
+
 
 def get_path_validator(session_id: str) -> Ag3ntumPathValidator:
     """
@@ -1081,6 +1038,8 @@ def configure_path_validator(
         readonly_prefixes=readonly_prefixes or DEFAULT_READONLY_PREFIXES.copy(),
     )
     validator = Ag3ntumPathValidator(config)
+    if session_id in _cache_disabled_sessions:
+        validator.suspend_cache()
     _session_validators[session_id] = validator
 
     # Also configure SandboxPathResolver for this session
@@ -1127,6 +1086,79 @@ def cleanup_path_validator(session_id: str) -> None:
     cleanup_sandbox_path_resolver(session_id)
 
 
+def invalidate_path_cache(session_id: str) -> None:
+    """
+    Drop a session's cached path resolutions.
+
+    Call after creating or changing symlinks inside the session workspace.
+    No-op if no validator is configured for the session.
+
+    Args:
+        session_id: The session ID
+    """
+    validator = _session_validators.get(session_id)
+    if validator is not None:
+        validator.invalidate_cache()
+
+
+def suspend_path_cache(session_id: str) -> None:
+    """
+    Bypass a session's path resolution cache until resume_path_cache().
+
+    Ag3ntumBash calls this around each command, since commands can create
+    symlinks in the workspace while other tools validate paths.
+
+    Args:
+        session_id: The session ID
+    """
+    validator = _session_validators.get(session_id)
+    if validator is not None:
+        validator.suspend_cache()
+
+
+def resume_path_cache(session_id: str) -> None:
+    """
+    Re-enable a session's path resolution cache, starting empty.
+
+    Args:
+        session_id: The session ID
+    """
+    validator = _session_validators.get(session_id)
+    if validator is not None:
+        validator.resume_cache()
+
+
+def disable_path_cache(session_id: str) -> None:
+    """
+    Bypass a session's path resolution cache until enable_path_cache().
+
+    Used while the session has a persistent shell: background jobs started
+    in it keep running between commands and can re-point workspace
+    symlinks at any time. A validator configured for the session in the
+    meantime starts with its cache bypassed too. Repeated calls are no-ops.
+
+    Args:
+        session_id: The session ID
+    """
+    if session_id in _cache_disabled_sessions:
+        return
+    _cache_disabled_sessions.add(session_id)
+    suspend_path_cache(session_id)
+
+
+def enable_path_cache(session_id: str) -> None:
+    """
+    End a disable_path_cache() period for a session.
+
+    Args:
+        session_id: The session ID
+    """
+    if session_id not in _cache_disabled_sessions:
+        return
+    _cache_disabled_sessions.discard(session_id)
+    resume_path_cache(session_id)
+
+
 def has_path_validator(session_id: str) -> bool:
     """
     Check if a path validator is configured for a session.
@@ -41,6 +41,7 @@ from pydantic import BaseModel, Field, field_validator
 
 # Import paths from central config
 from ..config import AGENT_DIR, CONFIG_DIR
+from .permission_engine import LOG_SAMPLE_EVERY, PermissionEngine, split_glob_pattern
 from .tool_utils import extract_patterns_for_tool
 
 logger = logging.getLogger(__name__)
@@ -600,6 +601,10 @@ class PermissionConfigManager:
         self._last_modified: Optional[float] = None
         # Working directory for resolving relative paths in permission matching
         self._working_directory: Optional[Path] = None
+        # Compiled deny/allow/ask patterns (see compile())
+        self._engine: Optional[PermissionEngine] = None
+        # False once an in-memory config is set (see set_config())
+        self._file_reload = True
 
     def set_working_directory(self, working_dir: Path) -> None:
         """
@@ -681,7 +686,9 @@ class PermissionConfigManager:
         Returns:
             Loaded PermissionConfig.
         """
-        if not force and self._config is not None and not self._needs_reload():
+        if not force and self._config is not None and (
+            not self._file_reload or not self._needs_reload()
+        ):
             return self._config
 
         config_file = self._find_config_file()
@@ -709,6 +716,20 @@ class PermissionConfigManager:
 
         return self._config
 
+    def set_config(self, config: PermissionConfig) -> None:
+        """
+        Use an in-memory configuration instead of a config file.
+
+        The config files are no longer checked for changes on every load(),
+        which keeps them off the per-tool-call permission check path.
+
+        Args:
+            config: Configuration to use.
+        """
+        self._config = config
+        self._config_path = None
+        self._file_reload = False
+
     def reload(self) -> PermissionConfig:
         """Force reload configuration from file."""
         return self.load(force=True)
@@ -771,33 +792,25 @@ class PermissionConfigManager:
         Returns:
             True if allowed, False if denied.
         """
-        config = self.load()
-
-        # Log the tool call being checked
-        logger.info(f"PERMISSION_CHECK: Checking tool_call='{tool_call}'")
-
-        # SECURITY: Check deny rules FIRST - explicit denies always win
-        # This prevents broad allow patterns like Bash(*) from defeating
-        # specific deny patterns like Bash(ps *) or Bash(kill *)
-        for pattern in config.permissions.deny:
-            if self._matches_pattern(tool_call, pattern):
-                logger.info(f"PERMISSION_CHECK: Tool '{tool_call}' DENIED by pattern '{pattern}'")
-                return False
-
-        # Check allow rules - if not denied, check if explicitly allowed
-        for pattern in config.permissions.allow:
-            if self._matches_pattern(tool_call, pattern):
-                logger.info(f"PERMISSION_CHECK: Tool '{tool_call}' ALLOWED by pattern '{pattern}'")
-                return True
-
-        # Default behavior based on mode
-        if config.defaultMode == PermissionMode.BYPASS:
-            logger.info(f"PERMISSION_CHECK: Tool '{tool_call}' ALLOWED (bypass mode)")
+        engine = self.compile()
+        decision, cached = engine.decide(tool_call)
+
+        # Log volume is sampled: repeated decisions served from the cache are
+        # logged at DEBUG, with a periodic INFO summary; denials always at INFO
+        if decision.allowed and cached:
+            logger.debug(f"PERMISSION_CHECK: Tool '{tool_call}' ALLOWED (cached)")
+            if engine.hits % LOG_SAMPLE_EVERY == 0:
+                logger.info(
+                    f"PERMISSION_CHECK: {engine.hits} cached decisions served, "
+                    f"{engine.misses} evaluated"
+                )
             return True
 
-        # Default to denied for security
-        logger.info(f"PERMISSION_CHECK: Tool '{tool_call}' DENIED (no matching allow rule, default deny)")
-        return False
+        detail = f"by pattern '{decision.pattern}'" if decision.pattern else f"({decision.reason})"
+        verdict = "ALLOWED" if decision.allowed else "DENIED"
+        suffix = " [cached]" if cached else ""
+        logger.info(f"PERMISSION_CHECK: Tool '{tool_call}' {verdict} {detail}{suffix}")
+        return decision.allowed
 
     def needs_confirmation(self, tool_call: str) -> bool:
         """
@@ -809,13 +822,34 @@ class PermissionConfigManager:
         Returns:
             True if confirmation needed.
         """
-        config = self.load()
+        return self.compile().needs_confirmation(tool_call)
 
-        for pattern in config.permissions.ask:
-            if self._matches_pattern(tool_call, pattern):
-                return True
+    def compile(self) -> PermissionEngine:
+        """
+        Get the compiled matcher for the current config and working directory.
 
-        return False
+        Recompiled only when the loaded config, its patterns or the working
+        directory change; PermissionManager.activate() calls this so the
+        first tool call of a session does not pay for compilation.
+
+        Returns:
+            PermissionEngine for the active rules.
+        """
+        config = self.load()
+        rules = config.permissions
+        resolve_base = self._working_directory or AGENT_DIR
+        bypass = config.defaultMode == PermissionMode.BYPASS
+        engine = self._engine
+        if engine is None or not engine.matches_source(
+            rules.deny, rules.allow, rules.ask, bypass, resolve_base
+        ):
+            engine = PermissionEngine(rules.deny, rules.allow, rules.ask, bypass, resolve_base)
+            self._engine = engine
+            logger.info(
+                f"PERMISSION_SETUP: Compiled {len(rules.deny)} deny, {len(rules.allow)} allow, "
+                f"{len(rules.ask)} ask patterns for {resolve_base}"
+            )
+        return engine
 
     def _matches_pattern(self, tool_call: str, pattern: str) -> bool:
         """
@@ -1081,47 +1115,7 @@ class PermissionConfigManager:
         Returns:
             Tuple of (directory_path, file_glob or None).
         """
-        # Check if pattern ends with a file glob (e.g., *.py, *.txt)
-        # Look for patterns like **/*.py or *.py at the end
-        parts = pattern.split("/")
-
-        # Check the last part for file glob
-        last_part = parts[-1] if parts else ""
-
-        # If last part is a file glob (starts with * and has extension)
-        # Examples: *.py, *.txt, *.json
-        if last_part.startswith("*") and "." in last_part and last_part != "**":
-            file_glob = last_part
-            # Remove the file glob from the path
-            remaining_parts = parts[:-1]
-
-            # Also remove trailing ** if present
-            if remaining_parts and remaining_parts[-1] == "**":
-                remaining_parts = remaining_parts[:-1]
-
-            # Handle absolute paths like /**/*.py -> remaining_parts = ['']
-            # Should return "/" not "" to preserve absolute path indicator
-            if remaining_parts == [""]:
-                dir_pattern = "/"
-            else:
-                dir_pattern = "/".join(remaining_parts) if remaining_parts else "."
-            return dir_pattern, file_glob
-
-        # If last part is just **, it matches everything under the directory
-        if last_part == "**":
-            remaining_parts = parts[:-1]
-            # Handle absolute paths like /** -> remaining_parts = ['']
-            # Should return "/" not "" to preserve absolute path indicator
-            if remaining_parts == [""]:
-                dir_pattern = "/"
-            else:
-                dir_pattern = "/".join(remaining_parts) if remaining_parts else "."
-            return dir_pattern, None
-
-        # No glob pattern - the whole thing is a directory path
-        # Strip any trailing * that might be there
-        clean_pattern = pattern.rstrip("*").rstrip("/")
-        return clean_pattern if clean_pattern else ".", None
+        return split_glob_pattern(pattern)
 
     def to_claude_settings(self) -> dict[str, Any]:
         """
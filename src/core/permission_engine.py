@@ -0,0 +1,415 @@
+"""
+Compiled permission matching for PermissionConfigManager.
+
+The uncompiled matcher walks every deny and allow pattern for each tool call,
+re-splitting globs, resolving the pattern's base directory and the call's
+path (filesystem access) for every path pattern. PermissionEngine does that
+work once per configuration and working directory:
+
+- patterns are indexed by tool name (tool-name-only patterns with wildcards
+  apply to every tool), keeping their original order;
+- globs are translated to compiled regexes;
+- base directories of path patterns are resolved once;
+- a tool call's own path is resolved once, not once per pattern;
+- decisions are kept in an LRU keyed by the normalized call. For path tools
+  the key holds the resolved path, so a symlink created after a decision
+  cannot reuse it for a different target.
+
+Matching semantics are those of PermissionConfigManager._matches_pattern.
+"""
+import fnmatch
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tools whose argument is a file path (matched with path semantics)
+PATH_TOOLS = ("Read", "Write", "Edit", "MultiEdit", "Glob", "Grep")
+
+# Bash commands containing these never match a Bash pattern
+COMPOUND_OPERATORS = (" && ", " || ", " ; ", " | ", "$(", "`")
+
+VERDICT_CACHE_SIZE = 4096
+# Calls longer than this (e.g. large Bash heredocs) are not cached
+MAX_CACHED_CALL_LENGTH = 4096
+# Cached decisions are logged at INFO once per this many cache hits
+LOG_SAMPLE_EVERY = 100
+
+
+def split_glob_pattern(pattern: str) -> tuple[str, Optional[str]]:
+    """
+    Split a glob pattern into directory portion and file glob.
+
+    Examples:
+        "./skills/**/*.py" -> ("./skills", "*.py")
+        "./skills/**" -> ("./skills", None)
+        "./src/*.txt" -> ("./src", "*.txt")
+        "./data" -> ("./data", None)
+
+    Args:
+        pattern: The glob pattern to split.
+
+    Returns:
+        Tuple of (directory_path, file_glob or None).
+    """
+    # Check if pattern ends with a file glob (e.g., *.py, *.txt)
+    # Look for patterns like **/*.py or *.py at the end
+    parts = pattern.split("/")
+
+    # Check the last part for file glob
+    last_part = parts[-1] if parts else ""
+
+    # If last part is a file glob (starts with * and has extension)
+    # Examples: *.py, *.txt, *.json
+    if last_part.startswith("*") and "." in last_part and last_part != "**":
+        file_glob = last_part
+        # Remove the file glob from the path
+        remaining_parts = parts[:-1]
+
+        # Also remove trailing ** if present
+        if remaining_parts and remaining_parts[-1] == "**":
+            remaining_parts = remaining_parts[:-1]
+
+        # Handle absolute paths like /**/*.py -> remaining_parts = ['']
+        # Should return "/" not "" to preserve absolute path indicator
+        if remaining_parts == [""]:
+            dir_pattern = "/"
+        else:
+            dir_pattern = "/".join(remaining_parts) if remaining_parts else "."
+        return dir_pattern, file_glob
+
+    # If last part is just **, it matches everything under the directory
+    if last_part == "**":
+        remaining_parts = parts[:-1]
+        # Handle absolute paths like /** -> remaining_parts = ['']
+        # Should return "/" not "" to preserve absolute path indicator
+        if remaining_parts == [""]:
+            dir_pattern = "/"
+        else:
+            dir_pattern = "/".join(remaining_parts) if remaining_parts else "."
+        return dir_pattern, None
+
+    # No glob pattern - the whole thing is a directory path
+    # Strip any trailing * that might be there
+    clean_pattern = pattern.rstrip("*").rstrip("/")
+    return clean_pattern if clean_pattern else ".", None
+
+
+def _glob(pattern: str) -> Callable[[str], Optional[re.Match]]:
+    """Compiled equivalent of fnmatch.fnmatch(name, pattern) on POSIX."""
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+@dataclass(frozen=True)
+class _ResolvedPath:
+    """A call's path resolved against the working directory."""
+    path: Path
+    in_workspace: bool
+
+
+class _PathMatcher:
+    """A compiled path pattern (the argument of e.g. Read(./src/**))."""
+
+    def __init__(self, pattern: str, resolve_base: Path) -> None:
+        self.match_all = pattern in ("**", "*")
+        self.absolute = False
+        self.base: Optional[Path] = None
+        self.file_glob = None
+        if self.match_all:
+            return
+        dir_pattern, file_glob = split_glob_pattern(pattern)
+        if dir_pattern.startswith("/"):
+            # Absolute patterns only match files outside the workspace
+            self.absolute = True
+            base_dir = Path(dir_pattern)
+        elif dir_pattern.startswith("./"):
+            base_dir = resolve_base / dir_pattern[2:]
+        else:
+            base_dir = resolve_base / dir_pattern
+        # Resolved once at compile time: a base directory later replaced by a
+        # symlink keeps naming the directory it was when the rules were compiled
+        self.base = base_dir.resolve()
+        if file_glob:
+            self.file_glob = _glob(file_glob)
+
+    def matches(self, resolved: _ResolvedPath) -> bool:
+        if self.match_all:
+            return True
+        if self.absolute and resolved.in_workspace:
+            return False
+        if not resolved.path.is_relative_to(self.base):
+            return False
+        if self.file_glob is not None:
+            return self.file_glob(resolved.path.name) is not None
+        return True
+
+
+class _Call:
+    """One tool call split into name and argument, with lazily resolved paths."""
+
+    __slots__ = ("text", "tool_name", "arg", "_engine", "_resolved", "_bash_parts", "_compound")
+
+    def __init__(self, text: str, engine: "PermissionEngine") -> None:
+        self.text = text
+        self.tool_name = text.split("(")[0]
+        self.arg = text[len(self.tool_name) + 1:-1]
+        self._engine = engine
+        self._resolved: dict[str, _ResolvedPath] = {}
+        self._bash_parts: Optional[list[str]] = None
+        self._compound: Optional[bool] = None
+
+    def resolve(self, file_path: str) -> _ResolvedPath:
+        resolved = self._resolved.get(file_path)
+        if resolved is None:
+            resolved = self._engine.resolve_path(file_path)
+            self._resolved[file_path] = resolved
+        return resolved
+
+    @property
+    def bash_parts(self) -> list[str]:
+        if self._bash_parts is None:
+            self._bash_parts = self.arg.split()
+        return self._bash_parts
+
+    @property
+    def compound(self) -> bool:
+        if self._compound is None:
+            self._compound = any(op in self.arg for op in COMPOUND_OPERATORS)
+        return self._compound
+
+
+class _Rule:
+    """One compiled permission pattern."""
+
+    def __init__(self, position: int, pattern: str, resolve_base: Path) -> None:
+        self.position = position
+        self.pattern = pattern
+        self.tool_name: Optional[str] = None  # None: tool-name-only pattern
+        self.name_glob = None
+        self.path: Optional[_PathMatcher] = None
+        self.arg_glob = None
+        self.bash_executable = None
+        self.bash_pattern_words = 0
+        self.bash_path_word: Optional[str] = None
+
+        if "(" not in pattern:
+            self.name_glob = _glob(pattern)
+            return
+
+        self.tool_name = pattern.split("(")[0]
+        arg = pattern[len(self.tool_name) + 1:-1]
+        if self.tool_name in PATH_TOOLS:
+            self.path = _PathMatcher(arg, resolve_base)
+        elif self.tool_name == "Bash":
+            words = arg.split()
+            self.bash_pattern_words = len(words)
+            if words:
+                self.bash_executable = _glob(words[0])
+            if len(words) > 1 and ("./" in words[1] or "/" in words[1] or "**" in words[1]):
+                self.bash_path_word = words[1]
+                self.path = _PathMatcher(words[1], resolve_base)
+            self.arg_glob = _glob(arg.replace(":*", "*").replace("**", "*"))
+        else:
+            self.arg_glob = _glob(arg.replace(":*", "*").replace("**", "*"))
+
+    @property
+    def exact_name(self) -> Optional[str]:
+        """Tool name this rule is limited to, if any."""
+        if self.tool_name is not None:
+            return self.tool_name
+        if not any(c in self.pattern for c in "*?["):
+            return self.pattern
+        return None
+
+    @property
+    def needs_resolution(self) -> bool:
+        return self.path is not None and not self.path.match_all
+
+    def matches(self, call: _Call) -> bool:
+        if self.name_glob is not None:
+            return self.name_glob(call.tool_name) is not None
+        if call.tool_name != self.tool_name:
+            return False
+        if self.tool_name in PATH_TOOLS:
+            if self.path.match_all:
+                return True
+            return self.path.matches(call.resolve(call.arg))
+        if self.tool_name == "Bash":
+            return self._matches_bash(call)
+        return self.arg_glob(call.arg) is not None
+
+    def _matches_bash(self, call: _Call) -> bool:
+        if call.compound:
+            return False
+        words = call.bash_parts
+        if not words or not self.bash_pattern_words:
+            return False
+        if self.bash_executable(words[0]) is None:
+            return False
+        if self.path is not None and len(words) > 1:
+            return self.path.matches(call.resolve(words[1]))
+        if self.bash_pattern_words == 1:
+            return True
+        return self.arg_glob(call.arg) is not None
+
+
+@dataclass(frozen=True)
+class PermissionDecision:
+    """Outcome of a permission check."""
+    allowed: bool
+    pattern: Optional[str]
+    reason: str
+
+
+class PermissionEngine:
+    """Deny/allow/ask patterns compiled for one configuration and working directory."""
+
+    def __init__(
+        self,
+        deny: list[str],
+        allow: list[str],
+        ask: list[str],
+        bypass: bool,
+        resolve_base: Path,
+    ) -> None:
+        self.source = (tuple(deny), tuple(allow), tuple(ask), bypass, resolve_base)
+        self._resolve_base = resolve_base
+        self._resolved_base = resolve_base.resolve()
+        self._bypass = bypass
+        self._deny = _RuleSet(deny, resolve_base)
+        self._allow = _RuleSet(allow, resolve_base)
+        self._ask = _RuleSet(ask, resolve_base)
+        self._needs_resolution_by_tool: dict[str, bool] = {}
+        self._verdicts: OrderedDict[tuple, PermissionDecision] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def matches_source(
+        self, deny: list[str], allow: list[str], ask: list[str], bypass: bool, resolve_base: Path
+    ) -> bool:
+        """True if compiled from these patterns (lists may be mutated in place)."""
+        return self.source == (tuple(deny), tuple(allow), tuple(ask), bypass, resolve_base)
+
+    def resolve_path(self, file_path: str) -> _ResolvedPath:
+        """Resolve a call's path and tell whether it is inside the working directory."""
+        if not file_path.startswith("/"):
+            file_path = str(self._resolve_base / file_path)
+        path = Path(file_path).resolve()
+        return _ResolvedPath(path, path.is_relative_to(self._resolved_base))
+
+    def decide(self, tool_call: str) -> tuple[PermissionDecision, bool]:
+        """
+        Decide a tool call: deny patterns first, then allow, then the default.
+
+        Returns:
+            (decision, cached) - cached is True when served from the LRU.
+        """
+        call = _Call(tool_call, self)
+        key = self._cache_key(call)
+        if key is not None:
+            with self._lock:
+                decision = self._verdicts.get(key)
+                if decision is not None:
+                    self._verdicts.move_to_end(key)
+                    self.hits += 1
+                    return decision, True
+
+        decision = self._evaluate(call)
+        if key is not None:
+            with self._lock:
+                self.misses += 1
+                self._verdicts[key] = decision
+                if len(self._verdicts) > VERDICT_CACHE_SIZE:
+                    self._verdicts.popitem(last=False)
+        return decision, False
+
+    def needs_confirmation(self, tool_call: str) -> bool:
+        """True if any ask pattern matches."""
+        return self._ask.first_match(_Call(tool_call, self)) is not None
+
+    def _evaluate(self, call: _Call) -> PermissionDecision:
+        # SECURITY: deny rules first - explicit denies always win
+        pattern = self._deny.first_match(call)
+        if pattern is not None:
+            return PermissionDecision(False, pattern, "denied")
+        pattern = self._allow.first_match(call)
+        if pattern is not None:
+            return PermissionDecision(True, pattern, "allowed")
+        if self._bypass:
+            return PermissionDecision(True, None, "bypass mode")
+        return PermissionDecision(False, None, "no matching allow rule, default deny")
+
+    def _cache_key(self, call: _Call) -> Optional[tuple]:
+        """
+        Everything the decision depends on, or None if it should not be cached.
+
+        Path tools: the resolved path (not the raw argument), so a symlink
+        created after a decision cannot reuse it for a different target.
+        Bash: the command, plus the resolved script path when a Bash path
+        pattern could consult it.
+        """
+        if len(call.text) > MAX_CACHED_CALL_LENGTH:
+            return None
+        name = call.tool_name
+        if name in PATH_TOOLS:
+            if not self._needs_resolution(name):
+                return (name,)
+            resolved = call.resolve(call.arg)
+            return (name, str(resolved.path), resolved.in_workspace)
+        if name == "Bash" and self._needs_resolution(name):
+            words = call.bash_parts
+            if not call.compound and len(words) > 1:
+                resolved = call.resolve(words[1])
+                return (call.text, str(resolved.path), resolved.in_workspace)
+        return (call.text,)
+
+    def _needs_resolution(self, tool_name: str) -> bool:
+        """True if any rule for tool_name compares the call's resolved path."""
+        needed = self._needs_resolution_by_tool.get(tool_name)
+        if needed is None:
+            needed = any(
+                rule.needs_resolution
+                for rules in (self._deny, self._allow)
+                for rule in rules.for_tool(tool_name)
+            )
+            self._needs_resolution_by_tool[tool_name] = needed
+        return needed
+
+
+class _RuleSet:
+    """Ordered rules indexed by tool name."""
+
+    def __init__(self, patterns: list[str], resolve_base: Path) -> None:
+        rules = [_Rule(i, pattern, resolve_base) for i, pattern in enumerate(patterns)]
+        self._by_name: dict[str, list[_Rule]] = {}
+        self._wildcard: list[_Rule] = []
+        for rule in rules:
+            name = rule.exact_name
+            if name is None:
+                self._wildcard.append(rule)
+            else:
+                self._by_name.setdefault(name, []).append(rule)
+        self._merged: dict[str, list[_Rule]] = {}
+
+    def for_tool(self, tool_name: str) -> list[_Rule]:
+        """Rules that can match tool_name, in pattern order."""
+        rules = self._merged.get(tool_name)
+        if rules is None:
+            rules = sorted(
+                self._by_name.get(tool_name, []) + self._wildcard,
+                key=lambda rule: rule.position,
+            )
+            self._merged[tool_name] = rules
+        return rules
+
+    def first_match(self, call: _Call) -> Optional[str]:
+        for rule in self.for_tool(call.tool_name):
+            if rule.matches(call):
+                return rule.pattern
+        return None
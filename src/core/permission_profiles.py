@@ -19,7 +19,6 @@ Usage:
 """
 import json
 import logging
-import time
 from pathlib import Path
 from typing import Any, Optional
 
@@ -43,6 +42,7 @@ from .permission_config import (
     PermissionRules,
     ToolsConfig,
 )
+from .prep_cache import get_preparation_cache
 from .sandbox import SandboxConfig
 
 from typing import TYPE_CHECKING
@@ -340,20 +340,13 @@ class PermissionManager:
             )
 
         try:
-            with path.open("r", encoding="utf-8") as f:
-                # Determine format by extension
-                suffix = path.suffix.lower()
-                if suffix in (".yaml", ".yml"):
-                    data = yaml.safe_load(f)
-                elif suffix == ".json":
-                    data = json.load(f)
-                else:
-                    # Try YAML first (more permissive parser)
-                    data = yaml.safe_load(f)
-
-            profile = PermissionProfile.model_validate(data)
+            # Parsed profiles are cached across runs and re-parsed only when
+            # the file content changes; each manager gets its own copy
+            profile = get_preparation_cache().load_file(
+                path, lambda raw: self._parse_profile(path, raw), namespace="profile"
+            )
             logger.info(f"Loaded permission profile from {path}")
-            return profile
+            return profile.model_copy(deep=True)
         except yaml.YAMLError as e:
             raise ValueError(f"Failed to parse YAML profile {path}: {e}")
         except json.JSONDecodeError as e:
@@ -361,6 +354,30 @@ class PermissionManager:
         except Exception as e:
             raise ValueError(f"Failed to load profile {path}: {e}")
 
+    @staticmethod
+    def _parse_profile(path: Path, raw: bytes) -> PermissionProfile:
+        """
+        Parse raw profile file content (YAML or JSON by extension).
+
+        Args:
+            path: Profile path (used for format detection).
+            raw: File content.
+
+        Returns:
+            Validated PermissionProfile.
+        """
+        text = raw.decode("utf-8")
+        # Determine format by extension
+        suffix = path.suffix.lower()
+        if suffix in (".yaml", ".yml"):
+            data = yaml.safe_load(text)
+        elif suffix == ".json":
+            data = json.loads(text)
+        else:
+            # Try YAML first (more permissive parser)
+            data = yaml.safe_load(text)
+        return PermissionProfile.model_validate(data)
+
     def _ensure_profile_loaded(self) -> None:
         """Ensure profile is loaded from config file."""
         if self._profile_base is None:
@@ -605,6 +622,8 @@ class PermissionManager:
             The activated profile.
         """
         self._ensure_profile_loaded()
+        # Compile the rules now rather than on the first tool call
+        self._config_manager.compile()
 
         # Log profile activation with details
         profile_name = self._active_profile.name if self._active_profile else "user"
@@ -649,11 +668,8 @@ class PermissionManager:
             permissions=perm_rules,
             tools=tools_config,
         )
-        self._config_manager._config = config
-        # Set _last_modified to prevent reload from file
-        self._config_manager._last_modified = time.time()
-        # Also clear _config_path to prevent file-based reload
-        self._config_manager._config_path = None
+        # In-memory config: no file-based reload
+        self._config_manager.set_config(config)
 
     def is_allowed(self, tool_call: str) -> bool:
         """
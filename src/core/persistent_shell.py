@@ -0,0 +1,357 @@
+"""
+Persistent shell sessions for Ag3ntumBash.
+
+By default every Bash call starts a new sandbox (sudo + timeout + bwrap +
+bash), so the working directory, exported variables and activated virtual
+environments are lost between calls, and each call pays for new namespaces.
+When enabled (tools.bash.persistent_shell), a session keeps one long-lived
+bash process instead, started through the same bwrap command line and so
+under the same isolation.
+
+Commands are sent over the shell's stdin with a simple framed protocol:
+
+    printf '%s\\n' '<token>'; { eval -- '<command>'
+    } </dev/null 2>&1; printf '\\n%s %d\\n' '<token>' "$?"
+
+The command runs in the shell itself (cd/export persist), with stdin from
+/dev/null so it cannot consume the protocol. Its output is streamed from the
+first line carrying the random per-command token until the second one, which
+also carries the exit code; the newline printed before it is not part of the
+output.
+
+Background jobs (`cmd &`) inherit the shell's output pipe. Between commands
+the pipe is drained and their output discarded, so a chatty job never blocks
+on a full pipe, and whatever they wrote before a command's start line is
+dropped rather than attributed to that command. Output they write while a
+later command runs is part of that command's output; jobs whose output
+matters should redirect it (`cmd > job.log 2>&1 &`).
+
+A command that exceeds its timeout cannot be interrupted reliably inside the
+sandbox, so the shell is killed and the next command starts a fresh one. A
+command that exits the shell (e.g. `exit`) ends it the same way. Shells are
+closed after an idle timeout, when the agent run for the session ends, and
+when the command line changes (new mounts, profile or secrets).
+
+Background jobs started in the shell keep running between commands and can
+re-point workspace symlinks at any time, so a session's path resolution
+cache stays off from its first shell until close_persistent_shell().
+"""
+import asyncio
+import logging
+import os
+import secrets
+import shlex
+import signal
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from .output_capture import CHUNK_SIZE, OutputCapture
+from .path_validator import disable_path_cache, enable_path_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_TIMEOUT_SECONDS = 600
+# Time allowed for a shell to exit after its stdin is closed
+CLOSE_GRACE_SECONDS = 2.0
+
+SHELL_COMMAND = ["bash", "--noprofile", "--norc"]
+
+
+@dataclass
+class ShellResult:
+    """Outcome of one command run in a persistent shell."""
+    exit_code: int
+    timed_out: bool = False
+    # The shell ended during the command (exit, crash or timeout kill);
+    # the next command runs in a fresh shell
+    shell_ended: bool = False
+
+
+class PersistentShell:
+    """One long-lived bash process that runs commands one at a time."""
+
+    def __init__(
+        self,
+        argv: list[str],
+        cwd: Optional[str] = None,
+        env: Optional[dict[str, str]] = None,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SECONDS,
+    ) -> None:
+        self.argv = list(argv)
+        self.cwd = cwd
+        self.env = env
+        self.idle_timeout = idle_timeout
+        self.commands_run = 0
+        self.started_at: Optional[float] = None
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
+        self._idle_handle: Optional[asyncio.TimerHandle] = None
+        self._drain_task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        """True while the shell process is running."""
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self) -> None:
+        """Start the shell process (no-op if already running)."""
+        if self.alive:
+            return
+        self._process = await asyncio.create_subprocess_exec(
+            *self.argv,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=self.cwd,
+            env=self.env,
+            # Own process group, so a kill also reaches the command's children
+            start_new_session=True,
+        )
+        self.started_at = time.monotonic()
+        self.commands_run = 0
+        logger.info(f"PERSISTENT SHELL: Started pid={self._process.pid}")
+
+    async def run(self, command: str, timeout: float, capture: OutputCapture) -> ShellResult:
+        """
+        Run one command, streaming its output (stdout and stderr) to capture.
+
+        Args:
+            command: Shell command text.
+            timeout: Seconds before the shell is killed.
+            capture: Receives the command's output.
+
+        Returns:
+            ShellResult with the command's exit code.
+        """
+        async with self._lock:
+            self._cancel_idle_timer()
+            await self._stop_drain()
+            await self.start()
+            process = self._process
+            token = secrets.token_hex(16)
+            frame = (
+                f"printf '%s\\n' '{token}'; "
+                f"{{ eval -- {shlex.quote(command)}\n"
+                f"}} </dev/null 2>&1; printf '\\n%s %d\\n' '{token}' \"$?\"\n"
+            )
+            capture.open()
+            try:
+                process.stdin.write(frame.encode("utf-8"))
+                await process.stdin.drain()
+                exit_code = await asyncio.wait_for(
+                    self._read_until(process.stdout, token.encode(), capture),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"PERSISTENT SHELL: Command timed out after {timeout}s, killing shell")
+                self.kill()
+                await process.wait()
+                return ShellResult(exit_code=124, timed_out=True, shell_ended=True)
+            except (BrokenPipeError, ConnectionResetError):
+                exit_code = None
+            finally:
+                capture.close()
+
+            self.commands_run += 1
+            if exit_code is None:
+                # EOF before the frame ended: the command ended the shell
+                try:
+                    returncode = await asyncio.wait_for(process.wait(), CLOSE_GRACE_SECONDS)
+                except asyncio.TimeoutError:
+                    self.kill()
+                    returncode = 1
+                logger.info(f"PERSISTENT SHELL: Shell exited during command (code {returncode})")
+                self._process = None
+                return ShellResult(exit_code=returncode, shell_ended=True)
+
+            self._schedule_idle_timer()
+            self._start_drain()
+            return ShellResult(exit_code=exit_code)
+
+    @staticmethod
+    async def _read_until(
+        stream: asyncio.StreamReader, token: bytes, capture: OutputCapture
+    ) -> Optional[int]:
+        """Stream output to capture between the frame markers; None on EOF."""
+        start = token + b"\n"
+        marker = b"\n" + token + b" "
+        buffer = bytearray()
+        # Skip background job output written before the frame started
+        while True:
+            chunk = await stream.read(CHUNK_SIZE)
+            if not chunk:
+                return None
+            buffer += chunk
+            index = buffer.find(start)
+            if index >= 0:
+                del buffer[:index + len(start)]
+                break
+            del buffer[:-(len(start) - 1)]
+        while True:
+            index = buffer.find(marker)
+            if index >= 0:
+                end = buffer.find(b"\n", index + len(marker))
+                if end >= 0:
+                    await capture.write(bytes(buffer[:index]))
+                    return int(buffer[index + len(marker):end])
+                # Exit code line not complete yet
+            else:
+                # Keep a possible partial marker for the next chunk
+                safe = len(buffer) - (len(marker) - 1)
+                if safe > 0:
+                    await capture.write(bytes(buffer[:safe]))
+                    del buffer[:safe]
+            chunk = await stream.read(CHUNK_SIZE)
+            if not chunk:
+                await capture.write(bytes(buffer))
+                return None
+            buffer += chunk
+
+    async def close(self) -> None:
+        """Stop the shell: close stdin, then kill it if it does not exit."""
+        self._cancel_idle_timer()
+        await self._stop_drain()
+        process, self._process = self._process, None
+        if process is None or process.returncode is not None:
+            return
+        try:
+            process.stdin.close()
+            await asyncio.wait_for(process.wait(), CLOSE_GRACE_SECONDS)
+        except (asyncio.TimeoutError, OSError):
+            _kill(process)
+            try:
+                await asyncio.wait_for(process.wait(), CLOSE_GRACE_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning(f"PERSISTENT SHELL: pid={process.pid} did not exit after kill")
+        logger.info(f"PERSISTENT SHELL: Closed pid={process.pid}")
+
+    def kill(self) -> None:
+        """Stop the shell immediately (usable without awaiting)."""
+        self._cancel_idle_timer()
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            self._drain_task = None
+        process, self._process = self._process, None
+        if process is not None and process.returncode is None:
+            _kill(process)
+            _reap(process)
+            logger.info(f"PERSISTENT SHELL: Killed pid={process.pid}")
+
+    def _start_drain(self) -> None:
+        """Read and discard background job output until the next command."""
+        if self.alive:
+            self._drain_task = asyncio.ensure_future(_discard(self._process.stdout))
+
+    async def _stop_drain(self) -> None:
+        task, self._drain_task = self._drain_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def _schedule_idle_timer(self) -> None:
+        if self.idle_timeout and self.idle_timeout > 0:
+            loop = asyncio.get_running_loop()
+            self._idle_handle = loop.call_later(
+                self.idle_timeout, lambda: asyncio.ensure_future(self._close_if_idle())
+            )
+
+    def _cancel_idle_timer(self) -> None:
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+    async def _close_if_idle(self) -> None:
+        if not self._lock.locked():
+            logger.info(f"PERSISTENT SHELL: Idle for {self.idle_timeout}s, closing")
+            await self.close()
+
+
+async def _discard(stream: asyncio.StreamReader) -> None:
+    """Read a stream until EOF (or cancellation), dropping the data."""
+    while await stream.read(CHUNK_SIZE):
+        pass
+
+
+def _kill(process: asyncio.subprocess.Process) -> None:
+    try:
+        process.stdin.close()
+    except Exception:
+        pass
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+
+
+# Reaper tasks for shells killed from synchronous code
+_reapers: set[asyncio.Task] = set()
+
+
+def _reap(process: asyncio.subprocess.Process) -> None:
+    """Wait for a killed process in the background, when a loop is running."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(process.wait())
+    _reapers.add(task)
+    task.add_done_callback(_reapers.discard)
+
+
+# =============================================================================
+# Per-session registry
+# =============================================================================
+
+_shells: dict[str, PersistentShell] = {}
+
+
+def get_persistent_shell(
+    session_id: str,
+    argv: list[str],
+    cwd: Optional[str] = None,
+    env: Optional[dict[str, str]] = None,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SECONDS,
+) -> PersistentShell:
+    """
+    Get the session's shell, replacing it if its command line changed.
+
+    The shell is started lazily by its first run(). The session's path
+    resolution cache is disabled until close_persistent_shell().
+    """
+    disable_path_cache(session_id)
+    shell = _shells.get(session_id)
+    if shell is not None and (shell.argv != argv or shell.cwd != cwd or shell.env != env):
+        logger.info(f"PERSISTENT SHELL: Command line changed for session {session_id}, restarting")
+        shell.kill()
+        shell = None
+    if shell is None:
+        shell = PersistentShell(argv, cwd=cwd, env=env, idle_timeout=idle_timeout)
+        _shells[session_id] = shell
+    return shell
+
+
+def close_persistent_shell(session_id: str) -> bool:
+    """
+    Stop and forget a session's shell; re-enables its path cache.
+
+    Returns:
+        True if the session had a shell.
+    """
+    enable_path_cache(session_id)
+    shell = _shells.pop(session_id, None)
+    if shell is None:
+        return False
+    shell.kill()
+    return True
+
+
+def default_shell_env() -> dict[str, str]:
+    """Environment for an unsandboxed shell (matches one-off Bash commands)."""
+    return {**os.environ, "TERM": "dumb"}
@@ -0,0 +1,410 @@
+"""
+Cache for agent run preparation artifacts.
+
+Every run used to re-read and re-parse the same inputs before the first
+SDK message: the permission profile YAML, the external mounts manifest, the
+role file, every skill's SKILL.md frontmatter, and the system.j2 template
+tree. PreparationCache keeps the parsed results in memory and validates
+them cheaply on each access:
+
+1. stat() the file: unchanged (mtime_ns, size, inode) means a cache hit.
+2. If the stat changed, read the bytes and compare a SHA-256 content hash:
+   a touched-but-identical file is still a hit and is not re-parsed.
+3. Otherwise parse again and replace the entry.
+
+Rendered templates are keyed by a digest of the render context plus the
+signatures of the template and everything it includes, so editing any
+module under prompts/ invalidates the rendered prompt. Per-session values
+(session ID, date, workspace path) can be passed as substitutions: they
+are rendered as placeholders and spliced into the cached text afterwards,
+so every session with the same profile shares one render.
+
+Lookups that depend on a directory tree (e.g. a skill's script file) use
+memoize_tree(): the tree is walked on a miss, and a hit only stats the
+directories seen by that walk.
+
+Cached values are shared between runs and must be treated as read-only;
+callers that hand out mutable objects copy them first.
+
+Usage:
+    cache = get_preparation_cache()
+    manifest = cache.load_file(path, lambda raw: yaml.safe_load(raw) or {})
+    prompt = cache.render_template(
+        jinja_env, "system.j2", context, substitutions={"session_id": session_id}
+    )
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Hashable, Mapping, Optional, TypeVar
+
+from jinja2 import Environment, meta
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# (mtime_ns, size, inode) of a file, or None if it does not exist
+FileSignature = Optional[tuple[int, int, int]]
+
+# Rendered prompts vary with profile and role; bound memory with an LRU
+MAX_RENDERED_TEMPLATES = 256
+
+# (directory, mtime_ns) of every directory in a tree
+TreeSnapshot = tuple[tuple[str, int], ...]
+
+
+def file_signature(path: Path) -> FileSignature:
+    """
+    Return a cheap change-detection signature for a file.
+
+    Args:
+        path: File to stat.
+
+    Returns:
+        (mtime_ns, size, inode), or None if the file does not exist.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _placeholder(name: str) -> str:
+    """Marker rendered in place of a substituted value."""
+    return f"\x00{name}\x00"
+
+
+def _with_placeholders(value: Any, replacements: list[tuple[str, str]]) -> Any:
+    """Copy of a render context with substituted values replaced in every string."""
+    if isinstance(value, str):
+        for real, marker in replacements:
+            value = value.replace(real, marker)
+        return value
+    if isinstance(value, dict):
+        return {k: _with_placeholders(v, replacements) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_with_placeholders(v, replacements) for v in value)
+    return value
+
+
+def snapshot_tree(root: Path) -> TreeSnapshot:
+    """
+    Record the mtime of a directory and of all its subdirectories.
+
+    Each directory is stat'ed before it is listed, so an entry added while
+    the walk runs changes a recorded mtime. Symlinked directories are not
+    followed.
+
+    Args:
+        root: Directory to walk.
+
+    Returns:
+        (directory, mtime_ns) pairs; empty if root does not exist.
+    """
+    snapshot: list[tuple[str, int]] = []
+    pending = [str(root)]
+    while pending:
+        path = pending.pop()
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            with os.scandir(path) as entries:
+                pending.extend(
+                    entry.path for entry in entries if entry.is_dir(follow_symlinks=False)
+                )
+        except OSError:
+            continue
+        snapshot.append((path, mtime_ns))
+    return tuple(snapshot)
+
+
+def tree_unchanged(snapshot: TreeSnapshot) -> bool:
+    """
+    Whether no directory in a snapshot was modified, removed or replaced.
+
+    Adding, removing or renaming an entry changes its parent directory's
+    mtime, so stat'ing the recorded directories (without listing them)
+    detects any change to the set of files and subdirectories in the tree.
+    """
+    for path, mtime_ns in snapshot:
+        try:
+            if os.stat(path).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return bool(snapshot)
+
+
+class _FileEntry:
+    """Parsed file plus the signature and digest it was parsed from."""
+
+    __slots__ = ("signature", "digest", "value")
+
+    def __init__(self, signature: FileSignature, digest: str, value: Any) -> None:
+        self.signature = signature
+        self.digest = digest
+        self.value = value
+
+
+class PreparationCache:
+    """
+    In-memory cache of parsed configuration files and rendered templates.
+
+    Thread-safe: MCP tools and API handlers may prepare runs from worker
+    threads as well as the event loop.
+    """
+
+    def __init__(self, max_rendered: int = MAX_RENDERED_TEMPLATES) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_rendered: Maximum number of rendered templates kept (LRU).
+        """
+        self._files: dict[tuple[str, Hashable], _FileEntry] = {}
+        self._memo: dict[Hashable, tuple[Any, Any]] = {}
+        self._rendered: OrderedDict[tuple, str] = OrderedDict()
+        self._max_rendered = max_rendered
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load_file(
+        self,
+        path: Path,
+        parser: Callable[[bytes], T],
+        namespace: Hashable = None,
+    ) -> T:
+        """
+        Return the parsed contents of a file, re-parsing only on change.
+
+        Args:
+            path: File to load.
+            parser: Converts the raw bytes into the cached value. Exceptions
+                propagate and nothing is cached.
+            namespace: Distinguishes different parsers of the same file.
+
+        Returns:
+            The parsed value (shared; do not mutate).
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        key = (str(path), namespace)
+        signature = file_signature(path)
+        if signature is None:
+            with self._lock:
+                self._files.pop(key, None)
+            raise FileNotFoundError(str(path))
+
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is not None and entry.signature == signature:
+                self.hits += 1
+                return entry.value
+
+        raw = Path(path).read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is not None and entry.digest == digest:
+                # Touched but unchanged: keep the parsed value
+                entry.signature = signature
+                self.hits += 1
+                return entry.value
+
+        value = parser(raw)
+        with self._lock:
+            self._files[key] = _FileEntry(signature, digest, value)
+            self.misses += 1
+        logger.debug(f"PREP CACHE: Parsed {path}")
+        return value
+
+    def memoize(self, key: Hashable, signature: Hashable, compute: Callable[[], T]) -> T:
+        """
+        Return a computed value, recomputing when its signature changes.
+
+        Args:
+            key: Identity of the artifact.
+            signature: Cheap fingerprint of the artifact's inputs.
+            compute: Produces the value when the signature is new.
+
+        Returns:
+            The cached or freshly computed value.
+        """
+        with self._lock:
+            cached = self._memo.get(key)
+            if cached is not None and cached[0] == signature:
+                self.hits += 1
+                return cached[1]
+        value = compute()
+        with self._lock:
+            self._memo[key] = (signature, value)
+            self.misses += 1
+        return value
+
+    def memoize_tree(self, key: Hashable, root: Path, compute: Callable[[], T]) -> T:
+        """
+        Return a value derived from a directory tree, recomputed when it changes.
+
+        A miss walks the tree once (snapshot_tree) before computing; a hit
+        stats only the directories recorded by that walk.
+
+        Args:
+            key: Identity of the artifact.
+            root: Directory tree the value depends on.
+            compute: Produces the value from the current tree.
+
+        Returns:
+            The cached or freshly computed value.
+        """
+        with self._lock:
+            cached = self._memo.get(key)
+        if cached is not None and tree_unchanged(cached[0]):
+            with self._lock:
+                self.hits += 1
+            return cached[1]
+        snapshot = snapshot_tree(root)
+        value = compute()
+        with self._lock:
+            self._memo[key] = (snapshot, value)
+            self.misses += 1
+        return value
+
+    def template_signature(self, env: Environment, name: str) -> tuple:
+        """
+        Signature of a template and every template it includes or extends.
+
+        The include graph is parsed once per template version.
+
+        Args:
+            env: Jinja environment with a FileSystemLoader.
+            name: Template name.
+
+        Returns:
+            Tuple of (name, file signature) pairs, sorted by name.
+        """
+        signatures: dict[str, FileSignature] = {}
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            if current in signatures:
+                continue
+            path = self._template_path(env, current)
+            signature = file_signature(path) if path else None
+            signatures[current] = signature
+            if path is None or signature is None:
+                continue
+            pending.extend(self.memoize(
+                ("template-deps", id(env), current),
+                signature,
+                lambda p=path: self._referenced_templates(env, p),
+            ))
+        return tuple(sorted(signatures.items()))
+
+    def render_template(
+        self,
+        env: Environment,
+        name: str,
+        context: dict[str, Any],
+        substitutions: Optional[Mapping[str, str]] = None,
+    ) -> str:
+        """
+        Render a template, reusing the previous output for identical inputs.
+
+        Each substitution value is replaced by a placeholder wherever it
+        occurs in the context (including inside longer strings such as
+        paths), the placeholder text is rendered and cached, and the values
+        are spliced back in. Renders that differ only in these values share
+        one cache entry. Templates must output substituted values verbatim
+        (no filters that change them).
+
+        Args:
+            env: Jinja environment.
+            name: Template name.
+            context: Render context (must be JSON-serializable, or str()-able).
+            substitutions: Per-render values by name (empty values are ignored).
+
+        Returns:
+            Rendered text.
+        """
+        # Longest first: a session ID is also part of the workspace path
+        replacements = sorted(
+            ((value, _placeholder(key)) for key, value in (substitutions or {}).items() if value),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        if replacements:
+            context = _with_placeholders(context, replacements)
+
+        context_digest = hashlib.sha256(
+            json.dumps(context, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        key = (id(env), name, context_digest, self.template_signature(env, name))
+
+        with self._lock:
+            rendered = self._rendered.get(key)
+            if rendered is not None:
+                self._rendered.move_to_end(key)
+                self.hits += 1
+        if rendered is None:
+            rendered = env.get_template(name).render(**context)
+            with self._lock:
+                self._rendered[key] = rendered
+                self._rendered.move_to_end(key)
+                while len(self._rendered) > self._max_rendered:
+                    self._rendered.popitem(last=False)
+                self.misses += 1
+
+        for real, marker in replacements:
+            rendered = rendered.replace(marker, real)
+        return rendered
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and entry counts."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "files": len(self._files),
+                "memoized": len(self._memo),
+                "rendered": len(self._rendered),
+            }
+
+    def clear(self) -> None:
+        """Drop all cached artifacts."""
+        with self._lock:
+            self._files.clear()
+            self._memo.clear()
+            self._rendered.clear()
+
+    @staticmethod
+    def _template_path(env: Environment, name: str) -> Optional[Path]:
+        """Resolve a template name to a file via the environment's search path."""
+        for base in getattr(env.loader, "searchpath", []):
+            path = Path(base) / name
+            if path.is_file():
+                return path
+        return None
+
+    @staticmethod
+    def _referenced_templates(env: Environment, path: Path) -> list[str]:
+        """List templates statically included/extended/imported by a file."""
+        source = path.read_text(encoding="utf-8")
+        return [
+            ref for ref in meta.find_referenced_templates(env.parse(source))
+            if ref is not None
+        ]
+
+
+_preparation_cache = PreparationCache()
+
+
+def get_preparation_cache() -> PreparationCache:
+    """Get the process-wide preparation cache."""
+    return _preparation_cache
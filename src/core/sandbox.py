@@ -7,12 +7,15 @@ provides a Bubblewrap-based command wrapper for tool execution.
 from __future__ import annotations
 
 import logging
+import os
 import shlex
 from pathlib import Path
 from typing import Iterable, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
+from .output_capture import DEFAULT_PROGRESS_INTERVAL, OutputCapture, ProgressCallback
+
 logger = logging.getLogger(__name__)
 
 
@@ -176,7 +179,19 @@ class SandboxConfig(BaseModel):
 
 
 class SandboxExecutor:
-    """Build bubblewrap commands for sandboxed execution."""
+    """Build bubblewrap commands for sandboxed execution.
+
+    The bwrap arguments before the command (namespaces, /proc entries,
+    mounts, environment, UID/GID) only depend on the configuration, so they
+    are compiled once into a frozen template per (allow_network,
+    nested_container) and reused by every command. The template is rebuilt
+    when the configuration's fingerprint changes: a different profile,
+    mounts added or changed, different sandboxed_envs (secrets), or an
+    optional mount source that appeared or went away (e.g. the skills
+    directory created by skill sync mid-run). Required mount sources are
+    checked when the template is compiled; a source that disappears later
+    makes bwrap itself fail, so execution still fails closed.
+    """
 
     def __init__(
         self,
@@ -187,6 +202,8 @@ class SandboxExecutor:
         self._config = config
         self._linux_uid = linux_uid
         self._linux_gid = linux_gid
+        # (allow_network, nested_container) -> (config fingerprint, argv prefix)
+        self._templates: dict[tuple[bool, bool], tuple[tuple, tuple[str, ...]]] = {}
 
     @property
     def config(self) -> SandboxConfig:
@@ -214,7 +231,52 @@ class SandboxExecutor:
             allow_network: Whether to allow network access.
             nested_container: If True, use flags compatible with running
                 inside Docker (avoids pivot_root issues).
+
+        Raises:
+            SandboxMountError: If a required mount source does not exist.
         """
+        key = (allow_network, nested_container)
+        fingerprint = self._config_fingerprint()
+        cached = self._templates.get(key)
+        if cached is None or cached[0] != fingerprint:
+            if cached is not None:
+                logger.info("BWRAP: Sandbox configuration changed, recompiling command template")
+            cached = (fingerprint, self._compile_template(allow_network, nested_container))
+            self._templates[key] = cached
+        return [*cached[1], *command]
+
+    def invalidate_bwrap_template(self) -> None:
+        """Drop compiled templates; the next command recompiles them."""
+        self._templates.clear()
+
+    def _config_fingerprint(self) -> tuple:
+        """Everything the template depends on; cheap to compute (one stat per optional mount)."""
+        config = self._config
+        env = config.environment
+        mounts = [
+            *config.static_mounts.items(),
+            *config.session_mounts.items(),
+            *(("", mount) for mount in config.dynamic_mounts),
+        ]
+        return (
+            config.bwrap_path,
+            config.use_tmpfs_root,
+            config.network_sandboxing,
+            config.proc_filtering.enabled,
+            tuple(config.proc_filtering.allowed_entries),
+            tuple((name, m.source, m.target, m.mode, m.optional) for name, m in mounts),
+            # Optional sources are skipped while missing: remount them once they exist
+            tuple(os.path.exists(m.source) for _, m in mounts if m.optional),
+            env.home,
+            env.path,
+            env.clear_env,
+            tuple(env.custom_env.items()),
+            self._linux_uid,
+            self._linux_gid,
+        )
+
+    def _compile_template(self, allow_network: bool, nested_container: bool) -> tuple[str, ...]:
+        """Build the bwrap arguments up to and including "--"."""
         config = self._config
 
         # Base command - avoid flags that cause pivot_root in Docker
@@ -360,9 +422,8 @@ class SandboxExecutor:
         cmd.extend(["--chdir", config.environment.home])
 
         cmd.append("--")
-        cmd.extend(list(command))
 
-        return cmd
+        return tuple(cmd)
 
     def wrap_shell_command(self, command: str, allow_network: bool) -> str:
         """Wrap a shell command string in a bubblewrap invocation."""
@@ -484,11 +545,20 @@ def create_demote_fn(
 _create_demote_fn = create_demote_fn
 
 
+# Output kept in memory per stream by execute_sandboxed_command (head + tail);
+# anything in between is replaced by an "omitted" marker
+SANDBOX_OUTPUT_HEAD_BYTES = 512 * 1024
+SANDBOX_OUTPUT_TAIL_BYTES = 512 * 1024
+
+
 async def execute_sandboxed_command(
     executor: SandboxExecutor,
     command: str,
     allow_network: bool = False,
     timeout: int = 300,
+    output_file: Optional[Path] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
 ) -> tuple[int, str, str]:
     """
     Execute a shell command inside the bubblewrap sandbox.
@@ -496,11 +566,18 @@ async def execute_sandboxed_command(
     This is the core sandboxed execution function that wraps any command
     in bubblewrap with the configured mounts and isolation.
 
+    stdout and stderr are read as they are produced. At most
+    SANDBOX_OUTPUT_HEAD_BYTES + SANDBOX_OUTPUT_TAIL_BYTES of each are kept
+    in memory; the full stdout can be streamed to output_file.
+
     Args:
         executor: SandboxExecutor with resolved mount configuration.
         command: Shell command to execute inside the sandbox.
         allow_network: Whether to allow network access.
         timeout: Command timeout in seconds.
+        output_file: Optional file receiving the complete stdout.
+        on_progress: Optional async callback for stdout progress.
+        progress_interval: Minimum seconds between progress callbacks.
 
     Returns:
         Tuple of (exit_code, stdout, stderr).
@@ -523,6 +600,7 @@ async def execute_sandboxed_command(
     if executor.linux_uid is not None and executor.linux_gid is not None:
         logger.debug(f"Bwrap will drop privileges to UID={executor.linux_uid}, GID={executor.linux_gid}")
 
+    process = None
     try:
         process = await asyncio.create_subprocess_exec(
             *bwrap_cmd,
@@ -530,16 +608,34 @@ async def execute_sandboxed_command(
             stderr=asyncio.subprocess.PIPE,
         )
 
-        stdout_bytes, stderr_bytes = await asyncio.wait_for(
-            process.communicate(),
-            timeout=timeout,
+        stdout_capture = OutputCapture(
+            output_file,
+            head_bytes=SANDBOX_OUTPUT_HEAD_BYTES,
+            tail_bytes=SANDBOX_OUTPUT_TAIL_BYTES,
+            on_progress=on_progress,
+            progress_interval=progress_interval,
+        )
+        stderr_capture = OutputCapture(
+            head_bytes=SANDBOX_OUTPUT_HEAD_BYTES,
+            tail_bytes=SANDBOX_OUTPUT_TAIL_BYTES,
         )
 
+        async def run_to_exit() -> None:
+            await asyncio.gather(
+                stdout_capture.pump(process.stdout),
+                stderr_capture.pump(process.stderr),
+            )
+            await process.wait()
+
+        await asyncio.wait_for(run_to_exit(), timeout=timeout)
+
         exit_code = process.returncode or 0
-        stdout = stdout_bytes.decode("utf-8", errors="replace")
-        stderr = stderr_bytes.decode("utf-8", errors="replace")
+        stdout = stdout_capture.text()
+        stderr = stderr_capture.text()
 
-        logger.info(f"SANDBOX RESULT: exit={exit_code}, stdout_len={len(stdout)}")
+        logger.info(
+            f"SANDBOX RESULT: exit={exit_code}, stdout_bytes={stdout_capture.total_bytes}"
+        )
         return exit_code, stdout, stderr
 
     except asyncio.TimeoutError:
@@ -180,6 +180,56 @@ def reset_context_cache() -> None:
 # Mount Configuration
 # =============================================================================
 
+class PathPrefixTrie:
+    """
+    Absolute path prefixes mapped to values, matched by whole components.
+
+    A lookup walks the query path once, so its cost depends on the path
+    depth rather than on the number of prefixes. "/a/b" matches "/a/b" and
+    "/a/b/c" but not "/a/bc" (the same rule as Path.is_relative_to()).
+    Used for mount lookups by SandboxPathContext and by Ag3ntumPathValidator.
+    """
+
+    __slots__ = ("_root",)
+
+    def __init__(self) -> None:
+        # Node: (children by component, values stored at this prefix)
+        self._root: tuple[dict, list] = ({}, [])
+
+    def insert(self, prefix: str, value: object) -> None:
+        """Add a value for an absolute prefix (several values may share one)."""
+        node = self._root
+        for part in path_components(prefix):
+            node = node[0].setdefault(part, ({}, []))
+        node[1].append(value)
+
+    def matches(self, path: str) -> list[tuple[int, object]]:
+        """
+        All (depth, value) pairs whose prefix contains path, shortest first.
+
+        Depth is the number of components in the matched prefix; the
+        remaining components of path are the part below that prefix.
+        """
+        node = self._root
+        found = [(0, value) for value in node[1]]
+        for depth, part in enumerate(path_components(path), 1):
+            node = node[0].get(part)
+            if node is None:
+                break
+            found.extend((depth, value) for value in node[1])
+        return found
+
+
+def path_components(path: str) -> list[str]:
+    """Components of a POSIX path, without the root and empty parts."""
+    return [part for part in path.split("/") if part]
+
+
+def is_canonical_path(path: str) -> bool:
+    """True for absolute paths without empty components or a trailing slash."""
+    return path == "/" + "/".join(path_components(path))
+
+
 @dataclass
 class MountMapping:
     """
@@ -367,6 +417,34 @@ class SandboxPathContext:
         mounts.sort(key=lambda m: len(m.sandbox_path), reverse=True)
 
         self._mounts = mounts
+        self._compile_tries()
+
+    def _compile_tries(self) -> None:
+        """
+        Index the mounts by sandbox and Docker path.
+
+        Each value is (position in _mounts, mount): when several mounts
+        contain a path, the lookup returns the one the linear scan over
+        _mounts would find first. Mount paths of "/" or in non-canonical
+        form (e.g. a trailing slash from config) keep the linear scan,
+        whose string-prefix rule differs from component matching for them.
+        """
+        self._sandbox_trie = PathPrefixTrie()
+        self._docker_trie = PathPrefixTrie()
+        self._tries_exact = all(
+            is_canonical_path(path) and path != "/"
+            for mount in self._mounts
+            for path in (mount.sandbox_path, mount.docker_path)
+        )
+        for position, mount in enumerate(self._mounts):
+            self._sandbox_trie.insert(mount.sandbox_path, (position, mount))
+            self._docker_trie.insert(mount.docker_path, (position, mount))
+
+    def _lookup(self, trie: PathPrefixTrie, path: str) -> Optional[MountMapping]:
+        candidates = trie.matches(path)
+        if not candidates:
+            return None
+        return min(value for _, value in candidates)[1]
 
     @property
     def mounts(self) -> list[MountMapping]:
@@ -375,6 +453,8 @@ class SandboxPathContext:
 
     def find_mount_for_sandbox_path(self, sandbox_path: str) -> Optional[MountMapping]:
         """Find the mount mapping that matches a sandbox path (longest prefix match)."""
+        if self._tries_exact and is_canonical_path(sandbox_path):
+            return self._lookup(self._sandbox_trie, sandbox_path)
         for mount in self._mounts:
             if mount.matches_sandbox_path(sandbox_path):
                 return mount
@@ -382,6 +462,8 @@ class SandboxPathContext:
 
     def find_mount_for_docker_path(self, docker_path: str) -> Optional[MountMapping]:
         """Find the mount mapping that matches a docker path (longest prefix match)."""
+        if self._tries_exact and is_canonical_path(docker_path):
+            return self._lookup(self._docker_trie, docker_path)
         for mount in self._mounts:
             if mount.matches_docker_path(docker_path):
                 return mount
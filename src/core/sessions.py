@@ -24,6 +24,7 @@ from pathlib import Path
 from typing import Optional
 
 from .exceptions import SessionError
+from .path_validator import invalidate_path_cache
 
 logger = logging.getLogger(__name__)
 
@@ -139,7 +140,7 @@ class SessionManager:
             session_id: The session ID.
 
         Returns:
-            Path to the agent.jsonl file.
+            Path to the agent.jsonl file (see transcript.py for the format).
         """
         return self.get_session_dir(session_id) / "agent.jsonl"
 
@@ -360,6 +361,8 @@ class SessionManager:
                 f"Failed to create persistent storage symlink: {e}"
             )
 
+        # Symlinks changed: cached path resolutions may point elsewhere now
+        invalidate_path_cache(session_id)
         logger.info(f"Set up external mounts for session {session_id}")
 
     def cleanup_workspace_skills(self, session_id: str) -> None:
@@ -497,7 +500,7 @@ def ensure_secure_session_files(
     _secure_path(session_dir, 0o700, owner_uid)
 
     # Secure sensitive root files
-    for sensitive_file in ["agent.jsonl", ".claude.json"]:
+    for sensitive_file in ["agent.jsonl", "agent.jsonl.zst", ".claude.json"]:
         file_path = session_dir / sensitive_file
         if file_path.exists():
             _secure_path(file_path, 0o600, owner_uid)
@@ -27,7 +27,9 @@ Skill file format (SKILL.md):
     ...
 """
 import logging
+import os
 import re
+import shutil
 import subprocess
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -38,6 +40,7 @@ import yaml
 # Import paths from central config
 from ..config import SKILLS_DIR, USERS_DIR
 from .exceptions import SkillError
+from .prep_cache import get_preparation_cache
 from .tool_utils import build_script_command
 
 logger = logging.getLogger(__name__)
@@ -47,6 +50,60 @@ DESCRIPTION_PREVIEW_LENGTH = 50
 BODY_PREVIEW_LENGTH = 200
 
 
+# Skill catalog per skills base directory: {base: (signature, {name: path})}
+_skill_catalogs: dict[str, tuple[tuple, dict[str, Path]]] = {}
+
+
+def _stat_mtime(path: str) -> Optional[int]:
+    """Return a path's mtime_ns, or None if it does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _scan_skills_dir(base: Path) -> dict[str, Path]:
+    """
+    List the skills in one skills directory, cached by directory mtimes.
+
+    The cached catalog is revalidated by stat()ing the base directory and
+    each of its subdirectories: adding, removing or renaming a skill
+    changes the base mtime, and adding or removing a SKILL.md changes the
+    skill directory's mtime. A warm lookup therefore costs a few stat
+    calls instead of a directory listing plus one stat per skill file.
+
+    Args:
+        base: Directory containing <skill_name>/SKILL.md entries.
+
+    Returns:
+        Dict mapping skill_name -> skill directory (shared; do not mutate).
+    """
+    key = str(base)
+    cached = _skill_catalogs.get(key)
+    if cached is not None:
+        signature, skills = cached
+        if all(_stat_mtime(path) == mtime for path, mtime in signature):
+            return skills
+
+    base_mtime = _stat_mtime(key)
+    signature: list[tuple[str, Optional[int]]] = [(key, base_mtime)]
+    skills: dict[str, Path] = {}
+    if base_mtime is not None:
+        try:
+            entries = sorted(os.scandir(key), key=lambda entry: entry.name)
+        except OSError:
+            entries = []
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            signature.append((entry.path, _stat_mtime(entry.path)))
+            if os.path.isfile(os.path.join(entry.path, "SKILL.md")):
+                skills[entry.name] = Path(entry.path)
+
+    _skill_catalogs[key] = (tuple(signature), skills)
+    return skills
+
+
 def discover_merged_skills(username: str | None = None) -> dict[str, Path]:
     """
     Discover skills from global and user directories with proper merging.
@@ -55,7 +112,8 @@ def discover_merged_skills(username: str | None = None) -> dict[str, Path]:
     1. Global skills: SKILLS_DIR/.claude/skills/
     2. User skills: USERS_DIR/<username>/.claude/skills/
 
-    User skills with the same name override global skills.
+    User skills with the same name override global skills. Each directory's
+    catalog is cached and invalidated by directory mtimes.
 
     This function is used by both:
     - agent_core._setup_workspace_skills() for setting up session workspaces
@@ -67,26 +125,64 @@ def discover_merged_skills(username: str | None = None) -> dict[str, Path]:
     Returns:
         Dict mapping skill_name -> source_path, with user skills overriding global.
     """
-    skill_sources: dict[str, Path] = {}
-
     # 1. Add global skills
-    global_skills_dir = SKILLS_DIR / ".claude" / "skills"
-    if global_skills_dir.exists():
-        for skill_dir in global_skills_dir.iterdir():
-            if skill_dir.is_dir() and (skill_dir / "SKILL.md").exists():
-                skill_sources[skill_dir.name] = skill_dir
+    skill_sources = dict(_scan_skills_dir(SKILLS_DIR / ".claude" / "skills"))
 
     # 2. Add user skills (overrides global)
     if username:
-        user_skills_dir = USERS_DIR / username / ".claude" / "skills"
-        if user_skills_dir.exists():
-            for skill_dir in user_skills_dir.iterdir():
-                if skill_dir.is_dir() and (skill_dir / "SKILL.md").exists():
-                    skill_sources[skill_dir.name] = skill_dir  # Override
+        skill_sources.update(_scan_skills_dir(USERS_DIR / username / ".claude" / "skills"))
 
     return skill_sources
 
 
+def sync_skill_links(skills_target: Path, links: dict[str, Path]) -> tuple[int, int]:
+    """
+    Make a directory contain exactly the given skill symlinks.
+
+    Compares the desired links with what is on disk and only touches
+    entries that differ. Anything that is not a symlink with the expected
+    target (a stale link, a regular file or directory the agent created)
+    is removed and replaced, so the directory is always restored to the
+    infrastructure-managed state.
+
+    Args:
+        skills_target: Directory holding the links (workspace/.claude/skills).
+        links: Mapping of link name -> symlink target.
+
+    Returns:
+        Tuple of (links created, entries removed).
+    """
+    if skills_target.is_symlink() or (skills_target.exists() and not skills_target.is_dir()):
+        skills_target.unlink()
+    skills_target.mkdir(parents=True, exist_ok=True)
+
+    created = 0
+    removed = 0
+    present: set[str] = set()
+    for entry in os.scandir(skills_target):
+        target = links.get(entry.name)
+        if target is not None and entry.is_symlink() and os.readlink(entry.path) == str(target):
+            present.add(entry.name)
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path)
+        else:
+            os.unlink(entry.path)
+        removed += 1
+
+    for name, target in links.items():
+        if name in present:
+            continue
+        try:
+            (skills_target / name).symlink_to(target)
+            created += 1
+            logger.debug(f"Linked skill: {name} -> {target}")
+        except OSError as e:
+            logger.warning(f"Failed to create skill symlink {name}: {e}")
+
+    return created, removed
+
+
 def _parse_skill_frontmatter(content: str) -> tuple[str, str, str]:
     """
     Parse YAML frontmatter from a skill markdown file.
@@ -132,6 +228,20 @@ def _parse_skill_frontmatter(content: str) -> tuple[str, str, str]:
     return name, description, body
 
 
+def _parse_skill_file(raw: bytes) -> tuple[str, str, str, str]:
+    """
+    Decode a SKILL.md file and parse its frontmatter.
+
+    Args:
+        raw: Raw file content.
+
+    Returns:
+        Tuple of (content, name, description, body).
+    """
+    content = raw.decode("utf-8")
+    return (content, *_parse_skill_frontmatter(content))
+
+
 @dataclass
 class Skill:
     """
@@ -257,33 +367,23 @@ class SkillManager:
                 f"No {self.SKILL_FILENAME} found in skill directory: {skill_dir}"
             )
 
-        # Find optional script file anywhere in skill directory (recursive)
-        script_file = None
-
-        # First, look for exact name match recursively
-        for ext in self.SUPPORTED_SCRIPT_EXTENSIONS:
-            matches = list(skill_dir.rglob(f"{skill_name}{ext}"))
-            if matches:
-                script_file = matches[0]
-                break
+        # Find optional script file anywhere in skill directory (recursive).
+        # The lookup is cached until a directory in the skill tree changes.
+        script_file = get_preparation_cache().memoize_tree(
+            ("skill-script", str(skill_dir), skill_name),
+            skill_dir,
+            lambda: self._find_script_file(skill_dir, skill_name),
+        )
 
-        # If no exact match, find any script file recursively
-        if script_file is None:
-            for ext in self.SUPPORTED_SCRIPT_EXTENSIONS:
-                matches = list(skill_dir.rglob(f"*{ext}"))
-                if matches:
-                    script_file = matches[0]
-                    break
-
-        # Read the markdown content
+        # Read the markdown content and parse frontmatter for name and description
+        # (cached until SKILL.md changes)
         try:
-            content = description_file.read_text(encoding="utf-8")
+            content, parsed_name, description, body = get_preparation_cache().load_file(
+                description_file, _parse_skill_file, namespace="skill"
+            )
         except IOError as e:
             raise SkillError(f"Failed to read skill file: {e}") from e
 
-        # Parse frontmatter for name and description
-        parsed_name, description, body = _parse_skill_frontmatter(content)
-
         # Use frontmatter name if available, otherwise folder name
         final_name = parsed_name if parsed_name else skill_name
 
@@ -301,6 +401,33 @@ class SkillManager:
 
         return skill
 
+    def _find_script_file(self, skill_dir: Path, skill_name: str) -> Optional[Path]:
+        """
+        Find the script file for a skill, searching the skill tree recursively.
+
+        An exact name match (<skill_name>.<ext>) wins over any other script.
+
+        Args:
+            skill_dir: The skill directory.
+            skill_name: Name of the skill.
+
+        Returns:
+            Path to the script file, or None if the skill has no script.
+        """
+        # First, look for exact name match recursively
+        for ext in self.SUPPORTED_SCRIPT_EXTENSIONS:
+            matches = list(skill_dir.rglob(f"{skill_name}{ext}"))
+            if matches:
+                return matches[0]
+
+        # If no exact match, find any script file recursively
+        for ext in self.SUPPORTED_SCRIPT_EXTENSIONS:
+            matches = list(skill_dir.rglob(f"*{ext}"))
+            if matches:
+                return matches[0]
+
+        return None
+
     def load_all_skills(self) -> dict[str, Skill]:
         """
         Load all available skills.
@@ -0,0 +1,482 @@
+"""
+Per-phase latency spans for agent runs.
+
+A RunTrace collects timed spans for one run of a session: queue wait,
+user/DB lookups, option building, SDK process spawn, time to first
+message, tool execution, permission checks and event persistence. Spans
+are flat children of a single "agent_run" root span.
+
+Active traces are registered by Ag3ntum session ID rather than held in a
+context variable. MCP tool handlers and permission callbacks run inside
+the SDK client's task group, which may have been created by an earlier
+run (see client_pool.py); looking traces up by session keeps their spans
+attached to the run that is actually executing.
+
+When the outermost holder of a trace releases it:
+- a timing_summary (per-phase count/total/max) is available for the
+  agent_complete event,
+- per-phase totals are added to the in-process PhaseStats (p50/p95 served
+  by GET /api/v1/metrics/phases),
+- if spans.export is enabled, the spans are appended to a JSONL file in
+  the OTLP/JSON "resourceSpans" format written by the OpenTelemetry
+  collector file exporter, so existing OTel tooling can ingest it.
+
+Usage:
+    async with run_trace(session_id) as trace:
+        with span(session_id, "prepare.options"):
+            ...
+        add_phase_time(session_id, "trace.process", elapsed_ns)
+"""
+import asyncio
+import functools
+import json
+import logging
+import math
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ROOT_SPAN_NAME = "agent_run"
+SERVICE_NAME = "ag3ntum"
+
+_SPANS_DEFAULTS = {
+    "export": False,
+    "export_path": None,  # Defaults to LOGS_DIR/spans.jsonl
+    "sample_size": 1000,
+}
+
+# OTLP status codes
+_STATUS_OK = 1
+_STATUS_ERROR = 2
+
+
+def _attribute_value(value: Any) -> dict[str, Any]:
+    """Encode an attribute value as an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {"key": key, "value": _attribute_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+class Span:
+    """A finished span."""
+
+    __slots__ = ("name", "span_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        attributes: Optional[dict[str, Any]] = None,
+        error: bool = False,
+    ) -> None:
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.attributes = attributes or {}
+        self.error = error
+
+    @property
+    def duration_ns(self) -> int:
+        return max(0, self.end_ns - self.start_ns)
+
+
+class RunTrace:
+    """Spans and per-phase totals for one agent run."""
+
+    def __init__(self, session_id: str, attributes: Optional[dict[str, Any]] = None) -> None:
+        """
+        Start a trace.
+
+        Args:
+            session_id: Ag3ntum session ID.
+            attributes: Attributes for the root span.
+        """
+        self.session_id = session_id
+        self.trace_id = secrets.token_hex(16)
+        self.root_span_id = secrets.token_hex(8)
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = {"session.id": session_id, **(attributes or {})}
+        self.spans: list[Span] = []
+        # phase -> [count, total_ns, max_ns]
+        self._phases: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+        self._holders = 0
+        self.error = False
+
+    def record(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        attributes: Optional[dict[str, Any]] = None,
+        error: bool = False,
+    ) -> None:
+        """
+        Add a finished span and count it towards its phase.
+
+        Args:
+            name: Phase name (e.g. "sdk.connect", "tool.Read").
+            start_ns: Start time (time.time_ns()).
+            end_ns: End time (time.time_ns()).
+            attributes: Span attributes.
+            error: Whether the spanned operation failed.
+        """
+        recorded = Span(name, start_ns, end_ns, attributes, error)
+        with self._lock:
+            self.spans.append(recorded)
+        self.add(name, recorded.duration_ns)
+
+    def add(self, name: str, duration_ns: int) -> None:
+        """
+        Count time towards a phase without recording a span.
+
+        Used for high-frequency work (per-message processing) where one span
+        per call would dwarf the work being measured.
+
+        Args:
+            name: Phase name.
+            duration_ns: Elapsed time in nanoseconds.
+        """
+        with self._lock:
+            phase = self._phases.get(name)
+            if phase is None:
+                self._phases[name] = [1, duration_ns, duration_ns]
+            else:
+                phase[0] += 1
+                phase[1] += duration_ns
+                if duration_ns > phase[2]:
+                    phase[2] = duration_ns
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+        """
+        Time a block as a span.
+
+        Yields the attribute dict so the block can add attributes.
+
+        Args:
+            name: Phase name.
+            **attributes: Span attributes.
+        """
+        start_ns = time.time_ns()
+        error = False
+        try:
+            yield attributes
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record(name, start_ns, time.time_ns(), attributes, error)
+
+    def timing_summary(self) -> dict[str, Any]:
+        """
+        Per-phase latency breakdown of the run.
+
+        Returns:
+            {"total_ms": float, "phases": {name: {"count", "total_ms", "max_ms"}}}
+        """
+        end_ns = self.end_ns or time.time_ns()
+        with self._lock:
+            phases = {
+                name: {
+                    "count": count,
+                    "total_ms": round(total_ns / 1e6, 3),
+                    "max_ms": round(max_ns / 1e6, 3),
+                }
+                for name, (count, total_ns, max_ns) in self._phases.items()
+            }
+        return {"total_ms": round((end_ns - self.start_ns) / 1e6, 3), "phases": phases}
+
+    def phase_totals_ms(self) -> dict[str, float]:
+        """Total milliseconds per phase, plus the run total under ROOT_SPAN_NAME."""
+        end_ns = self.end_ns or time.time_ns()
+        with self._lock:
+            totals = {name: total_ns / 1e6 for name, (_, total_ns, _) in self._phases.items()}
+        totals[ROOT_SPAN_NAME] = (end_ns - self.start_ns) / 1e6
+        return totals
+
+    def to_otlp(self) -> dict[str, Any]:
+        """Encode the trace as an OTLP/JSON ExportTraceServiceRequest."""
+        end_ns = self.end_ns or time.time_ns()
+        with self._lock:
+            spans = list(self.spans)
+        encoded = [{
+            "traceId": self.trace_id,
+            "spanId": self.root_span_id,
+            "name": ROOT_SPAN_NAME,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(end_ns),
+            "attributes": _attributes(self.attributes),
+            "status": {"code": _STATUS_ERROR if self.error else _STATUS_OK},
+        }]
+        for item in spans:
+            encoded.append({
+                "traceId": self.trace_id,
+                "spanId": item.span_id,
+                "parentSpanId": self.root_span_id,
+                "name": item.name,
+                "kind": 1,
+                "startTimeUnixNano": str(item.start_ns),
+                "endTimeUnixNano": str(item.end_ns),
+                "attributes": _attributes(item.attributes),
+                "status": {"code": _STATUS_ERROR if item.error else _STATUS_OK},
+            })
+        return {"resourceSpans": [{
+            "resource": {"attributes": _attributes({"service.name": SERVICE_NAME})},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": encoded}],
+        }]}
+
+
+class PhaseStats:
+    """Rolling per-phase samples of run totals for percentile queries."""
+
+    def __init__(self, sample_size: int = 1000) -> None:
+        """
+        Initialize the aggregator.
+
+        Args:
+            sample_size: Number of most recent runs kept per phase.
+        """
+        self._sample_size = sample_size
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+        self.runs = 0
+
+    def add_run(self, trace: RunTrace) -> None:
+        """Add one finished run's per-phase totals."""
+        with self._lock:
+            self.runs += 1
+            for name, total_ms in trace.phase_totals_ms().items():
+                samples = self._samples.get(name)
+                if samples is None:
+                    samples = self._samples[name] = deque(maxlen=self._sample_size)
+                samples.append(total_ms)
+
+    def percentiles(self) -> dict[str, dict[str, float]]:
+        """
+        Return p50/p95/max per phase over the retained runs.
+
+        Returns:
+            {phase: {"count", "p50_ms", "p95_ms", "max_ms"}}
+        """
+        with self._lock:
+            snapshot = {name: sorted(samples) for name, samples in self._samples.items()}
+        return {
+            name: {
+                "count": len(values),
+                "p50_ms": round(_percentile(values, 0.50), 3),
+                "p95_ms": round(_percentile(values, 0.95), 3),
+                "max_ms": round(values[-1], 3),
+            }
+            for name, values in sorted(snapshot.items())
+            if values
+        }
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        with self._lock:
+            self._samples.clear()
+            self.runs = 0
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+class JsonlSpanExporter:
+    """Appends traces to a file, one OTLP/JSON request per line."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, trace: RunTrace) -> None:
+        """Write one trace (blocking; call from a worker thread)."""
+        line = json.dumps(trace.to_otlp(), separators=(",", ":")) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line)
+
+
+_active_traces: dict[str, RunTrace] = {}
+_phase_stats: Optional[PhaseStats] = None
+_exporter: Optional[JsonlSpanExporter] = None
+_config: Optional[dict[str, Any]] = None
+
+
+def _spans_config() -> dict[str, Any]:
+    global _config
+    if _config is None:
+        config = dict(_SPANS_DEFAULTS)
+        try:
+            from ..config import get_config_loader
+            config.update(get_config_loader().get_section("spans", _SPANS_DEFAULTS))
+        except Exception as e:
+            logger.debug(f"SPANS: Using defaults ({e})")
+        _config = config
+    return _config
+
+
+def get_phase_stats() -> PhaseStats:
+    """Get the process-wide per-phase latency aggregator."""
+    global _phase_stats
+    if _phase_stats is None:
+        _phase_stats = PhaseStats(sample_size=int(_spans_config().get("sample_size") or 1000))
+    return _phase_stats
+
+
+def get_span_exporter() -> Optional[JsonlSpanExporter]:
+    """Get the JSONL exporter, or None if spans.export is disabled."""
+    global _exporter
+    config = _spans_config()
+    if _exporter is None and config.get("export"):
+        path = config.get("export_path")
+        if not path:
+            from ..config import LOGS_DIR
+            path = LOGS_DIR / "spans.jsonl"
+        _exporter = JsonlSpanExporter(Path(os.path.expanduser(str(path))))
+    return _exporter
+
+
+def get_run_trace(session_id: Optional[str]) -> Optional[RunTrace]:
+    """Return the active trace of a session, if any."""
+    if session_id is None:
+        return None
+    return _active_traces.get(session_id)
+
+
+@asynccontextmanager
+async def run_trace(session_id: str, **attributes: Any) -> AsyncIterator[RunTrace]:
+    """
+    Hold the trace of a session's run, creating it if needed.
+
+    Nested holders (AgentRunner, then ClaudeAgent._execute) share one trace;
+    the outermost holder finishes and exports it.
+
+    Args:
+        session_id: Ag3ntum session ID.
+        **attributes: Root span attributes (only used when creating).
+
+    Yields:
+        The active RunTrace.
+    """
+    trace = _active_traces.get(session_id)
+    if trace is None:
+        trace = RunTrace(session_id, attributes)
+        _active_traces[session_id] = trace
+    trace._holders += 1
+    try:
+        yield trace
+    except BaseException:
+        trace.error = True
+        raise
+    finally:
+        trace._holders -= 1
+        if trace._holders == 0:
+            trace.end_ns = time.time_ns()
+            if _active_traces.get(session_id) is trace:
+                del _active_traces[session_id]
+            get_phase_stats().add_run(trace)
+            exporter = get_span_exporter()
+            if exporter is not None:
+                try:
+                    await asyncio.shield(asyncio.to_thread(exporter.export, trace))
+                except Exception as e:
+                    logger.warning(f"SPANS: Failed to export trace for {session_id}: {e}")
+
+
+@contextmanager
+def span(session_id: Optional[str], name: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+    """
+    Time a block as a span of the session's active run (no-op without one).
+
+    Args:
+        session_id: Ag3ntum session ID.
+        name: Phase name.
+        **attributes: Span attributes.
+
+    Yields:
+        The attribute dict, for attributes known only after the block.
+    """
+    trace = get_run_trace(session_id)
+    if trace is None:
+        yield attributes
+        return
+    with trace.span(name, **attributes) as attrs:
+        yield attrs
+
+
+def record_span(
+    session_id: Optional[str],
+    name: str,
+    start_ns: int,
+    end_ns: int,
+    **attributes: Any,
+) -> None:
+    """Record an already measured span on the session's active run."""
+    trace = get_run_trace(session_id)
+    if trace is not None:
+        trace.record(name, start_ns, end_ns, attributes)
+
+
+def add_phase_time(session_id: Optional[str], name: str, duration_ns: int) -> None:
+    """Count time towards a phase of the session's active run."""
+    trace = get_run_trace(session_id)
+    if trace is not None:
+        trace.add(name, duration_ns)
+
+
+def timing_summary(session_id: Optional[str]) -> Optional[dict[str, Any]]:
+    """Return the timing summary of the session's active run, if any."""
+    trace = get_run_trace(session_id)
+    return trace.timing_summary() if trace is not None else None
+
+
+def timed(session_id: Optional[str], name: str, handler: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Wrap an async callback so each call is recorded as a span.
+
+    Used for MCP tool handlers and the can_use_tool permission callback.
+
+    Args:
+        session_id: Ag3ntum session ID the callback belongs to.
+        name: Phase name (e.g. "tool.Read", "permission.check").
+        handler: Async callable to wrap.
+
+    Returns:
+        Wrapped callable with the same signature.
+    """
+    @functools.wraps(handler)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        with span(session_id, name):
+            return await handler(*args, **kwargs)
+
+    return wrapper
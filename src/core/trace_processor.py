@@ -39,6 +39,7 @@ from claude_agent_sdk.types import (
     ToolUseBlock,
 )
 
+from .spans import add_phase_time
 from .tracer import TracerBase
 
 
@@ -382,14 +383,18 @@ class TraceProcessor:
     Args:
         tracer: The tracer instance to dispatch events to.
         include_user_messages: Whether to trace user messages.
+        session_id: Ag3ntum session ID; message processing time is counted
+            towards the run's "trace.process" phase (see spans.py).
     """
 
     def __init__(
         self,
         tracer: TracerBase,
-        include_user_messages: bool = False
+        include_user_messages: bool = False,
+        session_id: Optional[str] = None
     ) -> None:
         self.tracer = tracer
+        self._session_id = session_id
         self.include_user_messages = include_user_messages
         self._pending_tool_calls: dict[str, dict[str, Any]] = {}
         self._initialized = False
@@ -515,19 +520,25 @@ class TraceProcessor:
         Args:
             message: The SDK message to process.
         """
-        if isinstance(message, SystemMessage):
-            self._handle_system_message(message)
-        elif isinstance(message, AssistantMessage):
-            self._handle_assistant_message(message)
-        elif isinstance(message, UserMessage):
-            self._handle_user_message(message)
-        elif isinstance(message, ResultMessage):
-            self._handle_result_message(message)
-        elif isinstance(message, StreamEvent):
-            self._handle_stream_event(message)
-        else:
-            # Unknown message type - try to handle generically
-            self._handle_unknown_message(message)
+        started_ns = time.perf_counter_ns()
+        try:
+            if isinstance(message, SystemMessage):
+                self._handle_system_message(message)
+            elif isinstance(message, AssistantMessage):
+                self._handle_assistant_message(message)
+            elif isinstance(message, UserMessage):
+                self._handle_user_message(message)
+            elif isinstance(message, ResultMessage):
+                self._handle_result_message(message)
+            elif isinstance(message, StreamEvent):
+                self._handle_stream_event(message)
+            else:
+                # Unknown message type - try to handle generically
+                self._handle_unknown_message(message)
+        finally:
+            add_phase_time(
+                self._session_id, "trace.process", time.perf_counter_ns() - started_ns
+            )
 
     def _handle_system_message(self, msg: SystemMessage) -> None:
         """Handle system lifecycle messages."""
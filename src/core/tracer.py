@@ -224,7 +224,8 @@ class TracerBase(ABC):
         model: Optional[str] = None,
         cumulative_cost_usd: Optional[float] = None,
         cumulative_turns: Optional[int] = None,
-        cumulative_tokens: Optional[int] = None
+        cumulative_tokens: Optional[int] = None,
+        timing_summary: Optional[dict[str, Any]] = None
     ) -> None:
         """
         Called when the agent completes execution.
@@ -241,6 +242,7 @@ class TracerBase(ABC):
             cumulative_cost_usd: Total cost across all runs (for resumed sessions).
             cumulative_turns: Total turns across all runs (for resumed sessions).
             cumulative_tokens: Total tokens across all runs (for resumed sessions).
+            timing_summary: Per-phase latency breakdown of this run (see spans.py).
         """
         pass
 
@@ -1518,7 +1520,8 @@ class ExecutionTracer(TracerBase):
         model: Optional[str] = None,
         cumulative_cost_usd: Optional[float] = None,
         cumulative_turns: Optional[int] = None,
-        cumulative_tokens: Optional[int] = None
+        cumulative_tokens: Optional[int] = None,
+        timing_summary: Optional[dict[str, Any]] = None
     ) -> None:
         """Called when the agent completes execution."""
         self._stop_spinner()
@@ -2085,7 +2088,8 @@ class QuietTracer(TracerBase):
         model: Optional[str] = None,
         cumulative_cost_usd: Optional[float] = None,
         cumulative_turns: Optional[int] = None,
-        cumulative_tokens: Optional[int] = None
+        cumulative_tokens: Optional[int] = None,
+        timing_summary: Optional[dict[str, Any]] = None
     ) -> None:
         """Report completion with token usage."""
         cost_str = f" (${total_cost_usd:.4f})" if total_cost_usd else ""
@@ -2366,7 +2370,8 @@ class BackendConsoleTracer(TracerBase):
         model: Optional[str] = None,
         cumulative_cost_usd: Optional[float] = None,
         cumulative_turns: Optional[int] = None,
-        cumulative_tokens: Optional[int] = None
+        cumulative_tokens: Optional[int] = None,
+        timing_summary: Optional[dict[str, Any]] = None
     ) -> None:
         """Log agent completion with metrics."""
         duration_str = self._format_duration(duration_ms)
@@ -3013,7 +3018,8 @@ class EventingTracer(TracerBase):
         model: Optional[str] = None,
         cumulative_cost_usd: Optional[float] = None,
         cumulative_turns: Optional[int] = None,
-        cumulative_tokens: Optional[int] = None
+        cumulative_tokens: Optional[int] = None,
+        timing_summary: Optional[dict[str, Any]] = None
     ) -> None:
         self._tracer.on_agent_complete(
             status=status,
@@ -3027,6 +3033,7 @@ class EventingTracer(TracerBase):
             cumulative_cost_usd=cumulative_cost_usd,
             cumulative_turns=cumulative_turns,
             cumulative_tokens=cumulative_tokens,
+            timing_summary=timing_summary,
         )
         self.emit_event(
             "agent_complete",
@@ -3042,6 +3049,7 @@ class EventingTracer(TracerBase):
                 "cumulative_cost_usd": cumulative_cost_usd,
                 "cumulative_turns": cumulative_turns,
                 "cumulative_tokens": cumulative_tokens,
+                "timing_summary": timing_summary,
             },
         )
 
@@ -3347,7 +3355,8 @@ class NullTracer(TracerBase):
         model: Optional[str] = None,
         cumulative_cost_usd: Optional[float] = None,
         cumulative_turns: Optional[int] = None,
-        cumulative_tokens: Optional[int] = None
+        cumulative_tokens: Optional[int] = None,
+        timing_summary: Optional[dict[str, Any]] = None
     ) -> None:
         pass
 
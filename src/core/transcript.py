@@ -0,0 +1,330 @@
+"""
+Session transcript (agent.jsonl) writer and reader.
+
+Every SDK message received during a run is appended to the session's
+agent.jsonl. The writer is designed to stay off the hot path of the
+receive loop:
+
+- Messages are serialized directly from the SDK dataclasses with a shallow
+  json default hook instead of dataclasses.asdict() deep copies.
+- Lines are buffered in memory and written by a worker thread once the
+  buffer reaches buffer_bytes or flush_interval_seconds has passed, so the
+  event loop never blocks on disk I/O.
+- Runs append to the file instead of truncating it. Each run starts with a
+  segment marker line so resumed conversations keep their full history:
+      {"_segment": {"started_at": "...", "resume_id": "...", "previous_messages": N}}
+  previous_messages counts the records of the run before it. Nothing is
+  written after a run's last message, so the final line of agent.jsonl is
+  still the run's result message.
+- With compress enabled, segments of earlier runs are moved into
+  agent.jsonl.zst (one zstd frame per segment batch) when a new run starts,
+  leaving only the latest run in plain text.
+
+iter_transcript() streams records back in order from both files for
+replay and debugging tools.
+"""
+import asyncio
+import dataclasses
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_KEY = "_segment"
+ARCHIVE_SUFFIX = ".zst"
+
+# Start of a segment marker line (json.dumps of {SEGMENT_KEY: {...}})
+_SEGMENT_PREFIX = b'{"' + SEGMENT_KEY.encode() + b'": '
+_TAIL_BLOCK_BYTES = 64 * 1024
+
+_TRANSCRIPT_DEFAULTS = {
+    "compress": False,
+    "compression_level": 3,
+    "buffer_bytes": 64 * 1024,
+    "flush_interval_seconds": 1.0,
+}
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize SDK dataclasses field by field without copying them."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def serialize_message(message: Any) -> str:
+    """
+    Serialize an SDK message to a JSON line.
+
+    Produces the same JSON as json.dumps(asdict(message)) without building
+    the intermediate deep copy.
+
+    Args:
+        message: SDK message dataclass (or any JSON-serializable value).
+
+    Returns:
+        JSON text terminated by a newline.
+    """
+    return json.dumps(message, default=_json_default) + "\n"
+
+
+def archive_path(path: Path) -> Path:
+    """Return the compressed archive path for a transcript file."""
+    return path.with_name(path.name + ARCHIVE_SUFFIX)
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _last_segment_records(path: Path) -> Optional[int]:
+    """
+    Count the records after the last segment marker of a transcript.
+
+    Reads backwards from the end of the file, so only the last segment is
+    scanned.
+
+    Returns:
+        Number of lines after the marker, or None if the file does not
+        exist or has no marker (written before segments existed).
+    """
+    try:
+        f = path.open("rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        position = f.seek(0, os.SEEK_END)
+        tail = b""
+        while position > 0:
+            step = min(_TAIL_BLOCK_BYTES, position)
+            position -= step
+            f.seek(position)
+            tail = f.read(step) + tail
+            # Only the new block (plus a marker's length) can hold a new match
+            start = tail.rfind(b"\n" + _SEGMENT_PREFIX, 0, step + len(_SEGMENT_PREFIX))
+            if start >= 0:
+                tail = tail[start + 1:]
+                break
+        else:
+            if not tail.startswith(_SEGMENT_PREFIX):
+                return None
+    return tail.count(b"\n") - 1
+
+
+class TranscriptWriter:
+    """
+    Buffered, append-only writer for one run's transcript segment.
+
+    Not thread-safe: write() is called from the event loop only; the
+    actual file writes run serially in worker threads.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        compress: bool = False,
+        compression_level: int = 3,
+        buffer_bytes: int = 64 * 1024,
+        flush_interval_seconds: float = 1.0,
+    ) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            path: Transcript file (agent.jsonl).
+            compress: Move earlier segments into a zstd archive on open().
+            compression_level: zstd level used for the archive.
+            buffer_bytes: Flush once this many bytes are buffered.
+            flush_interval_seconds: Flush buffered lines at least this often
+                while messages keep arriving.
+        """
+        self.path = Path(path)
+        self.compress = compress
+        self.compression_level = compression_level
+        self.buffer_bytes = buffer_bytes
+        self.flush_interval_seconds = flush_interval_seconds
+        self.messages_written = 0
+        self._buffer: list[str] = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._open = False
+
+    async def open(self, **metadata: Any) -> None:
+        """
+        Start a new segment, archiving earlier ones if compression is on.
+
+        The marker records how many messages the previous segment holds.
+
+        Args:
+            **metadata: Extra fields for the segment marker (e.g. resume_id).
+        """
+        previous = await asyncio.to_thread(_last_segment_records, self.path)
+        if previous is not None:
+            metadata = {**metadata, "previous_messages": previous}
+        if self.compress:
+            await asyncio.to_thread(self._archive_previous_segments)
+        self._open = True
+        self._append_line(json.dumps({SEGMENT_KEY: {"started_at": _utc_now(), **metadata}}) + "\n")
+
+    def write(self, message: Any) -> None:
+        """
+        Buffer one SDK message; schedules a background flush when due.
+
+        Args:
+            message: SDK message dataclass.
+        """
+        if not self._open:
+            raise RuntimeError("TranscriptWriter.write() called before open()")
+        self._append_line(serialize_message(message))
+        self.messages_written += 1
+
+    async def flush(self) -> None:
+        """Write all buffered lines and wait for pending writes."""
+        self._schedule_flush()
+        if self._flush_task is not None:
+            await self._flush_task
+
+    async def close(self) -> None:
+        """Flush everything to disk (the segment has no end marker)."""
+        if not self._open:
+            return
+        self._open = False
+        await self.flush()
+
+    def _append_line(self, line: str) -> None:
+        self._buffer.append(line)
+        self._buffered_bytes += len(line)
+        if (
+            self._buffered_bytes >= self.buffer_bytes
+            or time.monotonic() - self._last_flush >= self.flush_interval_seconds
+        ):
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Hand the buffer to a writer task chained after the previous one."""
+        if not self._buffer:
+            return
+        data = "".join(self._buffer)
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        self._flush_task = asyncio.get_running_loop().create_task(
+            self._write_after(self._flush_task, data)
+        )
+
+    async def _write_after(self, previous: Optional[asyncio.Task], data: str) -> None:
+        if previous is not None:
+            await previous
+        await asyncio.to_thread(self._write_data, data)
+
+    def _write_data(self, data: str) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(data)
+
+    def _archive_previous_segments(self) -> None:
+        """Append the plain transcript to the zstd archive and truncate it."""
+        try:
+            if self.path.stat().st_size == 0:
+                return
+        except FileNotFoundError:
+            return
+
+        import pyzstd  # Only needed when compress is on
+
+        archive = archive_path(self.path)
+        with self.path.open("rb") as src, archive.open("ab") as dst:
+            compressor = pyzstd.ZstdCompressor(level_or_option=self.compression_level)
+            for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                dst.write(compressor.compress(chunk))
+            dst.write(compressor.flush())
+        os.chmod(archive, 0o600)
+        self.path.open("w").close()
+        logger.debug(f"TRANSCRIPT: Archived previous segments to {archive}")
+
+
+def _transcript_config() -> dict[str, Any]:
+    config = dict(_TRANSCRIPT_DEFAULTS)
+    try:
+        from ..config import get_config_loader
+        config.update(get_config_loader().get_section("transcript", _TRANSCRIPT_DEFAULTS))
+    except Exception as e:
+        logger.debug(f"TRANSCRIPT: Using defaults ({e})")
+    return config
+
+
+@asynccontextmanager
+async def open_transcript(path: Path, **metadata: Any) -> AsyncIterator[TranscriptWriter]:
+    """
+    Open a transcript segment configured from agent.yaml.
+
+    The segment is closed and flushed on exit, including on errors.
+
+    Args:
+        path: Transcript file (agent.jsonl).
+        **metadata: Extra fields for the segment marker.
+
+    Yields:
+        TranscriptWriter for the run.
+    """
+    config = _transcript_config()
+    writer = TranscriptWriter(
+        path,
+        compress=bool(config.get("compress")),
+        compression_level=int(config.get("compression_level", 3)),
+        buffer_bytes=int(config.get("buffer_bytes", 64 * 1024)),
+        flush_interval_seconds=float(config.get("flush_interval_seconds", 1.0)),
+    )
+    await writer.open(**metadata)
+    try:
+        yield writer
+    finally:
+        await writer.close()
+
+
+def _iter_lines(path: Path) -> Iterator[str]:
+    if path.name.endswith(ARCHIVE_SUFFIX):
+        import pyzstd
+
+        with pyzstd.open(path, "rt", encoding="utf-8") as f:
+            yield from f
+    else:
+        with path.open("r", encoding="utf-8") as f:
+            yield from f
+
+
+def iter_transcript(path: Path, include_markers: bool = False) -> Iterator[dict[str, Any]]:
+    """
+    Stream transcript records in order, archived segments first.
+
+    Transcripts written before segment markers existed are read as a single
+    unmarked segment. A truncated last line (e.g. after a crash) is skipped.
+
+    Args:
+        path: Transcript file (agent.jsonl).
+        include_markers: Also yield segment marker records.
+
+    Yields:
+        Decoded JSON records.
+    """
+    path = Path(path)
+    for source in (archive_path(path), path):
+        if not source.exists():
+            continue
+        for line_number, line in enumerate(_iter_lines(source), start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"TRANSCRIPT: Skipping malformed line {line_number} in {source}")
+                continue
+            if not include_markers and isinstance(record, dict) and SEGMENT_KEY in record:
+                continue
+            yield record
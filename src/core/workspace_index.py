@@ -0,0 +1,485 @@
+"""
+Per-session workspace file index shared by Glob, Grep, LS and the files API.
+
+Agents call the file discovery tools many times per task, and each call used
+to re-walk the workspace and stat every entry. WorkspaceIndex keeps the
+directory listings it has seen (name, type, size, mtime, ctime) in memory
+and revalidates them cheaply:
+
+- With inotify (Linux), every indexed directory is watched. Pending events
+  are drained before each query and drop the listings they affect (entries
+  added, removed, renamed or modified), which are re-read on next use.
+- Without inotify (or when the watch limit is reached), a listing is reused
+  while the directory's mtime is unchanged. Writing to a file in place does
+  not change its directory's mtime, so entry metadata may then be stale:
+  list_dir() always re-reads and get() re-stats the entry in this mode.
+
+Listings are loaded lazily: a query only reads the directories it visits,
+so pruned trees such as node_modules are never indexed by Grep. File content
+hashes are computed on request and cached until size or mtime change.
+
+get_workspace_index() returns the index of a session (or None when disabled
+via the workspace_index section in agent.yaml).
+"""
+import ctypes
+import ctypes.util
+import hashlib
+import logging
+import os
+import struct
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+from .file_search import GitIgnore, GITIGNORE_FILE, walk_entries
+
+logger = logging.getLogger(__name__)
+
+_WORKSPACE_INDEX_DEFAULTS = {
+    "enabled": True,
+    "inotify": True,
+    "max_sessions": 64,
+}
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class IndexEntry:
+    """Cached metadata of one directory entry (symlinks are followed)."""
+    name: str
+    path: str
+    is_dir: bool
+    is_file: bool
+    size: int
+    mtime_ns: int
+    ctime_ns: int
+    key: tuple[int, int]  # (st_dev, st_ino)
+    is_symlink: bool = False
+    content_hash: Optional[str] = None
+
+    @property
+    def mtime(self) -> float:
+        return self.mtime_ns / 1e9
+
+    @property
+    def ctime(self) -> float:
+        return self.ctime_ns / 1e9
+
+
+@dataclass
+class _DirRecord:
+    mtime_ns: int
+    entries: list[IndexEntry]
+    by_name: dict[str, IndexEntry] = field(default_factory=dict)
+    gitignore: Any = None  # (signature, GitIgnore | None) once loaded
+
+
+# =============================================================================
+# inotify (ctypes, no dependency)
+# =============================================================================
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal non-blocking inotify wrapper."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add_watch(self, path: str) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self) -> list[tuple[int, int, str]]:
+        """Return pending (wd, mask, name) events without blocking."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                events.append((wd, mask, os.fsdecode(name)))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+class WorkspaceIndex:
+    """
+    Lazily built, incrementally refreshed file index of one workspace.
+
+    Thread-safe: tools query it from worker threads.
+    """
+
+    def __init__(self, root: Path, use_inotify: bool = True) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            root: Workspace directory.
+            use_inotify: Watch indexed directories with inotify if available.
+        """
+        self.root = Path(root)
+        self._lock = threading.RLock()
+        self._dirs: dict[str, _DirRecord] = {}
+        self._watches: dict[int, set[str]] = {}
+        self._inotify: Optional[_Inotify] = None
+        self.scans = 0
+        self.hits = 0
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logger.debug(f"WORKSPACE INDEX: inotify unavailable, using mtime checks ({e})")
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Whether listings are invalidated by inotify events."""
+        return self._inotify is not None
+
+    def list_dir(self, path: Union[Path, str]) -> list[IndexEntry]:
+        """
+        Entries of a directory, sorted by name.
+
+        Args:
+            path: Directory path (inside or linked from the workspace).
+
+        Returns:
+            Current entries (empty if the directory cannot be read).
+        """
+        path = os.fspath(path)
+        with self._lock:
+            if self._inotify is None:
+                return self._scan(path).entries  # Entry metadata must be current
+            return self._record(path).entries
+
+    def get(self, path: Union[Path, str]) -> Optional[IndexEntry]:
+        """Entry for a path, or None if it does not exist (metadata is current)."""
+        path = os.fspath(path)
+        parent, name = os.path.split(path.rstrip("/"))
+        with self._lock:
+            entry = self._record(parent).by_name.get(name)
+            if entry is not None and self._inotify is None:
+                return self._restat(entry)
+            return entry
+
+    def walk(self, root: Union[Path, str], **kwargs) -> Iterator[tuple[str, str, bool]]:
+        """
+        walk_entries() over the index (same options and output).
+
+        Each visited directory is revalidated once per walk.
+        """
+        return walk_entries(
+            Path(root),
+            list_dir=self._walk_listing,
+            load_ignore=self._load_gitignore,
+            **kwargs,
+        )
+
+    def walk_files(self, root: Union[Path, str], **kwargs) -> Iterator[tuple[str, str]]:
+        """walk_files() over the index: (relative path, path) per file."""
+        for rel, path, _ in self.walk(root, include_dirs=False, **kwargs):
+            yield rel, path
+
+    def content_hash(self, path: Union[Path, str]) -> Optional[str]:
+        """
+        SHA-256 of a file's content, cached until its size or mtime change.
+
+        Returns:
+            Hex digest, or None if the path is not a readable file.
+        """
+        entry = self.get(path)
+        if entry is None or not entry.is_file:
+            return None
+        if entry.content_hash is not None:
+            return entry.content_hash
+        digest = hashlib.sha256()
+        try:
+            with open(entry.path, "rb") as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            st = os.stat(entry.path)
+        except OSError:
+            return None
+        value = digest.hexdigest()
+        if (st.st_size, st.st_mtime_ns) == (entry.size, entry.mtime_ns):
+            entry.content_hash = value
+        return value
+
+    def invalidate(self, path: Optional[Union[Path, str]] = None) -> None:
+        """
+        Drop cached listings of a directory subtree (or everything).
+
+        Writers inside this process may call this to make changes visible
+        immediately in mtime mode.
+        """
+        with self._lock:
+            if path is None:
+                self._dirs.clear()
+            else:
+                self._drop_subtree(os.fspath(path))
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for diagnostics."""
+        with self._lock:
+            return {
+                "directories": len(self._dirs),
+                "entries": sum(len(r.entries) for r in self._dirs.values()),
+                "inotify": self.uses_inotify,
+                "scans": self.scans,
+                "hits": self.hits,
+            }
+
+    def close(self) -> None:
+        """Release the inotify descriptor and cached listings."""
+        with self._lock:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+            self._dirs.clear()
+            self._watches.clear()
+
+    # -- internals ------------------------------------------------------------
+
+    def _walk_listing(self, path: str) -> list[IndexEntry]:
+        with self._lock:
+            return self._record(path).entries
+
+    def _load_gitignore(self, directory: str) -> Optional[GitIgnore]:
+        with self._lock:
+            record = self._record(directory)
+            entry = record.by_name.get(GITIGNORE_FILE)
+            signature = (entry.size, entry.mtime_ns) if entry is not None else None
+            if record.gitignore is not None and record.gitignore[0] == signature:
+                return record.gitignore[1]
+        ignore = GitIgnore.load(directory) if signature is not None else None
+        with self._lock:
+            record.gitignore = (signature, ignore)
+        return ignore
+
+    def _record(self, path: str) -> _DirRecord:
+        """Return a valid listing for path, re-reading it if needed (lock held)."""
+        self._drain_events()
+        record = self._dirs.get(path)
+        if record is not None:
+            if self._inotify is not None:
+                self.hits += 1
+                return record
+            try:
+                if os.stat(path).st_mtime_ns == record.mtime_ns:
+                    self.hits += 1
+                    return record
+            except OSError:
+                pass
+        return self._scan(path)
+
+    def _restat(self, entry: IndexEntry) -> Optional[IndexEntry]:
+        """Refresh an entry's metadata in mtime mode (lock held)."""
+        try:
+            st = os.stat(entry.path)
+        except OSError:
+            return None
+        if (st.st_size, st.st_mtime_ns) != (entry.size, entry.mtime_ns):
+            entry.content_hash = None
+        entry.size = st.st_size
+        entry.mtime_ns = st.st_mtime_ns
+        entry.ctime_ns = st.st_ctime_ns
+        return entry
+
+    def _scan(self, path: str) -> _DirRecord:
+        self.scans += 1
+        try:
+            dir_mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._dirs.pop(path, None)
+            return _DirRecord(0, [])
+        self._watch(path)
+
+        entries = []
+        try:
+            with os.scandir(path) as it:
+                for item in it:
+                    try:
+                        st = item.stat()
+                    except OSError:
+                        continue  # Broken symlink or vanished entry
+                    is_dir = item.is_dir()
+                    entries.append(IndexEntry(
+                        name=item.name,
+                        path=item.path,
+                        is_dir=is_dir,
+                        is_file=not is_dir and item.is_file(),
+                        size=st.st_size,
+                        mtime_ns=st.st_mtime_ns,
+                        ctime_ns=st.st_ctime_ns,
+                        key=(st.st_dev, st.st_ino),
+                        is_symlink=item.is_symlink(),
+                    ))
+        except OSError:
+            self._dirs.pop(path, None)
+            return _DirRecord(0, [])
+        entries.sort(key=lambda e: e.name)
+
+        previous = self._dirs.get(path)
+        record = _DirRecord(dir_mtime, entries, {e.name: e for e in entries})
+        if previous is not None:
+            # Keep hashes of unchanged files and the parsed .gitignore
+            for entry in entries:
+                old = previous.by_name.get(entry.name)
+                if old is not None and old.content_hash and (old.size, old.mtime_ns) == (
+                    entry.size, entry.mtime_ns
+                ):
+                    entry.content_hash = old.content_hash
+            record.gitignore = previous.gitignore
+        self._dirs[path] = record
+        return record
+
+    def _watch(self, path: str) -> None:
+        if self._inotify is None:
+            return
+        try:
+            wd = self._inotify.add_watch(path)
+        except OSError as e:
+            logger.warning(
+                f"WORKSPACE INDEX: inotify watch failed for {path} ({e}); "
+                f"falling back to mtime checks"
+            )
+            self._inotify.close()
+            self._inotify = None
+            self._watches.clear()
+            return
+        self._watches.setdefault(wd, set()).add(path)
+
+    def _drain_events(self) -> None:
+        if self._inotify is None:
+            return
+        for wd, mask, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                self._dirs.clear()
+                continue
+            paths = self._watches.get(wd, ())
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                for path in self._watches.pop(wd, ()):
+                    self._drop_subtree(path)
+                continue
+            for path in paths:
+                self._dirs.pop(path, None)
+                if name and mask & IN_ISDIR and mask & (IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO):
+                    self._drop_subtree(os.path.join(path, name))
+
+    def _drop_subtree(self, path: str) -> None:
+        prefix = path.rstrip("/") + "/"
+        self._dirs.pop(path, None)
+        for key in [k for k in self._dirs if k.startswith(prefix)]:
+            del self._dirs[key]
+
+
+# =============================================================================
+# Per-session registry
+# =============================================================================
+
+_indexes: "OrderedDict[str, WorkspaceIndex]" = OrderedDict()
+_registry_lock = threading.Lock()
+_config: Optional[dict[str, Any]] = None
+
+
+def _index_config() -> dict[str, Any]:
+    global _config
+    if _config is None:
+        config = dict(_WORKSPACE_INDEX_DEFAULTS)
+        try:
+            from ..config import get_config_loader
+            config.update(
+                get_config_loader().get_section("workspace_index", _WORKSPACE_INDEX_DEFAULTS)
+            )
+        except Exception as e:
+            logger.debug(f"WORKSPACE INDEX: Using defaults ({e})")
+        _config = config
+    return _config
+
+
+def get_workspace_index(session_id: str, root: Path) -> Optional[WorkspaceIndex]:
+    """
+    Get (or create) the file index of a session's workspace.
+
+    Indexes are kept for the most recently used max_sessions sessions.
+
+    Args:
+        session_id: Session ID.
+        root: Session workspace directory.
+
+    Returns:
+        WorkspaceIndex, or None if the index is disabled.
+    """
+    config = _index_config()
+    if not config.get("enabled", True):
+        return None
+    root = Path(root).resolve()
+    with _registry_lock:
+        index = _indexes.get(session_id)
+        if index is not None and index.root == root:
+            _indexes.move_to_end(session_id)
+            return index
+        if index is not None:
+            index.close()
+        index = WorkspaceIndex(root, use_inotify=bool(config.get("inotify", True)))
+        _indexes[session_id] = index
+        while len(_indexes) > max(1, int(config.get("max_sessions", 64))):
+            _, evicted = _indexes.popitem(last=False)
+            evicted.close()
+        return index
+
+
+def drop_workspace_index(session_id: str) -> None:
+    """Close and forget a session's index (e.g. when the session is deleted)."""
+    with _registry_lock:
+        index = _indexes.pop(session_id, None)
+    if index is not None:
+        index.close()
@@ -46,16 +46,48 @@ class Base(DeclarativeBase):
     pass
 
 
+# Columns added to existing tables after their initial release.
+# create_all() only creates missing tables, so databases created by an older
+# version get these columns (and their indexes) added in place on startup.
+# Format: table -> [(column, SQL type, index name or None)]
+_ADDED_COLUMNS: dict[str, list[tuple[str, str, str | None]]] = {
+    "sessions": [
+        ("batch_id", "VARCHAR(50)", "ix_sessions_batch_id"),
+    ],
+}
+
+
+def _add_missing_columns(sync_conn) -> None:
+    """Add columns from _ADDED_COLUMNS that are missing in an existing database."""
+    for table, columns in _ADDED_COLUMNS.items():
+        existing = {
+            row[1]
+            for row in sync_conn.exec_driver_sql(f"PRAGMA table_info({table})")
+        }
+        for column, column_type, index_name in columns:
+            if column not in existing:
+                sync_conn.exec_driver_sql(
+                    f"ALTER TABLE {table} ADD COLUMN {column} {column_type}"
+                )
+                logger.info(f"Added missing column {table}.{column}")
+            if index_name:
+                sync_conn.exec_driver_sql(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({column})"
+                )
+
+
 async def init_db() -> None:
     """
     Initialize the database.
 
-    Creates the database directory and all tables if they don't exist.
+    Creates the database directory and all tables if they don't exist,
+    then adds any columns introduced since the database was created.
     """
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
 
     logger.info(f"Database initialized at {DATABASE_PATH}")
 
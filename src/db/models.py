@@ -109,6 +109,11 @@ class Session(Base):
     # Session forking
     parent_session_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
 
+    # Batch submission (POST /sessions/run-batch groups sessions under one ID)
+    batch_id: Mapped[Optional[str]] = mapped_column(
+        String(50), nullable=True, index=True
+    )
+
     # Checkpointing (JSON array of Checkpoint objects)
     file_checkpointing_enabled: Mapped[bool] = mapped_column(Boolean, default=False)
     checkpoints_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
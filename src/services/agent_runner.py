@@ -6,16 +6,18 @@ Uses the unified task_runner for execution (shared with CLI).
 """
 import asyncio
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Optional
 
 import yaml
 from sqlalchemy import select
 
 from ..config import CONFIG_DIR
 from ..core.schemas import SessionContext, TaskExecutionParams
+from ..core.spans import add_phase_time, record_span, run_trace
 from ..core.task_runner import execute_agent_task
 from ..core.tracer import BackendConsoleTracer, EventingTracer
 from ..db.database import AsyncSessionLocal
@@ -66,6 +68,9 @@ class TaskParams:
     # Permission profile (CLI: --profile)
     profile: Optional[str] = None
 
+    # When the task entered the queue (set by the queue processor; for queue.wait spans)
+    queued_at: Optional[datetime] = None
+
     def __post_init__(self):
         if self.additional_dirs is None:
             self.additional_dirs = []
@@ -88,6 +93,8 @@ class AgentRunner:
         self._running_tasks: dict[str, asyncio.Task] = {}
         self._cancel_flags: dict[str, bool] = {}
         self._results: dict[str, dict[str, Any]] = {}
+        # Parameters of runs that stopped on AskUserQuestion (for hot resume)
+        self._paused_params: dict[str, TaskParams] = {}
         self._completion_callbacks: list[Callable[[str, str], None]] = []
 
         # Load Redis URL from config (required)
@@ -201,12 +208,19 @@ class AgentRunner:
                 await db.commit()
                 logger.debug(f"Updated session {session_id} status to {status}")
 
-    async def start_task(self, params: TaskParams) -> None:
+    async def start_task(
+        self,
+        params: TaskParams,
+        before_run: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> None:
         """
         Start agent execution in background.
 
         Args:
             params: TaskParams with all execution parameters.
+            before_run: Awaited by the background task before the agent runs
+                (e.g. to record the user message), only once the session's
+                slot is taken, so it never runs for a start that fails.
 
         Raises:
             RuntimeError: If task is already running for this session.
@@ -221,13 +235,89 @@ class AgentRunner:
 
         # Initialize cancel flag and event queue
         self._cancel_flags[session_id] = False
+        self._paused_params.pop(session_id, None)
 
         # Start the background task
-        task_coro = self._run_agent(params)
+        task_coro = self._run_agent_traced(params, before_run)
         self._running_tasks[session_id] = asyncio.create_task(task_coro)
 
         logger.info(f"Started background task for session: {session_id}")
 
+    def has_paused_run(self, session_id: str) -> bool:
+        """
+        Check if the session's last run in this process stopped on AskUserQuestion.
+
+        Args:
+            session_id: The session ID.
+
+        Returns:
+            True if resume_with_answer() can reuse the run's parameters.
+        """
+        return session_id in self._paused_params
+
+    async def resume_with_answer(
+        self,
+        session_id: str,
+        task: str,
+        before_run: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> bool:
+        """
+        Continue a run that stopped on AskUserQuestion with the user's answer.
+
+        Reuses the paused run's parameters so the follow-up run resolves to
+        the same SDK options and can be bound to the suspended CLI process
+        (see core/client_pool.py).
+
+        Args:
+            session_id: The session ID.
+            task: Follow-up prompt carrying the answer.
+            before_run: Passed to start_task(); not called if this returns False.
+
+        Returns:
+            True if the run was started, False if no paused run is known in
+            this process or another run started first (the caller should
+            fall back to a cold resume).
+        """
+        params = self._paused_params.get(session_id)
+        if params is None or session_id in self._running_tasks:
+            return False
+        try:
+            await self.start_task(replace(
+                params,
+                task=task,
+                resume_session_id=session_id,
+                fork_session=False,
+                queued_at=None,
+            ), before_run=before_run)
+        except RuntimeError as e:
+            logger.info(f"Hot resume of {session_id} not started: {e}")
+            return False
+        logger.info(f"Hot-resuming session {session_id} with the user's answer")
+        return True
+
+    async def _run_agent_traced(
+        self,
+        params: TaskParams,
+        before_run: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> None:
+        """
+        Run _run_agent() inside the session's latency trace (see core/spans.py).
+
+        Args:
+            params: TaskParams with all execution parameters.
+            before_run: See start_task().
+        """
+        if before_run is not None:
+            try:
+                await before_run()
+            except Exception as e:
+                logger.warning(f"Pre-run step failed for session {params.session_id}: {e}")
+        async with run_trace(params.session_id, resumed=bool(params.resume_session_id)):
+            if params.queued_at is not None:
+                queued_ns = int(params.queued_at.timestamp() * 1_000_000_000)
+                record_span(params.session_id, "queue.wait", queued_ns, time.time_ns())
+            await self._run_agent(params)
+
     async def _run_agent(self, params: TaskParams) -> None:
         """
         Run the agent in background using the unified task runner.
@@ -298,7 +388,9 @@ class AgentRunner:
 
             async def persist_event(event: dict[str, Any]) -> None:
                 """Persist event to database. Returns when persistence is complete."""
+                started_ns = time.perf_counter_ns()
                 await event_service.record_event(event)
+                add_phase_time(session_id, "events.persist", time.perf_counter_ns() - started_ns)
 
             tracer = EventingTracer(
                 base_tracer,
@@ -315,6 +407,7 @@ class AgentRunner:
             linux_gid: Optional[int] = None
             session_context: Optional[SessionContext] = None
 
+            lookup_started_ns = time.time_ns()
             async with AsyncSessionLocal() as db:
                 # Fetch user
                 result = await db.execute(select(User).where(User.id == params.user_id))
@@ -388,6 +481,8 @@ class AgentRunner:
                 else:
                     logger.warning(f"Session {session_id} not found in database")
 
+            record_span(session_id, "run.lookup", lookup_started_ns, time.time_ns())
+
             # Use sessions_dir passed from API endpoint (already determined once)
             sessions_dir = Path(params.sessions_dir)
             working_dir = sessions_dir / session_id
@@ -427,6 +522,7 @@ class AgentRunner:
 
             # Execute using unified task runner
             result = await execute_agent_task(exec_params)
+            finalize_started_ns = time.time_ns()
 
             # Store result
             self._results[session_id] = {
@@ -452,6 +548,7 @@ class AgentRunner:
                 pending_question = await get_pending_question_from_events(session_id)
                 if pending_question:
                     final_status = "waiting_for_input"
+                    self._paused_params[session_id] = params
                     logger.info(
                         f"Session {session_id} waiting for user input "
                         f"(question_id: {pending_question.get('question_id')})"
@@ -478,6 +575,7 @@ class AgentRunner:
                 total_cost_usd=metrics.total_cost_usd if metrics else None,
                 usage=usage_dict,
             )
+            record_span(session_id, "run.finalize", finalize_started_ns, time.time_ns())
 
             logger.info(f"Agent completed for session: {session_id} (status: {final_status})")
 
@@ -654,6 +752,10 @@ class AgentRunner:
         """Publish an event to all subscribers for a session."""
         await self._event_hub.publish(session_id, event)
 
+    async def publish_events(self, events: list[dict[str, Any]]) -> None:
+        """Publish events for several sessions in one pipelined call."""
+        await self._event_hub.publish_many(events)
+
     def get_result(self, session_id: str) -> Optional[dict]:
         """
         Get the result of a completed task.
@@ -674,6 +776,7 @@ class AgentRunner:
             session_id: The session ID.
         """
         self._results.pop(session_id, None)
+        self._paused_params.pop(session_id, None)
 
 
 # Global agent runner instance
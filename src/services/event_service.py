@@ -85,20 +85,23 @@ def with_db_retry(
     return decorator
 
 
-async def record_event(event: dict[str, Any]) -> bool:
+def _prepare_event(
+    event: dict[str, Any],
+) -> Optional[tuple[str, int, str, dict[str, Any], datetime]]:
     """
-    Persist a structured event to the database.
+    Normalize an event into the fields stored in the events table.
 
     Args:
         event: The event dictionary to persist.
 
     Returns:
-        True if event was recorded successfully, False otherwise.
+        Tuple of (session_id, sequence, event_type, payload, timestamp),
+        or None if the event has no session_id.
     """
     session_id = event.get("session_id") or event.get("data", {}).get("session_id")
     if not session_id:
         logger.warning("Skipping event without session_id: %s", event.get("type"))
-        return False
+        return None
 
     timestamp_raw = event.get("timestamp")
     timestamp = None
@@ -124,6 +127,24 @@ async def record_event(event: dict[str, Any]) -> bool:
         )
         sequence = 0
 
+    return session_id, sequence, event_type, payload, timestamp
+
+
+async def record_event(event: dict[str, Any]) -> bool:
+    """
+    Persist a structured event to the database.
+
+    Args:
+        event: The event dictionary to persist.
+
+    Returns:
+        True if event was recorded successfully, False otherwise.
+    """
+    prepared = _prepare_event(event)
+    if prepared is None:
+        return False
+    session_id, sequence, event_type, payload, timestamp = prepared
+
     # Handle agent_start event - update resume_id
     if event_type == "agent_start":
         resume_id = payload.get("session_id")
@@ -174,23 +195,64 @@ async def record_event(event: dict[str, Any]) -> bool:
         return False
 
 
-@with_db_retry()
-async def _persist_event(
+async def record_events(events: list[dict[str, Any]]) -> int:
+    """
+    Persist several events in a single transaction.
+
+    Intended for bulk writes of simple events (e.g. the initial user_message
+    of every session in a batch). Partial messages are skipped, like in
+    record_event(); agent_start side effects are not applied here.
+
+    Args:
+        events: The event dictionaries to persist.
+
+    Returns:
+        Number of events written (0 if the transaction failed).
+    """
+    rows = []
+    for event in events:
+        prepared = _prepare_event(event)
+        if prepared is None:
+            continue
+        _, _, event_type, payload, _ = prepared
+        if event_type == "message" and payload.get("is_partial"):
+            continue
+        rows.append(prepared)
+
+    if not rows:
+        return 0
+
+    try:
+        await asyncio.wait_for(
+            _persist_events(rows),
+            timeout=DB_OPERATION_TIMEOUT
+        )
+        return len(rows)
+
+    except asyncio.TimeoutError:
+        logger.error(f"Timeout recording {len(rows)} events in bulk")
+        return 0
+
+    except Exception as e:
+        logger.error(f"Failed to record {len(rows)} events in bulk: {e}")
+        return 0
+
+
+def _serialize_payload(
     session_id: str,
-    sequence: int,
     event_type: str,
     payload: dict[str, Any],
-    timestamp: datetime,
-) -> None:
+) -> str:
     """
-    Internal function to persist event with retry logic.
+    Serialize an event payload and redact sensitive data.
 
     Args:
-        session_id: The session ID.
-        sequence: Event sequence number.
+        session_id: The session ID (for logging).
         event_type: Type of event.
         payload: Event data payload.
-        timestamp: Event timestamp.
+
+    Returns:
+        JSON string safe to persist.
     """
     # Serialize payload with error handling
     try:
@@ -218,6 +280,29 @@ async def _persist_event(
         except Exception as e:
             logger.warning(f"Failed to scan event payload: {e}")
 
+    return data_json
+
+
+@with_db_retry()
+async def _persist_event(
+    session_id: str,
+    sequence: int,
+    event_type: str,
+    payload: dict[str, Any],
+    timestamp: datetime,
+) -> None:
+    """
+    Internal function to persist event with retry logic.
+
+    Args:
+        session_id: The session ID.
+        sequence: Event sequence number.
+        event_type: Type of event.
+        payload: Event data payload.
+        timestamp: Event timestamp.
+    """
+    data_json = _serialize_payload(session_id, event_type, payload)
+
     async with AsyncSessionLocal() as db:
         db_event = Event(
             session_id=session_id,
@@ -230,6 +315,32 @@ async def _persist_event(
         await db.commit()
 
 
+@with_db_retry()
+async def _persist_events(
+    rows: list[tuple[str, int, str, dict[str, Any], datetime]],
+) -> None:
+    """
+    Internal function to persist several events in one transaction.
+
+    Args:
+        rows: Prepared (session_id, sequence, event_type, payload, timestamp) tuples.
+    """
+    db_events = [
+        Event(
+            session_id=session_id,
+            sequence=sequence,
+            event_type=event_type,
+            data=_serialize_payload(session_id, event_type, payload),
+            timestamp=timestamp,
+        )
+        for session_id, sequence, event_type, payload, timestamp in rows
+    ]
+
+    async with AsyncSessionLocal() as db:
+        db.add_all(db_events)
+        await db.commit()
+
+
 @with_db_retry()
 async def list_events(
     session_id: str,
@@ -227,6 +227,7 @@ class QueueProcessor:
                 sessions_dir=str(user_sessions_dir),
                 resume_session_id=queued_task.resume_from or session_id,
                 fork_session=False,
+                queued_at=queued_task.queued_at,
             )
 
             # Start agent (this returns immediately, runs in background)
@@ -18,11 +18,11 @@ from typing import Optional, TYPE_CHECKING
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..db.models import UserQuota
 from .queue_config import QuotaConfig
 
 if TYPE_CHECKING:
     from .task_queue import TaskQueue
-    from ..db.models import UserQuota
 
 logger = logging.getLogger(__name__)
 
@@ -103,6 +103,41 @@ class QuotaManager:
 
         return (True, "")
 
+    async def available_slots(
+        self,
+        user_id: str,
+        db: Optional[AsyncSession] = None,
+    ) -> int:
+        """
+        Number of tasks the user could start right now.
+
+        Evaluates the same three limits as can_start_task() once, so callers
+        starting many tasks at once (batch submission) do not have to re-check
+        quotas for every task.
+
+        Args:
+            user_id: The user requesting to start tasks.
+            db: Optional database session for daily limit check.
+
+        Returns:
+            Number of tasks that can start immediately (0 if none).
+        """
+        global_free = self._config.global_max_concurrent - self._global_active_count
+        user_active = await self._queue.get_user_active_count(user_id)
+        user_free = self._config.per_user_max_concurrent - user_active
+        slots = min(global_free, user_free)
+
+        if self._config.per_user_daily_limit > 0 and db is not None:
+            result = await db.execute(
+                select(UserQuota).where(UserQuota.user_id == user_id)
+            )
+            quota = result.scalar_one_or_none()
+            if quota is not None:
+                quota.reset_if_needed()
+                slots = min(slots, quota.max_daily_tasks - quota.tasks_today)
+
+        return max(0, slots)
+
     async def _check_daily_limit(
         self,
         user_id: str,
@@ -167,6 +167,48 @@ class RedisEventHub:
             )
             raise
 
+    async def publish_many(self, events: list[Dict[str, Any]]) -> list[str]:
+        """
+        Publish events to their sessions' streams with one pipelined round trip.
+
+        Each event is routed by its "session_id" field. Used when many sessions
+        are created at once (batch submission).
+
+        Args:
+            events: Events to publish, each with a session_id.
+
+        Returns:
+            The stream entry IDs, in the same order as events.
+        """
+        if not events:
+            return []
+
+        pool = await self._ensure_pool()
+
+        try:
+            async with redis.Redis(connection_pool=pool) as conn:
+                pipe = conn.pipeline(transaction=False)
+                stream_keys = set()
+                for event in events:
+                    stream_key = self._get_stream_key(event["session_id"])
+                    stream_keys.add(stream_key)
+                    pipe.xadd(
+                        stream_key,
+                        {"data": json.dumps(event, default=str)},
+                        maxlen=self._stream_maxlen,
+                        approximate=True,
+                    )
+                for stream_key in stream_keys:
+                    pipe.expire(stream_key, self._stream_ttl_seconds)
+                results = await pipe.execute()
+
+            logger.debug(f"Published {len(events)} events to {len(stream_keys)} streams")
+            return list(results[:len(events)])
+
+        except Exception as e:
+            logger.error(f"Failed to publish {len(events)} events to Redis Streams: {e}")
+            raise
+
     async def subscribe(
         self,
         session_id: str,
@@ -37,6 +37,15 @@ T = TypeVar("T")
 # Session ID validation pattern: YYYYMMDD_HHMMSS_hexchars
 SESSION_ID_PATTERN = re.compile(r"^\d{8}_\d{6}_[a-f0-9]{8}$")
 
+# Batch ID validation pattern: batch_YYYYMMDD_HHMMSS_hexchars
+BATCH_ID_PREFIX = "batch_"
+BATCH_ID_PATTERN = re.compile(r"^batch_\d{8}_\d{6}_[a-f0-9]{8}$")
+
+# Session statuses that will not change without a new run
+TERMINAL_STATUSES = frozenset(
+    {"complete", "completed", "partial", "failed", "cancelled", "error"}
+)
+
 # Retry configuration
 MAX_RETRIES = 3
 RETRY_DELAY_SECONDS = 0.1
@@ -89,6 +98,16 @@ def validate_session_id(session_id: str) -> None:
         )
 
 
+def generate_batch_id() -> str:
+    """Generate a unique batch ID (same timestamp+hex scheme as session IDs)."""
+    return f"{BATCH_ID_PREFIX}{generate_session_id()}"
+
+
+def is_valid_batch_id(batch_id: str) -> bool:
+    """Check batch ID format (rejects anything that could be a path)."""
+    return bool(batch_id) and BATCH_ID_PATTERN.match(batch_id) is not None
+
+
 def with_db_retry(
     max_retries: int = MAX_RETRIES,
     retry_delay: float = RETRY_DELAY_SECONDS,
@@ -258,6 +277,166 @@ class SessionService:
             logger.error(f"Session creation failed: {e}")
             raise SessionCreationError(f"Failed to create session: {e}") from e
 
+    @with_db_retry()
+    async def create_sessions_batch(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        tasks: list[str],
+        sessions_dir: Path,
+        batch_id: str,
+        model: Optional[str] = None,
+    ) -> list[Session]:
+        """
+        Create one session per task atomically, in a single transaction.
+
+        The user lookup and external mount resolution happen once for the whole
+        batch, and all database records are committed together. If anything
+        fails, every session directory created so far is removed and nothing
+        is committed.
+
+        Args:
+            db: Database session.
+            user_id: Owner user ID.
+            tasks: Task descriptions, one session is created per entry.
+            sessions_dir: User-specific sessions base directory (e.g., /users/username/sessions).
+            batch_id: Batch ID stored on every created session.
+            model: Claude model to use.
+
+        Returns:
+            The created Session database objects, in task order.
+
+        Raises:
+            SessionCreationError: If batch creation fails.
+        """
+        session_ids: list[str] = []
+        for _ in tasks:
+            session_id = generate_session_id()
+            # IDs generated within the same second only differ by the random part
+            while session_id in session_ids:
+                session_id = generate_session_id()
+            validate_session_id(session_id)
+            session_ids.append(session_id)
+
+        created_dirs: list[str] = []
+
+        try:
+            user_result = await db.execute(
+                select(User).where(User.id == user_id)
+            )
+            user = user_result.scalar_one_or_none()
+            owner_uid = user.linux_uid if user else None
+
+            session_manager = SessionManager(sessions_dir)
+            username = sessions_dir.parent.name
+
+            db_sessions: list[Session] = []
+            for session_id, task in zip(session_ids, tasks):
+                session_manager.create_session_directory(session_id, owner_uid=owner_uid)
+                created_dirs.append(session_id)
+                session_manager.setup_external_mounts(session_id, username)
+
+                db_sessions.append(Session(
+                    id=session_id,
+                    user_id=user_id,
+                    status="pending",
+                    task=task,
+                    model=model,
+                    working_dir=str(sessions_dir / session_id),
+                    batch_id=batch_id,
+                ))
+
+            db.add_all(db_sessions)
+
+            try:
+                await db.commit()
+            except Exception as db_error:
+                logger.error(
+                    f"Database commit failed for batch {batch_id}, "
+                    f"rolling back {len(created_dirs)} session directories: {db_error}"
+                )
+                await db.rollback()
+                raise SessionCreationError(
+                    f"Failed to create batch in database: {db_error}"
+                ) from db_error
+
+            logger.info(
+                f"Created batch {batch_id} with {len(db_sessions)} sessions "
+                f"for user: {user_id}"
+            )
+            return db_sessions
+
+        except SessionCreationError:
+            for session_id in created_dirs:
+                self._cleanup_file_session(session_id, sessions_dir)
+            raise
+        except Exception as e:
+            for session_id in created_dirs:
+                self._cleanup_file_session(session_id, sessions_dir)
+            logger.error(f"Batch creation failed: {e}")
+            raise SessionCreationError(f"Failed to create batch: {e}") from e
+
+    @with_db_retry()
+    async def get_batch_stats(
+        self,
+        db: AsyncSession,
+        batch_id: str,
+        user_id: str,
+    ) -> Optional[dict[str, Any]]:
+        """
+        Aggregate progress and cost for a batch with one grouped query.
+
+        Args:
+            db: Database session.
+            batch_id: The batch ID.
+            user_id: Owner user ID (batches of other users are not visible).
+
+        Returns:
+            Dict with total, finished, status_counts and summed metrics,
+            or None if the batch has no sessions for this user.
+        """
+        from sqlalchemy import func
+
+        query = (
+            select(
+                Session.status,
+                func.count(Session.id),
+                func.coalesce(func.sum(Session.cumulative_turns), 0),
+                func.coalesce(func.sum(Session.cumulative_duration_ms), 0),
+                func.coalesce(func.sum(Session.cumulative_cost_usd), 0.0),
+                func.coalesce(func.sum(Session.cumulative_input_tokens), 0),
+                func.coalesce(func.sum(Session.cumulative_output_tokens), 0),
+            )
+            .where(Session.batch_id == batch_id, Session.user_id == user_id)
+            .group_by(Session.status)
+        )
+        rows = (await db.execute(query)).all()
+        if not rows:
+            return None
+
+        stats: dict[str, Any] = {
+            "total": 0,
+            "finished": 0,
+            "status_counts": {},
+            "total_turns": 0,
+            "total_duration_ms": 0,
+            "total_cost_usd": 0.0,
+            "total_input_tokens": 0,
+            "total_output_tokens": 0,
+        }
+        for status, count, turns, duration, cost, input_tokens, output_tokens in rows:
+            stats["status_counts"][status] = count
+            stats["total"] += count
+            if status in TERMINAL_STATUSES:
+                stats["finished"] += count
+            stats["total_turns"] += int(turns)
+            stats["total_duration_ms"] += int(duration)
+            stats["total_cost_usd"] += float(cost)
+            stats["total_input_tokens"] += int(input_tokens)
+            stats["total_output_tokens"] += int(output_tokens)
+
+        return stats
+
     def _cleanup_file_session(self, session_id: str, sessions_dir: Path) -> None:
         """
         Clean up a session directory on creation failure.
@@ -205,6 +205,73 @@ class TaskQueue:
             logger.error(f"Redis error during enqueue: {e}")
             raise QueueUnavailableError(f"Queue error: {e}", cause=e) from e
 
+    async def enqueue_many(self, tasks: list[QueuedTask]) -> list[int]:
+        """
+        Add several tasks to the queue with one pipelined round trip.
+
+        The queue size limit is checked once for the whole batch: either
+        all tasks fit and are enqueued, or none are.
+
+        Args:
+            tasks: The tasks to queue.
+
+        Returns:
+            Queue positions (1-based), in the same order as tasks.
+
+        Raises:
+            QueueUnavailableError: If Redis is unavailable.
+            QueueOverflowError: If the batch does not fit within max_queue_size.
+        """
+        if not tasks:
+            return []
+
+        try:
+            pool = await self._ensure_pool()
+            async with redis.Redis(connection_pool=pool) as conn:
+                if self._max_queue_size > 0:
+                    current_size = await conn.zcard(self.QUEUE_KEY)
+                    if current_size + len(tasks) > self._max_queue_size:
+                        logger.warning(
+                            f"Queue overflow: {current_size}+{len(tasks)}/"
+                            f"{self._max_queue_size} - rejecting batch of {len(tasks)} tasks"
+                        )
+                        raise QueueOverflowError(
+                            f"Queue is full ({current_size}/{self._max_queue_size} tasks, "
+                            f"batch needs {len(tasks)})",
+                            current_size=current_size,
+                            max_size=self._max_queue_size,
+                        )
+
+                pipe = conn.pipeline(transaction=True)
+                for task in tasks:
+                    score = task.queued_at.timestamp() - (task.priority * 1_000_000)
+                    pipe.set(
+                        f"{self.TASK_KEY_PREFIX}{task.session_id}",
+                        task.to_json(),
+                        ex=self._task_ttl_seconds,
+                    )
+                    pipe.zadd(self.QUEUE_KEY, {task.session_id: score})
+                for task in tasks:
+                    pipe.zrank(self.QUEUE_KEY, task.session_id)
+                results = await pipe.execute()
+
+                ranks = results[2 * len(tasks):]
+                positions = [(rank or 0) + 1 for rank in ranks]
+
+                logger.info(
+                    f"Enqueued {len(tasks)} tasks in one pipeline "
+                    f"(positions {min(positions)}-{max(positions)})"
+                )
+                return positions
+        except QueueOverflowError:
+            raise  # Re-raise overflow error without wrapping
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Redis unavailable for batch enqueue: {e}")
+            raise QueueUnavailableError("Cannot enqueue tasks - queue unavailable", cause=e) from e
+        except RedisError as e:
+            logger.error(f"Redis error during batch enqueue: {e}")
+            raise QueueUnavailableError(f"Queue error: {e}", cause=e) from e
+
     async def dequeue(self) -> Optional[QueuedTask]:
         """
         Remove and return highest priority task.
@@ -337,6 +404,21 @@ class TaskQueue:
             await conn.sadd(f"{self.USER_ACTIVE_PREFIX}{user_id}:active", session_id)
             logger.debug(f"Marked {session_id} as active for user {user_id}")
 
+    async def mark_user_active_many(self, user_id: str, session_ids: list[str]) -> None:
+        """
+        Mark several tasks as active for user quota tracking in one call.
+
+        Args:
+            user_id: The user ID.
+            session_ids: The session IDs that are now active.
+        """
+        if not session_ids:
+            return
+        pool = await self._ensure_pool()
+        async with redis.Redis(connection_pool=pool) as conn:
+            await conn.sadd(f"{self.USER_ACTIVE_PREFIX}{user_id}:active", *session_ids)
+            logger.debug(f"Marked {len(session_ids)} sessions as active for user {user_id}")
+
     async def mark_user_inactive(self, user_id: str, session_id: str) -> None:
         """
         Mark task as inactive (completed/failed/cancelled).
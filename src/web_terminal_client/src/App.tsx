@@ -2442,6 +2442,14 @@ function App({ initialSessionId }: AppProps): JSX.Element {
             return prev;
           }
         }
+        if (event.type === 'tool_progress') {
+          // Keep only the latest live-output snapshot per tool
+          const toolName = event.data.tool_name;
+          const rest = prev.filter(
+            (e) => !(e.type === 'tool_progress' && e.data.tool_name === toolName)
+          );
+          return [...rest, event];
+        }
         const next = [...prev, event];
         const maxLines = config?.ui.max_output_lines ?? 1000;
         if (next.length > maxLines) {
@@ -3097,6 +3105,26 @@ function App({ initialSessionId }: AppProps): JSX.Element {
 
       const result = await response.json();
 
+      // The server delivered the answer to the suspended agent process and the
+      // run is already continuing: just follow its events
+      if (result.resumed) {
+        appendEvent({
+          type: 'user_message',
+          data: { text: `[Answer submitted: ${answerText}]` },
+          timestamp: new Date().toISOString(),
+          sequence: Date.now(),
+        });
+        setStatus('running');
+        setRunningStartTime(new Date().toISOString());
+        setCurrentSession((prev) => ({
+          ...prev!,
+          status: 'running',
+          updated_at: new Date().toISOString(),
+        }));
+        startSSE(currentSession.id, getLastServerSequence(events));
+        return;
+      }
+
       // Step 2: If the session can be resumed, resume it automatically
       if (result.can_resume) {
         // Add an event showing the user's answer
@@ -3710,6 +3738,25 @@ function App({ initialSessionId }: AppProps): JSX.Element {
           }
           break;
         }
+        case 'tool_progress': {
+          // Live output of a running command; replaced by tool_complete
+          const toolName = String(event.data.tool_name ?? 'Tool');
+          const tool = findOpenTool(toolName, undefined);
+          if (tool && tool.status === 'running') {
+            const recentLines = Array.isArray(event.data.recent_lines)
+              ? (event.data.recent_lines as unknown[]).map(String)
+              : [];
+            const bytes = Number(event.data.bytes ?? 0);
+            const lines = Number(event.data.lines ?? 0);
+            const seconds = Math.round(Number(event.data.elapsed_ms ?? 0) / 1000);
+            tool.output = [
+              `… running ${seconds}s: ${lines.toLocaleString()} lines, ${bytes.toLocaleString()} bytes so far`,
+              ...recentLines,
+            ].join('\n');
+            tool.outputTruncated = false;
+          }
+          break;
+        }
         case 'tool_input_ready': {
           // Update tool with complete input (arrives after streaming completes)
           const toolName = String(event.data.tool_name ?? 'Tool');
@@ -259,6 +259,12 @@ export function connectSSE(
           return;
         }
 
+        // Live tool output is ephemeral (sequence 0): never deduplicated
+        if (parsed.type === 'tool_progress') {
+          onEvent(parsed as SSEEvent);
+          return;
+        }
+
         const sseEvent = parsed as SSEEvent;
         const seq = sseEvent.sequence;
 
@@ -3,6 +3,7 @@ export type SSEEventType =
   | 'user_message'
   | 'tool_start'
   | 'tool_complete'
+  | 'tool_progress'
   | 'thinking'
   | 'message'
   | 'error'
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Fake Claude Code CLI for SDK client tests.
+
+Speaks the stream-json control protocol used by claude_agent_sdk closely
+enough for ClaudeSDKClient to connect, send queries and receive responses,
+without network access or an API key.
+
+Behaviour:
+- ``-v`` prints a version string and exits.
+- FAKE_CLAUDE_STARTUP_DELAY (seconds) delays the handshake to simulate the
+  CLI cold start (process boot, MCP server registration).
+- Every user message is answered with an assistant echo and a result. The
+  result text is ``pid=<pid> turn=<n>`` so tests can tell whether two runs
+  were served by the same process.
+"""
+import json
+import os
+import sys
+import time
+import uuid
+
+
+def _emit(message: dict) -> None:
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+def main() -> int:
+    if "-v" in sys.argv[1:]:
+        print("2.0.50 (Claude Code)")
+        return 0
+
+    time.sleep(float(os.environ.get("FAKE_CLAUDE_STARTUP_DELAY", "0")))
+
+    session_id = str(uuid.uuid4())
+    turn = 0
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        message = json.loads(line)
+
+        if message.get("type") == "control_request":
+            _emit({
+                "type": "control_response",
+                "response": {
+                    "subtype": "success",
+                    "request_id": message["request_id"],
+                    "response": {"commands": []},
+                },
+            })
+            continue
+
+        if message.get("type") != "user":
+            continue
+
+        turn += 1
+        prompt = message["message"]["content"]
+        text = f"pid={os.getpid()} turn={turn}"
+        _emit({"type": "system", "subtype": "init", "session_id": session_id})
+        _emit({
+            "type": "assistant",
+            "message": {
+                "model": "fake-model",
+                "content": [{"type": "text", "text": f"echo: {prompt}"}],
+            },
+            "parent_tool_use_id": None,
+        })
+        _emit({
+            "type": "result",
+            "subtype": "success",
+            "duration_ms": 1,
+            "duration_api_ms": 1,
+            "is_error": False,
+            "num_turns": turn,
+            "session_id": session_id,
+            "total_cost_usd": 0.0,
+            "usage": {"input_tokens": 1, "output_tokens": 1},
+            "result": text,
+        })
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,7 @@ Tests the enhanced Write tool functionality:
 - Overwrite protection (requires explicit flag)
 - File creation verification
 - Display path normalization
+- Append and chunked (open/chunk/commit) write modes
 """
 import os
 import stat
@@ -17,11 +18,13 @@ from unittest.mock import MagicMock, patch, AsyncMock
 import pytest
 
 # Import the functions to test
+from tools.ag3ntum.ag3ntum_write import tool as write_module
 from tools.ag3ntum.ag3ntum_write.tool import (
     _is_path_writable,
     _verify_file_written,
     _write_impl,
     create_write_tool,
+    discard_chunked_writes,
     AG3NTUM_WRITE_TOOL,
 )
 
@@ -752,6 +755,161 @@ class TestWriteTool:
             assert "1048576 bytes" in result["content"][0]["text"]
 
 
+class TestWriteModes:
+    """Tests for mode="append" and chunked writes."""
+
+    @pytest.fixture
+    def env(self, tmp_path):
+        """Patch validator/resolver; yield (target path, write coroutine)."""
+        target = tmp_path / "out" / "report.csv"
+        validator = MagicMock()
+        validator.validate_path.return_value.normalized = target
+        resolver = MagicMock()
+        resolver.normalize.return_value = "/workspace/out/report.csv"
+
+        async def write(**kwargs):
+            kwargs.setdefault("file_path", "out/report.csv")
+            kwargs.setdefault("content", "")
+            result = await _write_impl(session_id="test-session", **kwargs)
+            return result, result["content"][0]["text"]
+
+        with patch('tools.ag3ntum.ag3ntum_write.tool.get_path_validator', return_value=validator), \
+             patch('tools.ag3ntum.ag3ntum_write.tool.get_resolver_for_session', return_value=resolver), \
+             patch('tools.ag3ntum.ag3ntum_write.tool.is_scanner_enabled', return_value=False), \
+             patch.object(write_module, "_chunked_writes", {}):
+            yield target, write, validator
+
+    @staticmethod
+    def _write_id(text: str) -> str:
+        return text.split("**write_id:** `")[1].split("`")[0]
+
+    @pytest.mark.asyncio
+    async def test_append_creates_and_extends(self, env):
+        """Append creates the file and parents, then extends it."""
+        target, write, _ = env
+        result, text = await write(content="a,b\n", mode="append")
+        assert not result.get("isError")
+        result, text = await write(content="1,2\n", mode="append")
+        assert target.read_text() == "a,b\n1,2\n"
+        assert "**Appended:** 4 bytes" in text and "**Size:** 8 bytes" in text
+
+    @pytest.mark.asyncio
+    async def test_chunked_write_commits_atomically(self, env):
+        """Chunks are staged; the target only appears on commit."""
+        target, write, _ = env
+        result, text = await write(content="id,value\n", mode="open")
+        assert not result.get("isError")
+        write_id = self._write_id(text)
+
+        for i in range(3):
+            result, _ = await write(file_path="", content=f"{i},x", mode="chunk", write_id=write_id)
+            assert not result.get("isError")
+            await write(file_path="", content="\n", mode="chunk", write_id=write_id)
+        assert not target.exists()
+
+        result, text = await write(file_path="", mode="commit", write_id=write_id)
+        assert not result.get("isError")
+        assert target.read_text() == "id,value\n0,x\n1,x\n2,x\n"
+        assert "**Lines:** 4" in text and "**Chunks:** 7" in text
+        assert os.listdir(target.parent) == ["report.csv"]
+
+        result, text = await write(file_path="", mode="chunk", write_id=write_id)
+        assert result["isError"] and "Unknown or expired" in text
+
+    @pytest.mark.asyncio
+    async def test_chunked_write_respects_overwrite_and_abort(self, env):
+        """Open refuses existing files without the flag; abort removes the staging file."""
+        target, write, _ = env
+        target.parent.mkdir()
+        target.write_text("keep\n")
+        result, text = await write(content="x", mode="open")
+        assert result["isError"] and "already exists" in text
+
+        result, text = await write(content="new\n", mode="open", overwrite_existing=True)
+        write_id = self._write_id(text)
+        await write(file_path="", mode="abort", write_id=write_id)
+        assert target.read_text() == "keep\n"
+        assert os.listdir(target.parent) == ["report.csv"]
+
+        result, text = await write(content="new\n", mode="open", overwrite_existing=True)
+        await write(file_path="", mode="commit", write_id=self._write_id(text))
+        assert target.read_text() == "new\n"
+
+    @pytest.mark.asyncio
+    async def test_each_chunk_validated_and_scanned(self, env):
+        """Path validation and secret redaction run for every chunk."""
+        from src.core.path_validator import PathValidationError
+
+        target, write, validator = env
+        _, text = await write(content="start\n", mode="open")
+        write_id = self._write_id(text)
+
+        scan = MagicMock(has_secrets=True, redacted_text="KEY=****\n", secret_count=1,
+                         secret_types={"api_key"})
+        with patch('tools.ag3ntum.ag3ntum_write.tool.is_scanner_enabled', return_value=True), \
+             patch('tools.ag3ntum.ag3ntum_write.tool.scan_and_redact', return_value=scan):
+            result, text = await write(file_path="", content="KEY=sk-123\n",
+                                       mode="chunk", write_id=write_id)
+        assert "Security Notice" in text
+        assert validator.validate_path.call_count == 2
+
+        validator.validate_path.side_effect = PathValidationError("denied", "x", "mount removed")
+        result, text = await write(file_path="", content="more", mode="chunk", write_id=write_id)
+        assert result["isError"] and "mount removed" in text
+        assert os.listdir(target.parent) == []
+        assert write_id not in write_module._chunked_writes
+
+    @pytest.mark.asyncio
+    async def test_staging_file_swapped_for_symlink(self, env, tmp_path):
+        """Chunks never follow a symlink put in place of the staging file."""
+        target, write, _ = env
+        outside = tmp_path / "outside.txt"
+        outside.write_text("original\n")
+
+        _, text = await write(content="first\n", mode="open")
+        write_id = self._write_id(text)
+        staging = write_module._chunked_writes[write_id].tmp_path
+        staging.unlink()
+        staging.symlink_to(outside)
+
+        result, _ = await write(file_path="", content="second\n", mode="chunk", write_id=write_id)
+        assert not result.get("isError")
+        assert outside.read_text() == "original\n"
+
+        result, text = await write(file_path="", mode="commit", write_id=write_id)
+        assert result["isError"] and "staging file was replaced" in text
+        assert outside.read_text() == "original\n"
+        assert not target.exists()
+        assert os.listdir(target.parent) == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_mode_and_session_cleanup(self, env):
+        """Unknown modes are rejected; open writes can be discarded per session."""
+        target, write, _ = env
+        result, text = await write(content="x", mode="truncate")
+        assert result["isError"] and "Invalid mode" in text
+
+        await write(content="x", mode="open")
+        assert discard_chunked_writes("other-session") == 0
+        assert discard_chunked_writes("test-session") == 1
+        assert os.listdir(target.parent) == []
+
+    @pytest.mark.asyncio
+    async def test_expired_writes_swept_by_chunk_calls(self, env):
+        """Chunk calls also discard writes idle for the TTL, closing their staging files."""
+        target, write, _ = env
+        _, text = await write(content="stale\n", mode="open")
+        stale = write_module._chunked_writes[self._write_id(text)]
+        _, text = await write(content="live\n", mode="open")
+        live_id = self._write_id(text)
+        stale.last_used -= write_module.CHUNKED_WRITE_TTL_SECONDS + 1
+
+        result, _ = await write(file_path="", content="more\n", mode="chunk", write_id=live_id)
+        assert not result.get("isError")
+        assert list(write_module._chunked_writes) == [live_id]
+        assert stale.fd == -1 and not stale.tmp_path.exists()
+
+
 class TestIsPathWritableEdgeCases:
     """Additional edge case tests for _is_path_writable."""
 
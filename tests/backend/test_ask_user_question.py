@@ -1181,3 +1181,89 @@ class TestAskUserQuestionMocked:
         assert "question_pending" in event_types, "question_pending event missing"
 
         print("✓ Events recorded in correct sequence for frontend buffering")
+
+
+# =============================================================================
+# Hot Resume Tests (suspended client, answer delivered in-process)
+# =============================================================================
+
+class TestHotResume:
+    """Tests for continuing a paused run with the answer without a cold resume."""
+
+    def test_pop_asked_question_clears_marker(self):
+        """pop_asked_question() returns the run's question once."""
+        from tools.ag3ntum.ag3ntum_ask import tool as ask_tool
+
+        ask_tool._asked_questions["hot_session"] = "q1"
+        assert ask_tool.pop_asked_question("hot_session") == "q1"
+        assert ask_tool.pop_asked_question("hot_session") is None
+
+    def test_answer_prompt_contains_answer(self):
+        """The follow-up prompt carries only the answer in resume-context tags."""
+        from src.api.routes.sessions import HOT_RESUME_MESSAGE, build_answer_prompt
+
+        prompt = build_answer_prompt("Python")
+        assert prompt.startswith("<resume-context>")
+        assert "  A: Python\n</resume-context>" in prompt
+        assert prompt.endswith(HOT_RESUME_MESSAGE)
+
+    @pytest.mark.asyncio
+    async def test_resume_with_answer_reuses_paused_params(self):
+        """The follow-up run keeps the paused run's config and resumes the session."""
+        from src.services.agent_runner import AgentRunner, TaskParams
+
+        runner = AgentRunner.__new__(AgentRunner)
+        runner._running_tasks = {}
+        runner._paused_params = {}
+        started = []
+
+        async def start_task(params, before_run=None):
+            if runner._running_tasks:
+                raise RuntimeError("Task already running")
+            started.append((params, before_run))
+
+        runner.start_task = start_task
+
+        assert await runner.resume_with_answer("s1", "answer") is False
+
+        runner._paused_params["s1"] = TaskParams(
+            task="original", session_id="s1", user_id="u1", sessions_dir="/tmp",
+            model="model-a", thinking_tokens=1024,
+        )
+        assert runner.has_paused_run("s1")
+
+        # Another run took the session's slot first: no start, no pre-run step
+        runner._running_tasks["other"] = object()
+        assert await runner.resume_with_answer("s1", "answer") is False
+        runner._running_tasks.clear()
+
+        async def record() -> None:
+            pass
+
+        assert await runner.resume_with_answer("s1", "answer", before_run=record) is True
+
+        params, before_run = started[0]
+        assert before_run is record
+        assert (params.task, params.resume_session_id, params.fork_session) == (
+            "answer", "s1", False,
+        )
+        assert (params.model, params.thinking_tokens) == ("model-a", 1024)
+
+    @pytest.mark.asyncio
+    async def test_before_run_awaited_before_the_agent(self):
+        """The pre-run step (recording the user message) precedes the run's own events."""
+        from src.services.agent_runner import AgentRunner, TaskParams
+
+        runner = AgentRunner.__new__(AgentRunner)
+        order = []
+
+        async def run_agent(params):
+            order.append("run")
+
+        async def before_run():
+            order.append("recorded")
+
+        runner._run_agent = run_agent
+        params = TaskParams(task="answer", session_id="s1", user_id="u1", sessions_dir="/tmp")
+        await runner._run_agent_traced(params, before_run)
+        assert order == ["recorded", "run"]
@@ -0,0 +1,328 @@
+"""
+Tests for the warm SDK client pool (src/core/client_pool.py).
+
+Uses tests/backend/fake_claude_cli.py as the CLI binary so real
+ClaudeSDKClient connections are exercised without an API key.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from claude_agent_sdk import ClaudeAgentOptions, HookMatcher, ResultMessage
+
+from src.core import client_pool
+from src.core.client_pool import SDKClientPool, options_fingerprint
+
+FAKE_CLI = Path(__file__).parent / "fake_claude_cli.py"
+
+
+@pytest.fixture
+def fake_cli(tmp_path: Path) -> Path:
+    """Executable wrapper running the fake CLI with this interpreter."""
+    wrapper = tmp_path / "claude"
+    wrapper.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_CLI}" "$@"\n')
+    wrapper.chmod(0o755)
+    return wrapper
+
+
+def _options(fake_cli: Path, tmp_path: Path, **overrides) -> ClaudeAgentOptions:
+    values = {
+        "system_prompt": "You are a test agent.",
+        "model": "fake-model",
+        "cwd": str(tmp_path),
+        "cli_path": str(fake_cli),
+        "env": {"CLAUDE_CONFIG_DIR": str(tmp_path)},
+    }
+    values.update(overrides)
+    return ClaudeAgentOptions(**values)
+
+
+async def _run(pooled, prompt: str = "hello") -> ResultMessage:
+    await pooled.client.query(prompt)
+    result = None
+    async for message in pooled.client.receive_response():
+        if isinstance(message, ResultMessage):
+            result = message
+    return result
+
+
+class TestOptionsFingerprint:
+    """Tests for options_fingerprint()."""
+
+    @pytest.mark.unit
+    def test_per_run_fields_ignored(self, fake_cli: Path, tmp_path: Path) -> None:
+        """Resume target and callbacks do not change the key."""
+        async def allow(*args):
+            return None
+
+        base = _options(fake_cli, tmp_path)
+        resumed = _options(fake_cli, tmp_path, resume="abc", can_use_tool=None)
+        assert options_fingerprint(base) == options_fingerprint(resumed)
+
+        with_cb_1 = _options(fake_cli, tmp_path, can_use_tool=allow)
+        with_cb_2 = _options(fake_cli, tmp_path, can_use_tool=lambda *a: None)
+        assert options_fingerprint(with_cb_1) == options_fingerprint(with_cb_2)
+        assert options_fingerprint(with_cb_1) != options_fingerprint(base)
+
+    @pytest.mark.unit
+    def test_spawn_fields_change_key(self, fake_cli: Path, tmp_path: Path) -> None:
+        """System prompt, model and MCP server names are part of the key."""
+        base = _options(fake_cli, tmp_path)
+        assert options_fingerprint(base) != options_fingerprint(
+            _options(fake_cli, tmp_path, system_prompt="Other prompt")
+        )
+        assert options_fingerprint(base) != options_fingerprint(
+            _options(fake_cli, tmp_path, model="other-model")
+        )
+        server_a = {"ag3ntum": {"type": "sdk", "name": "ag3ntum", "instance": object()}}
+        server_b = {"ag3ntum": {"type": "sdk", "name": "ag3ntum", "instance": object()}}
+        assert options_fingerprint(
+            _options(fake_cli, tmp_path, mcp_servers=server_a)
+        ) == options_fingerprint(_options(fake_cli, tmp_path, mcp_servers=server_b))
+
+
+class TestSDKClientPool:
+    """Tests for SDKClientPool lease/park/recycle behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_disabled_pool_connects_per_run(self, fake_cli: Path, tmp_path: Path) -> None:
+        """With max_size 0 every run gets a fresh process."""
+        pool = SDKClientPool(max_size=0)
+        options = _options(fake_cli, tmp_path)
+
+        async with pool.lease(options) as pooled:
+            first = await _run(pooled)
+            pooled.keep(first.session_id)
+        async with pool.lease(_options(fake_cli, tmp_path, resume=first.session_id)) as pooled:
+            second = await _run(pooled)
+
+        assert first.result.split()[0] != second.result.split()[0]
+        assert pool.idle_count == 0
+
+    @pytest.mark.asyncio
+    async def test_follow_up_run_reuses_parked_client(self, fake_cli: Path, tmp_path: Path) -> None:
+        """A resume of the parked conversation is bound to the same process."""
+        pool = SDKClientPool(max_size=2)
+        try:
+            async with pool.lease(_options(fake_cli, tmp_path)) as pooled:
+                first = await _run(pooled)
+                assert pooled.reused is False
+                pooled.keep(first.session_id)
+            assert pool.idle_count == 1
+
+            resume = _options(fake_cli, tmp_path, resume=first.session_id)
+            async with pool.lease(resume) as pooled:
+                assert pooled.reused is True
+                assert pooled.client.options is resume
+                second = await _run(pooled)
+                pooled.keep(second.session_id)
+
+            pid_1, _ = first.result.split()
+            pid_2, turn_2 = second.result.split()
+            assert pid_1 == pid_2
+            assert turn_2 == "turn=2"
+            assert pool.stats()["hits"] == 1
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_new_conversation_does_not_take_parked_client(
+        self, fake_cli: Path, tmp_path: Path
+    ) -> None:
+        """A parked client is only bound to the conversation it holds."""
+        pool = SDKClientPool(max_size=2)
+        try:
+            async with pool.lease(_options(fake_cli, tmp_path)) as pooled:
+                first = await _run(pooled)
+                pooled.keep(first.session_id)
+
+            forked = _options(fake_cli, tmp_path, resume=first.session_id, fork_session=True)
+            async with pool.lease(forked) as pooled:
+                assert pooled.reused is False
+                second = await _run(pooled)
+
+            assert first.result.split()[0] != second.result.split()[0]
+            assert pool.idle_count == 1
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_fresh_session_spawns_its_own_process(
+        self, fake_cli: Path, tmp_path: Path
+    ) -> None:
+        """A new session never continues a parked conversation, even with equal options."""
+        pool = SDKClientPool(max_size=2)
+        try:
+            options = _options(fake_cli, tmp_path)
+            async with pool.lease(options) as pooled:
+                first = await _run(pooled)
+                pooled.keep(first.session_id)
+
+            async with pool.lease(_options(fake_cli, tmp_path)) as pooled:
+                assert pooled.reused is False
+                second = await _run(pooled)
+                pooled.keep(second.session_id)
+
+            assert first.result.split()[0] != second.result.split()[0]
+            assert second.result.endswith("turn=1")
+            assert pool.stats()["hits"] == 0 and pool.idle_count == 2
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_rebinding_replaces_hook_callbacks(self, fake_cli: Path, tmp_path: Path) -> None:
+        """A reused client calls the new run's hooks; the hook layout is part of the key."""
+        async def first_hook(*args):
+            return {}
+
+        async def second_hook(*args):
+            return {}
+
+        def hooks(callback, matcher="Bash"):
+            return {"PreToolUse": [HookMatcher(matcher=matcher, hooks=[callback])]}
+
+        assert options_fingerprint(_options(fake_cli, tmp_path, hooks=hooks(first_hook))) != (
+            options_fingerprint(_options(fake_cli, tmp_path, hooks=hooks(first_hook, "Write")))
+        )
+        pool = SDKClientPool(max_size=2)
+        try:
+            async with pool.lease(_options(fake_cli, tmp_path, hooks=hooks(first_hook))) as pooled:
+                first = await _run(pooled)
+                pooled.keep(first.session_id)
+
+            resume = _options(fake_cli, tmp_path, hooks=hooks(second_hook), resume=first.session_id)
+            async with pool.lease(resume) as pooled:
+                assert pooled.reused is True
+                assert pooled.client._query.hook_callbacks == {"hook_0": second_hook}
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_unchecked_sdk_version_disables_reuse(
+        self, fake_cli: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Private SDK state is only rewritten for the checked SDK versions."""
+        monkeypatch.setattr(client_pool.claude_agent_sdk, "__version__", "0.2.0")
+        client_pool.rebinding_supported.cache_clear()
+        pool = SDKClientPool(max_size=2)
+        try:
+            async with pool.lease(_options(fake_cli, tmp_path)) as pooled:
+                first = await _run(pooled)
+                pooled.keep(first.session_id)
+
+            async with pool.lease(_options(fake_cli, tmp_path, resume=first.session_id)) as pooled:
+                assert pooled.reused is False
+                second = await _run(pooled)
+            assert first.result.split()[0] != second.result.split()[0]
+        finally:
+            await pool.close()
+            client_pool.rebinding_supported.cache_clear()
+
+    @pytest.mark.asyncio
+    async def test_recycled_after_max_runs(self, fake_cli: Path, tmp_path: Path) -> None:
+        """A client that reached max_runs_per_client is closed, not parked."""
+        pool = SDKClientPool(max_size=2, max_runs_per_client=1)
+        async with pool.lease(_options(fake_cli, tmp_path)) as pooled:
+            result = await _run(pooled)
+            pooled.keep(result.session_id)
+        assert pool.idle_count == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_run_discards_client(self, fake_cli: Path, tmp_path: Path) -> None:
+        """An exception inside the lease closes the client."""
+        pool = SDKClientPool(max_size=2)
+        with pytest.raises(RuntimeError):
+            async with pool.lease(_options(fake_cli, tmp_path)) as pooled:
+                result = await _run(pooled)
+                pooled.keep(result.session_id)
+                raise RuntimeError("boom")
+        assert pool.idle_count == 0
+
+    @pytest.mark.asyncio
+    async def test_idle_ttl_and_invalidate(self, fake_cli: Path, tmp_path: Path) -> None:
+        """Parked clients expire after the idle TTL and on invalidate()."""
+        pool = SDKClientPool(max_size=2, idle_ttl_seconds=0.05)
+        async with pool.lease(_options(fake_cli, tmp_path)) as pooled:
+            result = await _run(pooled)
+            pooled.keep(result.session_id)
+        assert pool.idle_count == 1
+        await asyncio.sleep(0.2)
+        assert pool.idle_count == 0
+
+        pool = SDKClientPool(max_size=2)
+        async with pool.lease(_options(fake_cli, tmp_path)) as pooled:
+            result = await _run(pooled)
+            pooled.keep(result.session_id)
+        assert await pool.invalidate() == 1
+        assert pool.idle_count == 0
+
+
+class TestSuspendedConversations:
+    """Tests for suspending clients of runs paused on AskUserQuestion."""
+
+    @pytest.mark.asyncio
+    async def test_answer_resumes_suspended_client(self, fake_cli: Path, tmp_path: Path) -> None:
+        """With the idle pool disabled, a suspended conversation keeps its process."""
+        pool = SDKClientPool(max_size=0, suspend_ttl_seconds=60)
+        try:
+            async with pool.lease(_options(fake_cli, tmp_path)) as pooled:
+                first = await _run(pooled)
+                pooled.suspend(first.session_id)
+            assert pool.idle_count == 0
+            assert pool.has_suspended(first.session_id)
+
+            resume = _options(fake_cli, tmp_path, resume=first.session_id)
+            async with pool.lease(resume) as pooled:
+                assert pooled.reused is True
+                second = await _run(pooled, "answer")
+                pooled.keep(second.session_id)
+
+            assert first.result.split()[0] == second.result.split()[0]
+            assert second.result.split()[1] == "turn=2"
+            assert not pool.has_suspended(first.session_id)
+            assert pool.suspended_count == 0
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_suspension_ttl_and_mismatch_fall_back_cold(
+        self, fake_cli: Path, tmp_path: Path
+    ) -> None:
+        """Expired or no-longer-matching suspended clients are closed."""
+        pool = SDKClientPool(max_size=0, suspend_ttl_seconds=0.05)
+        async with pool.lease(_options(fake_cli, tmp_path)) as pooled:
+            result = await _run(pooled)
+            pooled.suspend(result.session_id)
+        assert pool.has_suspended(result.session_id)
+        await asyncio.sleep(0.2)
+        assert not pool.has_suspended(result.session_id)
+
+        pool = SDKClientPool(max_size=0, suspend_ttl_seconds=60)
+        try:
+            async with pool.lease(_options(fake_cli, tmp_path)) as pooled:
+                first = await _run(pooled)
+                pooled.suspend(first.session_id)
+            changed = _options(
+                fake_cli, tmp_path, resume=first.session_id, system_prompt="Changed prompt"
+            )
+            async with pool.lease(changed) as pooled:
+                assert pooled.reused is False
+                second = await _run(pooled)
+            assert first.result.split()[0] != second.result.split()[0]
+            assert pool.suspended_count == 0
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_suspend_is_keep_when_disabled(self, fake_cli: Path, tmp_path: Path) -> None:
+        """Without suspend_ttl_seconds a suspended run is parked like any other."""
+        pool = SDKClientPool(max_size=2)
+        try:
+            async with pool.lease(_options(fake_cli, tmp_path)) as pooled:
+                result = await _run(pooled)
+                pooled.suspend(result.session_id)
+            assert pool.idle_count == 1
+            assert not pool.has_suspended(result.session_id)
+        finally:
+            await pool.close()
@@ -0,0 +1,290 @@
+"""
+Tests for atomic search/replace edits (src/core/file_edit.py), Ag3ntumEdit
+and Ag3ntumMultiEdit.
+
+Covers:
+- Single-pass replacement semantics (unique, replace_all, first occurrence)
+- Dependent edits applied in order, chosen from the edit list alone
+- Streaming parity with in-memory edits, matches across chunk boundaries
+- Precondition hash and concurrent-modification detection
+- Temp file + replace: mode kept, symlinks kept, original untouched on error
+- MultiEdit applying several edits to one file and all-or-nothing across files
+"""
+import hashlib
+import os
+import random
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core import file_edit
+from src.core.file_edit import (
+    FileEditError,
+    Replacement,
+    apply_edits,
+    file_sha256,
+    prepare_edits,
+)
+from tools.ag3ntum.ag3ntum_edit.tool import create_edit_tool
+from tools.ag3ntum.ag3ntum_multiedit.tool import create_multiedit_tool
+
+
+def _write(path: Path, text: str) -> Path:
+    path.write_bytes(text.encode("utf-8"))
+    return path
+
+
+class TestApplyEdits:
+    """Tests for prepare_edits() / apply_edits()."""
+
+    @pytest.mark.unit
+    def test_unique_and_replace_all(self, tmp_path: Path) -> None:
+        """A unique match is replaced; duplicates need replace_all."""
+        path = _write(tmp_path / "f.py", "a = 1\nb = 1\n")
+        with pytest.raises(FileEditError) as exc:
+            apply_edits(path, [Replacement("= 1", "= 2")])
+        assert (exc.value.edit_index, exc.value.count) == (0, 2)
+        assert path.read_text() == "a = 1\nb = 1\n"
+
+        result = apply_edits(path, [Replacement("= 1", "= 2", replace_all=True)])
+        assert result.counts == [2]
+        assert path.read_text() == "a = 2\nb = 2\n"
+        assert result.sha256 == file_sha256(path)
+
+        with pytest.raises(FileEditError) as exc:
+            apply_edits(path, [Replacement("missing", "x")])
+        assert (exc.value.edit_index, exc.value.count) == (0, 0)
+
+    @pytest.mark.unit
+    def test_several_edits_in_one_pass(self, tmp_path: Path) -> None:
+        """Independent edits are matched against the original content, first occurrence each."""
+        path = _write(tmp_path / "f.txt", "alpha beta alpha gamma\n")
+        result = apply_edits(path, [
+            Replacement("alpha", "one", require_unique=False),
+            Replacement("beta", "two", require_unique=False),
+            Replacement("gamma", "delta", require_unique=False),
+        ])
+        assert path.read_text() == "one two alpha delta\n"
+        assert result.counts == [2, 1, 1]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("stream_threshold", [None, 0])
+    def test_dependent_edits_applied_in_order(self, tmp_path: Path, stream_threshold) -> None:
+        """An edit whose old string an earlier edit produces is applied after it."""
+        path = _write(tmp_path / "f.py", "x=1\ny=0\n")
+        with patch.object(file_edit, "CHUNK_SIZE", 3):
+            result = apply_edits(path, [
+                Replacement("x=1", "x=2", require_unique=False),
+                Replacement("x=2", "x=3", require_unique=False),
+            ], stream_threshold=stream_threshold)
+        assert path.read_text() == "x=3\ny=0\n"
+        assert result.counts == [1, 1]
+        assert result.sha256 == file_sha256(path)
+        assert os.listdir(tmp_path) == ["f.py"]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("stream_threshold", [None, 0])
+    def test_overlapping_edits_reported(self, tmp_path: Path, stream_threshold) -> None:
+        """An edit whose text an earlier edit replaced names that edit."""
+        content = "def a():\n    pass\n\ndef b():\n    pass\n"
+        path = _write(tmp_path / "f.py", content)
+        with pytest.raises(FileEditError) as exc:
+            apply_edits(path, [
+                Replacement("def a():\n    pass", "def a():\n    return 1", require_unique=False),
+                Replacement("    pass\n\ndef b():", "    pass\n\n\ndef b():", require_unique=False),
+            ], stream_threshold=stream_threshold)
+        assert (exc.value.edit_index, exc.value.overlaps) == (1, 0)
+        assert "edit 1 overlaps edit 0" in exc.value.reason
+        assert path.read_text() == content
+        assert os.listdir(tmp_path) == ["f.py"]
+
+    @pytest.mark.unit
+    def test_contained_old_strings_applied_in_order(self, tmp_path: Path) -> None:
+        """An old string contained in another one is matched after the earlier edit."""
+        path = _write(tmp_path / "f.txt", "foobar foo\n")
+        apply_edits(path, [
+            Replacement("foobar", "FB"),
+            Replacement("foo", "F", require_unique=False),
+        ])
+        assert path.read_text() == "FB F\n"
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("stream_threshold", [None, 0])
+    def test_mode_does_not_depend_on_content(self, tmp_path: Path, stream_threshold) -> None:
+        """The same dependent edit list is applied in order whatever the file holds."""
+        edits = [
+            Replacement("foo", "bar", require_unique=False),
+            Replacement("bar", "Q", require_unique=False),
+        ]
+        with_bar = apply_edits(_write(tmp_path / "a.txt", "foo baz bar"), edits, stream_threshold=stream_threshold)
+        without_bar = apply_edits(_write(tmp_path / "b.txt", "foo baz"), edits, stream_threshold=stream_threshold)
+
+        # In order both times: the second edit sees the first one's output
+        assert (tmp_path / "a.txt").read_text() == "Q baz bar"
+        assert (tmp_path / "b.txt").read_text() == "Q baz"
+        assert (with_bar.counts, without_bar.counts) == ([1, 2], [1, 1])
+
+    @pytest.mark.unit
+    def test_newlines_normalized_like_read_text(self, tmp_path: Path) -> None:
+        """CRLF content is matched with \\n and written back with \\n."""
+        path = tmp_path / "f.txt"
+        path.write_bytes(b"one\r\ntwo\r\n")
+        apply_edits(path, [Replacement("one\ntwo", "1\n2")])
+        assert path.read_bytes() == b"1\n2\n"
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("chunk", [7, 64, 1000])
+    def test_streaming_matches_in_memory(self, tmp_path: Path, chunk: int) -> None:
+        """Streamed output equals the in-memory result, including boundary matches."""
+        rng = random.Random(chunk)
+        words = ["needle", "hay", "ñandú", "stack\r\n", "needlepoint", "\n"]
+        text = "".join(rng.choice(words) for _ in range(2000))
+        edits = [
+            Replacement("needle", "pin", replace_all=True),
+            Replacement("ñandú", "emu", replace_all=True),
+            Replacement("stack\nhay", "HAYSTACK", replace_all=True),
+        ]
+        memory = _write(tmp_path / "memory.txt", text)
+        streamed = _write(tmp_path / "streamed.txt", text)
+
+        expected = apply_edits(memory, edits)
+        with patch.object(file_edit, "CHUNK_SIZE", chunk):
+            result = apply_edits(streamed, edits, stream_threshold=0)
+        assert result.streamed and not expected.streamed
+        assert streamed.read_bytes() == memory.read_bytes()
+        assert result.counts == expected.counts
+        assert result.sha256 == expected.sha256 == file_sha256(streamed)
+        assert result.previous_sha256 == hashlib.sha256(text.encode()).hexdigest()
+
+    @pytest.mark.unit
+    def test_streaming_failure_leaves_file_and_no_temp(self, tmp_path: Path) -> None:
+        """A missing string found only after streaming discards the temp file."""
+        path = _write(tmp_path / "f.txt", "abc\n" * 100)
+        with patch.object(file_edit, "CHUNK_SIZE", 16), pytest.raises(FileEditError):
+            apply_edits(path, [Replacement("abc", "x")], stream_threshold=0)
+        assert path.read_text() == "abc\n" * 100
+        assert os.listdir(tmp_path) == ["f.txt"]
+
+    @pytest.mark.unit
+    def test_expected_hash(self, tmp_path: Path) -> None:
+        """The edit only applies to the content the caller last saw."""
+        path = _write(tmp_path / "f.txt", "v1\n")
+        seen = file_sha256(path)
+        path.write_text("v2\n")
+        with pytest.raises(FileEditError, match="changed"):
+            apply_edits(path, [Replacement("v", "w")], expected_sha256=seen)
+        assert path.read_text() == "v2\n"
+
+        result = apply_edits(path, [Replacement("v", "w")], expected_sha256=file_sha256(path))
+        # The returned hash chains into the next edit
+        apply_edits(path, [Replacement("w", "x")], expected_sha256=result.sha256)
+        assert path.read_text() == "x2\n"
+
+    @pytest.mark.unit
+    def test_concurrent_modification_detected_at_commit(self, tmp_path: Path) -> None:
+        """A write between prepare and commit aborts the edit."""
+        path = _write(tmp_path / "f.txt", "old\n")
+        prepared = prepare_edits(path, [Replacement("old", "new")])
+        path.write_text("someone else's content\n")
+        with pytest.raises(FileEditError, match="modified"):
+            prepared.commit()
+        assert path.read_text() == "someone else's content\n"
+        assert os.listdir(tmp_path) == ["f.txt"]
+
+    @pytest.mark.unit
+    def test_mode_and_symlink_preserved(self, tmp_path: Path) -> None:
+        """The target keeps its mode; a symlink keeps pointing at it."""
+        target = _write(tmp_path / "script.sh", "echo old\n")
+        target.chmod(0o750)
+        link = tmp_path / "link.sh"
+        link.symlink_to(target)
+
+        apply_edits(link, [Replacement("old", "new")])
+        assert link.is_symlink()
+        assert target.read_text() == "echo new\n"
+        assert target.stat().st_mode & 0o777 == 0o750
+
+    @pytest.mark.unit
+    def test_invalid_utf8_rejected(self, tmp_path: Path) -> None:
+        """Binary content is not rewritten."""
+        path = tmp_path / "f.bin"
+        path.write_bytes(b"abc\xff\xfe")
+        with pytest.raises(FileEditError, match="UTF-8"):
+            apply_edits(path, [Replacement("abc", "x")])
+        assert path.read_bytes() == b"abc\xff\xfe"
+
+
+@pytest.fixture
+def validator(tmp_path: Path):
+    """PathValidator stand-in resolving names inside tmp_path."""
+    mock = MagicMock()
+    mock.validate_path.side_effect = lambda p, operation=None: MagicMock(normalized=tmp_path / p)
+    return mock
+
+
+class TestEditTools:
+    """Tests for Ag3ntumEdit and Ag3ntumMultiEdit handlers."""
+
+    @pytest.mark.asyncio
+    async def test_edit_reports_hash_and_checks_expected(self, tmp_path: Path, validator) -> None:
+        """Edit returns the new hash and rejects a stale expected_hash."""
+        path = _write(tmp_path / "main.py", "def old():\n    pass\n")
+        stale = file_sha256(path)
+        tool = create_edit_tool("test-session")
+        with patch("tools.ag3ntum.ag3ntum_edit.tool.get_path_validator", return_value=validator):
+            result = await tool.handler({
+                "file_path": "main.py", "old_string": "old", "new_string": "new",
+                "replace_all": False, "expected_hash": "",
+            })
+            assert not result.get("isError")
+            assert f"**SHA-256:** `{file_sha256(path)}`" in result["content"][0]["text"]
+
+            result = await tool.handler({
+                "file_path": "main.py", "old_string": "new", "new_string": "newer",
+                "expected_hash": stale,
+            })
+            assert result["isError"]
+            assert path.read_text() == "def new():\n    pass\n"
+
+            result = await tool.handler({"file_path": "main.py", "old_string": "nope",
+                                         "new_string": "x"})
+            assert "String not found in file." in result["content"][0]["text"]
+
+    @pytest.mark.asyncio
+    async def test_multiedit_same_file_and_all_or_nothing(self, tmp_path: Path, validator) -> None:
+        """Several edits to one file all land; a failing edit leaves every file untouched."""
+        a = _write(tmp_path / "a.txt", "one two three\n")
+        b = _write(tmp_path / "b.txt", "four\n")
+        tool = create_multiedit_tool("test-session")
+        with patch("tools.ag3ntum.ag3ntum_multiedit.tool.get_path_validator",
+                   return_value=validator):
+            result = await tool.handler({"edits": [
+                {"file_path": "a.txt", "old_string": "one", "new_string": "1"},
+                {"file_path": "b.txt", "old_string": "four", "new_string": "4"},
+                {"file_path": "a.txt", "old_string": "three", "new_string": "3"},
+            ]})
+            assert not result.get("isError")
+            assert a.read_text() == "1 two 3\n"
+            assert b.read_text() == "4\n"
+            assert "`a.txt`: 2 replacements" in result["content"][0]["text"]
+
+            result = await tool.handler({"edits": [
+                {"file_path": "a.txt", "old_string": "two", "new_string": "2"},
+                {"file_path": "b.txt", "old_string": "missing", "new_string": "x"},
+            ]})
+            assert result["isError"]
+            assert "Edit 1 (b.txt): String not found." in result["content"][0]["text"]
+            assert a.read_text() == "1 two 3\n"
+            assert sorted(os.listdir(tmp_path)) == ["a.txt", "b.txt"]
+
+            result = await tool.handler({"edits": [
+                {"file_path": "b.txt", "old_string": "4", "new_string": "5"},
+                {"file_path": "a.txt", "old_string": "1 two", "new_string": "1 2"},
+                {"file_path": "a.txt", "old_string": "two 3", "new_string": "2 3"},
+            ]})
+            assert result["isError"]
+            assert "Edit 2 (a.txt): String not found after applying edit 1: edit 2 overlaps edit 1" in (
+                result["content"][0]["text"]
+            )
+            assert b.read_text() == "4\n"
@@ -0,0 +1,264 @@
+"""
+Tests for workspace file search (src/core/file_search.py).
+
+Covers:
+- walk_files() ordering, pruning, include globs and .gitignore rules
+- Symlinks are only followed into the workspace or mounts
+- GlobMatcher matching and subtree pruning
+- GrepEngine binary skipping, chunked literal prefilter and context lines
+- Deterministic, early-stopping concurrent search
+"""
+import os
+import re
+from pathlib import Path
+
+import pytest
+
+from src.core.file_search import (
+    GitIgnore,
+    GlobMatcher,
+    GrepEngine,
+    _required_literal,
+    walk_entries,
+    walk_files,
+)
+from src.core.path_validator import (
+    cleanup_path_validator,
+    configure_path_validator,
+    get_path_validator,
+)
+
+
+def _write(root: Path, rel: str, content: str | bytes = "x\n") -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+    else:
+        path.write_text(content)
+    return path
+
+
+def _rels(root: Path, **kwargs) -> list[str]:
+    return [rel for rel, _ in walk_files(root, **kwargs)]
+
+
+def _naive_grep(text: str, regex: re.Pattern, context: int) -> list[tuple[int, list, str, list]]:
+    """Reference implementation: whole file, line by line."""
+    lines = [line.rstrip("\r") for line in text.split("\n")]
+    if text.endswith("\n"):
+        lines.pop()
+    found = []
+    for i, line in enumerate(lines):
+        if regex.search(line):
+            found.append((
+                i + 1,
+                lines[max(0, i - context):i],
+                line,
+                lines[i + 1:i + 1 + context],
+            ))
+    return found
+
+
+class TestWalkFiles:
+    """Tests for walk_files()."""
+
+    @pytest.mark.unit
+    def test_sorted_depth_first_and_default_pruning(self, tmp_path: Path) -> None:
+        """Entries come in sorted order; .git and node_modules are skipped."""
+        for rel in ("b.txt", "a/z.txt", "a/b/c.txt", ".git/config",
+                    "node_modules/x/index.js", "src/node_modules.txt"):
+            _write(tmp_path, rel)
+        assert _rels(tmp_path) == [
+            "a/b/c.txt", "a/z.txt", "b.txt", "src/node_modules.txt",
+        ]
+
+    @pytest.mark.unit
+    def test_include_glob(self, tmp_path: Path) -> None:
+        """Name globs match at any depth; globs with "/" match the relative path."""
+        for rel in ("top.py", "pkg/mod.py", "pkg/data.json", "src/deep/x.py"):
+            _write(tmp_path, rel)
+        assert _rels(tmp_path, include="*.py") == ["pkg/mod.py", "src/deep/x.py", "top.py"]
+        assert _rels(tmp_path, include="src/**/*.py") == ["src/deep/x.py"]
+        assert _rels(tmp_path, include="**/*") == [
+            "pkg/data.json", "pkg/mod.py", "src/deep/x.py", "top.py",
+        ]
+
+    @pytest.mark.unit
+    def test_gitignore_rules(self, tmp_path: Path) -> None:
+        """Nested files, anchoring, directory-only rules and negation."""
+        _write(tmp_path, ".gitignore", "*.log\n!keep.log\n/build/\ncache/\n")
+        _write(tmp_path, "sub/.gitignore", "secret.txt\n")
+        for rel in ("a.log", "keep.log", "build/out.js", "src/build/ok.js",
+                    "src/cache/c.bin", "sub/secret.txt", "secret.txt", "main.py"):
+            _write(tmp_path, rel)
+
+        assert _rels(tmp_path) == [
+            ".gitignore", "keep.log", "main.py", "secret.txt", "src/build/ok.js",
+            "sub/.gitignore",
+        ]
+        assert "a.log" in _rels(tmp_path, respect_gitignore=False)
+
+    @pytest.mark.unit
+    def test_ancestor_gitignore_applies_to_subdirectory_search(self, tmp_path: Path) -> None:
+        """Rules of the workspace .gitignore apply when searching a subdirectory."""
+        _write(tmp_path, ".gitignore", "src/gen/\n*.tmp\n")
+        for rel in ("src/gen/a.py", "src/b.py", "src/c.tmp"):
+            _write(tmp_path, rel)
+        assert _rels(tmp_path / "src", gitignore_root=tmp_path) == ["b.py"]
+
+    @pytest.mark.unit
+    def test_symlink_cycles_are_skipped(self, tmp_path: Path) -> None:
+        """Linked directories are walked once; a loop back to the root is not."""
+        _write(tmp_path, "real/file.txt")
+        os.symlink(tmp_path / "real", tmp_path / "link")
+        os.symlink(tmp_path, tmp_path / "real" / "loop")
+        # "link" sorts first, so the shared directory is reached through it
+        assert _rels(tmp_path, follow_symlink=lambda path: True) == ["link/file.txt"]
+
+    @pytest.mark.unit
+    def test_symlinks_outside_the_workspace_are_not_followed(self, tmp_path: Path) -> None:
+        """Links rejected by the validator are listed, never walked or read."""
+        workspace = tmp_path / "users" / "tester" / "sessions" / "walk" / "workspace"
+        _write(workspace, "real/file.txt")
+        _write(tmp_path, "outside/passwd", "root:x:0:0\n")
+        os.symlink(workspace / "real", workspace / "inside")
+        os.symlink(tmp_path / "outside", workspace / "escape")
+        os.symlink(tmp_path / "outside" / "passwd", workspace / "passwd")
+
+        # Without a predicate no link is followed
+        assert _rels(workspace) == ["real/file.txt"]
+
+        configure_path_validator("walk", workspace, username="tester")
+        try:
+            allowed = get_path_validator("walk").is_link_target_allowed
+            assert _rels(workspace, follow_symlink=allowed) == ["inside/file.txt"]
+            listed = [
+                (rel, is_dir) for rel, _, is_dir in walk_entries(
+                    workspace, include_dirs=True, follow_symlink=allowed,
+                )
+            ]
+            assert listed == [("escape", True), ("inside", True), ("inside/file.txt", False)]
+        finally:
+            cleanup_path_validator("walk")
+
+    @pytest.mark.unit
+    def test_gitignore_parse_globstar(self) -> None:
+        """"**" patterns match across directories."""
+        ignore = GitIgnore.parse("docs/**/*.md\n**/tmp\n")
+        assert ignore.match("docs/a/b/c.md", False) is True
+        assert ignore.match("docs/c.md", False) is True
+        assert ignore.match("x/y/tmp", True) is True
+        assert ignore.match("src/c.md", False) is None
+
+
+class TestGlobMatcher:
+    """Tests for GlobMatcher."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("pattern,descend,prune", [
+        ("*.py", [], ["src"]),
+        ("src/*.py", ["src"], ["lib", "src/sub"]),
+        ("src/**/*.py", ["src", "src/a", "src/a/b"], ["lib"]),
+        ("**/test_*.py", ["a", "a/b/c"], []),
+        ("*/deep/*.txt", ["x", "x/deep"], ["x/other", "x/deep/more"]),
+        ("src/**", ["src", "src/a"], ["lib"]),
+    ])
+    def test_can_descend(self, pattern: str, descend: list, prune: list) -> None:
+        """Only directories on a possible match path are walked."""
+        matcher = GlobMatcher(pattern)
+        for rel in descend:
+            assert matcher.can_descend(rel), rel
+        for rel in prune:
+            assert not matcher.can_descend(rel), rel
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("pattern", [
+        "*.py", "**/*.py", "src/*.py", "src/**/*.py", "*/deep/*.txt", "**/b*/*",
+    ])
+    def test_pruned_walk_matches_full_walk(self, tmp_path: Path, pattern: str) -> None:
+        """Pruning never drops a match."""
+        for rel in ("a.py", "src/b.py", "src/x/deep/c.txt", "src/x/c.py",
+                    "lib/deep/d.txt", "lib/bin/e.py", "x/deep/f.txt"):
+            _write(tmp_path, rel)
+        matcher = GlobMatcher(pattern)
+        full = [rel for rel, _, d in walk_entries(tmp_path, respect_gitignore=False)
+                if not d and matcher.matches(rel)]
+        pruned = [rel for rel, _, d in walk_entries(
+            tmp_path, respect_gitignore=False, descend=matcher.can_descend,
+        ) if not d and matcher.matches(rel)]
+        assert pruned == full
+        assert full == sorted(
+            p.relative_to(tmp_path).as_posix() for p in tmp_path.glob(pattern) if p.is_file()
+        )
+
+
+class TestGrepEngine:
+    """Tests for GrepEngine."""
+
+    @pytest.mark.unit
+    def test_required_literal(self) -> None:
+        """The longest top-level literal run is used as prefilter."""
+        assert _required_literal(re.compile("def main")) == "def main"
+        assert _required_literal(re.compile(r"foo\(\w+\)bar")) == "foo("
+        assert _required_literal(re.compile("a|b")) is None
+        assert _required_literal(re.compile(r"\d+")) is None
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("pattern,flags", [
+        ("needle", 0),
+        (r"need(le|ed)\d", 0),
+        ("NEEDLE", re.IGNORECASE),
+        (r"^\s*$", 0),
+    ])
+    @pytest.mark.parametrize("chunk_size", [7, 64, 1 << 20])
+    def test_matches_reference_across_chunk_sizes(
+        self, tmp_path: Path, pattern: str, flags: int, chunk_size: int
+    ) -> None:
+        """Line numbers and context are independent of chunking and prefilter."""
+        lines = []
+        for i in range(300):
+            if i % 37 == 0:
+                lines.append(f"line {i} has a needle{i % 10} here")
+            elif i % 53 == 0:
+                lines.append("")
+            else:
+                lines.append(f"filler line {i}\r" if i % 11 == 0 else f"filler line {i}")
+        text = "\n".join(lines) + "\n"
+        path = _write(tmp_path, "f.txt", text)
+        regex = re.compile(pattern, flags)
+
+        engine = GrepEngine(regex, context=3, chunk_size=chunk_size)
+        got = [(m.line_number, m.before, m.line, m.after) for m in engine.search_file(str(path))]
+        assert got == _naive_grep(text, regex, 3)
+
+    @pytest.mark.unit
+    def test_binary_files_skipped(self, tmp_path: Path) -> None:
+        """Files with a NUL byte in the first 8 KB are not searched."""
+        path = _write(tmp_path, "blob.bin", b"needle\x00\x01\x02needle\n")
+        assert GrepEngine(re.compile("needle")).search_file(str(path)) == []
+
+    @pytest.mark.unit
+    def test_no_trailing_newline_and_limit_keeps_after_context(self, tmp_path: Path) -> None:
+        """The last line is searched; the match at the limit gets its context."""
+        path = _write(tmp_path, "f.txt", "a\nhit\nb\nhit\nc\nhit")
+        matches = GrepEngine(re.compile("hit"), context=1, max_results=2).search_file(str(path))
+        assert [(m.line_number, m.after) for m in matches] == [(2, ["b"]), (4, ["c"])]
+        matches = GrepEngine(re.compile("hit")).search_file(str(path))
+        assert [m.line_number for m in matches] == [2, 4, 6]
+
+    @pytest.mark.unit
+    def test_search_is_ordered_and_stops_at_max_results(self, tmp_path: Path) -> None:
+        """Concurrent search yields walk order and truncates at the limit."""
+        for i in range(40):
+            _write(tmp_path, f"d{i % 4}/f{i:02d}.txt", "match\n" * 3 if i % 3 else "none\n")
+        files = list(walk_files(tmp_path))
+
+        sequential = list(GrepEngine(re.compile("match"), max_workers=1).search(files))
+        parallel = list(GrepEngine(re.compile("match"), max_workers=8).search(files))
+        assert [f.rel_path for f in parallel] == [f.rel_path for f in sequential]
+
+        limited = list(GrepEngine(re.compile("match"), max_results=10, max_workers=8).search(files))
+        assert sum(len(f.matches) for f in limited) == 10
+        assert [f.rel_path for f in limited] == [f.rel_path for f in sequential[:4]]
+        assert len(limited[-1].matches) == 1
@@ -0,0 +1,117 @@
+"""
+Tests for streamed command output capture (src/core/output_capture.py) and
+Ag3ntumBash output handling.
+
+Covers:
+- Head/tail previews and line counts against splitting the whole output
+- Bounded memory for large output, full output in the file
+- Throttled progress callbacks
+- Ag3ntumBash streaming to .tmp/cmd and publishing progress
+"""
+import asyncio
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.core.output_capture import OutputCapture
+from tools.ag3ntum.ag3ntum_bash.tool import create_bash_tool
+
+
+def _reader(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+class TestOutputCapture:
+    """Tests for OutputCapture."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("data", [
+        b"",
+        b"one line, no newline",
+        b"a\nb\r\nc\n",
+        b"".join(b"line %d\n" % i for i in range(500)),
+        b"".join(b"row %d\n" % i for i in range(500)) + b"partial",
+    ])
+    async def test_matches_whole_output(self, tmp_path: Path, data: bytes) -> None:
+        """Previews, counts and file content equal the unbounded result."""
+        out = tmp_path / "out.txt"
+        for head, tail in ((1 << 20, 1 << 20), (100, 100)):
+            capture = OutputCapture(out, head_bytes=head, tail_bytes=tail)
+            await capture.pump(_reader(data))
+            lines = data.decode().splitlines()
+
+            assert out.read_bytes() == data
+            assert capture.total_bytes == len(data)
+            assert capture.total_lines == len(lines)
+            assert capture.head_lines(5) == lines[:5]
+            assert capture.tail_lines(5) == lines[-5:]
+            if capture.complete:
+                assert capture.text() == data.decode()
+
+    @pytest.mark.unit
+    def test_memory_bounded_for_large_output(self) -> None:
+        """Only head and tail are kept; the middle is reported as omitted."""
+        capture = OutputCapture(head_bytes=1000, tail_bytes=1000)
+        for i in range(20_000):
+            capture.feed(b"line %06d\n" % i)
+        assert not capture.complete
+        assert len(capture._head) == 1000 and len(capture._tail) <= 2000
+        assert capture.total_lines == 20_000
+        assert capture.head_lines(2) == ["line 000000", "line 000001"]
+        assert capture.tail_lines(2) == ["line 019998", "line 019999"]
+        text = capture.text()
+        assert text.startswith("line 000000\n") and text.endswith("line 019999\n")
+        assert f"{capture.total_bytes - 2000:,} bytes omitted" in text
+
+    @pytest.mark.asyncio
+    async def test_progress_throttled(self) -> None:
+        """Progress is reported at most once per interval, with recent lines."""
+        reports = []
+
+        async def on_progress(progress):
+            reports.append(progress)
+
+        capture = OutputCapture(on_progress=on_progress, progress_interval=3600)
+        capture._last_progress -= 3600  # First chunk is due
+        await capture.pump(_reader(b"".join(b"step %d\n" % i for i in range(100))))
+        assert len(reports) == 1
+        assert reports[0].bytes == capture.total_bytes
+        assert reports[0].recent_lines[-1] == "step 99"
+
+
+class TestBashStreaming:
+    """Ag3ntumBash without a sandbox executor streams to its output file."""
+
+    @pytest.mark.asyncio
+    async def test_large_output_preview_and_progress(self, tmp_path: Path) -> None:
+        """Output goes to the file in full; preview comes from the tail buffer."""
+        events = []
+
+        async def record(progress):
+            events.append(progress)
+
+        with patch("tools.ag3ntum.ag3ntum_bash.tool.create_progress_publisher",
+                   return_value=record):
+            bash = create_bash_tool(tmp_path, session_id="s1", progress_interval=1e-6)
+        # ~540 KB: larger than the in-memory head + tail
+        result = await bash.handler({
+            "command": "for i in $(seq 1 50000); do echo row $i; done",
+            "preview_mode": "tail",
+            "preview_lines": 3,
+        })
+
+        text = result["content"][0]["text"]
+        assert "**Exit code:** 0" in text
+        assert "**Total lines:** 50,000" in text
+        assert "row 49998\nrow 49999\nrow 50000" in text
+
+        (output_file,) = (tmp_path / ".tmp" / "cmd").iterdir()
+        content = output_file.read_text()
+        assert content.startswith("row 1\nrow 2\n")
+        assert content.endswith("EXIT_CODE:0\nFILESIZE:%d\n" % sum(
+            len(f"row {i}\n") for i in range(1, 50001)))
+        assert events and events[-1].recent_lines[-1].startswith("row ")
@@ -614,3 +614,131 @@ class TestEdgeCases:
         (workspace / "...").touch()
         result = validator.validate_path("...", "read")
         assert result.normalized == workspace / "..."
+
+
+class TestResolutionCache:
+    """Test the short-lived cache of resolved paths."""
+
+    @pytest.fixture(autouse=True)
+    def cleanup_validators(self):
+        """Clean up validators after each test."""
+        yield
+        from src.core.path_validator import _session_validators
+        _session_validators.clear()
+
+    @pytest.fixture
+    def workspace(self, tmp_path: Path) -> Path:
+        """Workspace with two directories a link can point to."""
+        workspace = tmp_path / "workspace"
+        (workspace / "docs").mkdir(parents=True)
+        (workspace / "data").mkdir()
+        (workspace / "link").symlink_to(workspace / "docs")
+        return workspace
+
+    def test_repeated_paths_resolved_once(
+        self, workspace: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A repeated path is served from the cache; a new one is resolved."""
+        validator = Ag3ntumPathValidator(PathValidatorConfig(workspace_path=workspace))
+        calls = []
+        normalize = validator._normalize_path
+        monkeypatch.setattr(validator, "_normalize_path", lambda p: calls.append(p) or normalize(p))
+
+        for _ in range(3):
+            validator.validate_path("docs/a.md", "read")
+        validator.validate_path("docs/b.md", "read")
+        assert calls == ["docs/a.md", "docs/b.md"]
+
+    def test_entries_expire(self, workspace: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Entries older than the TTL are resolved again."""
+        from src.core import path_validator
+
+        monkeypatch.setattr(path_validator, "RESOLUTION_CACHE_TTL_SECONDS", 0.0)
+        validator = Ag3ntumPathValidator(PathValidatorConfig(workspace_path=workspace))
+        validator.validate_path("link/a.md", "read")
+        (workspace / "link").unlink()
+        (workspace / "link").symlink_to(workspace / "data")
+        assert validator.validate_path("link/a.md", "read").normalized == workspace / "data" / "a.md"
+
+    def test_invalidate_after_symlink_change(self, workspace: Path) -> None:
+        """invalidate_path_cache() makes a re-pointed link resolve to its new target."""
+        from src.core.path_validator import invalidate_path_cache
+
+        validator = configure_path_validator("cache_session", workspace)
+        assert validator.validate_path("link/a.md", "read").normalized == workspace / "docs" / "a.md"
+
+        (workspace / "link").unlink()
+        (workspace / "link").symlink_to("/etc")
+        invalidate_path_cache("cache_session")
+        with pytest.raises(PathValidationError):
+            validator.validate_path("link/passwd", "read")
+        with pytest.raises(PathValidationError, match="traversal"):
+            validator._normalize_path("/workspace/link/passwd")
+
+    def test_suspended_while_command_runs(self, workspace: Path) -> None:
+        """While suspended nothing is cached; resuming starts empty."""
+        from src.core.path_validator import resume_path_cache, suspend_path_cache
+
+        validator = configure_path_validator("suspend_session", workspace)
+        validator.validate_path("link/a.md", "read")
+        suspend_path_cache("suspend_session")
+        assert not validator._resolved_cache
+        validator.validate_path("link/a.md", "read")
+        assert not validator._resolved_cache
+        resume_path_cache("suspend_session")
+        validator.validate_path("link/a.md", "read")
+        assert list(validator._resolved_cache) == ["link/a.md"]
+        # Unknown sessions are ignored
+        suspend_path_cache("unknown")
+        resume_path_cache("unknown")
+
+    @pytest.mark.asyncio
+    async def test_bash_symlink_seen_by_next_validation(self, workspace: Path) -> None:
+        """A link re-pointed by a Bash command is resolved afresh afterwards."""
+        from tools.ag3ntum.ag3ntum_bash.tool import create_bash_tool
+
+        validator = configure_path_validator("bash_session", workspace)
+        assert validator.validate_path("link/a.md", "read").normalized == workspace / "docs" / "a.md"
+
+        bash = create_bash_tool(workspace, session_id="bash_session", progress_interval=0)
+        result = await bash.handler({"command": "ln -sfn data link"})
+        assert not result.get("isError")
+        assert validator.validate_path("link/a.md", "read").normalized == workspace / "data" / "a.md"
+
+
+class TestMountRoutes:
+    """Test sandbox prefix routing to external and per-user mounts."""
+
+    def test_routes_and_boundaries(self, tmp_path: Path) -> None:
+        """Each prefix maps to its mount; escapes report the mount's boundary."""
+        workspace = tmp_path / "workspace"
+        workspace.mkdir()
+        for name in ("ro", "rw", "persistent", "user_ro", "user_rw"):
+            (tmp_path / name).mkdir()
+        validator = Ag3ntumPathValidator(PathValidatorConfig(
+            workspace_path=workspace,
+            external_ro_base=tmp_path / "ro",
+            external_rw_base=tmp_path / "rw",
+            persistent_path=tmp_path / "persistent",
+            user_mounts_ro={"photos": tmp_path / "user_ro"},
+            user_mounts_rw={"code": tmp_path / "user_rw"},
+        ))
+
+        assert validator._normalize_path("external/ro/a/x") == tmp_path / "ro" / "a" / "x"
+        assert validator._normalize_path("/workspace/external/rw/b") == tmp_path / "rw" / "b"
+        assert validator._normalize_path("/workspace/external/persistent/p") == tmp_path / "persistent" / "p"
+        assert validator._normalize_path("/workspace/external/user-ro/photos") == tmp_path / "user_ro"
+        assert validator._normalize_path("/workspace/external/user-rw/code/m.py") == tmp_path / "user_rw" / "m.py"
+        # Unknown per-user mount: workspace path, rejected later by the boundary check
+        assert validator._normalize_path("/workspace/external/user-ro/none/x") == (
+            workspace / "external" / "user-ro" / "none" / "x"
+        )
+
+        result = validator.validate_path("/workspace/external/user-ro/photos/a.jpg", "read")
+        assert result.is_readonly
+        with pytest.raises(PathValidationError) as exc:
+            validator._normalize_path("/workspace/external/user-rw/code/../../etc")
+        assert exc.value.reason == "PATH_TRAVERSAL: Resolved path escapes user-rw mount boundary"
+        with pytest.raises(PathValidationError) as exc:
+            validator._normalize_path("/workspace/external/persistent/../x")
+        assert exc.value.reason == "PATH_TRAVERSAL: Resolved path escapes persistent storage boundary"
@@ -0,0 +1,241 @@
+"""
+Tests for the compiled permission matcher (src/core/permission_engine.py).
+
+Covers:
+- Same decisions as the per-pattern reference matcher for path, Bash,
+  generic and tool-name-only patterns
+- Verdict cache keyed by resolved path (symlinks re-pointed after a decision)
+- Recompilation when patterns or the working directory change
+- Compilation at PermissionManager.activate()
+"""
+import itertools
+import os
+from pathlib import Path
+
+import pytest
+
+from src.core import permission_engine
+from src.core.permission_config import (
+    PermissionConfig,
+    PermissionConfigManager,
+    PermissionMode,
+    PermissionRules,
+)
+from src.core.permission_engine import split_glob_pattern
+
+DENY = [
+    "Bash(ps *)",
+    "Bash(kill *)",
+    "Read(./secrets/**)",
+    "Write(/**)",
+    "Read(/etc/**)",
+    "Glob(./src/**/*.pyc)",
+    "mcp__ag3ntum__Bash(rm -rf *)",
+    "WebFetch",
+]
+ALLOW = [
+    "Read(./**)",
+    "Write(./src/*.py)",
+    "Edit(./src/**)",
+    "Glob(*)",
+    "Grep(./src)",
+    "Bash(python ./skills/**)",
+    "Bash(git:*)",
+    "Bash(ls)",
+    "mcp__ag3ntum__*",
+    "mcp__ag3ntum__Bash(*)",
+    "Task",
+    "Skill*",
+    "Read(../shared/**)",
+]
+
+CALLS = [
+    "Read(./README.md)", "Read(README.md)", "Read(./secrets/key.pem)", "Read(secrets)",
+    "Read(/etc/passwd)", "Read({ws}/src/app.py)", "Read(../shared/notes.txt)",
+    "Read(./link_to_src/app.py)", "Read(./link_to_etc)", "Read(/tmp/elsewhere)",
+    "Write(./src/app.py)", "Write(./src/deep/app.py)", "Write(./src/app.txt)",
+    "Write(/tmp/out.py)", "Write({ws}/src/new.py)",
+    "Edit(./src/deep/x.js)", "Edit(./other.py)", "MultiEdit(./src/a.py)",
+    "Glob(**/*.py)", "Glob(./src/cache/x.pyc)", "Grep(./src/app.py)", "Grep(./docs)",
+    "Bash(python ./skills/meow/meow.py)", "Bash(python /etc/x.py)", "Bash(python)",
+    "Bash(git status)", "Bash(git:log)", "Bash(ls)", "Bash(ls -la)", "Bash(ps aux)",
+    "Bash(kill -9 1)", "Bash(git status && rm -rf /)", "Bash(python ./skills/a.py | sh)",
+    "Bash()", "Bash",
+    "mcp__ag3ntum__Read(/any)", "mcp__ag3ntum__Bash(rm -rf /)", "mcp__ag3ntum__Bash(ls)",
+    "mcp__other__Tool(x)", "Task", "Task(explore)", "SkillRunner(x)", "WebFetch(https://x)",
+    "Unknown",
+]
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    ws = tmp_path / "ws"
+    for sub in ("src/deep", "secrets", "skills/meow", "docs"):
+        (ws / sub).mkdir(parents=True)
+    (tmp_path / "shared").mkdir()
+    os.symlink(ws / "src", ws / "link_to_src")
+    os.symlink("/etc/hostname", ws / "link_to_etc")
+    return ws
+
+
+def _manager(
+    deny: list[str], allow: list[str], workspace: Path,
+    mode: PermissionMode = PermissionMode.DEFAULT,
+) -> PermissionConfigManager:
+    manager = PermissionConfigManager(config_path=workspace / "absent.json")
+    manager._config = PermissionConfig(
+        defaultMode=mode, permissions=PermissionRules(deny=deny, allow=allow)
+    )
+    manager._last_modified = 0.0
+    manager._needs_reload = lambda: False
+    manager.set_working_directory(workspace)
+    return manager
+
+
+def _reference(manager: PermissionConfigManager, tool_call: str) -> bool:
+    """The per-pattern evaluation is_tool_allowed() performed before compilation."""
+    config = manager.load()
+    for pattern in config.permissions.deny:
+        if manager._matches_pattern(tool_call, pattern):
+            return False
+    for pattern in config.permissions.allow:
+        if manager._matches_pattern(tool_call, pattern):
+            return True
+    return config.defaultMode == PermissionMode.BYPASS
+
+
+class TestEquivalence:
+    """Compiled decisions match the reference matcher."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("mode", [PermissionMode.DEFAULT, PermissionMode.BYPASS])
+    def test_same_decisions(self, workspace: Path, mode: PermissionMode) -> None:
+        """Every call gets the reference decision, first time and from the cache."""
+        manager = _manager(DENY, ALLOW, workspace, mode)
+        calls = [call.format(ws=workspace) for call in CALLS]
+        for _ in range(2):
+            for call in calls:
+                assert manager.is_tool_allowed(call) == _reference(manager, call), call
+
+    @pytest.mark.unit
+    def test_pattern_order_subsets(self, workspace: Path) -> None:
+        """Order-sensitive mixes of wildcard and tool-specific patterns."""
+        patterns = ["Read(./src/**)", "Read(*)", "*", "Bash(python *)", "Bash(*)", "Re*"]
+        calls = [call.format(ws=workspace) for call in CALLS]
+        for deny, allow in itertools.product(
+            itertools.combinations(patterns, 1), itertools.permutations(patterns, 2)
+        ):
+            manager = _manager(list(deny), list(allow), workspace)
+            for call in calls:
+                assert manager.is_tool_allowed(call) == _reference(manager, call), (deny, allow, call)
+
+    @pytest.mark.unit
+    def test_needs_confirmation(self, workspace: Path) -> None:
+        """Ask patterns use the same matching."""
+        manager = _manager([], [], workspace)
+        manager._config.permissions.ask = ["Bash(git push*)", "Write(./src/**)"]
+        assert manager.needs_confirmation("Bash(git push origin)")
+        assert manager.needs_confirmation("Write(./src/app.py)")
+        assert not manager.needs_confirmation("Write(./docs/a.md)")
+
+    @pytest.mark.unit
+    def test_split_glob_pattern(self) -> None:
+        """The manager's splitter delegates to the module function."""
+        manager = PermissionConfigManager()
+        for pattern in ("./skills/**/*.py", "./skills/**", "/**", "/**/*.py", "./data", "**"):
+            assert manager._split_glob_pattern(pattern) == split_glob_pattern(pattern)
+        assert split_glob_pattern("./skills/**/*.py") == ("./skills", "*.py")
+        assert split_glob_pattern("/**") == ("/", None)
+
+
+class TestVerdictCache:
+    """Tests for the per-engine verdict cache."""
+
+    @pytest.mark.unit
+    def test_repeated_calls_served_from_cache(self, workspace: Path) -> None:
+        """Repeated checks hit the cache; match-all rules share one entry per tool."""
+        manager = _manager(["Bash(ps *)"], ["Read(*)", "Bash(*)"], workspace)
+        for _ in range(3):
+            assert manager.is_tool_allowed("Bash(git status)")
+            assert not manager.is_tool_allowed("Bash(ps aux)")
+        assert manager.is_tool_allowed("Read(./a)") and manager.is_tool_allowed("Read(./b)")
+        engine = manager.compile()
+        assert (engine.misses, engine.hits) == (3, 5)
+
+    @pytest.mark.unit
+    def test_symlink_repointed_after_decision(self, workspace: Path, tmp_path: Path) -> None:
+        """A cached allow for a link does not survive the link pointing elsewhere."""
+        manager = _manager(["Read(./secrets/**)"], ["Read(./**)"], workspace)
+        link = workspace / "notes"
+        os.symlink(workspace / "docs", link)
+        assert manager.is_tool_allowed("Read(./notes/a.md)")
+
+        link.unlink()
+        os.symlink(workspace / "secrets", link)
+        assert not manager.is_tool_allowed("Read(./notes/a.md)")
+
+        link.unlink()
+        os.symlink(tmp_path / "shared", link)
+        assert not manager.is_tool_allowed("Read(./notes/a.md)")
+        assert _reference(manager, "Read(./notes/a.md)") is False
+
+    @pytest.mark.unit
+    def test_bash_script_symlink(self, workspace: Path, tmp_path: Path) -> None:
+        """Bash path patterns key the cache on the resolved script path."""
+        manager = _manager([], ["Bash(python ./skills/**)"], workspace)
+        script = workspace / "skills" / "run.py"
+        os.symlink(workspace / "skills" / "meow", script)
+        assert manager.is_tool_allowed("Bash(python ./skills/run.py)")
+        script.unlink()
+        os.symlink(tmp_path / "shared", script)
+        assert not manager.is_tool_allowed("Bash(python ./skills/run.py)")
+
+    @pytest.mark.unit
+    def test_cache_bounded(self, workspace: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The LRU keeps at most VERDICT_CACHE_SIZE entries; long calls are not cached."""
+        monkeypatch.setattr(permission_engine, "VERDICT_CACHE_SIZE", 8)
+        manager = _manager([], ["Bash(*)"], workspace)
+        for i in range(20):
+            manager.is_tool_allowed(f"Bash(echo {i})")
+        manager.is_tool_allowed("Bash(echo " + "x" * permission_engine.MAX_CACHED_CALL_LENGTH + ")")
+        assert len(manager.compile()._verdicts) == 8
+
+
+class TestCompile:
+    """Tests for recompilation and activation."""
+
+    @pytest.mark.unit
+    def test_recompiled_on_change(self, workspace: Path, tmp_path: Path) -> None:
+        """New patterns, in-place edits and a new working directory recompile."""
+        manager = _manager([], ["Read(./src/**)"], workspace)
+        engine = manager.compile()
+        assert manager.compile() is engine
+        assert manager.is_tool_allowed("Read(./src/a.py)")
+
+        manager._config.permissions.deny.append("Read(./src/a.py)")
+        assert not manager.is_tool_allowed("Read(./src/a.py)")
+        assert manager.compile() is not engine
+
+        engine = manager.compile()
+        manager.set_working_directory(tmp_path)
+        assert manager.compile() is not engine
+        assert not manager.is_tool_allowed("Read(./ws/src/b.py)")
+
+    @pytest.mark.unit
+    def test_activate_compiles(self, tmp_path: Path) -> None:
+        """PermissionManager.activate() compiles the active profile's rules."""
+        from src.core.permission_profiles import PermissionManager
+
+        profile = tmp_path / "permissions.yaml"
+        profile.write_text(
+            "name: test\npermissions:\n  allow:\n    - 'mcp__ag3ntum__*'\n  deny:\n    - 'Bash(*)'\n"
+        )
+        manager = PermissionManager(profile_path=profile)
+        manager.activate()
+        engine = manager._config_manager._engine
+        assert engine is not None
+        # The profile is pinned: no config file probing per check
+        manager._config_manager._needs_reload = lambda: pytest.fail("config files probed")
+        assert manager.is_allowed("mcp__ag3ntum__Read(./x)")
+        assert not manager.is_allowed("Bash(ls)")
+        assert manager._config_manager._engine is engine
@@ -0,0 +1,218 @@
+"""
+Tests for persistent shell sessions (src/core/persistent_shell.py) and
+Ag3ntumBash with persistent_shell enabled.
+
+Covers:
+- Working directory and exported variables persisting between commands
+- Exit codes, stderr capture, output not confused with the frame marker
+- Timeout and `exit` ending the shell, next command starting a fresh one
+- Background job output drained between commands, not leaked into the next
+- Idle close, registry replacement on command line change, session close
+- Path resolution cache bypassed while a session's shell lives
+"""
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from src.core import persistent_shell
+from src.core.output_capture import OutputCapture
+from src.core.path_validator import cleanup_path_validator, configure_path_validator
+from src.core.persistent_shell import (
+    SHELL_COMMAND,
+    PersistentShell,
+    close_persistent_shell,
+    default_shell_env,
+    get_persistent_shell,
+)
+from tools.ag3ntum.ag3ntum_bash.tool import create_bash_tool
+
+
+async def _run(shell: PersistentShell, command: str, timeout: float = 10):
+    capture = OutputCapture()
+    result = await shell.run(command, timeout, capture)
+    return result, capture.text()
+
+
+@pytest.fixture
+async def shell(tmp_path: Path):
+    shell = PersistentShell(SHELL_COMMAND, cwd=str(tmp_path), env=default_shell_env())
+    yield shell
+    await shell.close()
+
+
+class TestPersistentShell:
+    """Tests for PersistentShell.run()."""
+
+    @pytest.mark.asyncio
+    async def test_state_persists(self, shell: PersistentShell, tmp_path: Path) -> None:
+        """cd, export and shell variables survive between commands in one process."""
+        (tmp_path / "sub").mkdir()
+        await _run(shell, "cd sub && export GREETING=hello && counter=41")
+        pid = shell._process.pid
+        result, output = await _run(shell, 'pwd; echo "$GREETING $((counter + 1))"')
+        assert result.exit_code == 0
+        assert output == f"{tmp_path / 'sub'}\nhello 42\n"
+        assert shell._process.pid == pid and shell.commands_run == 2
+
+    @pytest.mark.asyncio
+    async def test_exit_codes_and_stderr(self, shell: PersistentShell) -> None:
+        """Exit codes are reported per command; stderr is captured with stdout."""
+        result, output = await _run(shell, "echo out; echo err >&2; false")
+        assert result.exit_code == 1 and not result.shell_ended
+        assert output == "out\nerr\n"
+        result, output = await _run(shell, "printf 'no newline'; (exit 7)")
+        assert (result.exit_code, output) == (7, "no newline")
+
+    @pytest.mark.asyncio
+    async def test_stdin_and_quoting(self, shell: PersistentShell) -> None:
+        """Commands cannot read the protocol stream; quotes pass through unchanged."""
+        result, output = await _run(shell, "cat; echo \"it's $((1 + 1))\" '$HOME'")
+        assert result.exit_code == 0
+        assert output == "it's 2 $HOME\n"
+
+    @pytest.mark.asyncio
+    async def test_large_output_to_file(self, shell: PersistentShell, tmp_path: Path) -> None:
+        """Output larger than a read chunk is streamed to the file intact."""
+        out = tmp_path / "out.txt"
+        capture = OutputCapture(out)
+        result = await shell.run("seq 1 200000", 30, capture)
+        assert result.exit_code == 0
+        assert out.read_bytes() == b"".join(b"%d\n" % i for i in range(1, 200001))
+        assert capture.total_lines == 200000
+
+    @pytest.mark.asyncio
+    async def test_timeout_restarts_shell(self, shell: PersistentShell) -> None:
+        """A timed-out command kills the shell; state is reset afterwards."""
+        await _run(shell, "export MARK=1")
+        result, _ = await _run(shell, "sleep 30", timeout=0.5)
+        assert result.timed_out and result.shell_ended
+        assert not shell.alive
+        result, output = await _run(shell, 'echo "mark=${MARK:-unset}"')
+        assert result.exit_code == 0 and output == "mark=unset\n"
+
+    @pytest.mark.asyncio
+    async def test_exit_ends_shell(self, shell: PersistentShell) -> None:
+        """`exit N` reports N and the next command runs in a fresh shell."""
+        result, output = await _run(shell, "echo bye; exit 3")
+        assert (result.exit_code, result.shell_ended, output) == (3, True, "bye\n")
+        result, output = await _run(shell, "echo again")
+        assert (result.exit_code, output) == (0, "again\n")
+
+    @pytest.mark.asyncio
+    async def test_background_output_between_commands(
+        self, shell: PersistentShell, tmp_path: Path
+    ) -> None:
+        """Job output written between commands is drained, not blocked on or leaked."""
+        result, output = await _run(
+            shell, "(sleep 0.3; head -c 1000000 /dev/zero; echo late; touch done) & echo started"
+        )
+        assert (result.exit_code, output) == (0, "started\n")
+        for _ in range(50):
+            await asyncio.sleep(0.1)
+            if (tmp_path / "done").exists():
+                break
+        assert (tmp_path / "done").exists()
+        result, output = await _run(shell, "echo next")
+        assert (result.exit_code, output) == (0, "next\n")
+
+    @pytest.mark.asyncio
+    async def test_idle_close(self, tmp_path: Path) -> None:
+        """The shell is closed after idle_timeout without commands."""
+        shell = PersistentShell(SHELL_COMMAND, cwd=str(tmp_path), idle_timeout=0.1)
+        await _run(shell, "true")
+        assert shell.alive
+        for _ in range(50):
+            await asyncio.sleep(0.1)
+            if not shell.alive:
+                break
+        assert not shell.alive
+
+
+class TestShellRegistry:
+    """Tests for the per-session registry."""
+
+    @pytest.mark.asyncio
+    async def test_replaced_on_change_and_closed(self, tmp_path: Path) -> None:
+        """A different command line replaces the shell; close stops it."""
+        first = get_persistent_shell("reg-session", SHELL_COMMAND, cwd=str(tmp_path))
+        assert get_persistent_shell("reg-session", SHELL_COMMAND, cwd=str(tmp_path)) is first
+        await _run(first, "true")
+
+        second = get_persistent_shell("reg-session", SHELL_COMMAND + ["-e"], cwd=str(tmp_path))
+        assert second is not first and not first.alive
+
+        await _run(second, "true")
+        assert close_persistent_shell("reg-session")
+        assert not second.alive
+        await asyncio.gather(*persistent_shell._reapers)
+        assert "reg-session" not in persistent_shell._shells
+        assert not close_persistent_shell("reg-session")
+
+
+class TestBashPersistent:
+    """Ag3ntumBash with persistent_shell enabled (no sandbox executor)."""
+
+    @pytest.mark.asyncio
+    async def test_cd_persists_between_calls(self, tmp_path: Path) -> None:
+        """A cd in one Bash call applies to the next; results keep their format."""
+        (tmp_path / "project").mkdir()
+        bash = create_bash_tool(
+            tmp_path, session_id="bash-persist", progress_interval=0, persistent_shell=True
+        )
+        try:
+            await bash.handler({"command": "cd project && export NAME=ag3ntum"})
+            result = await bash.handler({"command": "basename $PWD; echo $NAME; exit 5"})
+            text = result["content"][0]["text"]
+            assert "**Exit code:** 5" in text
+            assert "project\nag3ntum" in text
+            assert "The shell exited" in text
+        finally:
+            close_persistent_shell("bash-persist")
+
+        output_files = sorted((tmp_path / ".tmp" / "cmd").iterdir())
+        assert len(output_files) == 2
+        assert any(f.read_text().startswith("project\nag3ntum\n\nEXIT_CODE:5\n")
+                   for f in output_files)
+
+    @pytest.mark.asyncio
+    async def test_timeout_reports_reset(self, tmp_path: Path) -> None:
+        """A timeout kills the persistent shell and says its state was reset."""
+        bash = create_bash_tool(
+            tmp_path, timeout_seconds=1, session_id="bash-timeout",
+            progress_interval=0, persistent_shell=True,
+        )
+        try:
+            result = await bash.handler({"command": "sleep 30"})
+        finally:
+            close_persistent_shell("bash-timeout")
+        assert result["isError"]
+        assert "timed out after 1 seconds" in result["content"][0]["text"]
+        assert "reset" in result["content"][0]["text"]
+
+    @pytest.mark.asyncio
+    async def test_path_cache_off_while_shell_lives(self, tmp_path: Path) -> None:
+        """Background jobs can re-point symlinks: no cached resolutions until the shell closes."""
+        workspace = tmp_path / "users" / "tester" / "sessions" / "bash-cache" / "workspace"
+        workspace.mkdir(parents=True)
+        (workspace / "real").mkdir()
+        (workspace / "other").mkdir()
+        validator = configure_path_validator("bash-cache", workspace, username="tester")
+        bash = create_bash_tool(
+            workspace, session_id="bash-cache", progress_interval=0, persistent_shell=True
+        )
+        try:
+            await bash.handler({"command": "ln -s real link; (sleep 0.3; ln -sfn other link) &"})
+            resolved = validator.validate_path("link", operation="read", allow_directory=True)
+            assert resolved.normalized == workspace / "real"
+            await asyncio.sleep(0.6)
+            resolved = validator.validate_path("link", operation="read", allow_directory=True)
+            assert resolved.normalized == workspace / "other"
+
+            # A validator configured while the shell lives starts uncached too
+            validator = configure_path_validator("bash-cache", workspace, username="tester")
+            assert validator._cache_suspended
+        finally:
+            close_persistent_shell("bash-cache")
+            assert not validator._cache_suspended
+            cleanup_path_validator("bash-cache")
@@ -0,0 +1,222 @@
+"""
+Tests for the run preparation cache (src/core/prep_cache.py).
+
+Covers:
+- File parse caching with stat fast path and content-hash fallback
+- Rendered template invalidation through the include tree
+- Per-session substitutions into a shared render
+- Directory tree memoization without re-walking on hits
+- Permission profile caching in PermissionManager
+- Skill frontmatter and script lookup caching in SkillManager
+"""
+import os
+from pathlib import Path
+
+import pytest
+from jinja2 import Environment, FileSystemLoader
+
+from src.core.permission_profiles import PermissionManager
+from src.core.prep_cache import PreparationCache, get_preparation_cache
+from src.core.skills import SkillManager
+
+
+def _bump_mtime(path: Path) -> None:
+    """Move a file's mtime forward so the stat signature changes."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestLoadFile:
+    """Tests for PreparationCache.load_file()."""
+
+    @pytest.mark.unit
+    def test_parses_once_until_content_changes(self, tmp_path: Path) -> None:
+        """Unchanged and touched-but-identical files are not re-parsed."""
+        cache = PreparationCache()
+        path = tmp_path / "data.txt"
+        path.write_text("one")
+        calls = []
+
+        def parse(raw: bytes) -> str:
+            calls.append(raw)
+            return raw.decode()
+
+        assert cache.load_file(path, parse) == "one"
+        assert cache.load_file(path, parse) == "one"
+        _bump_mtime(path)
+        assert cache.load_file(path, parse) == "one"
+        assert len(calls) == 1
+
+        path.write_text("two")
+        _bump_mtime(path)
+        assert cache.load_file(path, parse) == "two"
+        assert len(calls) == 2
+
+    @pytest.mark.unit
+    def test_missing_file_raises_and_evicts(self, tmp_path: Path) -> None:
+        """A deleted file raises FileNotFoundError instead of serving stale data."""
+        cache = PreparationCache()
+        path = tmp_path / "data.txt"
+        path.write_text("x")
+        cache.load_file(path, bytes.decode)
+        path.unlink()
+        with pytest.raises(FileNotFoundError):
+            cache.load_file(path, bytes.decode)
+
+    @pytest.mark.unit
+    def test_parser_errors_are_not_cached(self, tmp_path: Path) -> None:
+        """A failing parser propagates and the next call retries."""
+        cache = PreparationCache()
+        path = tmp_path / "data.txt"
+        path.write_text("x")
+
+        def fail(raw: bytes) -> str:
+            raise ValueError("bad")
+
+        with pytest.raises(ValueError):
+            cache.load_file(path, fail)
+        assert cache.load_file(path, bytes.decode) == "x"
+
+
+class TestRenderTemplate:
+    """Tests for PreparationCache.render_template()."""
+
+    @pytest.fixture
+    def env(self, tmp_path: Path) -> Environment:
+        (tmp_path / "modules").mkdir()
+        (tmp_path / "modules" / "part.j2").write_text("part={{ value }}")
+        (tmp_path / "main.j2").write_text("main {% include 'modules/part.j2' %}")
+        return Environment(loader=FileSystemLoader(tmp_path))
+
+    @pytest.mark.unit
+    def test_reuses_output_for_same_context(self, env: Environment) -> None:
+        """Identical context renders once."""
+        cache = PreparationCache()
+        assert cache.render_template(env, "main.j2", {"value": 1}) == "main part=1"
+        misses = cache.stats()["misses"]
+        assert cache.render_template(env, "main.j2", {"value": 1}) == "main part=1"
+        assert cache.render_template(env, "main.j2", {"value": 2}) == "main part=2"
+        assert cache.stats()["misses"] == misses + 1
+
+    @pytest.mark.unit
+    def test_included_template_change_invalidates(self, env: Environment, tmp_path: Path) -> None:
+        """Editing an included module re-renders the parent template."""
+        cache = PreparationCache()
+        assert cache.render_template(env, "main.j2", {"value": 1}) == "main part=1"
+        part = tmp_path / "modules" / "part.j2"
+        part.write_text("changed={{ value }}")
+        _bump_mtime(part)
+        assert cache.render_template(env, "main.j2", {"value": 1}) == "main changed=1"
+
+    @pytest.mark.unit
+    def test_substitutions_share_one_render(self, tmp_path: Path) -> None:
+        """Sessions differing only in substituted values reuse the render."""
+        (tmp_path / "env.j2").write_text(
+            "Session: {{ session_id }}\n"
+            "Workspace: {{ workspace }}\n"
+            "{% for rule in rules %}- {{ rule }}\n{% endfor %}"
+        )
+        env = Environment(loader=FileSystemLoader(tmp_path))
+        cache = PreparationCache()
+
+        def render(session_id: str) -> str:
+            workspace = f"/users/alice/sessions/{session_id}/workspace"
+            context = {
+                "session_id": session_id,
+                "workspace": workspace,
+                "rules": [f"Read({workspace}/**)", "Bash(ls)"],
+            }
+            rendered = cache.render_template(
+                env, "env.j2", context,
+                substitutions={"session_id": session_id, "workspace": workspace},
+            )
+            assert rendered == env.get_template("env.j2").render(**context)
+            return rendered
+
+        assert "Read(/users/alice/sessions/s1/workspace/**)" in render("s1")
+        misses = cache.stats()["misses"]
+        assert "Session: s2\n" in render("s2")
+        assert cache.stats()["misses"] == misses
+        assert cache.stats()["rendered"] == 1
+
+
+class TestMemoizeTree:
+    """Tests for PreparationCache.memoize_tree()."""
+
+    @pytest.mark.unit
+    def test_hits_stat_without_listing(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A hit does not list directories; a nested addition recomputes."""
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        cache = PreparationCache()
+        calls = []
+
+        def compute() -> list[str]:
+            calls.append(1)
+            return sorted(p.name for p in tmp_path.rglob("*.py"))
+
+        assert cache.memoize_tree("tree", tmp_path, compute) == []
+
+        listed = []
+        real_scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda path: listed.append(path) or real_scandir(path))
+        assert cache.memoize_tree("tree", tmp_path, compute) == []
+        assert listed == [] and len(calls) == 1
+
+        (tmp_path / "a" / "b" / "tool.py").write_text("")
+        assert cache.memoize_tree("tree", tmp_path, compute) == ["tool.py"]
+        assert len(calls) == 2
+
+
+class TestCachedConsumers:
+    """Tests for callers that load through the shared cache."""
+
+    @pytest.mark.unit
+    def test_permission_profile_copies_are_independent(self, tmp_path: Path) -> None:
+        """Managers share the parse but not the profile objects."""
+        profile_path = tmp_path / "permissions.yaml"
+        profile_path.write_text(
+            "name: test\n"
+            "tools:\n"
+            "  enabled: [Read]\n"
+            "  disabled: []\n"
+        )
+        first = PermissionManager(profile_path=profile_path).profile
+        first.tools.enabled.append("Write")
+        second = PermissionManager(profile_path=profile_path).profile
+        assert second.tools.enabled == ["Read"]
+
+        profile_path.write_text(
+            "name: test\n"
+            "tools:\n"
+            "  enabled: [Read, Grep]\n"
+            "  disabled: []\n"
+        )
+        _bump_mtime(profile_path)
+        third = PermissionManager(profile_path=profile_path).profile
+        assert third.tools.enabled == ["Read", "Grep"]
+
+    @pytest.mark.unit
+    def test_skill_reloads_after_edit_and_new_script(self, tmp_path: Path) -> None:
+        """SKILL.md edits and added scripts are picked up by new managers."""
+        skill_dir = tmp_path / "demo"
+        skill_dir.mkdir()
+        skill_md = skill_dir / "SKILL.md"
+        skill_md.write_text("---\nname: demo\ndescription: first\n---\nBody\n")
+
+        skill = SkillManager(tmp_path).load_skill("demo")
+        assert skill.description == "first"
+        assert skill.script_file is None
+
+        skill_md.write_text("---\nname: demo\ndescription: second\n---\nBody\n")
+        _bump_mtime(skill_md)
+        (skill_dir / "scripts").mkdir()
+        (skill_dir / "scripts" / "demo.py").write_text("print('hi')\n")
+
+        skill = SkillManager(tmp_path).load_skill("demo")
+        assert skill.description == "second"
+        assert skill.script_file == skill_dir / "scripts" / "demo.py"
+
+    @pytest.mark.unit
+    def test_shared_cache_is_singleton(self) -> None:
+        """get_preparation_cache() returns one process-wide instance."""
+        assert get_preparation_cache() is get_preparation_cache()
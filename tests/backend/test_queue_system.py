@@ -150,6 +150,56 @@ class TestTaskQueue:
         assert position == 1  # 0-indexed rank + 1
         patched_redis.zadd.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_enqueue_many_uses_one_pipeline(self, task_queue, patched_redis):
+        """Test batch enqueue sends all commands in a single pipeline."""
+        now = datetime.now(timezone.utc)
+        tasks = [
+            QueuedTask(
+                session_id=f"session-{i}",
+                user_id="user-456",
+                task=f"Task {i}",
+                priority=0,
+                queued_at=now + timedelta(microseconds=i),
+            )
+            for i in range(3)
+        ]
+        pipe = MagicMock()
+        # 3x (set, zadd) followed by 3x zrank
+        pipe.execute = AsyncMock(return_value=[True, 1] * 3 + [4, 5, 6])
+        patched_redis.pipeline = MagicMock(return_value=pipe)
+
+        positions = await task_queue.enqueue_many(tasks)
+
+        assert positions == [5, 6, 7]
+        pipe.execute.assert_awaited_once()
+        assert pipe.zadd.call_count == 3
+        assert pipe.set.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_enqueue_many_overflow_rejects_whole_batch(self, task_queue, patched_redis):
+        """Test batch enqueue is all-or-nothing against max_queue_size."""
+        from src.services.task_queue import QueueOverflowError
+
+        task_queue._max_queue_size = 10
+        patched_redis.zcard.return_value = 9
+        patched_redis.pipeline = MagicMock()
+        tasks = [
+            QueuedTask(
+                session_id=f"session-{i}",
+                user_id="user-456",
+                task="Task",
+                priority=0,
+                queued_at=datetime.now(timezone.utc),
+            )
+            for i in range(2)
+        ]
+
+        with pytest.raises(QueueOverflowError):
+            await task_queue.enqueue_many(tasks)
+
+        patched_redis.pipeline.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_dequeue_empty_queue(self, task_queue, patched_redis):
         """Test dequeue from empty queue returns None."""
@@ -311,6 +361,19 @@ class TestQuotaManager:
         assert can_start is False
         assert "user" in reason.lower() or "concurrent" in reason.lower()
 
+    @pytest.mark.asyncio
+    async def test_available_slots_is_tightest_limit(self, quota_manager, mock_task_queue, mock_db):
+        """Test available slots is the minimum of the global and per-user headroom."""
+        quota_manager._global_active_count = 3
+        mock_task_queue.get_user_active_count.return_value = 0
+
+        assert await quota_manager.available_slots("user-123", mock_db) == 1
+
+        quota_manager._global_active_count = 0
+        mock_task_queue.get_user_active_count.return_value = 2
+
+        assert await quota_manager.available_slots("user-123", mock_db) == 0
+
     def test_increment_global(self, quota_manager):
         """Test incrementing global active count."""
         initial = quota_manager.get_global_active()
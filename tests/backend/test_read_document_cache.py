@@ -0,0 +1,398 @@
+"""
+Tests for the ReadDocument extraction cache (tools/ag3ntum/ag3ntum_read_document/cache.py).
+
+Covers:
+- Round trip, TTL expiry and clearing
+- Incremental size tracking in the SQLite index (no directory walks on put)
+- LRU eviction by last read, not by creation
+- Several processes sharing one cache directory
+- Import of entry files written before the index existed
+- Batched reads and writes (one index transaction per batch)
+- Full-file fingerprints and the PDF extractor's per-page cache: overlapping
+  page ranges extract only missing pages, OCR results are reused, and the
+  cache is accessed in batches off the event loop
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+import time
+from pathlib import Path
+
+import fitz
+import pytest
+
+import src.core  # noqa: F401  (import order: src.core before tools)
+from tools.ag3ntum.ag3ntum_read_document import cache as cache_module
+from tools.ag3ntum.ag3ntum_read_document.cache import CacheManager, document_fingerprint
+from tools.ag3ntum.ag3ntum_read_document.config import CacheConfig
+from tools.ag3ntum.ag3ntum_read_document.extractors import pdf as pdf_module
+from tools.ag3ntum.ag3ntum_read_document.extractors.pdf import PDFExtractor
+
+
+def _key(n: int) -> str:
+    return f"{n:064x}"
+
+
+def _manager(directory: Path, max_size_mb: int = 1024, ttl_days: int = 7) -> CacheManager:
+    return CacheManager(CacheConfig(directory=str(directory), max_size_mb=max_size_mb, ttl_days=ttl_days))
+
+
+def _file_sizes(directory: Path) -> tuple[int, int]:
+    files = list(directory.glob("*/*/*.json"))
+    return len(files), sum(f.stat().st_size for f in files)
+
+
+def _put_entries(directory: str, worker: int, count: int) -> None:
+    """Worker process: store count entries (some keys shared with other workers)."""
+    manager = _manager(Path(directory))
+    for i in range(count):
+        key = _key(i) if i % 5 == 0 else _key(worker * 1000 + i)
+        manager.put("pdf", key, f"worker {worker} entry {i}")
+        manager.get("pdf", _key(0))
+    manager.close()
+
+
+class TestCacheManager:
+    """Tests for storage, expiry and size tracking."""
+
+    @pytest.mark.unit
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Stored content and metadata come back; unknown keys miss."""
+        manager = _manager(tmp_path)
+        manager.put("pdf", _key(1), "page text", {"pages": 3})
+        entry = manager.get("pdf", _key(1))
+
+        assert entry is not None
+        assert (entry.content, entry.metadata) == ("page text", {"pages": 3})
+        assert manager.get("pdf", _key(2)) is None
+        assert (manager.hits, manager.misses) == (1, 1)
+        assert not list(tmp_path.glob("*/*/*.tmp"))
+
+    @pytest.mark.unit
+    def test_size_tracked_incrementally(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The index total matches the entry files through overwrites and removals."""
+        manager = _manager(tmp_path)
+        manager.get_stats()
+        monkeypatch.setattr(Path, "rglob", lambda *a, **k: pytest.fail("directory walked"))
+        monkeypatch.setattr(Path, "glob", lambda *a, **k: pytest.fail("directory walked"))
+
+        for i in range(20):
+            manager.put("office" if i % 2 else "pdf", _key(i), "x" * (i * 100))
+        manager.put("pdf", _key(4), "shorter")
+        manager._remove_entry("pdf", _key(6))
+        stats = manager.get_stats()
+        monkeypatch.undo()
+
+        assert (stats.total_entries, stats.total_size_bytes) == _file_sizes(tmp_path)
+        assert stats.total_entries == 19
+
+    @pytest.mark.unit
+    def test_expired_entry_removed(self, tmp_path: Path) -> None:
+        """Entries older than ttl_days miss and leave the index."""
+        manager = _manager(tmp_path, ttl_days=1)
+        manager.put("pdf", _key(1), "old")
+        path = manager._get_cache_path("pdf", _key(1))
+        data = json.loads(path.read_text())
+        data["created_at"] = time.time() - 2 * 86400
+        path.write_text(json.dumps(data))
+
+        assert manager.get("pdf", _key(1)) is None
+        assert not path.exists()
+        assert manager.get_stats().total_entries == 0
+
+    @pytest.mark.unit
+    def test_batches_use_one_transaction(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """put_many() and get_many() write the index once per batch."""
+        manager = _manager(tmp_path)
+        transactions = []
+        transaction = manager._transaction
+
+        def counting_transaction():
+            transactions.append(1)
+            return transaction()
+
+        monkeypatch.setattr(manager, "_transaction", counting_transaction)
+        manager.put_many("pdf", [(_key(i), f"page {i}", {"n": i}) for i in range(10)])
+        entries = manager.get_many("pdf", [_key(i) for i in range(12)])
+
+        assert len(transactions) == 2
+        assert sorted(entries) == [_key(i) for i in range(10)]
+        assert (entries[_key(3)].content, entries[_key(3)].metadata) == ("page 3", {"n": 3})
+        assert (manager.hits, manager.misses) == (10, 2)
+        stats = manager.get_stats()
+        assert (stats.total_entries, stats.total_size_bytes) == _file_sizes(tmp_path)
+
+    @pytest.mark.unit
+    def test_same_key_in_two_categories(self, tmp_path: Path) -> None:
+        """Categories have separate index rows for the same key."""
+        manager = _manager(tmp_path)
+        manager.put("pdf", _key(1), "pdf content")
+        manager.put("office", _key(1), "office content " * 10)
+        manager._remove_entry("pdf", _key(1))
+
+        assert manager.get("pdf", _key(1)) is None
+        assert manager.get("office", _key(1)).content.startswith("office content")
+        stats = manager.get_stats()
+        assert (stats.total_entries, stats.total_size_bytes) == _file_sizes(tmp_path)
+        assert stats.total_entries == 1
+
+    @pytest.mark.unit
+    def test_clear(self, tmp_path: Path) -> None:
+        """clear() empties the index and deletes the entry files."""
+        manager = _manager(tmp_path)
+        for i in range(5):
+            manager.put("archive", _key(i), "content")
+        manager.clear()
+
+        assert _file_sizes(tmp_path) == (0, 0)
+        assert manager.get_stats().total_size_bytes == 0
+
+
+class TestEviction:
+    """Tests for LRU eviction."""
+
+    @pytest.mark.unit
+    def test_least_recently_read_evicted(self, tmp_path: Path) -> None:
+        """A recently read entry survives; the least recently read one goes."""
+        manager = _manager(tmp_path, max_size_mb=1)
+        chunk = "x" * 300_000
+        for i in range(3):
+            manager.put("pdf", _key(i), chunk)
+        assert manager.get("pdf", _key(0)) is not None
+
+        manager.put("pdf", _key(3), chunk)
+
+        assert manager.get("pdf", _key(1)) is None
+        assert not manager._get_cache_path("pdf", _key(1)).exists()
+        for i in (0, 2, 3):
+            assert manager.get("pdf", _key(i)) is not None
+        stats = manager.get_stats()
+        assert stats.total_size_bytes <= manager.max_size_bytes
+        assert (stats.total_entries, stats.total_size_bytes) == _file_sizes(tmp_path)
+
+
+class TestSharedIndex:
+    """Tests for processes sharing a cache directory and index creation."""
+
+    @pytest.mark.unit
+    def test_concurrent_processes(self, tmp_path: Path) -> None:
+        """Writers in several processes keep the index consistent with the files."""
+        manager = _manager(tmp_path)
+        manager.get_stats()  # Open the index in this process before forking
+
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=_put_entries, args=(str(tmp_path), worker, 60))
+            for worker in range(4)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+
+        stats = manager.get_stats()
+        assert (stats.total_entries, stats.total_size_bytes) == _file_sizes(tmp_path)
+        assert stats.total_entries == 12 + 4 * 48
+        assert manager.get("pdf", _key(0)) is not None
+
+    @pytest.mark.unit
+    def test_existing_entries_imported(self, tmp_path: Path) -> None:
+        """Entry files from before the index are indexed once; index.json is removed."""
+        for i in range(3):
+            path = tmp_path / "pdf" / _key(i)[:2] / f"{_key(i)}.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps({"content": f"legacy {i}", "created_at": time.time()}))
+        (tmp_path / "index.json").write_text("{}")
+
+        manager = _manager(tmp_path)
+        stats = manager.get_stats()
+
+        assert (stats.total_entries, stats.total_size_bytes) == _file_sizes(tmp_path)
+        assert stats.total_entries == 3
+        assert not (tmp_path / "index.json").exists()
+        assert manager.get("pdf", _key(2)).content == "legacy 2"
+
+    @pytest.mark.unit
+    def test_connection_reopened_after_fork(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A connection opened by another process id is not reused."""
+        manager = _manager(tmp_path)
+        manager.put("pdf", _key(1), "content")
+        first = manager._conn
+        monkeypatch.setattr(os, "getpid", lambda: -1)
+        manager.put("pdf", _key(2), "content")
+
+        assert manager._conn is not first
+        assert manager.get_stats().total_entries == 2
+        assert cache_module.SCHEMA_VERSION == manager._conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _write_pdf(path: Path, pages: int, label: str = "Page", blank: set[int] = frozenset()) -> Path:
+    """PDF with a line of text per page (blank pages are left empty, as scans)."""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        if i not in blank:
+            page.insert_text((72, 72), f"{label} {i + 1} " + "lorem ipsum " * 8)
+    doc.set_metadata({"title": "Test document"})
+    doc.save(path)
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def page_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> CacheManager:
+    """The extractor's cache, in a fresh directory."""
+    manager = _manager(tmp_path / "cache")
+    monkeypatch.setattr(cache_module, "_cache_manager", manager)
+    return manager
+
+
+@pytest.fixture
+def extracted_pages(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """Numbers of the pages whose text PyMuPDF extracts."""
+    extracted = []
+    get_text = fitz.Page.get_text
+
+    def counting_get_text(page, *args, **kwargs):
+        extracted.append(page.number + 1)
+        return get_text(page, *args, **kwargs)
+
+    monkeypatch.setattr(fitz.Page, "get_text", counting_get_text)
+    return extracted
+
+
+class TestFingerprint:
+    """Tests for document_fingerprint()."""
+
+    @pytest.mark.unit
+    def test_full_content_hashed(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A change after the first 64KB changes the fingerprint; unchanged files are not re-read."""
+        path = tmp_path / "doc.bin"
+        path.write_bytes(b"a" * 200_000)
+        first = document_fingerprint(path)
+
+        monkeypatch.setattr(cache_module, "open", lambda *a, **k: pytest.fail("file re-read"), raising=False)
+        assert document_fingerprint(path) == first
+        monkeypatch.undo()
+
+        # Same size; the memo is dropped in case the rewrite keeps the mtime
+        path.write_bytes(b"a" * 199_999 + b"b")
+        monkeypatch.setattr(cache_module, "_fingerprints", type(cache_module._fingerprints)())
+        assert document_fingerprint(path) != first
+
+        monkeypatch.setattr(cache_module, "xxhash", None)
+        monkeypatch.setattr(cache_module, "_fingerprints", type(cache_module._fingerprints)())
+        assert document_fingerprint(path).startswith("blake2b:")
+
+
+class TestPDFPageCache:
+    """Tests for the per-page PDF cache."""
+
+    @pytest.mark.asyncio
+    async def test_overlapping_ranges(
+        self, tmp_path: Path, page_cache: CacheManager, extracted_pages: list[int]
+    ) -> None:
+        """Pages 1-20 then 10-30: only pages 21-30 are extracted the second time."""
+        pdf = _write_pdf(tmp_path / "report.pdf", 30)
+        extractor = PDFExtractor()
+
+        first = await extractor.extract(pdf, {"pages": "1-20"})
+        assert extracted_pages == list(range(1, 21))
+        extracted_pages.clear()
+
+        second = await extractor.extract(pdf, {"pages": "10-30"})
+        assert extracted_pages == list(range(21, 31))
+        assert "11 of 21 pages from cache" in second.processing_notes
+        assert "--- Page 10 ---\nPage 10 lorem" in second.content
+        overlap = second.content[second.content.index("\n--- Page 10 ---"):second.content.index("\n--- Page 21 ---")]
+        assert first.content.endswith(overlap)
+
+        page_cache.config.enabled = False
+        uncached = await extractor.extract(pdf, {"pages": "10-30"})
+        assert (uncached.content, uncached.metadata) == (second.content, second.metadata)
+        assert second.metadata == {"title": "Test document"}
+
+    @pytest.mark.asyncio
+    async def test_cached_range_does_not_open_document(
+        self, tmp_path: Path, page_cache: CacheManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A range served from the cache needs neither the document nor its page count."""
+        pdf = _write_pdf(tmp_path / "report.pdf", 12)
+        extractor = PDFExtractor()
+        await extractor.extract(pdf, {})
+
+        monkeypatch.setattr(pdf_module.fitz, "open", lambda *a, **k: pytest.fail("document opened"))
+        result = await extractor.extract(pdf, {"pages": "3-5", "include_metadata": False})
+
+        assert result.total_pages == 12 and result.extracted_pages == [2, 3, 4]
+        assert result.metadata == {}
+        assert "3 of 3 pages from cache" in result.processing_notes
+
+    @pytest.mark.asyncio
+    async def test_pages_cached_in_batches_off_the_event_loop(
+        self, tmp_path: Path, page_cache: CacheManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Page lookups and stores are one batch each, run in worker threads."""
+        pdf = _write_pdf(tmp_path / "report.pdf", 20)
+        calls = []
+        # get() and put() go through the batch methods
+        for name in ("get_many", "put_many"):
+            method = getattr(page_cache, name)
+
+            def recording(*args, _name=name, _method=method, **kwargs):
+                calls.append((_name, threading.current_thread() is threading.main_thread()))
+                return _method(*args, **kwargs)
+
+            monkeypatch.setattr(page_cache, name, recording)
+
+        extractor = PDFExtractor()
+        await extractor.extract(pdf, {"pages": "1-10"})
+        assert calls == [("get_many", False), ("get_many", False), ("put_many", False)]
+
+        calls.clear()
+        result = await extractor.extract(pdf, {"pages": "5-20"})
+        assert calls == [("get_many", False), ("get_many", False), ("put_many", False)]
+        assert "6 of 16 pages from cache" in result.processing_notes
+
+    @pytest.mark.asyncio
+    async def test_changed_file_extracted_again(self, tmp_path: Path, page_cache: CacheManager) -> None:
+        """Rewriting the file (same name) misses the cache."""
+        pdf = _write_pdf(tmp_path / "report.pdf", 3)
+        extractor = PDFExtractor()
+        await extractor.extract(pdf, {})
+
+        _write_pdf(pdf, 3, label="Revised")
+        result = await extractor.extract(pdf, {})
+        assert "Revised 2" in result.content
+        assert not any("from cache" in note for note in result.processing_notes)
+
+    @pytest.mark.asyncio
+    async def test_ocr_pages_reused(
+        self, tmp_path: Path, page_cache: CacheManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """OCR text is cached per page and reused by other ranges; failures are not cached."""
+        pdf = _write_pdf(tmp_path / "scan.pdf", 6, blank={1, 2, 4})
+        ocr_calls = []
+
+        async def fake_ocr(self, page, timeout):
+            ocr_calls.append(page.number + 1)
+            if page.number == 4 and len(ocr_calls) == 3:
+                raise asyncio.TimeoutError
+            return f"recognized text {page.number + 1}"
+
+        monkeypatch.setattr(PDFExtractor, "_ocr_page", fake_ocr)
+        extractor = PDFExtractor()
+
+        first = await extractor.extract(pdf, {"pages": "1-5"})
+        assert ocr_calls == [2, 3, 5]
+        assert "[OCR timed out]" in first.content
+
+        second = await extractor.extract(pdf, {"pages": "2-6"})
+        assert ocr_calls == [2, 3, 5, 5]
+        assert "--- Page 2 [OCR] ---\nrecognized text 2" in second.content
+        assert "--- Page 5 [OCR] ---\nrecognized text 5" in second.content
+        assert second.ocr_pages_used == 3
+        assert "OCR applied to pages: 2, 3, 5" in second.processing_notes
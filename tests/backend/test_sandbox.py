@@ -10,6 +10,7 @@ Tests cover:
 - Environment variable handling
 - Mount source validation (fail-closed security)
 - Placeholder resolution in paths
+- Compiled bwrap argument templates and their invalidation
 """
 import sys
 from pathlib import Path
@@ -34,6 +35,21 @@ from src.core.sandbox import (
 )
 
 
+def _mock_process(stdout: bytes = b"", stderr: bytes = b"", returncode: int = 0) -> AsyncMock:
+    """Subprocess stand-in whose pipes are real stream readers."""
+    import asyncio
+
+    process = AsyncMock()
+    for name, data in (("stdout", stdout), ("stderr", stderr)):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        setattr(process, name, reader)
+    process.returncode = returncode
+    process.kill = MagicMock()
+    return process
+
+
 class TestSandboxMount:
     """Test SandboxMount configuration."""
 
@@ -564,10 +580,7 @@ class TestExecuteSandboxedCommand:
 
         # Mock the subprocess execution
         with patch('asyncio.create_subprocess_exec') as mock_exec:
-            mock_process = AsyncMock()
-            mock_process.communicate.return_value = (b"hello\n", b"")
-            mock_process.returncode = 0
-            mock_exec.return_value = mock_process
+            mock_exec.return_value = _mock_process(b"hello\n")
 
             exit_code, stdout, stderr = await execute_sandboxed_command(
                 executor, "echo hello", allow_network=False, timeout=10
@@ -594,9 +607,8 @@ class TestExecuteSandboxedCommand:
         executor = SandboxExecutor(config)
 
         with patch('asyncio.create_subprocess_exec') as mock_exec:
-            mock_process = AsyncMock()
-            mock_process.communicate.side_effect = asyncio.TimeoutError()
-            mock_process.kill = MagicMock()
+            mock_process = _mock_process()
+            mock_process.wait.side_effect = asyncio.TimeoutError()
             mock_exec.return_value = mock_process
 
             exit_code, stdout, stderr = await execute_sandboxed_command(
@@ -621,10 +633,7 @@ class TestExecuteSandboxedCommand:
         executor = SandboxExecutor(config, linux_uid=2000, linux_gid=2000)
 
         with patch('asyncio.create_subprocess_exec') as mock_exec:
-            mock_process = AsyncMock()
-            mock_process.communicate.return_value = (b"ok\n", b"")
-            mock_process.returncode = 0
-            mock_exec.return_value = mock_process
+            mock_exec.return_value = _mock_process(b"ok\n")
 
             await execute_sandboxed_command(
                 executor, "whoami", allow_network=False, timeout=10
@@ -778,6 +787,81 @@ class TestOptionalMounts:
         assert "/nonexistent/required" in missing
 
 
+class TestBwrapTemplate:
+    """Test the per-executor compiled bwrap argument template."""
+
+    @pytest.fixture
+    def config(self, tmp_path: Path) -> SandboxConfig:
+        workspace = tmp_path / "workspace"
+        workspace.mkdir()
+        return SandboxConfig(
+            static_mounts={"bin": SandboxMount(source="/usr/bin", target="/usr/bin")},
+            session_mounts={
+                "workspace": SandboxMount(source=str(workspace), target="/workspace", mode="rw"),
+            },
+        )
+
+    def test_template_reused_without_filesystem_checks(self, config: SandboxConfig) -> None:
+        """Later commands reuse the template: same prefix, no mount stat calls."""
+        executor = SandboxExecutor(config, linux_uid=2000, linux_gid=2000)
+        first = executor.build_bwrap_command(["echo", "one"], allow_network=False)
+
+        with patch("src.core.sandbox.Path.exists", side_effect=AssertionError("stat")):
+            second = executor.build_bwrap_command(["echo", "two"], allow_network=False)
+
+        assert first[:-2] == second[:-2]
+        assert second[-3:] == ["--", "echo", "two"]
+        # Same arguments as a freshly built command
+        fresh = SandboxExecutor(config, linux_uid=2000, linux_gid=2000)
+        assert fresh.build_bwrap_command(["echo", "two"], allow_network=False) == second
+
+    def test_recompiled_when_secrets_or_mounts_change(
+        self, config: SandboxConfig, tmp_path: Path
+    ) -> None:
+        """New sandboxed_envs, mounts or a replaced environment rebuild the template."""
+        executor = SandboxExecutor(config)
+        executor.build_bwrap_command(["true"], allow_network=False)
+
+        config.environment.custom_env = {"API_TOKEN": "secret-1"}
+        cmd = executor.build_bwrap_command(["true"], allow_network=False)
+        assert "secret-1" in cmd
+
+        config.environment.custom_env["API_TOKEN"] = "secret-2"
+        cmd = executor.build_bwrap_command(["true"], allow_network=False)
+        assert "secret-2" in cmd and "secret-1" not in cmd
+
+        extra = tmp_path / "extra"
+        extra.mkdir()
+        config.dynamic_mounts.append(SandboxMount(source=str(extra), target="/mnt/extra"))
+        cmd = executor.build_bwrap_command(["true"], allow_network=False)
+        assert "/mnt/extra" in cmd
+
+    def test_missing_required_mount_not_cached(self, config: SandboxConfig) -> None:
+        """A failed compile raises every time until the configuration is fixed."""
+        config.dynamic_mounts.append(SandboxMount(source="/nonexistent/src", target="/mnt/x"))
+        executor = SandboxExecutor(config)
+        for _ in range(2):
+            with pytest.raises(SandboxMountError):
+                executor.build_bwrap_command(["true"], allow_network=False)
+
+    def test_new_optional_source_mounted(
+        self, config: SandboxConfig, tmp_path: Path
+    ) -> None:
+        """An optional source created later is mounted by the next command, and dropped once gone."""
+        later = tmp_path / "later"
+        config.dynamic_mounts.append(
+            SandboxMount(source=str(later), target="/mnt/later", optional=True)
+        )
+        executor = SandboxExecutor(config)
+        assert "/mnt/later" not in executor.build_bwrap_command(["true"], allow_network=False)
+
+        later.mkdir()
+        assert "/mnt/later" in executor.build_bwrap_command(["true"], allow_network=False)
+
+        later.rmdir()
+        assert "/mnt/later" not in executor.build_bwrap_command(["true"], allow_network=False)
+
+
 class TestWorkspaceAndMountAccess:
     """Test file access validation for workspace, RO/RW mounts, and persistent storage."""
 
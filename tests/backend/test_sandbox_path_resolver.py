@@ -684,3 +684,56 @@ class TestIntegration:
         # Check properties
         assert resolver.get_mount_type(normalized) == "external_ro"
         assert resolver.is_path_writable(normalized) is False
+
+
+# =============================================================================
+# Mount Lookup Trie Tests
+# =============================================================================
+
+class TestPathPrefixTrie:
+    """Tests for PathPrefixTrie and the trie-backed mount lookups."""
+
+    def test_component_matching(self):
+        """Prefixes match whole components, shortest first."""
+        from src.core.sandbox_path_resolver import PathPrefixTrie
+
+        trie = PathPrefixTrie()
+        trie.insert("/", "root")
+        trie.insert("/a/b", "ab")
+        trie.insert("/a/b", "ab2")
+        trie.insert("/a/b/c", "abc")
+        assert trie.matches("/a/b/c/d") == [(0, "root"), (2, "ab"), (2, "ab2"), (3, "abc")]
+        assert trie.matches("/a/bc") == [(0, "root")]
+        assert trie.matches("/a/b") == [(0, "root"), (2, "ab"), (2, "ab2")]
+
+    @pytest.mark.parametrize("user_mounts_ro", [
+        {"downloads": "/data/downloads"},
+        {"home": "/users/testuser"},       # contains other mounts' Docker paths
+        {"odd": "/data/odd/"},             # non-canonical: linear scan
+    ])
+    def test_lookup_matches_linear_scan(self, user_mounts_ro):
+        """Trie lookups return the mount the ordered linear scan returns."""
+        ctx = SandboxPathContext(
+            session_id="test-session-123",
+            username="testuser",
+            user_mounts_ro=user_mounts_ro,
+            user_mounts_rw={"projects": "/mounts/rw/projects"},
+        )
+
+        def linear(path, by_docker):
+            for mount in ctx.mounts:
+                if (mount.matches_docker_path(path) if by_docker else mount.matches_sandbox_path(path)):
+                    return mount
+            return None
+
+        paths = [
+            "/workspace", "/workspace/a.txt", "/workspacex", "/venv/bin/python3",
+            "/skills/.claude/skills/x", "/mounts/ro/a", "/mounts/rw/projects/q",
+            "/workspace/external/user-ro/downloads/f", "/workspace/external/user-rw/projects",
+            "/users/testuser/sessions/test-session-123/workspace/f", "/users/testuser/venv",
+            "/users/testuser/ag3ntum/persistent/a", "/users/testuser/other", "/data/downloads/x",
+            "/data/odd/", "/data/odd//x", "/", "relative/path", "//workspace/a",
+        ]
+        for path in paths:
+            assert ctx.find_mount_for_sandbox_path(path) is linear(path, False), path
+            assert ctx.find_mount_for_docker_path(path) is linear(path, True), path
@@ -7,7 +7,7 @@ Comprehensive coverage of all session endpoints including:
 - Pagination and filtering
 """
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -140,6 +140,234 @@ class TestSessionRun:
         assert response.status_code == 401
 
 
+class TestSessionRunBatch:
+    """Tests for POST /api/v1/sessions/run-batch and GET /api/v1/sessions/batches/{id}."""
+
+    @pytest.mark.unit
+    def test_run_batch_creates_and_starts_all(
+        self,
+        client: TestClient,
+        auth_headers: dict
+    ) -> None:
+        """Batch endpoint creates one session per task and starts them."""
+        response = client.post(
+            "/api/v1/sessions/run-batch",
+            headers=auth_headers,
+            json={"tasks": [{"task": "Audit server 1"}, {"task": "Audit server 2"}]}
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["batch_id"].startswith("batch_")
+        assert len(data["session_ids"]) == 2
+        assert len(set(data["session_ids"])) == 2
+        assert data["running"] == 2
+        assert data["queued"] == 0
+        assert [s["session_id"] for s in data["sessions"]] == data["session_ids"]
+        assert all(s["status"] == "running" for s in data["sessions"])
+
+    @pytest.mark.unit
+    def test_run_batch_sessions_carry_batch_id(
+        self,
+        client: TestClient,
+        auth_headers: dict
+    ) -> None:
+        """Created sessions are tagged with the batch ID and keep their own task."""
+        response = client.post(
+            "/api/v1/sessions/run-batch",
+            headers=auth_headers,
+            json={"tasks": [{"task": "Task A"}, {"task": "Task B"}]}
+        )
+        data = response.json()
+
+        for session_id, task in zip(data["session_ids"], ["Task A", "Task B"]):
+            session = client.get(f"/api/v1/sessions/{session_id}", headers=auth_headers).json()
+            assert session["batch_id"] == data["batch_id"]
+            assert session["task"] == task
+            assert session["status"] == "running"
+
+    @pytest.mark.unit
+    def test_run_batch_rejects_too_many_tasks(
+        self,
+        client: TestClient,
+        auth_headers: dict
+    ) -> None:
+        """Batches above batch.max_tasks are rejected before creating sessions."""
+        with patch(
+            "src.api.routes.sessions._get_batch_config",
+            return_value={"max_tasks": 2},
+        ):
+            response = client.post(
+                "/api/v1/sessions/run-batch",
+                headers=auth_headers,
+                json={"tasks": [{"task": f"Task {i}"} for i in range(3)]}
+            )
+
+        assert response.status_code == 400
+        assert "Maximum is 2" in response.json()["detail"]
+
+        sessions = client.get("/api/v1/sessions", headers=auth_headers).json()
+        assert sessions["total"] == 0
+
+    @pytest.mark.unit
+    def test_run_batch_requires_tasks(
+        self,
+        client: TestClient,
+        auth_headers: dict
+    ) -> None:
+        """An empty task list is a validation error."""
+        response = client.post(
+            "/api/v1/sessions/run-batch",
+            headers=auth_headers,
+            json={"tasks": []}
+        )
+
+        assert response.status_code == 422
+
+    @pytest.mark.unit
+    def test_run_batch_rejects_blank_task(
+        self,
+        client: TestClient,
+        auth_headers: dict
+    ) -> None:
+        """A batch item without a task is a validation error."""
+        response = client.post(
+            "/api/v1/sessions/run-batch",
+            headers=auth_headers,
+            json={"tasks": [{"task": "Do something"}, {"task": "   "}]}
+        )
+
+        assert response.status_code == 422
+
+    @pytest.mark.unit
+    def test_run_batch_start_failure_marks_only_that_session(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        mock_agent_runner
+    ) -> None:
+        """A start failure fails its own session; the others still start and persist."""
+        mock_agent_runner.start_task.side_effect = [None, RuntimeError("boom"), None]
+
+        response = client.post(
+            "/api/v1/sessions/run-batch",
+            headers=auth_headers,
+            json={"tasks": [{"task": "One"}, {"task": "Two"}, {"task": "Three"}]}
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["running"] == 2
+        assert [s["status"] for s in data["sessions"]] == ["running", "failed", "running"]
+        for session_id, status in zip(data["session_ids"], ["running", "failed", "running"]):
+            session = client.get(f"/api/v1/sessions/{session_id}", headers=auth_headers).json()
+            assert session["status"] == status
+
+    @pytest.mark.unit
+    def test_run_batch_start_failure_queues_the_rest(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        mock_agent_runner
+    ) -> None:
+        """With the queue enabled, sessions after a failed start are queued, not dropped."""
+        task_queue = MagicMock()
+        task_queue.mark_user_active_many = AsyncMock()
+        task_queue.enqueue_many = AsyncMock(side_effect=lambda tasks: list(range(1, len(tasks) + 1)))
+        quota_manager = MagicMock()
+        quota_manager.available_slots = AsyncMock(return_value=3)
+        mock_agent_runner.start_task.side_effect = [None, RuntimeError("boom")]
+
+        state = client.app.state
+        state.task_queue, state.quota_manager = task_queue, quota_manager
+        try:
+            response = client.post(
+                "/api/v1/sessions/run-batch",
+                headers=auth_headers,
+                json={"tasks": [{"task": "One"}, {"task": "Two"}, {"task": "Three"}]}
+            )
+        finally:
+            state.task_queue = state.quota_manager = None
+
+        assert response.status_code == 201
+        data = response.json()
+        statuses = {s["session_id"]: s["status"] for s in data["sessions"]}
+        first, second, third = data["session_ids"]
+        assert statuses == {first: "running", second: "failed", third: "queued"}
+        assert data["running"] == 1
+        assert data["queued"] == 1
+        assert quota_manager.increment_global.call_count == 1
+        task_queue.mark_user_active_many.assert_awaited_once()
+        assert task_queue.mark_user_active_many.await_args.args[1] == [first]
+        queued = task_queue.enqueue_many.await_args.args[0]
+        assert [t.session_id for t in queued] == [third]
+
+        session = client.get(f"/api/v1/sessions/{third}", headers=auth_headers).json()
+        assert session["status"] == "queued"
+
+    @pytest.mark.unit
+    def test_batch_status_aggregates_sessions(
+        self,
+        client: TestClient,
+        auth_headers: dict
+    ) -> None:
+        """Batch status reports per-status counts for every session in the batch."""
+        batch = client.post(
+            "/api/v1/sessions/run-batch",
+            headers=auth_headers,
+            json={"tasks": [{"task": "One"}, {"task": "Two"}, {"task": "Three"}]}
+        ).json()
+
+        response = client.get(
+            f"/api/v1/sessions/batches/{batch['batch_id']}",
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["batch_id"] == batch["batch_id"]
+        assert data["total"] == 3
+        assert data["status_counts"] == {"running": 3}
+        assert data["finished"] == 0
+        assert data["is_finished"] is False
+        assert data["total_cost_usd"] == 0.0
+
+    @pytest.mark.unit
+    def test_batch_status_not_found(
+        self,
+        client: TestClient,
+        auth_headers: dict
+    ) -> None:
+        """Unknown or malformed batch IDs return 404."""
+        for batch_id in ("batch_20260101_120000_abc12345", "not-a-batch"):
+            response = client.get(
+                f"/api/v1/sessions/batches/{batch_id}",
+                headers=auth_headers,
+            )
+            assert response.status_code == 404
+
+    @pytest.mark.unit
+    def test_batch_status_isolated_by_user(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        second_auth_headers: dict
+    ) -> None:
+        """Another user cannot see a batch they did not submit."""
+        batch = client.post(
+            "/api/v1/sessions/run-batch",
+            headers=auth_headers,
+            json={"tasks": [{"task": "Private"}]}
+        ).json()
+
+        response = client.get(
+            f"/api/v1/sessions/batches/{batch['batch_id']}",
+            headers=second_auth_headers,
+        )
+
+        assert response.status_code == 404
+
+
 class TestSessionCreate:
     """Tests for POST /api/v1/sessions."""
 
@@ -0,0 +1,146 @@
+"""
+Tests for the cached skill catalog and incremental workspace skill sync.
+
+Covers:
+- discover_merged_skills() catalog invalidation by directory mtimes
+- sync_skill_links() diffing, stale link removal and tamper repair
+"""
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.core.skills import discover_merged_skills, sync_skill_links
+
+
+def _bump_mtime(path: Path) -> None:
+    """Move a directory's mtime forward so the catalog signature changes."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def _make_skill(base: Path, name: str) -> Path:
+    skill_dir = base / name
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(f"---\nname: {name}\ndescription: d\n---\n")
+    return skill_dir
+
+
+class TestSkillCatalog:
+    """Tests for discover_merged_skills() catalog caching."""
+
+    @pytest.fixture
+    def roots(self, tmp_path: Path):
+        skills_dir = tmp_path / "skills"
+        users_dir = tmp_path / "users"
+        (skills_dir / ".claude" / "skills").mkdir(parents=True)
+        (users_dir / "alice" / ".claude" / "skills").mkdir(parents=True)
+        with patch("src.core.skills.SKILLS_DIR", skills_dir), \
+                patch("src.core.skills.USERS_DIR", users_dir):
+            yield (
+                skills_dir / ".claude" / "skills",
+                users_dir / "alice" / ".claude" / "skills",
+            )
+
+    @pytest.mark.unit
+    def test_user_skills_override_global(self, roots) -> None:
+        """A user skill replaces the global skill of the same name."""
+        global_base, user_base = roots
+        _make_skill(global_base, "shared")
+        _make_skill(global_base, "only-global")
+        _make_skill(user_base, "shared")
+
+        skills = discover_merged_skills(username="alice")
+        assert skills == {
+            "shared": user_base / "shared",
+            "only-global": global_base / "only-global",
+        }
+        assert discover_merged_skills() == {
+            "shared": global_base / "shared",
+            "only-global": global_base / "only-global",
+        }
+
+    @pytest.mark.unit
+    def test_catalog_tracks_added_removed_and_new_skill_md(self, roots) -> None:
+        """Adding or removing skills and SKILL.md files is picked up."""
+        global_base, _ = roots
+        _make_skill(global_base, "one")
+        pending = global_base / "pending"
+        pending.mkdir()
+        assert set(discover_merged_skills()) == {"one"}
+
+        (pending / "SKILL.md").write_text("---\nname: pending\n---\n")
+        _bump_mtime(pending)
+        assert set(discover_merged_skills()) == {"one", "pending"}
+
+        (global_base / "one" / "SKILL.md").unlink()
+        (global_base / "one").rmdir()
+        _bump_mtime(global_base)
+        assert set(discover_merged_skills()) == {"pending"}
+
+    @pytest.mark.unit
+    def test_result_is_a_copy(self, roots) -> None:
+        """Mutating the returned dict does not corrupt the cached catalog."""
+        global_base, _ = roots
+        _make_skill(global_base, "one")
+        discover_merged_skills().clear()
+        assert set(discover_merged_skills()) == {"one"}
+
+
+class TestSyncSkillLinks:
+    """Tests for sync_skill_links()."""
+
+    @pytest.mark.unit
+    def test_unchanged_links_are_kept(self, tmp_path: Path) -> None:
+        """A second sync with the same set touches nothing."""
+        target = tmp_path / ".claude" / "skills"
+        links = {"a": Path("/skills/.claude/skills/a"), "b": Path("/user-skills/b")}
+
+        assert sync_skill_links(target, links) == (2, 0)
+        inode = os.lstat(target / "a").st_ino
+        assert sync_skill_links(target, links) == (0, 0)
+        assert os.lstat(target / "a").st_ino == inode
+        assert os.readlink(target / "b") == "/user-skills/b"
+
+    @pytest.mark.unit
+    def test_stale_and_retargeted_links_replaced(self, tmp_path: Path) -> None:
+        """Removed skills are unlinked and changed targets are re-pointed."""
+        target = tmp_path / "skills"
+        sync_skill_links(target, {
+            "a": Path("/skills/.claude/skills/a"),
+            "gone": Path("/skills/.claude/skills/gone"),
+        })
+
+        created, removed = sync_skill_links(target, {"a": Path("/user-skills/a")})
+        assert (created, removed) == (1, 2)
+        assert sorted(os.listdir(target)) == ["a"]
+        assert os.readlink(target / "a") == "/user-skills/a"
+
+    @pytest.mark.unit
+    def test_tampered_entries_are_restored(self, tmp_path: Path) -> None:
+        """Regular files/directories in place of links are replaced."""
+        target = tmp_path / "skills"
+        target.mkdir()
+        (target / "a").mkdir()
+        (target / "a" / "SKILL.md").write_text("malicious")
+        (target / "b").write_text("junk")
+
+        links = {"a": Path("/skills/.claude/skills/a"), "b": Path("/user-skills/b")}
+        assert sync_skill_links(target, links) == (2, 2)
+        assert (target / "a").is_symlink()
+        assert (target / "b").is_symlink()
+
+    @pytest.mark.unit
+    def test_symlinked_target_directory_is_replaced(self, tmp_path: Path) -> None:
+        """A symlink in place of the skills directory is not followed."""
+        elsewhere = tmp_path / "elsewhere"
+        elsewhere.mkdir()
+        (elsewhere / "keep.txt").write_text("x")
+        target = tmp_path / "skills"
+        target.symlink_to(elsewhere)
+
+        sync_skill_links(target, {"a": Path("/skills/.claude/skills/a")})
+        assert not target.is_symlink()
+        assert (elsewhere / "keep.txt").exists()
+        assert os.listdir(elsewhere) == ["keep.txt"]
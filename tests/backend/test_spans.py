@@ -0,0 +1,151 @@
+"""
+Tests for per-phase latency spans (src/core/spans.py).
+
+Covers:
+- Nested run_trace() holders sharing one trace
+- span()/record_span()/add_phase_time() and timing summaries
+- OTLP/JSON export format
+- PhaseStats percentiles and the admin /metrics/phases endpoint
+"""
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.core import spans
+from src.core.spans import (
+    JsonlSpanExporter,
+    PhaseStats,
+    RunTrace,
+    add_phase_time,
+    get_run_trace,
+    record_span,
+    run_trace,
+    span,
+    timed,
+    timing_summary,
+)
+
+
+@pytest.fixture
+def phase_stats():
+    """Fresh process-wide PhaseStats without file export."""
+    stats = PhaseStats(sample_size=100)
+    with patch.object(spans, "_phase_stats", stats), \
+            patch.object(spans, "_config", {"export": False, "sample_size": 100}), \
+            patch.object(spans, "_exporter", None):
+        yield stats
+
+
+class TestRunTrace:
+    """Tests for run_trace() and span helpers."""
+
+    @pytest.mark.asyncio
+    async def test_nested_holders_share_trace(self, phase_stats: PhaseStats) -> None:
+        """The outermost holder finishes the trace and feeds PhaseStats."""
+        async with run_trace("s1") as outer:
+            async with run_trace("s1") as inner:
+                assert inner is outer
+                with span("s1", "prepare.options", tools=3):
+                    pass
+            assert get_run_trace("s1") is outer
+            assert phase_stats.runs == 0
+        assert get_run_trace("s1") is None
+        assert phase_stats.runs == 1
+        assert set(phase_stats.percentiles()) == {"agent_run", "prepare.options"}
+
+    @pytest.mark.asyncio
+    async def test_timing_summary_aggregates_phases(self, phase_stats: PhaseStats) -> None:
+        """Repeated phases are counted and summed."""
+        async with run_trace("s2"):
+            record_span("s2", "tool.Read", 0, 2_000_000)
+            record_span("s2", "tool.Read", 0, 6_000_000)
+            add_phase_time("s2", "trace.process", 500_000)
+            summary = timing_summary("s2")
+
+        assert summary["phases"]["tool.Read"] == {"count": 2, "total_ms": 8.0, "max_ms": 6.0}
+        assert summary["phases"]["trace.process"]["total_ms"] == 0.5
+        assert summary["total_ms"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_helpers_are_noops_without_trace(self) -> None:
+        """Spans outside a run are dropped silently."""
+        with span("none", "x") as attrs:
+            attrs["k"] = 1
+        record_span("none", "x", 0, 1)
+        add_phase_time("none", "x", 1)
+        assert timing_summary("none") is None
+
+    @pytest.mark.asyncio
+    async def test_timed_wrapper_records_errors(self, phase_stats: PhaseStats) -> None:
+        """timed() records one span per call, flagging exceptions."""
+        async def ok(value):
+            return value
+
+        async def fail():
+            raise ValueError("boom")
+
+        async with run_trace("s3") as trace:
+            assert await timed("s3", "tool.Ok", ok)(5) == 5
+            with pytest.raises(ValueError):
+                await timed("s3", "tool.Fail", fail)()
+
+        assert [(s.name, s.error) for s in trace.spans] == [("tool.Ok", False), ("tool.Fail", True)]
+
+
+class TestExportAndStats:
+    """Tests for the OTLP exporter and PhaseStats."""
+
+    @pytest.mark.unit
+    def test_otlp_jsonl_export(self, tmp_path: Path) -> None:
+        """Each trace is one resourceSpans line with a root and child spans."""
+        trace = RunTrace("s4", {"model": "m"})
+        trace.record("sdk.connect", 1_000, 2_000, {"warm_client": True})
+        path = tmp_path / "spans.jsonl"
+        JsonlSpanExporter(path).export(trace)
+
+        payload = json.loads(path.read_text().splitlines()[0])
+        encoded = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        root, child = encoded
+        assert root["name"] == "agent_run"
+        assert child["parentSpanId"] == root["spanId"]
+        assert child["traceId"] == root["traceId"] == trace.trace_id
+        assert child["startTimeUnixNano"] == "1000"
+        assert child["attributes"] == [{"key": "warm_client", "value": {"boolValue": True}}]
+
+    @pytest.mark.unit
+    def test_percentiles_nearest_rank(self) -> None:
+        """p50/p95 use the nearest-rank method over per-run totals."""
+        stats = PhaseStats(sample_size=100)
+        for ms in range(1, 101):
+            trace = RunTrace("s")
+            trace.add("sdk.connect", ms * 1_000_000)
+            stats.add_run(trace)
+
+        result = stats.percentiles()["sdk.connect"]
+        assert result == {"count": 100, "p50_ms": 50.0, "p95_ms": 95.0, "max_ms": 100.0}
+
+
+class TestPhaseMetricsEndpoint:
+    """Tests for GET /api/v1/metrics/phases."""
+
+    @pytest.mark.asyncio
+    async def test_admin_gets_percentiles(
+        self, client, admin_auth_headers, phase_stats: PhaseStats
+    ) -> None:
+        """Admins see the aggregated phases."""
+        async with run_trace("s5"):
+            record_span("s5", "run.lookup", 0, 3_000_000)
+
+        response = client.get("/api/v1/metrics/phases", headers=admin_auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["runs"] == 1
+        assert data["phases"]["run.lookup"]["p95_ms"] == 3.0
+
+    @pytest.mark.unit
+    def test_regular_user_gets_403(self, client, auth_headers) -> None:
+        """Non-admins are rejected."""
+        response = client.get("/api/v1/metrics/phases", headers=auth_headers)
+        assert response.status_code == 403
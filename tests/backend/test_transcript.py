@@ -0,0 +1,167 @@
+"""
+Tests for the session transcript writer and reader (src/core/transcript.py).
+
+Covers:
+- Serialization parity with json.dumps(asdict(message))
+- Appending across runs with segment markers (previous segment's count
+  in the next marker, no trailing marker)
+- Buffered background flushing
+- zstd archiving of earlier segments and streamed reading
+"""
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+from claude_agent_sdk import (
+    AssistantMessage,
+    ResultMessage,
+    TextBlock,
+    ToolUseBlock,
+)
+
+from src.core import transcript as transcript_module
+from src.core.transcript import (
+    SEGMENT_KEY,
+    TranscriptWriter,
+    archive_path,
+    iter_transcript,
+    serialize_message,
+)
+
+
+def _assistant(text: str) -> AssistantMessage:
+    return AssistantMessage(
+        content=[
+            TextBlock(text=text),
+            ToolUseBlock(id="t1", name="Read", input={"file_path": "a.txt", "nested": [1, {"x": 2}]}),
+        ],
+        model="claude-test",
+    )
+
+
+def _result() -> ResultMessage:
+    return ResultMessage(
+        subtype="success",
+        duration_ms=10,
+        duration_api_ms=5,
+        is_error=False,
+        num_turns=1,
+        session_id="abc",
+        total_cost_usd=0.01,
+        usage={"input_tokens": 3},
+        result="done",
+    )
+
+
+class TestSerializeMessage:
+    """Tests for serialize_message()."""
+
+    @pytest.mark.unit
+    def test_matches_asdict(self) -> None:
+        """Output is identical to the previous asdict-based encoding."""
+        for message in (_assistant("hi"), _result()):
+            assert serialize_message(message) == json.dumps(asdict(message)) + "\n"
+
+
+class TestTranscriptWriter:
+    """Tests for TranscriptWriter and iter_transcript()."""
+
+    @pytest.mark.asyncio
+    async def test_runs_append_with_segment_markers(self, tmp_path: Path) -> None:
+        """A resumed run keeps the previous run's messages."""
+        path = tmp_path / "agent.jsonl"
+        for run, resume_id in enumerate((None, "abc")):
+            writer = TranscriptWriter(path)
+            await writer.open(resume_id=resume_id)
+            writer.write(_assistant(f"run {run}"))
+            writer.write(_result())
+            await writer.close()
+
+        records = list(iter_transcript(path, include_markers=True))
+        assert [next(iter(r)) for r in records] == [
+            SEGMENT_KEY, "content", "subtype",
+            SEGMENT_KEY, "content", "subtype",
+        ]
+        assert records[3][SEGMENT_KEY]["resume_id"] == "abc"
+        assert "previous_messages" not in records[0][SEGMENT_KEY]
+        assert records[3][SEGMENT_KEY]["previous_messages"] == 2
+        # The last line is still the run's result message
+        assert "subtype" in json.loads(path.read_text().splitlines()[-1])
+        assert [r["content"][0]["text"] for r in iter_transcript(path) if "content" in r] == [
+            "run 0", "run 1",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_buffered_until_threshold(self, tmp_path: Path) -> None:
+        """Small writes stay in memory until the buffer limit or close()."""
+        path = tmp_path / "agent.jsonl"
+        writer = TranscriptWriter(path, buffer_bytes=10_000, flush_interval_seconds=3600)
+        await writer.open()
+        writer.write(_result())
+        assert not path.exists()
+
+        for i in range(100):
+            writer.write(_assistant(f"message {i}"))
+        await writer.flush()
+        assert path.stat().st_size > 10_000
+
+        await writer.close()
+        texts = [r["content"][0]["text"] for r in iter_transcript(path) if "content" in r]
+        assert texts == [f"message {i}" for i in range(100)]
+
+    @pytest.mark.asyncio
+    async def test_compress_archives_previous_segments(self, tmp_path: Path) -> None:
+        """Earlier runs move to agent.jsonl.zst; the reader streams both files."""
+        path = tmp_path / "agent.jsonl"
+        for run in range(3):
+            writer = TranscriptWriter(path, compress=True)
+            await writer.open()
+            writer.write(_assistant(f"run {run}"))
+            await writer.close()
+
+        assert archive_path(path).exists()
+        plain = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [next(iter(r)) for r in plain] == [SEGMENT_KEY, "content"]
+        assert plain[0][SEGMENT_KEY]["previous_messages"] == 1
+        assert [r["content"][0]["text"] for r in iter_transcript(path)] == [
+            "run 0", "run 1", "run 2",
+        ]
+
+    @pytest.mark.unit
+    def test_reader_handles_legacy_and_truncated_files(self, tmp_path: Path) -> None:
+        """Unmarked files are readable and a torn last line is skipped."""
+        path = tmp_path / "agent.jsonl"
+        path.write_text(
+            serialize_message(_assistant("old"))
+            + serialize_message(_result())
+            + '{"content": [{"te'
+        )
+        records = list(iter_transcript(path))
+        assert len(records) == 2
+        assert records[0]["content"][0]["text"] == "old"
+
+    @pytest.mark.asyncio
+    async def test_previous_count_read_from_the_tail(self, tmp_path: Path) -> None:
+        """The previous segment is counted across read blocks; legacy files have no count."""
+        path = tmp_path / "agent.jsonl"
+        path.write_text(serialize_message(_result()) * 3)
+        writer = TranscriptWriter(path)
+        await writer.open()
+        for i in range(2000):
+            writer.write(_assistant(f"message {i}"))
+        await writer.close()
+        assert path.stat().st_size > 3 * transcript_module._TAIL_BLOCK_BYTES
+
+        writer = TranscriptWriter(path)
+        await writer.open()
+        await writer.close()
+        markers = [r[SEGMENT_KEY] for r in iter_transcript(path, include_markers=True) if SEGMENT_KEY in r]
+        assert "previous_messages" not in markers[0]
+        assert markers[1]["previous_messages"] == 2000
+
+    @pytest.mark.asyncio
+    async def test_write_before_open_raises(self, tmp_path: Path) -> None:
+        """Writing outside a segment is a programming error."""
+        with pytest.raises(RuntimeError):
+            TranscriptWriter(tmp_path / "agent.jsonl").write(_result())
@@ -0,0 +1,619 @@
+"""
+Tests for Ag3ntumWebFetch networking (tools/ag3ntum/ag3ntum_webfetch).
+
+Covers:
+- On-disk HTTP cache: fresh hits, ETag / Last-Modified revalidation,
+  storability rules for a shared cache, freshness, LRU eviction
+- DNS cache feeding the private-IP checks
+- Shared client: one per event loop, no cookies kept between calls
+- Redirects validated hop by hop
+- Multi-URL mode: global and per-host concurrency limits, per-URL SSRF
+  checks and errors, shared output budget, bodies saved to the workspace
+- Single-pass HTML to Markdown conversion: golden output of the previous
+  regex converter on simple pages, boilerplate removal, output budget
+
+Requests go to a stand-in documentation server (an httpx.MockTransport
+handler), so the SSRF checks see public hostnames and no network is used.
+"""
+import asyncio
+import email.utils
+import json
+import socket
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.core.path_validator import cleanup_path_validator, configure_path_validator
+from tools.ag3ntum.ag3ntum_webfetch import create_webfetch_tool, http_cache, tool as webfetch_tool
+from tools.ag3ntum.ag3ntum_webfetch.markdown import MarkdownConverter, convert_html, html_to_markdown
+from tools.ag3ntum.ag3ntum_webfetch.http_cache import CachedResponse, HTTPCache, is_storable
+from tools.ag3ntum.ag3ntum_webfetch.network import DNSCache, get_dns_cache, get_shared_client
+
+PUBLIC_IP = "93.184.216.34"
+
+# Simple pages and the previous (regex) converter's output for them
+GOLDEN_PAGES = [
+    (
+        '<h1>Getting Started</h1><p>Install the package with <code>pip install ag3ntum</code>.</p>'
+        '<h2>Usage</h2><p>Run the <strong>agent</strong> from the <em>command line</em>.</p>',
+        '# Getting Started\n\nInstall the package with `pip install ag3ntum`.\n\n'
+        '## Usage\n\nRun the **agent** from the *command line*.',
+    ),
+    (
+        '<p>See the <a href="https://docs.example.com/api">API reference</a> and the <a href=\'/guide\'>guide</a>.</p>',
+        'See the [API reference](https://docs.example.com/api) and the [guide](/guide).',
+    ),
+    (
+        '<h3>Features</h3><ul><li>Sandboxed tools</li><li>Session workspaces</li>'
+        '<li>Streaming output</li></ul><p>More soon.</p>',
+        '### Features\n\n- Sandboxed tools\n- Session workspaces\n- Streaming output\n\nMore soon.',
+    ),
+    (
+        '<h1>One</h1><h2>Two</h2><h3>Three</h3><h4>Four</h4><h5>Five</h5><h6>Six</h6>',
+        '# One\n\n## Two\n\n### Three\n\n#### Four\n\n##### Five\n\n###### Six',
+    ),
+    (
+        '<div><h2>Intro</h2><p>First paragraph.</p><p>Second paragraph.</p></div><hr><div>Footnote text</div>',
+        '## Intro\n\nFirst paragraph.\n\nSecond paragraph.\n\n---\n\nFootnote text',
+    ),
+    (
+        '<p>Fish &amp; chips &lt;tag&gt; &quot;quoted&quot; it&#39;s</p>',
+        'Fish & chips <tag> "quoted" it\'s',
+    ),
+    (
+        "<style>.x { color: red }</style><h2>Title</h2><script>var a = '<p>no</p>';</script><p>Body text.</p>",
+        '## Title\n\nBody text.',
+    ),
+    (
+        '<p>As they said:</p><blockquote>Simple is better than complex.</blockquote>',
+        'As they said:\n\n> Simple is better than complex.',
+    ),
+    (
+        '<div class="content" id="main"><p class="lead">Lead paragraph with '
+        '<a class="ext" href="https://example.com" target="_blank">a link</a>.</p></div>',
+        'Lead paragraph with [a link](https://example.com).',
+    ),
+]
+
+
+class DocServer:
+    """Stand-in HTTP server: serves pages and answers conditional requests."""
+
+    def __init__(self) -> None:
+        self.pages: dict[str, tuple[bytes, dict[str, str]]] = {}
+        self.requests: list[httpx.Request] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        body, headers = self.pages.get(request.url.path, (b"not found", {}))
+        if request.url.path not in self.pages:
+            return httpx.Response(404, content=body)
+        if "location" in headers:
+            return httpx.Response(302, headers=headers)
+        etag = headers.get("etag")
+        if etag and request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"etag": etag, "cache-control": headers.get("cache-control", "")})
+        last_modified = headers.get("last-modified")
+        if not etag and last_modified and request.headers.get("if-modified-since") == last_modified:
+            return httpx.Response(304)
+        return httpx.Response(200, content=body, headers={"content-type": "text/html", **headers})
+
+
+@pytest.fixture(autouse=True)
+def public_dns(monkeypatch: pytest.MonkeyPatch):
+    """Resolve every hostname to a public address; count lookups."""
+    lookups = []
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        lookups.append(host)
+        if host == "internal.example.com":
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.5", port))]
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (PUBLIC_IP, port))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    get_dns_cache().clear()
+    yield lookups
+    get_dns_cache().clear()
+
+
+@pytest.fixture
+def server() -> DocServer:
+    return DocServer()
+
+
+@pytest.fixture
+def fetch(server: DocServer, tmp_path: Path):
+    """Call a WebFetch tool backed by the stand-in server and a fresh cache."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(server.handler))
+    webfetch = create_webfetch_tool(cache_dir=tmp_path / "cache", client=client)
+
+    async def call(url: str, **args) -> str:
+        result = await webfetch.handler({"url": url, **args})
+        assert not result.get("isError"), result
+        return result["content"][0]["text"]
+
+    return call
+
+
+def _http_date(offset: float = 0) -> str:
+    return email.utils.formatdate(time.time() + offset, usegmt=True)
+
+
+class TestHTTPCache:
+    """Cache hits and revalidation through the tool."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_response_served_from_cache(self, server: DocServer, fetch) -> None:
+        """A response within max-age is not requested again."""
+        server.pages["/docs"] = (b"<h1>Docs</h1>", {"cache-control": "max-age=300", "etag": '"v1"'})
+        first = await fetch("https://docs.example.com/docs")
+        second = await fetch("https://docs.example.com/docs", output_mode="content_markdown")
+        assert len(server.requests) == 1
+        assert "**Cache:**" not in first
+        assert "**Cache:** hit" in second and "# Docs" in second
+
+    @pytest.mark.asyncio
+    async def test_etag_revalidation(self, server: DocServer, fetch) -> None:
+        """Stale entries are revalidated with If-None-Match; 304 serves the stored body."""
+        server.pages["/api"] = (b"version one", {"cache-control": "no-cache", "etag": '"v1"'})
+        await fetch("https://docs.example.com/api")
+        second = await fetch("https://docs.example.com/api")
+        assert server.requests[1].headers["if-none-match"] == '"v1"'
+        assert "**Cache:** revalidated" in second and "version one" in second
+
+        server.pages["/api"] = (b"version two", {"cache-control": "no-cache", "etag": '"v2"'})
+        third = await fetch("https://docs.example.com/api")
+        assert "**Cache:**" not in third and "version two" in third
+        fourth = await fetch("https://docs.example.com/api")
+        assert server.requests[3].headers["if-none-match"] == '"v2"'
+        assert "version two" in fourth
+
+    @pytest.mark.asyncio
+    async def test_last_modified_revalidation(self, server: DocServer, fetch) -> None:
+        """Entries with only Last-Modified are revalidated with If-Modified-Since."""
+        modified = _http_date(-3600)
+        server.pages["/page"] = (b"page", {"cache-control": "max-age=0", "last-modified": modified})
+        await fetch("https://docs.example.com/page")
+        result = await fetch("https://docs.example.com/page")
+        assert server.requests[1].headers["if-modified-since"] == modified
+        assert "**Cache:** revalidated" in result
+
+    @pytest.mark.asyncio
+    async def test_request_no_cache_forces_revalidation(self, server: DocServer, fetch) -> None:
+        """An explicit Cache-Control: no-cache from the agent skips fresh hits."""
+        server.pages["/docs"] = (b"docs", {"cache-control": "max-age=300", "etag": '"v1"'})
+        await fetch("https://docs.example.com/docs")
+        result = await fetch("https://docs.example.com/docs", headers={"Cache-Control": "no-cache"})
+        assert len(server.requests) == 2
+        assert "**Cache:** revalidated" in result
+
+    @pytest.mark.asyncio
+    async def test_not_stored(self, server: DocServer, fetch) -> None:
+        """private / no-store responses and requests with cookies are fetched every time."""
+        server.pages["/private"] = (b"mine", {"cache-control": "private, max-age=300"})
+        server.pages["/nostore"] = (b"live", {"cache-control": "no-store", "etag": '"x"'})
+        server.pages["/public"] = (b"doc", {"cache-control": "max-age=300"})
+        for _ in range(2):
+            await fetch("https://docs.example.com/private")
+            await fetch("https://docs.example.com/nostore")
+            await fetch("https://docs.example.com/public", headers={"Cookie": "session=1"})
+            await fetch("https://docs.example.com/public", method="POST", body="x")
+        assert len(server.requests) == 8
+
+    @pytest.mark.asyncio
+    async def test_requests_with_agent_headers_bypass_cache(self, server: DocServer, fetch) -> None:
+        """A response fetched with a custom header is never served without it (or stored)."""
+        server.pages["/keyed"] = (
+            b"secret for key", {"cache-control": "max-age=300", "last-modified": _http_date(-86400)},
+        )
+        await fetch("https://docs.example.com/keyed", headers={"X-Api-Key": "k1"})
+        server.pages["/keyed"] = (b"anonymous", {"cache-control": "max-age=300"})
+        plain = await fetch("https://docs.example.com/keyed")
+        assert "secret for key" not in plain and "**Cache:**" not in plain
+
+        # A cached anonymous copy is not served to a request with a header either
+        poisoned = await fetch("https://docs.example.com/keyed", headers={"X-Forwarded-Host": "evil"})
+        assert "**Cache:**" not in poisoned
+        assert len(server.requests) == 3
+        assert server.requests[2].headers["x-forwarded-host"] == "evil"
+
+
+class TestCacheRules:
+    """Storability, freshness and eviction of HTTPCache."""
+
+    @pytest.mark.unit
+    def test_is_storable(self) -> None:
+        ok = {"cache-control": "max-age=60"}
+        assert is_storable("GET", 200, {}, ok)
+        assert is_storable("GET", 200, {}, {"ETag": '"a"'})
+        assert not is_storable("GET", 200, {}, {})
+        assert not is_storable("HEAD", 200, {}, ok)
+        assert not is_storable("GET", 404, {}, ok)
+        assert not is_storable("GET", 200, {"Cache-Control": "no-store"}, ok)
+        assert not is_storable("GET", 200, {}, {**ok, "Vary": "Accept, *"})
+        assert not is_storable("GET", 200, {"Authorization": "Bearer x"}, ok)
+        assert is_storable("GET", 200, {"Authorization": "Bearer x"}, {"cache-control": "public, max-age=60"})
+
+    @pytest.mark.unit
+    def test_freshness(self) -> None:
+        """s-maxage beats max-age; then Expires; then the Last-Modified heuristic."""
+        now = time.time()
+
+        def entry(headers: dict[str, str], stored_ago: float = 0) -> CachedResponse:
+            return CachedResponse("k", "u", 200, headers, now - stored_ago, now - stored_ago, 0)
+
+        assert entry({"cache-control": "max-age=10, s-maxage=100"}, 50).is_fresh(now)
+        assert not entry({"cache-control": "max-age=100, s-maxage=10"}, 50).is_fresh(now)
+        assert not entry({"cache-control": "max-age=100", "age": "120"}).is_fresh(now)
+        assert entry({"expires": _http_date(60), "date": _http_date()}).is_fresh(now)
+        assert not entry({"expires": "0"}).is_fresh(now)
+        # Modified 10 days ago: fresh for 1 day (10%), but capped at 24 hours
+        assert entry({"last-modified": _http_date(-10 * 86400)}, 3600).is_fresh(now)
+        assert not entry({"last-modified": _http_date(-10 * 86400)}, 86400 + 60).is_fresh(now)
+        assert not entry({"cache-control": "no-cache, max-age=100"}).is_fresh(now)
+
+    @pytest.mark.unit
+    def test_vary(self, tmp_path: Path) -> None:
+        """Stored request header values named by Vary must match."""
+        cache = HTTPCache(tmp_path)
+        cache.store("https://x/a", 200, {"Accept-Language": "en"},
+                    {"Cache-Control": "max-age=60", "Vary": "Accept-Language"}, b"en", 0, 0)
+        assert cache.lookup("https://x/a", {"accept-language": "en"}) is not None
+        assert cache.lookup("https://x/a", {"Accept-Language": "de"}) is None
+
+    @pytest.mark.unit
+    def test_lru_eviction(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Least recently accessed entries go first; the order survives a restart."""
+        monkeypatch.setattr(http_cache, "MAX_ENTRY_FRACTION", 1.0)
+        headers = {"cache-control": "max-age=60"}
+        cache = HTTPCache(tmp_path, max_size_bytes=3000)
+        for name in ("a", "b", "c"):
+            assert cache.store(f"https://x/{name}", 200, {}, headers, b"x" * 300, 0, 0)
+            time.sleep(0.01)
+        assert cache.lookup("https://x/a", {}) is not None  # a is now most recent
+        assert cache.total_size == 900
+
+        restarted = HTTPCache(tmp_path, max_size_bytes=750)
+        restarted.store("https://x/d", 200, {}, headers, b"x" * 300, 0, 0)
+        assert [u for u in "abcd" if restarted.lookup(f"https://x/{u}", {}) is not None] == ["a", "d"]
+        assert restarted.total_size == 600 and len(restarted) == 2
+        assert len(list(tmp_path.glob("*/*.body"))) == 2
+
+        # Bodies above a share of the cache are not stored
+        monkeypatch.setattr(http_cache, "MAX_ENTRY_FRACTION", 0.125)
+        assert not restarted.store("https://x/big", 200, {}, headers, b"x" * 100, 0, 0)
+        assert restarted.store("https://x/small", 200, {}, headers, b"x" * 90, 0, 0)
+
+    @pytest.mark.unit
+    def test_missing_body_is_a_miss(self, tmp_path: Path) -> None:
+        """Entries removed behind the cache's back are dropped."""
+        cache = HTTPCache(tmp_path)
+        cache.store("https://x/a", 200, {}, {"etag": '"1"'}, b"body", 0, 0)
+        for path in tmp_path.glob("*/*"):
+            path.unlink()
+        assert cache.lookup("https://x/a", {}) is None
+        assert cache.total_size == 0
+
+
+class TestNetwork:
+    """DNS cache, shared client and redirect validation."""
+
+    @pytest.mark.asyncio
+    async def test_dns_answers_cached(self, public_dns: list[str], server: DocServer, fetch) -> None:
+        """Repeated fetches from one host resolve it once."""
+        server.pages["/a"] = (b"a", {})
+        for _ in range(3):
+            await fetch("https://docs.example.com/a")
+        assert public_dns == ["docs.example.com"]
+
+        resolver = DNSCache(ttl=0)
+        await resolver.resolve("docs.example.com", 443)
+        await resolver.resolve("docs.example.com", 443)
+        assert public_dns.count("docs.example.com") == 3
+
+    @pytest.mark.asyncio
+    async def test_private_resolution_blocked(self, tmp_path: Path, server: DocServer) -> None:
+        """Hostnames resolving to private addresses are rejected before any request."""
+        webfetch = create_webfetch_tool(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(server.handler))
+        )
+        result = await webfetch.handler({"url": "https://internal.example.com/"})
+        assert result["isError"]
+        assert "resolves to private IP: 10.0.0.5" in result["content"][0]["text"]
+        assert server.requests == []
+
+    @pytest.mark.asyncio
+    async def test_redirects_validated(self, server: DocServer, fetch) -> None:
+        """Each hop is validated; redirects are counted once each."""
+        server.pages["/old"] = (b"", {"location": "https://docs.example.com/new"})
+        server.pages["/new"] = (b"moved here", {"cache-control": "max-age=300"})
+        server.pages["/evil"] = (b"", {"location": "http://169.254.169.254/latest/meta-data"})
+
+        result = await fetch("https://docs.example.com/old")
+        assert "**Redirects:** 1" in result and "moved here" in result
+        headers = await fetch("https://docs.example.com/old", output_mode="http_headers")
+        assert headers.count("### ") == 2
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(server.handler))
+        blocked = await create_webfetch_tool(client=client).handler({"url": "https://docs.example.com/evil"})
+        assert blocked["isError"] and "Redirect blocked" in blocked["content"][0]["text"]
+        assert all(r.url.host != "169.254.169.254" for r in server.requests)
+
+    @pytest.mark.asyncio
+    async def test_shared_client(self) -> None:
+        """One pooled client per loop; it never keeps cookies."""
+        client = get_shared_client()
+        assert get_shared_client() is client
+        assert client.follow_redirects is False
+        response = httpx.Response(
+            200, headers={"set-cookie": "session=secret; Path=/"},
+            request=httpx.Request("GET", "https://docs.example.com/"),
+        )
+        client.cookies.extract_cookies(response)
+        assert not client.cookies
+
+
+class TestMultiFetch:
+    """Tests for urls=[...] calls."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limits(self, server: DocServer) -> None:
+        """Requests overlap up to the global limit and the per-host limit."""
+        in_flight: dict[str, int] = {}
+        peaks = {"all": 0}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            host = request.url.host
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peaks[host] = max(peaks.get(host, 0), in_flight[host])
+            peaks["all"] = max(peaks["all"], sum(in_flight.values()))
+            await asyncio.sleep(0.02)
+            in_flight[host] -= 1
+            return server.handler(request)
+
+        server.pages["/page"] = (b"<p>page</p>", {})
+        webfetch = create_webfetch_tool(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            max_concurrency=3, per_host_concurrency=2,
+        )
+        urls = [f"https://site{i % 2}.example.com/page?n={i}" for i in range(12)]
+        result = await webfetch.handler({"urls": urls})
+        text = result["content"][0]["text"]
+
+        assert not result.get("isError")
+        assert text.startswith("**Fetched:** 12 of 12 URLs")
+        assert len(server.requests) == 12
+        assert peaks.pop("all") == 3
+        assert max(peaks.values()) == 2
+
+    @pytest.mark.asyncio
+    async def test_each_url_validated(self, server: DocServer, fetch) -> None:
+        """Blocked and failing URLs are reported in place; the others are fetched."""
+        server.pages["/ok"] = (b"<p>fine</p>", {})
+        urls = [
+            "https://docs.example.com/ok",
+            "https://internal.example.com/admin",
+            "http://169.254.169.254/latest/meta-data",
+            "https://docs.example.com/missing",
+        ]
+        text = await fetch("", urls=json.dumps(urls + urls[:1]))
+
+        assert text.startswith("**Fetched:** 2 of 4 URLs")
+        assert (
+            "## 2. https://internal.example.com/admin\n\n"
+            "**Error:** Domain internal.example.com resolves to private IP"
+        ) in text
+        assert "## 3. http://169.254.169.254/latest/meta-data\n\n**Error:** Access to private IP" in text
+        assert "**Status:** 404" in text
+        assert [r.url.host for r in server.requests] == ["docs.example.com"] * 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments(self, fetch, server: DocServer) -> None:
+        """Only GET, a bounded list, and url or urls but not both."""
+        webfetch = create_webfetch_tool(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(server.handler))
+        )
+        many = [f"https://docs.example.com/{i}" for i in range(webfetch_tool.MAX_URLS + 1)]
+        for args, message in [
+            ({"urls": many}, "Too many URLs"),
+            ({"urls": many[:2], "method": "POST"}, "GET requests only"),
+            ({"urls": many[:2], "url": many[0]}, "either url or urls"),
+            ({"urls": "[1, 2]"}, "list of URL strings"),
+            ({"urls": "[not json"}, "Invalid urls JSON"),
+        ]:
+            result = await webfetch.handler(args)
+            assert result["isError"] and message in result["content"][0]["text"], args
+
+        failed = await webfetch.handler({"urls": ["https://internal.example.com/"]})
+        assert failed["isError"]
+        assert server.requests == []
+
+    @pytest.mark.asyncio
+    async def test_conversion_failure_is_per_url(
+        self, server: DocServer, fetch, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A page that fails to convert is reported in place; the others still come back."""
+        convert = webfetch_tool.convert_html
+
+        def flaky_convert(html: str, max_chars: int):
+            if "broken" in html:
+                raise ValueError("bad markup")
+            return convert(html, max_chars=max_chars)
+
+        monkeypatch.setattr(webfetch_tool, "convert_html", flaky_convert)
+        server.pages["/ok"] = (b"<p>fine</p>", {})
+        server.pages["/broken"] = (b"<p>broken</p>", {})
+        text = await fetch(
+            "", urls=["https://docs.example.com/ok", "https://docs.example.com/broken"],
+            output_mode="content_markdown",
+        )
+
+        assert text.startswith("**Fetched:** 1 of 2 URLs")
+        assert "fine" in text
+        assert "## 2. https://docs.example.com/broken\n\n**Error:** Processing failed: bad markup" in text
+
+    @pytest.mark.unit
+    def test_share_budget(self) -> None:
+        """Short results keep their length; the rest split what is left."""
+        assert webfetch_tool._share_budget([100, 5000, 50, 9000], 3000) == [100, 1425, 50, 1425]
+        assert webfetch_tool._share_budget([10, 20], 3000) == [10, 20]
+        assert webfetch_tool._share_budget([], 3000) == []
+
+    @pytest.mark.asyncio
+    async def test_shared_output_budget(self, server: DocServer, fetch) -> None:
+        """Long pages are cut to their share of the budget."""
+        server.pages["/short"] = (b"short page", {})
+        server.pages["/long"] = (b"x" * 100_000, {})
+        urls = ["https://docs.example.com/short", "https://docs.example.com/long", "https://docs.example.org/long"]
+        text = await fetch("", urls=urls)
+
+        assert "short page" in text
+        assert text.count("x" * 19_000) == 2 and "x" * 21_000 not in text
+        assert text.count("[Content truncated for display]") == 2
+        assert len(text) < webfetch_tool.MULTI_DISPLAY_CHARS + 5000
+
+    @pytest.mark.asyncio
+    async def test_bodies_saved_to_workspace(self, server: DocServer, tmp_path: Path) -> None:
+        """save_dir keeps full bodies in the workspace and returns previews."""
+        workspace = tmp_path / "users" / "tester" / "sessions" / "webfetch-save" / "workspace"
+        workspace.mkdir(parents=True)
+        configure_path_validator("webfetch-save", workspace, username="tester")
+        try:
+            server.pages["/guide"] = (b"<h1>Guide</h1><p>" + b"word " * 2000 + b"</p>", {})
+            webfetch = create_webfetch_tool(
+                client=httpx.AsyncClient(transport=httpx.MockTransport(server.handler)),
+                session_id="webfetch-save",
+            )
+            result = await webfetch.handler({
+                "urls": ["https://docs.example.com/guide", "https://docs.example.com/guide?v=2"],
+                "output_mode": "content_markdown",
+                "save_dir": "./research",
+            })
+            text = result["content"][0]["text"]
+            saved = sorted((workspace / "research").iterdir())
+
+            assert [p.name for p in saved] == ["01-docs-example-com-guide.md", "02-docs-example-com-guide.md"]
+            assert saved[0].read_text().startswith("# Guide\n\nword word")
+            assert saved[0].read_text().count("word") == 2000
+            assert "**Saved:** `/workspace/research/01-docs-example-com-guide.md`" in text
+            assert "**Preview (Markdown):**" in text
+            assert text.count("word") < 2 * webfetch_tool.PREVIEW_CHARS / 4
+
+            # A second save keeps the first files and reports the new name
+            again = await webfetch.handler({
+                "urls": ["https://docs.example.com/guide"],
+                "output_mode": "content_markdown",
+                "save_dir": "./research",
+            })
+            again_text = again["content"][0]["text"]
+            assert not again.get("isError")
+            assert (
+                "**Saved:** `/workspace/research/01-docs-example-com-guide-2.md` "
+                "(`/workspace/research/01-docs-example-com-guide.md` already exists and was not overwritten)"
+            ) in again_text
+            assert saved[0].read_text().count("word") == 2000
+            assert (workspace / "research" / "01-docs-example-com-guide-2.md").read_text() == saved[0].read_text()
+
+            escaped = await webfetch.handler({"url": "https://docs.example.com/guide", "save_dir": "/etc"})
+            assert escaped["isError"] and "Path validation failed" in escaped["content"][0]["text"]
+        finally:
+            cleanup_path_validator("webfetch-save")
+
+        unbound = await create_webfetch_tool(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(server.handler))
+        ).handler({"url": "https://docs.example.com/guide", "save_dir": "./research"})
+        assert unbound["isError"] and "no workspace" in unbound["content"][0]["text"]
+
+    @pytest.mark.asyncio
+    async def test_single_url_save_failure_is_an_error_result(
+        self, server: DocServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A save that fails with OSError comes back as an error result, not an exception."""
+        workspace = tmp_path / "users" / "tester" / "sessions" / "webfetch-oserror" / "workspace"
+        workspace.mkdir(parents=True)
+        configure_path_validator("webfetch-oserror", workspace, username="tester")
+
+        def disk_full(*args, **kwargs):
+            raise OSError("No space left on device")
+
+        monkeypatch.setattr(webfetch_tool, "_save_body", disk_full)
+        try:
+            server.pages["/guide"] = (b"<h1>Guide</h1>", {})
+            webfetch = create_webfetch_tool(
+                client=httpx.AsyncClient(transport=httpx.MockTransport(server.handler)),
+                session_id="webfetch-oserror",
+            )
+            result = await webfetch.handler({"url": "https://docs.example.com/guide", "save_dir": "./research"})
+
+            assert result["isError"]
+            assert "Processing failed: No space left on device" in result["content"][0]["text"]
+        finally:
+            cleanup_path_validator("webfetch-oserror")
+
+
+class TestMarkdownConverter:
+    """Tests for the single-pass HTML to Markdown converter."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("html,expected", GOLDEN_PAGES)
+    def test_golden_simple_pages(self, html: str, expected: str) -> None:
+        """Simple pages convert exactly as with the previous converter."""
+        assert html_to_markdown(html) == expected
+
+    @pytest.mark.unit
+    def test_boilerplate_dropped(self) -> None:
+        html = (
+            "<html><head><title>Guide</title><style>p {}</style></head><body>"
+            "<nav><ul><li><a href='/'>Home</a></li></ul></nav>"
+            "<div role='navigation'>Menu <div>nested</div></div>"
+            "<h1>Guide</h1><p>Text<script>alert('<p>x</p>')</script> here.</p>"
+            "<footer><p>Copyright</p></footer><noscript>Enable JS</noscript></body></html>"
+        )
+        assert html_to_markdown(html) == "Guide\n\n# Guide\n\nText here."
+
+    @pytest.mark.unit
+    def test_structure(self) -> None:
+        """Code blocks stay verbatim; lists, quotes and tables keep their shape."""
+        html = (
+            "<pre><code>def f():\n    return 1 &lt; 2\n</code></pre>"
+            "<ol><li>one<ul><li>nested</li></ul></li><li>two</li></ol>"
+            "<blockquote><p>first</p><p>second</p></blockquote>"
+            "<table><tr><th>Name</th><th>Value</th></tr><tr><td>a|b</td><td>1<td>2</tr></table>"
+            "<p>x<br>y &copy; <b> bold </b>end</p>"
+        )
+        assert html_to_markdown(html) == (
+            "```\ndef f():\n    return 1 < 2\n```\n\n"
+            "1. one\n  - nested\n2. two\n\n"
+            "> first\n>\n> second\n\n"
+            "| Name | Value |\n| --- | --- |\n| a\\|b | 1 | 2 |\n\n"
+            "x\ny \u00a9 **bold** end"
+        )
+
+    @pytest.mark.unit
+    def test_unbalanced_tags(self) -> None:
+        """Unclosed links end at the next link; unclosed elements are flushed at the end."""
+        html = "<ul>" + "".join(f"<li><a href='/{i}'>item {i} <b>bold" for i in range(3))
+        assert html_to_markdown(html) == (
+            "- [item 0 **bold](/0)\n- [item 1 **bold](/1)\n- [item 2 **bold](/2)"
+        )
+
+    @pytest.mark.unit
+    def test_budget_stops_parsing(self) -> None:
+        """Conversion stops at the budget without reading the rest of the document."""
+        html = "\n".join(f"<p>paragraph {i}</p>" for i in range(10000))
+        converter = MarkdownConverter(max_chars=100)
+        markdown = converter.convert(html)
+        assert converter.truncated and len(markdown) <= 100
+        assert markdown.startswith("paragraph 0\n\nparagraph 1")
+        assert converter.getpos()[0] < 100
+        assert convert_html("<p>short</p>", max_chars=100) == ("short", False)
+
+    @pytest.mark.asyncio
+    async def test_tool_markdown_budget(self, server: DocServer, fetch) -> None:
+        """content_markdown output is cut at the display limit and says so."""
+        server.pages["/big"] = ("".join(f"<p>paragraph {i}</p>" for i in range(5000)).encode(), {})
+        result = await fetch("https://docs.example.com/big", output_mode="content_markdown")
+        assert "[Content truncated for display]" in result
+        assert "paragraph 4999" not in result
@@ -0,0 +1,224 @@
+"""
+Tests for the per-session workspace file index (src/core/workspace_index.py).
+
+Covers:
+- Listings refreshed on create/delete/modify (inotify and mtime modes)
+- walk_files() parity with file_search.walk_files()
+- Cached content hashes and their invalidation
+- Per-session registry (LRU, disabled config)
+- Glob/LS helpers answering from the index
+"""
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.core import workspace_index
+from src.core.file_search import walk_files
+from src.core.workspace_index import (
+    WorkspaceIndex,
+    drop_workspace_index,
+    get_workspace_index,
+)
+from tools.ag3ntum.ag3ntum_glob.tool import _find_files, _match_files
+from tools.ag3ntum.ag3ntum_ls.tool import _list_entries
+
+
+def _write(root: Path, rel: str, content: str = "x\n") -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+def _bump_mtime(path: Path) -> None:
+    """Move mtime forward so mtime checks see a change on coarse filesystems."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "mtime"])
+def index(request, tmp_path: Path):
+    idx = WorkspaceIndex(tmp_path, use_inotify=request.param)
+    if request.param and not idx.uses_inotify:
+        pytest.skip("inotify not available")
+    yield idx
+    idx.close()
+
+
+@pytest.fixture
+def index_config():
+    """Fresh registry with a small session limit."""
+    config = {"enabled": True, "inotify": False, "max_sessions": 2}
+    with patch.object(workspace_index, "_config", config), \
+            patch.object(workspace_index, "_indexes", workspace_index.OrderedDict()):
+        yield config
+
+
+class TestWorkspaceIndex:
+    """Tests for WorkspaceIndex."""
+
+    @pytest.mark.unit
+    def test_create_delete_and_modify_are_seen(self, index: WorkspaceIndex, tmp_path: Path) -> None:
+        """Listings reflect changes made after they were cached."""
+        _write(tmp_path, "a.txt")
+        _write(tmp_path, "sub/b.txt")
+        assert [e.name for e in index.list_dir(tmp_path)] == ["a.txt", "sub"]
+        assert [rel for rel, _ in index.walk_files(tmp_path)] == ["a.txt", "sub/b.txt"]
+
+        _write(tmp_path, "sub/c.txt", "longer content\n")
+        (tmp_path / "a.txt").unlink()
+        _bump_mtime(tmp_path / "sub")
+        _bump_mtime(tmp_path)
+        assert [rel for rel, _ in index.walk_files(tmp_path)] == ["sub/b.txt", "sub/c.txt"]
+
+        (tmp_path / "sub" / "b.txt").write_text("grown content\n")
+        assert index.get(tmp_path / "sub" / "c.txt").size == len("longer content\n")
+        assert index.list_dir(tmp_path / "sub")[0].size == len("grown content\n")
+
+    @pytest.mark.unit
+    def test_repeated_walks_reuse_listings(self, index: WorkspaceIndex, tmp_path: Path) -> None:
+        """Unchanged directories are not re-read."""
+        for i in range(5):
+            _write(tmp_path, f"d{i}/f.txt")
+        list(index.walk_files(tmp_path))
+        scans = index.scans
+        list(index.walk_files(tmp_path))
+        assert index.scans == scans
+        assert index.stats()["directories"] == 6
+
+    @pytest.mark.unit
+    def test_walk_matches_file_search(self, index: WorkspaceIndex, tmp_path: Path) -> None:
+        """Pruning, include globs and .gitignore work as in walk_files()."""
+        _write(tmp_path, ".gitignore", "*.log\nbuild/\n")
+        for rel in ("main.py", "a.log", "build/out.js", "pkg/mod.py",
+                    "node_modules/x/index.js", ".git/config"):
+            _write(tmp_path, rel)
+        for kwargs in ({}, {"include": "*.py"}, {"respect_gitignore": False}):
+            assert list(index.walk_files(tmp_path, **kwargs)) == list(walk_files(tmp_path, **kwargs))
+
+    @pytest.mark.unit
+    def test_content_hash_cached_until_change(self, index: WorkspaceIndex, tmp_path: Path) -> None:
+        """Hashes survive rescans of unchanged files and are dropped on change."""
+        path = _write(tmp_path, "f.txt", "one\n")
+        first = index.content_hash(path)
+        assert first is not None
+        assert index.get(path).content_hash == first
+
+        _write(tmp_path, "other.txt")
+        _bump_mtime(tmp_path)
+        assert index.content_hash(path) == first
+
+        path.write_text("two two\n")
+        index.invalidate(tmp_path)
+        assert index.content_hash(path) not in (None, first)
+        assert index.content_hash(tmp_path / "missing") is None
+
+    @pytest.mark.unit
+    def test_in_place_append_seen_in_mtime_mode(self, tmp_path: Path) -> None:
+        """Appending to a file leaves its directory mtime alone; entries are re-stat'ed."""
+        path = _write(tmp_path, "sub/log.txt", "one\n")
+        st = os.stat(path)
+        index = WorkspaceIndex(tmp_path, use_inotify=False)
+        first_hash = index.content_hash(path)
+        list(index.walk(tmp_path))
+        dir_mtime = os.stat(tmp_path / "sub").st_mtime_ns
+
+        with open(path, "a") as f:
+            f.write("two three\n")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+        assert os.stat(tmp_path / "sub").st_mtime_ns == dir_mtime
+
+        scans = index.scans
+        entry = index.get(path)
+        assert index.scans == scans  # The listing itself is reused
+        assert (entry.size, entry.mtime_ns) == (14, st.st_mtime_ns + 10_000_000)
+        assert index.content_hash(path) not in (None, first_hash)
+        assert (path, False, 14) in _list_entries(tmp_path, True, False, index)
+        index.close()
+
+
+class TestRegistry:
+    """Tests for get_workspace_index() and drop_workspace_index()."""
+
+    @pytest.mark.unit
+    def test_lru_and_drop(self, index_config, tmp_path: Path) -> None:
+        """The least recently used index is evicted; drop closes one."""
+        first = get_workspace_index("s1", tmp_path)
+        assert get_workspace_index("s1", tmp_path) is first
+        get_workspace_index("s2", tmp_path)
+        get_workspace_index("s1", tmp_path)
+        get_workspace_index("s3", tmp_path)
+        assert list(workspace_index._indexes) == ["s1", "s3"]
+
+        drop_workspace_index("s1")
+        assert get_workspace_index("s1", tmp_path) is not first
+
+    @pytest.mark.unit
+    def test_disabled_returns_none(self, index_config, tmp_path: Path) -> None:
+        """Tools fall back to direct filesystem access when disabled."""
+        index_config["enabled"] = False
+        assert get_workspace_index("s1", tmp_path) is None
+
+
+class TestToolHelpers:
+    """Glob/LS results are the same with and without the index."""
+
+    @pytest.mark.unit
+    def test_glob_matches_pathlib(self, tmp_path: Path) -> None:
+        """_match_files() follows Path.glob() semantics."""
+        for rel in ("a.py", "pkg/b.py", "pkg/deep/c.py", "pkg/d.txt", ".hidden/e.py"):
+            _write(tmp_path, rel)
+        index = WorkspaceIndex(tmp_path, use_inotify=False)
+        for pattern in ("*.py", "**/*.py", "pkg/*", "pkg/**/*.py"):
+            expected = sorted(str(p) for p in tmp_path.glob(pattern) if p.is_file())
+            assert sorted(_match_files(tmp_path, pattern)) == expected
+            assert sorted(_match_files(tmp_path, pattern, index)) == expected
+
+    @pytest.mark.unit
+    def test_glob_stops_at_limit_and_sorts_by_mtime(self, tmp_path: Path) -> None:
+        """Path order stops early; mtime order keeps the newest matches."""
+        for i in range(10):
+            path = _write(tmp_path, f"d/f{i}.log")
+            os.utime(path, ns=(0, (10 - i) * 1_000_000_000))
+        index = WorkspaceIndex(tmp_path, use_inotify=False)
+
+        files, total = _find_files(tmp_path, "**/*.log", index, limit=3)
+        assert (len(files), total) == (3, None)
+        files, total = _find_files(tmp_path, "**/*.log", None, limit=20)
+        assert (len(files), total) == (10, 10)
+
+        for idx in (index, None):
+            files, total = _find_files(tmp_path, "**/*.log", idx, limit=3, sort_by="mtime")
+            assert [f.name for f in files] == ["f0.log", "f1.log", "f2.log"]
+            assert total == 10
+
+    @pytest.mark.unit
+    def test_glob_mtime_sort_sees_in_place_writes(self, index: WorkspaceIndex, tmp_path: Path) -> None:
+        """A file rewritten in place after indexing sorts as the newest."""
+        for i in range(5):
+            path = _write(tmp_path, f"d/f{i}.log")
+            os.utime(path, ns=(0, (10 - i) * 1_000_000_000))
+        files, _ = _find_files(tmp_path, "**/*.log", index, limit=2, sort_by="mtime")
+        assert [f.name for f in files] == ["f0.log", "f1.log"]
+
+        with open(tmp_path / "d" / "f4.log", "a") as f:
+            f.write("more\n")
+        os.utime(tmp_path / "d" / "f4.log", ns=(0, 20 * 1_000_000_000))
+        files, _ = _find_files(tmp_path, "**/*.log", index, limit=2, sort_by="mtime")
+        assert [f.name for f in files] == ["f4.log", "f0.log"]
+
+    @pytest.mark.unit
+    def test_ls_entries_with_and_without_index(self, tmp_path: Path) -> None:
+        """_list_entries() returns the same names, types and sizes."""
+        _write(tmp_path, "a.txt", "abc")
+        _write(tmp_path, ".env", "S=1")
+        _write(tmp_path, "sub/b.txt", "12345")
+        index = WorkspaceIndex(tmp_path, use_inotify=False)
+        for recursive in (False, True):
+            for include_hidden in (False, True):
+                direct = _list_entries(tmp_path, recursive, include_hidden)
+                indexed = _list_entries(tmp_path, recursive, include_hidden, index)
+                assert sorted(direct) == sorted(indexed)
+        assert (tmp_path / "sub" / "b.txt", False, 5) in _list_entries(tmp_path, True, False, index)
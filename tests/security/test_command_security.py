@@ -518,5 +518,79 @@ class TestFailClosed:
         assert result.allowed, "Should allow when rules not loaded (fail-open)"
 
 
+# =============================================================================
+# Test: Compiled Matcher and Verdict Cache
+# =============================================================================
+
+def _reference_match(security_filter: CommandSecurityFilter, command: str):
+    """First matching rule found by trying every rule in order."""
+    for rule in security_filter._rules:
+        if rule.compiled_pattern.search(command):
+            return rule
+    return None
+
+
+def _equivalence_commands(security_filter: CommandSecurityFilter) -> list[str]:
+    """Exploits plus variants: case, position, shell separators, non-ASCII."""
+    commands = []
+    for exploit, _ in security_filter.get_exploits_for_testing():
+        commands += [
+            exploit,
+            exploit.upper(),
+            f"cd /workspace && {exploit}",
+            f"echo start; {exploit} | head",
+            f"$({exploit})",
+            f"echo '{exploit}'",
+            exploit.replace(" ", "  "),
+            f"{exploit} # ſ ünïcode",
+            exploit[: len(exploit) // 2],
+        ]
+    commands += [
+        "ls -la", "git status && git diff", "python3 script.py", "npm run build",
+        "cat README.md | grep -n TODO", "", "   ", "ſudo rm -rf /", "\u212aill -9 1",
+    ]
+    return commands
+
+
+class TestCompiledMatcher:
+    """The literal-prefiltered matcher returns the same first match as a full scan."""
+
+    def test_equivalent_to_full_scan(self, security_filter: CommandSecurityFilter) -> None:
+        """Every exploit (and variant) hits the same rule as trying all rules in order."""
+        for command in _equivalence_commands(security_filter):
+            expected = _reference_match(security_filter, command)
+            assert security_filter._matcher.first_match(command) is expected, command
+            if not command.strip() or "/skills/" in command:
+                continue
+            result = security_filter.check_command(command)
+            assert result.matched_rule is expected, command
+            assert result.allowed == (expected is None or expected.action == "record"), command
+
+    def test_most_rules_prefiltered(self, security_filter: CommandSecurityFilter) -> None:
+        """A benign command only runs a handful of rule regexes."""
+        assert security_filter._matcher.prefiltered_count > security_filter.rule_count * 0.9
+        assert len(security_filter._matcher.candidates("git status && git diff HEAD~1")) < 5
+
+    def test_verdict_cache(self, security_filter: CommandSecurityFilter) -> None:
+        """Repeated commands reuse the verdict; reload clears the cache."""
+        first = security_filter.check_command("kill -9 147")
+        assert security_filter.check_command("kill -9 147") is first
+        assert first.should_block
+
+        security_filter.reload_rules()
+        again = security_filter.check_command("kill -9 147")
+        assert again is not first and again.should_block
+
+    def test_verdict_cache_bounded(self, security_filter: CommandSecurityFilter) -> None:
+        """The cache keeps at most VERDICT_CACHE_SIZE short commands."""
+        from src.core import command_security
+
+        for i in range(command_security.VERDICT_CACHE_SIZE + 10):
+            security_filter.check_command(f"echo {i}")
+        security_filter.check_command("x" * (command_security.MAX_CACHED_COMMAND_LENGTH + 1))
+        assert len(security_filter._verdicts) == command_security.VERDICT_CACHE_SIZE
+        assert "echo 0" not in security_filter._verdicts
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -22,6 +22,7 @@ from .ag3ntum_read import (
 from .ag3ntum_write import (
     create_write_tool,
     create_ag3ntum_write_mcp_server,
+    discard_chunked_writes,
 )
 from .ag3ntum_edit import (
     create_edit_tool,
@@ -52,6 +53,7 @@ from .ag3ntum_ask import (
     create_ag3ntum_ask_mcp_server,
     AG3NTUM_ASK_TOOL,
     get_pending_question,
+    pop_asked_question,
     submit_answer,
 )
 from .ag3ntum_file_tools import (
@@ -83,10 +85,13 @@ __all__ = [
     "create_ag3ntum_grep_mcp_server",
     "create_ag3ntum_ls_mcp_server",
     "create_ag3ntum_webfetch_mcp_server",
+    # Write tool session cleanup (open chunked writes)
+    "discard_chunked_writes",
     # AskUserQuestion tool
     "create_ask_user_question_tool",
     "create_ag3ntum_ask_mcp_server",
     "AG3NTUM_ASK_TOOL",
     "get_pending_question",
+    "pop_asked_question",
     "submit_answer",
 ]
@@ -9,6 +9,7 @@ from .tool import (
     create_ag3ntum_ask_mcp_server,
     AG3NTUM_ASK_TOOL,
     get_pending_question,
+    pop_asked_question,
     submit_answer,
 )
 
@@ -17,5 +18,6 @@ __all__ = [
     "create_ag3ntum_ask_mcp_server",
     "AG3NTUM_ASK_TOOL",
     "get_pending_question",
+    "pop_asked_question",
     "submit_answer",
 ]
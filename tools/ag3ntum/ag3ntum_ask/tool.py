@@ -16,6 +16,11 @@ Architecture (event-based, session stop/resume):
 8. API emits a "question_answered" event
 9. User resumes session - agent continues with answer in context
 
+When the SDK client pool suspends conversations on questions
+(client_pool.suspend_on_question), the run's CLI process stays alive and the
+answer is delivered to it directly (hot resume); pop_asked_question() tells
+the agent which runs ended on a question.
+
 Events are stored in the same event table as all other session events,
 providing a unified history and natural fit with Claude Code's resume capability.
 """
@@ -44,6 +49,9 @@ MAX_OPTION_DESCRIPTION_LENGTH = 500  # Max length for option descriptions
 MAX_OPTIONS_PER_QUESTION = 10  # Max number of options per question
 MAX_QUESTIONS = 10  # Max number of questions per tool call
 
+# Questions asked during the current run, by session (for hot resume)
+_asked_questions: dict[str, str] = {}
+
 
 def create_ask_user_question_tool(session_id: str):
     """
@@ -186,6 +194,7 @@ Example:
 
             # Publish to SSE subscribers
             await agent_runner.publish_event(bound_session_id, event)
+            _asked_questions[bound_session_id] = question_id
 
             logger.info(
                 f"AskUserQuestion: Emitted question_pending event {question_id} "
@@ -230,6 +239,20 @@ def _error(message: str) -> dict[str, Any]:
     return {"content": [{"type": "text", "text": f"**Error:** {message}"}], "isError": True}
 
 
+def pop_asked_question(session_id: str) -> Optional[str]:
+    """
+    Return and clear the question ID asked during the session's current run.
+
+    Args:
+        session_id: The session ID.
+
+    Returns:
+        The last question ID asked in this process since the previous call,
+        or None if the run did not stop on a question.
+    """
+    return _asked_questions.pop(session_id, None)
+
+
 # API functions for use by the sessions endpoint
 # These query the event stream for question/answer state
 
@@ -5,6 +5,11 @@ Executes bash commands and automatically captures output to ./.tmp/cmd/
 directory. Returns metadata (exit code, filesize, line count) and
 configurable preview lines (head or tail) for efficient context management.
 
+Output is streamed from the pipe to the output file in chunks (only a
+bounded head and tail are kept in memory), and throttled "tool_progress"
+events with byte/line counts and recent lines are published to the
+session's event stream while the command runs.
+
 Security Layers:
 1. CommandSecurityFilter - Pre-execution regex filtering of dangerous commands
 2. Bubblewrap (bwrap) - OS-level filesystem and process isolation
@@ -20,7 +25,7 @@ import logging
 import os
 import shlex
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal, Optional
 
@@ -31,6 +36,20 @@ from src.core.command_security import (
     SecurityCheckResult,
     get_command_security_filter,
 )
+from src.core.output_capture import (
+    DEFAULT_PROGRESS_INTERVAL,
+    OutputCapture,
+    OutputProgress,
+    ProgressCallback,
+)
+from src.core.path_validator import resume_path_cache, suspend_path_cache
+from src.core.persistent_shell import (
+    DEFAULT_IDLE_TIMEOUT_SECONDS,
+    SHELL_COMMAND,
+    PersistentShell,
+    default_shell_env,
+    get_persistent_shell,
+)
 if TYPE_CHECKING:
     from src.core.sandbox import SandboxExecutor
 
@@ -57,6 +76,36 @@ MAX_PREVIEW_LINES: int = 100
 # Output directory (relative to workspace)
 OUTPUT_DIR: str = ".tmp/cmd"
 
+# Event type for live output updates (published, not persisted)
+TOOL_PROGRESS_EVENT: str = "tool_progress"
+
+
+def create_progress_publisher(session_id: str) -> ProgressCallback:
+    """
+    Create a callback publishing Bash output progress to a session's event stream.
+
+    Progress events are ephemeral: they are not stored in the event table
+    and carry sequence 0, so they never take part in replay or deduplication.
+    """
+    async def publish(progress: OutputProgress) -> None:
+        from src.services.agent_runner import agent_runner
+
+        await agent_runner.publish_event(session_id, {
+            "type": TOOL_PROGRESS_EVENT,
+            "data": {
+                "tool_name": AG3NTUM_BASH_TOOL,
+                "bytes": progress.bytes,
+                "lines": progress.lines,
+                "recent_lines": progress.recent_lines,
+                "elapsed_ms": int(progress.elapsed * 1000),
+            },
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "sequence": 0,
+            "session_id": session_id,
+        })
+
+    return publish
+
 
 def create_bash_tool(
     workspace_path: Path,
@@ -68,6 +117,10 @@ def create_bash_tool(
     output_dir: str = OUTPUT_DIR,
     sandbox_executor: Optional["SandboxExecutor"] = None,
     security_filter: Optional[CommandSecurityFilter] = None,
+    session_id: Optional[str] = None,
+    progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+    persistent_shell: bool = False,
+    persistent_idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SECONDS,
 ):
     """
     Create the Ag3ntumBash tool function with workspace binding.
@@ -88,6 +141,15 @@ def create_bash_tool(
         security_filter: Optional CommandSecurityFilter for pre-execution
                         command validation. If not provided, uses the
                         default global filter.
+        session_id: Session whose event stream receives tool_progress
+                   events. No progress is published when None.
+        progress_interval: Minimum seconds between progress events
+                          (0 or less disables them).
+        persistent_shell: Run commands in one long-lived (sandboxed) shell
+                         per session, so cd/export persist between calls.
+                         Requires session_id.
+        persistent_idle_timeout: Seconds of inactivity before the
+                                persistent shell is closed.
 
     Returns:
         Tool function decorated with @tool.
@@ -101,6 +163,25 @@ def create_bash_tool(
     bound_output_dir = output_dir
     bound_sandbox_executor = sandbox_executor
     bound_security_filter = security_filter or get_command_security_filter()
+    bound_progress_interval = progress_interval
+    bound_session_id = session_id
+    bound_persistent_shell = persistent_shell
+    bound_persistent_idle_timeout = persistent_idle_timeout
+    bound_on_progress: Optional[ProgressCallback] = (
+        create_progress_publisher(session_id)
+        if session_id and progress_interval > 0 else None
+    )
+
+    persistent_note = (
+        """
+Commands run in one shell that persists between calls: cd, export and
+activated virtual environments carry over. Background jobs (cmd &) keep
+running, but their output is discarded between calls and mixed into the
+output of whichever call is running when they print. Redirect the output of
+jobs you need to inspect: cmd > job.log 2>&1 &
+"""
+        if persistent_shell and session_id else ""
+    )
 
     @tool(
         "Bash",
@@ -108,7 +189,7 @@ def create_bash_tool(
 
 Output is automatically saved to ./{output_dir}/<id>.txt with metadata.
 Returns a preview (head or tail lines) plus total size and line count.
-
+{persistent_note}
 Use this tool instead of raw bash to prevent large outputs from bloating context.
 
 Args:
@@ -182,6 +263,12 @@ Example:
 
         logger.info(f"Ag3ntumBash: Executing command, output={output_file}")
 
+        # The command may create or re-point symlinks in the workspace: other
+        # tools must not reuse path resolutions cached before or during it.
+        # With a persistent shell the cache stays off until the shell is
+        # closed, since background jobs outlive the command.
+        if bound_session_id:
+            suspend_path_cache(bound_session_id)
         try:
             # Build execution command - wrap in sandbox if executor is available
             exec_command: str | list[str]
@@ -189,32 +276,21 @@ Example:
             exec_cwd: str | None
             exec_env: dict[str, str] | None
 
-            if bound_sandbox_executor is not None and bound_sandbox_executor.config.enabled:
-                # SECURITY: Wrap command in bubblewrap for filesystem isolation
-                # This is the PRIMARY security layer for Ag3ntumBash
+            # Stream output to the file as it is produced
+            capture = OutputCapture(
+                output_file,
+                on_progress=bound_on_progress,
+                progress_interval=bound_progress_interval,
+            )
+            shell_note = ""
+
+            if bound_persistent_shell and bound_session_id:
+                # Run in the session's long-lived shell: cd/export persist
+                # between calls and no sandbox is started per command
                 try:
-                    allow_network = bool(
-                        getattr(bound_sandbox_executor.config, "network", None)
-                        and bound_sandbox_executor.config.network.enabled
-                    )
-                    # Build bwrap command list (not shell string)
-                    bwrap_cmd = bound_sandbox_executor.build_bwrap_command(
-                        ["bash", "-c", command],
-                        allow_network=allow_network,
-                    )
-                    # TIMEOUT: Wrap bwrap command with Linux timeout for forcible termination
-                    # timeout --kill-after=KILL sends SIGTERM first, then SIGKILL after grace period
-                    exec_command = [
-                        "timeout",
-                        f"--kill-after={bound_kill_after}",
-                        str(bound_timeout),
-                    ] + bwrap_cmd
-                    use_shell = False
-                    exec_cwd = None  # bwrap sets --chdir internally
-                    exec_env = {"TERM": "dumb"}  # Minimal env, bwrap clears the rest
-                    logger.info(
-                        f"Ag3ntumBash: SANDBOX ENABLED - wrapping in timeout({bound_timeout}s, "
-                        f"kill-after={bound_kill_after}s) + bwrap: {command[:50]}..."
+                    shell = _get_session_shell(
+                        bound_session_id, bound_workspace, bound_sandbox_executor,
+                        bound_persistent_idle_timeout,
                     )
                 except Exception as e:
                     # SECURITY: FAIL-CLOSED - if sandbox fails, DENY the command
@@ -223,103 +299,152 @@ Example:
                         f"Sandbox unavailable (bwrap error: {e}). "
                         "Commands are blocked for security."
                     )
+                shell_result = await shell.run(command, bound_timeout, capture)
+                if shell_result.timed_out:
+                    logger.warning(
+                        f"Ag3ntumBash: Persistent shell command timed out after {bound_timeout}s"
+                    )
+                    return _error_response(
+                        f"Command timed out after {bound_timeout} seconds. The shell was "
+                        "restarted: working directory and environment variables were reset."
+                    )
+                exit_code = shell_result.exit_code
+                if shell_result.shell_ended:
+                    shell_note = (
+                        "\n**Note:** The shell exited; the next command starts a fresh shell "
+                        "(working directory and environment variables are reset).\n"
+                    )
             else:
-                # No sandbox - execute directly (SHOULD NOT happen in production)
-                # Log warning for visibility
-                logger.warning(
-                    "Ag3ntumBash: SANDBOX DISABLED - executing without isolation! "
-                    "This is a security risk."
-                )
-                # TIMEOUT: Wrap command with Linux timeout for forcible termination
-                # timeout --kill-after=KILL sends SIGTERM first, then SIGKILL after grace period
-                exec_command = f"timeout --kill-after={bound_kill_after} {bound_timeout} bash -c {shlex.quote(command)}"
-                use_shell = True
-                exec_cwd = str(bound_workspace)
-                exec_env = {**os.environ, "TERM": "dumb"}
-
-            # Execute command with timeout
-            # Note: Linux `timeout` handles the primary timeout via SIGTERM/SIGKILL
-            # asyncio timeout is a fallback safety net (timeout + kill_after + 30s buffer)
-            asyncio_timeout = bound_timeout + bound_kill_after + 30
-
-            # SECURITY: Privilege dropping is handled by bwrap --uid/--gid flags
-            # (configured in build_bwrap_command). Bwrap runs via sudo (see
-            # bwrap_path in permissions.yaml) which has NOPASSWD access configured
-            # in the Dockerfile sudoers rules. This approach works because:
-            # 1. The API runs as ag3ntum_api (UID 45045) - not root
-            # 2. Direct os.setuid() would fail (no CAP_SETUID)
-            # 3. But sudo bwrap --uid/--gid CAN switch UIDs
-            if (bound_sandbox_executor is not None
-                    and bound_sandbox_executor.linux_uid is not None
-                    and bound_sandbox_executor.linux_gid is not None):
-                logger.info(
-                    f"Ag3ntumBash: Bwrap will drop privileges to UID={bound_sandbox_executor.linux_uid}, "
-                    f"GID={bound_sandbox_executor.linux_gid}"
-                )
-
-            if use_shell:
-                process = await asyncio.create_subprocess_shell(
-                    exec_command,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.STDOUT,
-                    cwd=exec_cwd,
-                    env=exec_env,
-                )
-            else:
-                process = await asyncio.create_subprocess_exec(
-                    *exec_command,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.STDOUT,
-                    cwd=exec_cwd,
-                    env=exec_env,
-                )
-
-            try:
-                stdout, _ = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=asyncio_timeout
-                )
-            except asyncio.TimeoutError:
-                process.kill()
-                await process.wait()
-                logger.error(
-                    f"Ag3ntumBash: ASYNCIO TIMEOUT (fallback) after {asyncio_timeout}s - "
-                    f"Linux timeout failed to terminate the process"
-                )
-                return _error_response(
-                    f"Command timed out after {bound_timeout} seconds "
-                    f"(forcibly killed after {bound_kill_after}s grace period)"
-                )
-
-            exit_code = process.returncode or 0
-
-            # Check for Linux timeout exit codes
-            # 124 = SIGTERM sent (command timed out)
-            # 137 = SIGKILL sent (128 + 9, process killed after grace period)
-            if exit_code == 124:
-                logger.warning(
-                    f"Ag3ntumBash: Command terminated by timeout after {bound_timeout}s"
-                )
-                return _error_response(
-                    f"Command timed out after {bound_timeout} seconds (SIGTERM sent)"
-                )
-            elif exit_code == 137:
-                logger.warning(
-                    f"Ag3ntumBash: Command force-killed after {bound_timeout}+{bound_kill_after}s"
-                )
-                return _error_response(
-                    f"Command timed out and was force-killed after {bound_timeout}s + "
-                    f"{bound_kill_after}s grace period (SIGKILL sent)"
-                )
-
-            # Write command output to file
-            output_file.write_bytes(stdout)
+                if bound_sandbox_executor is not None and bound_sandbox_executor.config.enabled:
+                    # SECURITY: Wrap command in bubblewrap for filesystem isolation
+                    # This is the PRIMARY security layer for Ag3ntumBash
+                    try:
+                        allow_network = bool(
+                            getattr(bound_sandbox_executor.config, "network", None)
+                            and bound_sandbox_executor.config.network.enabled
+                        )
+                        # Build bwrap command list (not shell string)
+                        bwrap_cmd = bound_sandbox_executor.build_bwrap_command(
+                            ["bash", "-c", command],
+                            allow_network=allow_network,
+                        )
+                        # TIMEOUT: Wrap bwrap command with Linux timeout for forcible termination
+                        # timeout --kill-after=KILL sends SIGTERM first, then SIGKILL after grace period
+                        exec_command = [
+                            "timeout",
+                            f"--kill-after={bound_kill_after}",
+                            str(bound_timeout),
+                        ] + bwrap_cmd
+                        use_shell = False
+                        exec_cwd = None  # bwrap sets --chdir internally
+                        exec_env = {"TERM": "dumb"}  # Minimal env, bwrap clears the rest
+                        logger.info(
+                            f"Ag3ntumBash: SANDBOX ENABLED - wrapping in timeout({bound_timeout}s, "
+                            f"kill-after={bound_kill_after}s) + bwrap: {command[:50]}..."
+                        )
+                    except Exception as e:
+                        # SECURITY: FAIL-CLOSED - if sandbox fails, DENY the command
+                        logger.error(f"Ag3ntumBash: SANDBOX FAIL-CLOSED - bwrap error: {e}")
+                        return _error_response(
+                            f"Sandbox unavailable (bwrap error: {e}). "
+                            "Commands are blocked for security."
+                        )
+                else:
+                    # No sandbox - execute directly (SHOULD NOT happen in production)
+                    # Log warning for visibility
+                    logger.warning(
+                        "Ag3ntumBash: SANDBOX DISABLED - executing without isolation! "
+                        "This is a security risk."
+                    )
+                    # TIMEOUT: Wrap command with Linux timeout for forcible termination
+                    # timeout --kill-after=KILL sends SIGTERM first, then SIGKILL after grace period
+                    exec_command = (
+                        f"timeout --kill-after={bound_kill_after} {bound_timeout} "
+                        f"bash -c {shlex.quote(command)}"
+                    )
+                    use_shell = True
+                    exec_cwd = str(bound_workspace)
+                    exec_env = {**os.environ, "TERM": "dumb"}
+
+                # Execute command with timeout
+                # Note: Linux `timeout` handles the primary timeout via SIGTERM/SIGKILL
+                # asyncio timeout is a fallback safety net (timeout + kill_after + 30s buffer)
+                asyncio_timeout = bound_timeout + bound_kill_after + 30
+
+                # SECURITY: Privilege dropping is handled by bwrap --uid/--gid flags
+                # (configured in build_bwrap_command). Bwrap runs via sudo (see
+                # bwrap_path in permissions.yaml) which has NOPASSWD access configured
+                # in the Dockerfile sudoers rules. This approach works because:
+                # 1. The API runs as ag3ntum_api (UID 45045) - not root
+                # 2. Direct os.setuid() would fail (no CAP_SETUID)
+                # 3. But sudo bwrap --uid/--gid CAN switch UIDs
+                if (bound_sandbox_executor is not None
+                        and bound_sandbox_executor.linux_uid is not None
+                        and bound_sandbox_executor.linux_gid is not None):
+                    logger.info(
+                        f"Ag3ntumBash: Bwrap will drop privileges to UID={bound_sandbox_executor.linux_uid}, "
+                        f"GID={bound_sandbox_executor.linux_gid}"
+                    )
+
+                if use_shell:
+                    process = await asyncio.create_subprocess_shell(
+                        exec_command,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.STDOUT,
+                        cwd=exec_cwd,
+                        env=exec_env,
+                    )
+                else:
+                    process = await asyncio.create_subprocess_exec(
+                        *exec_command,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.STDOUT,
+                        cwd=exec_cwd,
+                        env=exec_env,
+                    )
+
+                async def run_to_exit() -> None:
+                    await capture.pump(process.stdout)
+                    await process.wait()
+
+                try:
+                    await asyncio.wait_for(run_to_exit(), timeout=asyncio_timeout)
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+                    logger.error(
+                        f"Ag3ntumBash: ASYNCIO TIMEOUT (fallback) after {asyncio_timeout}s - "
+                        f"Linux timeout failed to terminate the process"
+                    )
+                    return _error_response(
+                        f"Command timed out after {bound_timeout} seconds "
+                        f"(forcibly killed after {bound_kill_after}s grace period)"
+                    )
+
+                exit_code = process.returncode or 0
+
+                # Check for Linux timeout exit codes
+                # 124 = SIGTERM sent (command timed out)
+                # 137 = SIGKILL sent (128 + 9, process killed after grace period)
+                if exit_code == 124:
+                    logger.warning(
+                        f"Ag3ntumBash: Command terminated by timeout after {bound_timeout}s"
+                    )
+                    return _error_response(
+                        f"Command timed out after {bound_timeout} seconds (SIGTERM sent)"
+                    )
+                elif exit_code == 137:
+                    logger.warning(
+                        f"Ag3ntumBash: Command force-killed after {bound_timeout}+{bound_kill_after}s"
+                    )
+                    return _error_response(
+                        f"Command timed out and was force-killed after {bound_timeout}s + "
+                        f"{bound_kill_after}s grace period (SIGKILL sent)"
+                    )
 
             # Calculate content metadata (before appending metadata lines)
-            content_size = output_file.stat().st_size
-            output_text = stdout.decode("utf-8", errors="replace")
-            lines = output_text.splitlines()
-            total_lines = len(lines)
+            content_size = capture.total_bytes
+            total_lines = capture.total_lines
 
             # Append EXIT_CODE and FILESIZE metadata to file
             # This allows `tail` to reveal metadata without reading full output
@@ -330,13 +455,12 @@ Example:
             # Final filesize includes metadata
             filesize_bytes = output_file.stat().st_size
 
-            # Get preview lines
+            # Get preview lines (from the head/tail kept in memory)
             if preview_mode == "head":
-                preview_content = "\n".join(lines[:preview_lines])
-                truncated = total_lines > preview_lines
+                preview_content = "\n".join(capture.head_lines(preview_lines))
             else:  # tail
-                preview_content = "\n".join(lines[-preview_lines:])
-                truncated = total_lines > preview_lines
+                preview_content = "\n".join(capture.tail_lines(preview_lines))
+            truncated = total_lines > preview_lines
 
             # Build result
             relative_path = f"{bound_output_dir}/{filename}"
@@ -353,7 +477,7 @@ Example:
 {preview_content}
 ```
 {"[... output truncated ...]" if truncated else ""}
-
+{shell_note}
 **To read more:**
 - Full file: Use Read tool on `{relative_path}`
 - Metadata only: `tail -n 3 {relative_path}` → shows EXIT_CODE and FILESIZE
@@ -374,10 +498,45 @@ Example:
         except Exception as e:
             logger.exception(f"Ag3ntumBash: Execution failed - {e}")
             return _error_response(f"Command execution failed: {e}")
+        finally:
+            if bound_session_id:
+                resume_path_cache(bound_session_id)
 
     return bash
 
 
+def _get_session_shell(
+    session_id: str,
+    workspace_path: Path,
+    sandbox_executor: Optional["SandboxExecutor"],
+    idle_timeout: float,
+) -> PersistentShell:
+    """
+    Get the session's persistent shell, sandboxed like one-off commands.
+
+    The bwrap command line is rebuilt on every call; when it changes (new
+    mounts, profile or secrets) the registry replaces the running shell.
+    There is no `timeout` wrapper: per-command timeouts kill the shell.
+    """
+    if sandbox_executor is not None and sandbox_executor.config.enabled:
+        allow_network = bool(
+            getattr(sandbox_executor.config, "network", None)
+            and sandbox_executor.config.network.enabled
+        )
+        argv = sandbox_executor.build_bwrap_command(SHELL_COMMAND, allow_network=allow_network)
+        return get_persistent_shell(
+            session_id, argv, env={"TERM": "dumb"}, idle_timeout=idle_timeout
+        )
+    logger.warning(
+        "Ag3ntumBash: SANDBOX DISABLED - persistent shell runs without isolation! "
+        "This is a security risk."
+    )
+    return get_persistent_shell(
+        session_id, SHELL_COMMAND, cwd=str(workspace_path),
+        env=default_shell_env(), idle_timeout=idle_timeout,
+    )
+
+
 def _error_response(message: str) -> dict[str, Any]:
     """Create a standardized error response."""
     return {
@@ -5,17 +5,20 @@ Full feature parity with Claude Code Edit tool:
 - Search and replace within files
 - Exact match requirement
 - Multiple occurrence handling
+- Atomic write (temp file + os.replace), streamed for large files
+- Optional precondition hash to detect concurrent modification
 
 Security: Uses Ag3ntumPathValidator to ensure all paths are within
 the session workspace. The validator translates agent-provided paths
 (like /workspace/foo.txt) to real Docker filesystem paths.
 """
+import asyncio
 import logging
-from pathlib import Path
 from typing import Any
 
 from claude_agent_sdk import create_sdk_mcp_server, tool
 
+from src.core.file_edit import FileEditError, Replacement, apply_edits
 from src.core.path_validator import get_path_validator, PathValidationError
 
 logger = logging.getLogger(__name__)
@@ -48,15 +51,18 @@ Args:
     old_string: Exact text to find and replace
     new_string: Text to replace with
     replace_all: If True, replace all occurrences (default: False)
+    expected_hash: Optional SHA-256 of the content you last saw (as returned
+        by a previous Edit). The edit fails if the file has changed since.
 
 Returns:
-    Confirmation with diff preview or error.
+    Confirmation with diff preview and the new content hash, or error.
 
 Examples:
     Edit(file_path="./main.py", old_string="def old_name():", new_string="def new_name():")
     Edit(file_path="config.yaml", old_string="debug: false", new_string="debug: true", replace_all=True)
 """,
-        {"file_path": str, "old_string": str, "new_string": str, "replace_all": bool},
+        {"file_path": str, "old_string": str, "new_string": str, "replace_all": bool,
+         "expected_hash": str},
     )
     async def edit(args: dict[str, Any]) -> dict[str, Any]:
         """Edit a file by replacing text."""
@@ -64,6 +70,7 @@ Examples:
         old_string = args.get("old_string", "")
         new_string = args.get("new_string", "")
         replace_all = args.get("replace_all", False)
+        expected_hash = args.get("expected_hash") or None
 
         if not file_path:
             return _error("file_path is required")
@@ -93,40 +100,26 @@ Examples:
         if path.is_dir():
             return _error(f"Cannot edit directory: {file_path}")
 
-        # Read current content
+        edit_op = Replacement(old_string, new_string, replace_all=bool(replace_all))
         try:
-            content = path.read_text(encoding="utf-8")
-        except Exception as e:
-            return _error(f"Failed to read file: {e}")
-
-        # Check if old_string exists
-        count = content.count(old_string)
-        if count == 0:
-            return _error(
-                f"String not found in file.\n"
-                f"Make sure old_string matches exactly (including whitespace).\n"
-                f"Searched for: {repr(old_string[:100])}"
-            )
-
-        if count > 1 and not replace_all:
+            result = await asyncio.to_thread(apply_edits, path, [edit_op], expected_hash)
+        except FileEditError as e:
+            if e.edit_index is None:
+                return _error(e.reason)
+            if e.count == 0:
+                return _error(
+                    f"String not found in file.\n"
+                    f"Make sure old_string matches exactly (including whitespace).\n"
+                    f"Searched for: {repr(old_string[:100])}"
+                )
             return _error(
-                f"Found {count} occurrences of the string.\n"
+                f"Found {e.count} occurrences of the string.\n"
                 f"Use replace_all=True to replace all, or provide more context to make the match unique."
             )
-
-        # Perform replacement
-        if replace_all:
-            new_content = content.replace(old_string, new_string)
-            replaced = count
-        else:
-            new_content = content.replace(old_string, new_string, 1)
-            replaced = 1
-
-        # Write back
-        try:
-            path.write_text(new_content, encoding="utf-8")
         except Exception as e:
-            return _error(f"Failed to write file: {e}")
+            return _error(f"Failed to edit file: {e}")
+
+        replaced = result.counts[0]
 
         # Truncate for display
         old_display = old_string[:200] + ("..." if len(old_string) > 200 else "")
@@ -136,7 +129,8 @@ Examples:
 
         return _result(
             f"**Edited:** `{file_path}`\n"
-            f"**Replacements:** {replaced}\n\n"
+            f"**Replacements:** {replaced}\n"
+            f"**SHA-256:** `{result.sha256}`\n\n"
             f"**Changed:**\n```diff\n- {old_display}\n+ {new_display}\n```"
         )
 
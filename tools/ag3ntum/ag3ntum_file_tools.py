@@ -6,13 +6,18 @@ This ensures consistent tool naming: mcp__ag3ntum__Read, mcp__ag3ntum__Write,
 mcp__ag3ntum__Bash, etc.
 """
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Any, Optional
 
 import yaml
 from claude_agent_sdk import create_sdk_mcp_server
 
+from src.core.output_capture import DEFAULT_PROGRESS_INTERVAL
+from src.core.persistent_shell import DEFAULT_IDLE_TIMEOUT_SECONDS
+from src.core.prep_cache import get_preparation_cache
+from src.core.spans import timed
+
 from .ag3ntum_read import create_read_tool
 from .ag3ntum_read_document import create_read_document_tool
 from .ag3ntum_write import create_write_tool
@@ -22,6 +27,9 @@ from .ag3ntum_glob import create_glob_tool
 from .ag3ntum_grep import create_grep_tool
 from .ag3ntum_ls import create_ls_tool
 from .ag3ntum_webfetch import create_webfetch_tool
+from .ag3ntum_webfetch.http_cache import DEFAULT_CACHE_DIRECTORY, DEFAULT_MAX_SIZE_BYTES
+from .ag3ntum_webfetch.network import DEFAULT_DNS_TTL
+from .ag3ntum_webfetch.tool import DEFAULT_MAX_CONCURRENCY, DEFAULT_PER_HOST_CONCURRENCY
 from .ag3ntum_bash import (
     create_bash_tool,
     DEFAULT_TIMEOUT_SECONDS,
@@ -49,6 +57,9 @@ class BashToolConfig:
     preview_lines: int = DEFAULT_PREVIEW_LINES  # 20
     max_preview_lines: int = MAX_PREVIEW_LINES  # 100
     output_dir: str = OUTPUT_DIR  # ".tmp/cmd"
+    progress_interval: float = DEFAULT_PROGRESS_INTERVAL  # 1 second, 0 = off
+    persistent_shell: bool = False  # One long-lived shell per session
+    persistent_idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SECONDS  # 10 minutes
 
 
 def load_bash_config(config_path: Path | None = None) -> BashToolConfig:
@@ -68,8 +79,10 @@ def load_bash_config(config_path: Path | None = None) -> BashToolConfig:
         return BashToolConfig()
 
     try:
-        with open(path) as f:
-            yaml_data = yaml.safe_load(f) or {}
+        # tools-security.yaml is large; parse once per file version
+        yaml_data = get_preparation_cache().load_file(
+            path, lambda raw: yaml.safe_load(raw) or {}, namespace="yaml"
+        )
     except Exception as e:
         logger.error(f"Failed to load bash config from {path}: {e}")
         return BashToolConfig()
@@ -88,6 +101,11 @@ def load_bash_config(config_path: Path | None = None) -> BashToolConfig:
         preview_lines=bash_config.get("preview_lines", DEFAULT_PREVIEW_LINES),
         max_preview_lines=bash_config.get("max_preview_lines", MAX_PREVIEW_LINES),
         output_dir=bash_config.get("output_dir", OUTPUT_DIR),
+        progress_interval=bash_config.get("progress_interval", DEFAULT_PROGRESS_INTERVAL),
+        persistent_shell=bool(bash_config.get("persistent_shell", False)),
+        persistent_idle_timeout=bash_config.get(
+            "persistent_idle_timeout", DEFAULT_IDLE_TIMEOUT_SECONDS
+        ),
     )
 
     logger.info(
@@ -97,6 +115,59 @@ def load_bash_config(config_path: Path | None = None) -> BashToolConfig:
     return config
 
 
+@dataclass
+class WebFetchToolConfig:
+    """Configuration for WebFetch tool loaded from tools-security.yaml."""
+
+    http2: bool = False  # Needs the optional h2 package
+    dns_cache_ttl: float = DEFAULT_DNS_TTL  # 60 seconds
+    cache_enabled: bool = True
+    cache_directory: str = DEFAULT_CACHE_DIRECTORY  # "~/.tmp/webfetch-cache"
+    cache_max_size: int = DEFAULT_MAX_SIZE_BYTES  # 256MB
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY  # 8 requests per urls=[...] call
+    per_host_concurrency: int = DEFAULT_PER_HOST_CONCURRENCY  # 2 requests per host
+
+
+def load_webfetch_config(config_path: Path | None = None) -> WebFetchToolConfig:
+    """
+    Load WebFetch tool configuration from tools-security.yaml.
+
+    Args:
+        config_path: Path to tools-security.yaml. If None, uses default.
+
+    Returns:
+        WebFetchToolConfig with values from YAML or defaults.
+    """
+    path = config_path or DEFAULT_CONFIG_PATH
+
+    if not path.exists():
+        return WebFetchToolConfig()
+
+    try:
+        yaml_data = get_preparation_cache().load_file(
+            path, lambda raw: yaml.safe_load(raw) or {}, namespace="yaml"
+        )
+    except Exception as e:
+        logger.error(f"Failed to load webfetch config from {path}: {e}")
+        return WebFetchToolConfig()
+
+    webfetch_config = yaml_data.get("tools", {}).get("webfetch", {})
+    cache_config = webfetch_config.get("cache", {})
+    default_size_mb = DEFAULT_MAX_SIZE_BYTES // (1024 * 1024)
+
+    return WebFetchToolConfig(
+        http2=bool(webfetch_config.get("http2", False)),
+        dns_cache_ttl=webfetch_config.get("dns_cache_ttl", DEFAULT_DNS_TTL),
+        cache_enabled=bool(cache_config.get("enabled", True)),
+        cache_directory=cache_config.get("directory", DEFAULT_CACHE_DIRECTORY),
+        cache_max_size=int(cache_config.get("max_size_mb", default_size_mb)) * 1024 * 1024,
+        max_concurrency=int(webfetch_config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)),
+        per_host_concurrency=int(
+            webfetch_config.get("per_host_concurrency", DEFAULT_PER_HOST_CONCURRENCY)
+        ),
+    )
+
+
 def create_ag3ntum_tools_mcp_server(
     session_id: str,
     workspace_path: Optional[Path] = None,
@@ -153,6 +224,10 @@ def create_ag3ntum_tools_mcp_server(
                 max_preview_lines=bash_config.max_preview_lines,
                 output_dir=bash_config.output_dir,
                 sandbox_executor=sandbox_executor,
+                session_id=session_id,
+                progress_interval=bash_config.progress_interval,
+                persistent_shell=bash_config.persistent_shell,
+                persistent_idle_timeout=bash_config.persistent_idle_timeout,
             )
             tools.append(bash_tool)
             logger.debug(
@@ -161,7 +236,8 @@ def create_ag3ntum_tools_mcp_server(
             )
     
     # Add all file tools bound to this session
-    # Note: WebFetch doesn't need session_id as it doesn't access filesystem
+    # Note: WebFetch uses session_id only to save bodies into the workspace (save_dir)
+    webfetch_config = load_webfetch_config()
     tools.extend([
         create_read_tool(session_id=session_id),
         create_read_document_tool(session_id=session_id),
@@ -171,10 +247,24 @@ def create_ag3ntum_tools_mcp_server(
         create_glob_tool(session_id=session_id),
         create_grep_tool(session_id=session_id),
         create_ls_tool(session_id=session_id),
-        create_webfetch_tool(),  # No session_id needed
+        create_webfetch_tool(
+            session_id=session_id,
+            http2=webfetch_config.http2,
+            dns_cache_ttl=webfetch_config.dns_cache_ttl,
+            cache_dir=webfetch_config.cache_directory if webfetch_config.cache_enabled else None,
+            cache_max_size=webfetch_config.cache_max_size,
+            max_concurrency=webfetch_config.max_concurrency,
+            per_host_concurrency=webfetch_config.per_host_concurrency,
+        ),
         create_ask_user_question_tool(session_id=session_id),
     ])
 
+    # Record each call as a "tool.<Name>" span of the session's run
+    tools = [
+        replace(t, handler=timed(session_id, f"tool.{t.name}", t.handler))
+        for t in tools
+    ]
+
     # Log each tool for debugging
     tool_names = [getattr(t, '__name__', str(t)) for t in tools]
     logger.info(
@@ -6,17 +6,29 @@ Full feature parity with Claude Code Glob tool:
 - Recursive search
 - Results limited to workspace
 
+Matching runs in a worker thread over the session's workspace index
+(src/core/workspace_index.py), so repeated globs do not re-walk the tree.
+The pattern is compiled once, directories that cannot contain a match are
+not walked, and the walk stops at MAX_RESULTS. Sorting by modification time
+keeps only the newest MAX_RESULTS matches in a bounded heap.
+
 Security: Uses Ag3ntumPathValidator to ensure all paths are within
 the session workspace. The validator translates agent-provided paths
 (like /workspace/foo.txt) to real Docker filesystem paths.
 """
+import asyncio
+import heapq
+import itertools
 import logging
+import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator, Optional
 
 from claude_agent_sdk import create_sdk_mcp_server, tool
 
+from src.core.file_search import GlobMatcher, walk_entries
 from src.core.path_validator import get_path_validator, PathValidationError
+from src.core.workspace_index import WorkspaceIndex, get_workspace_index
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +38,9 @@ AG3NTUM_GLOB_TOOL: str = "mcp__ag3ntum__Glob"
 # Maximum results to return
 MAX_RESULTS: int = 10000
 
+SORT_BY_PATH = "path"
+SORT_BY_MTIME = "mtime"
+
 
 def create_glob_tool(session_id: str):
     """
@@ -46,6 +61,7 @@ def create_glob_tool(session_id: str):
 Args:
     pattern: Glob pattern (e.g., "**/*.py", "src/*.txt")
     path: Base directory for search (default: workspace root)
+    sort_by: "path" (default) or "mtime" (most recently modified first)
 
 Returns:
     List of matching file paths, or error.
@@ -54,16 +70,20 @@ Examples:
     Glob(pattern="**/*.py")
     Glob(pattern="*.yaml", path="./config")
     Glob(pattern="test_*.py", path="/workspace/tests")
+    Glob(pattern="**/*.log", sort_by="mtime")
 """,
-        {"pattern": str, "path": str},
+        {"pattern": str, "path": str, "sort_by": str},
     )
     async def glob(args: dict[str, Any]) -> dict[str, Any]:
         """Find files matching a glob pattern."""
         pattern = args.get("pattern", "")
         base_path = args.get("path", ".")
+        sort_by = args.get("sort_by") or SORT_BY_PATH
 
         if not pattern:
             return _error("pattern is required")
+        if sort_by not in (SORT_BY_PATH, SORT_BY_MTIME):
+            return _error(f"sort_by must be '{SORT_BY_PATH}' or '{SORT_BY_MTIME}'")
 
         # Get validator for this session
         try:
@@ -90,10 +110,15 @@ Examples:
 
         # Execute glob
         try:
-            matches = list(search_path.glob(pattern))
-
-            # Filter to only files (not directories) and limit results
-            files = [m for m in matches if m.is_file()][:MAX_RESULTS]
+            files, total_matches = await asyncio.to_thread(
+                _find_files,
+                search_path,
+                pattern,
+                get_workspace_index(bound_session_id, validator.workspace),
+                MAX_RESULTS,
+                sort_by,
+                validator.is_link_target_allowed,
+            )
 
             # Convert to relative paths for display
             workspace = validator.workspace
@@ -106,11 +131,11 @@ Examples:
                     # Should not happen after validation, but be safe
                     relative_paths.append(str(f))
 
-            # Sort for consistent output
-            relative_paths.sort()
+            # Sort for consistent output (mtime results are already ordered)
+            if sort_by == SORT_BY_PATH:
+                relative_paths.sort()
 
-            total_matches = len(matches)
-            truncated = total_matches > MAX_RESULTS
+            truncated = total_matches is None or total_matches > MAX_RESULTS
 
             logger.info(
                 f"Ag3ntumGlob: Found {len(relative_paths)} files matching '{pattern}'"
@@ -120,8 +145,10 @@ Examples:
                 return _result(f"No files found matching pattern: `{pattern}`")
 
             output = f"**Found {len(relative_paths)} files**"
-            if truncated:
-                output += f" (showing first {MAX_RESULTS} of {total_matches})"
+            if truncated and total_matches is None:
+                output += f" (stopped at {MAX_RESULTS}; narrow the pattern or path)"
+            elif truncated:
+                output += f" (showing {MAX_RESULTS} most recently modified of {total_matches})"
             output += f"\n\n```\n{chr(10).join(relative_paths)}\n```"
 
             return _result(output)
@@ -132,6 +159,82 @@ Examples:
     return glob
 
 
+def _match_files(
+    search_path: Path,
+    pattern: str,
+    index: Optional[WorkspaceIndex] = None,
+    follow_symlink: Optional[Callable[[str], bool]] = None,
+) -> Iterator[str]:
+    """
+    Match a pathlib-style glob against the files below search_path.
+
+    Lazy: directories are read as the caller consumes results, and
+    subtrees that cannot match the pattern are skipped. Symlinks are only
+    followed when follow_symlink accepts them.
+
+    Yields:
+        Paths of matching files in walk order.
+    """
+    matcher = GlobMatcher(pattern)
+    walker = index.walk if index is not None else walk_entries
+    for rel, path, is_dir in walker(
+        search_path,
+        respect_gitignore=False,
+        ignored_dirs=frozenset(),
+        descend=matcher.can_descend,
+        follow_symlink=follow_symlink,
+    ):
+        if not is_dir and matcher.matches(rel):
+            yield path
+
+
+def _find_files(
+    search_path: Path,
+    pattern: str,
+    index: Optional[WorkspaceIndex],
+    limit: int,
+    sort_by: str = SORT_BY_PATH,
+    follow_symlink: Optional[Callable[[str], bool]] = None,
+) -> tuple[list[Path], Optional[int]]:
+    """
+    Collect up to limit matching files.
+
+    By path, the walk stops after limit + 1 matches and the total is not
+    known. By mtime, every match is visited but only the newest limit are
+    kept (heapq.nlargest), newest first. mtimes come from the index only
+    while inotify keeps it current; otherwise each match is stat'ed, since
+    in-place writes do not invalidate mtime-mode listings.
+
+    Returns:
+        (files, total number of matches or None if the walk stopped early)
+    """
+    matches = _match_files(search_path, pattern, index, follow_symlink)
+    if sort_by != SORT_BY_MTIME:
+        found = list(itertools.islice(matches, limit + 1))
+        if len(found) > limit:
+            return [Path(p) for p in found[:limit]], None
+        return [Path(p) for p in found], len(found)
+
+    total = 0
+    indexed_mtimes = index is not None and index.uses_inotify
+
+    def with_mtime() -> Iterator[tuple[int, str]]:
+        nonlocal total
+        for path in matches:
+            total += 1
+            entry = index.get(path) if indexed_mtimes else None
+            if entry is not None:
+                yield entry.mtime_ns, path
+                continue
+            try:
+                yield os.stat(path).st_mtime_ns, path
+            except OSError:
+                continue
+
+    newest = heapq.nlargest(limit, with_mtime())
+    return [Path(p) for _, p in newest], total
+
+
 def _result(text: str) -> dict[str, Any]:
     """Create a successful result response."""
     return {"content": [{"type": "text", "text": text}]}
@@ -5,19 +5,29 @@ Full feature parity with Claude Code Grep tool:
 - Regex pattern search
 - Context lines before/after
 - Case-insensitive option
+- Skips binary files, .git/node_modules and .gitignore'd paths
+
+The search runs in a worker thread (see src/core/file_search.py): files are
+walked with os.scandir, searched concurrently in chunks with a literal
+prefilter, and the search stops at MAX_RESULTS. Output order is the sorted
+walk order regardless of concurrency. Directory listings come from the
+session's workspace index (src/core/workspace_index.py) when enabled.
 
 Security: Uses Ag3ntumPathValidator to ensure all paths are within
 the session workspace. The validator translates agent-provided paths
 (like /workspace/foo.txt) to real Docker filesystem paths.
 """
+import asyncio
 import logging
 import re
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Optional
 
 from claude_agent_sdk import create_sdk_mcp_server, tool
 
+from src.core.file_search import GrepEngine, walk_files
 from src.core.path_validator import get_path_validator, PathValidationError
+from src.core.workspace_index import WorkspaceIndex, get_workspace_index
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +58,7 @@ def create_grep_tool(session_id: str):
 Args:
     pattern: Regex pattern to search for
     path: File or directory to search (default: workspace root)
-    include: Glob pattern for files to include (e.g., "*.py")
+    include: Glob pattern for files to include (e.g., "*.py", "src/**/*.ts")
     ignore_case: Case-insensitive search (default: False)
     context: Number of context lines before/after match (default: 3)
 
@@ -100,52 +110,17 @@ Examples:
         if not search_path.exists():
             return _error(f"Path not found: {base_path}")
 
-        # Collect files to search
-        if search_path.is_file():
-            files_to_search = [search_path]
-        else:
-            files_to_search = [f for f in search_path.glob(include) if f.is_file()]
-
-        # Search files
-        results: list[str] = []
-        total_matches = 0
-        workspace = validator.workspace
-
-        for file_path in files_to_search:
-            if total_matches >= MAX_RESULTS:
-                break
-
-            try:
-                content = file_path.read_text(encoding="utf-8", errors="replace")
-                lines = content.splitlines()
-            except Exception:
-                continue  # Skip unreadable files
-
-            # Get relative path for display
-            try:
-                rel_path = file_path.relative_to(workspace)
-            except ValueError:
-                rel_path = file_path
-
-            file_matches: list[tuple[int, str]] = []
-            for i, line in enumerate(lines):
-                if regex.search(line):
-                    file_matches.append((i, line))
-                    total_matches += 1
-                    if total_matches >= MAX_RESULTS:
-                        break
-
-            if file_matches:
-                results.append(f"\n**{rel_path}**")
-                for line_num, line in file_matches:
-                    # Add context
-                    start = max(0, line_num - context)
-                    end = min(len(lines), line_num + context + 1)
-
-                    for ctx_num in range(start, end):
-                        prefix = ">" if ctx_num == line_num else " "
-                        results.append(f"{prefix} {ctx_num + 1}: {lines[ctx_num]}")
-                    results.append("")  # Blank line between matches
+        # Walk and search off the event loop
+        results, total_matches = await asyncio.to_thread(
+            _search,
+            regex,
+            search_path,
+            include,
+            max(0, int(context or 0)),
+            validator.workspace,
+            get_workspace_index(bound_session_id, validator.workspace),
+            validator.is_link_target_allowed,
+        )
 
         logger.info(f"Ag3ntumGrep: Found {total_matches} matches for '{pattern}'")
 
@@ -162,6 +137,59 @@ Examples:
     return grep
 
 
+def _search(
+    regex: re.Pattern,
+    search_path: Path,
+    include: str,
+    context: int,
+    workspace: Path,
+    index: Optional[WorkspaceIndex] = None,
+    follow_symlink: Optional[Callable[[str], bool]] = None,
+) -> tuple[list[str], int]:
+    """
+    Search a file or directory tree and format the matches.
+
+    Symlinks in the tree are only followed when follow_symlink accepts them.
+
+    Returns:
+        (output lines, number of matching lines)
+    """
+    if search_path.is_file():
+        files = iter([(search_path.name, str(search_path))])
+    elif index is not None:
+        files = index.walk_files(
+            search_path, include=include, gitignore_root=workspace, follow_symlink=follow_symlink,
+        )
+    else:
+        files = walk_files(
+            search_path, include=include, gitignore_root=workspace, follow_symlink=follow_symlink,
+        )
+
+    engine = GrepEngine(regex, context=context, max_results=MAX_RESULTS)
+    results: list[str] = []
+    total_matches = 0
+
+    for found in engine.search(files):
+        # Get relative path for display
+        try:
+            rel_path = Path(found.path).relative_to(workspace)
+        except ValueError:
+            rel_path = Path(found.path)
+
+        results.append(f"\n**{rel_path}**")
+        for match in found.matches:
+            total_matches += 1
+            first = match.line_number - len(match.before)
+            for offset, line in enumerate(match.before):
+                results.append(f"  {first + offset}: {line}")
+            results.append(f"> {match.line_number}: {match.line}")
+            for offset, line in enumerate(match.after, start=1):
+                results.append(f"  {match.line_number + offset}: {line}")
+            results.append("")  # Blank line between matches
+
+    return results, total_matches
+
+
 def _result(text: str) -> dict[str, Any]:
     """Create a successful result response."""
     return {"content": [{"type": "text", "text": text}]}
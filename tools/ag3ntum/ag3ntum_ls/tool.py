@@ -6,17 +6,23 @@ Full feature parity with Claude Code LS tool:
 - Recursive option
 - Hidden files option
 
+Listings come from the session's workspace index
+(src/core/workspace_index.py) when enabled.
+
 Security: Uses Ag3ntumPathValidator to ensure all paths are within
 the session workspace. The validator translates agent-provided paths
 (like /workspace/foo.txt) to real Docker filesystem paths.
 """
+import asyncio
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Optional
 
 from claude_agent_sdk import create_sdk_mcp_server, tool
 
+from src.core.file_search import walk_entries
 from src.core.path_validator import get_path_validator, PathValidationError
+from src.core.workspace_index import WorkspaceIndex, get_workspace_index
 
 logger = logging.getLogger(__name__)
 
@@ -89,33 +95,29 @@ Examples:
 
         # List contents
         try:
-            entries: list[str] = []
             workspace = validator.workspace
-
-            if recursive:
-                items = list(path.rglob("*"))
-            else:
-                items = list(path.iterdir())
-
-            # Filter and format
-            for item in items[:MAX_ENTRIES]:
-                # Skip hidden files unless requested
-                if not include_hidden and item.name.startswith("."):
-                    continue
-
+            items = await asyncio.to_thread(
+                _list_entries,
+                path,
+                recursive,
+                include_hidden,
+                get_workspace_index(bound_session_id, workspace),
+                validator.is_link_target_allowed,
+            )
+
+            # Format entries
+            entries: list[str] = []
+            for item_path, is_dir, size in items[:MAX_ENTRIES]:
                 # Get relative path
                 try:
-                    rel = item.relative_to(workspace)
+                    rel = item_path.relative_to(workspace)
                 except ValueError:
-                    rel = item
+                    rel = item_path
 
-                # Format entry
-                if item.is_dir():
+                if is_dir:
                     entries.append(f"📁 {rel}/")
                 else:
-                    size = item.stat().st_size
-                    size_str = _format_size(size)
-                    entries.append(f"📄 {rel} ({size_str})")
+                    entries.append(f"📄 {rel} ({_format_size(size)})")
 
             # Sort: directories first, then files
             entries.sort(key=lambda x: (not x.startswith("📁"), x.lower()))
@@ -140,6 +142,63 @@ Examples:
     return ls
 
 
+def _list_entries(
+    path: Path,
+    recursive: bool,
+    include_hidden: bool,
+    index: Optional[WorkspaceIndex] = None,
+    follow_symlink: Optional[Callable[[str], bool]] = None,
+) -> list[tuple[Path, bool, int]]:
+    """
+    Collect (path, is_dir, size) for a directory's entries.
+
+    Hidden entries are skipped (and not descended into) unless requested.
+    Entries that cannot be stat'ed (e.g. broken symlinks) are skipped.
+    Recursive listings only descend into (and list files behind) symlinks
+    that follow_symlink accepts.
+    """
+    items: list[tuple[Path, bool, int]] = []
+    if not recursive:
+        if index is not None:
+            listing = index.list_dir(path)
+            return [
+                (Path(e.path), e.is_dir, e.size)
+                for e in listing
+                if include_hidden or not e.name.startswith(".")
+            ]
+        for item in path.iterdir():
+            if not include_hidden and item.name.startswith("."):
+                continue
+            try:
+                items.append((item, item.is_dir(), item.stat().st_size))
+            except OSError:
+                continue
+        return items
+
+    walker = index.walk if index is not None else walk_entries
+    for _, item_path, is_dir in walker(
+        path,
+        respect_gitignore=False,
+        ignored_dirs=frozenset(),
+        include_hidden=include_hidden,
+        include_dirs=True,
+        follow_symlink=follow_symlink,
+    ):
+        if is_dir:
+            items.append((Path(item_path), True, 0))
+            continue
+        if index is not None:
+            entry = index.get(item_path)
+            size = entry.size if entry is not None else 0
+        else:
+            try:
+                size = Path(item_path).stat().st_size
+            except OSError:
+                continue
+        items.append((Path(item_path), False, size))
+    return items
+
+
 def _format_size(size: int) -> str:
     """Format file size in human-readable format."""
     if size < 1024:
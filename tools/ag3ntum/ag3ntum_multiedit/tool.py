@@ -5,17 +5,22 @@ Full feature parity with Claude Code MultiEdit tool:
 - Multiple edits in one call
 - Atomic operation (all or nothing)
 - Supports multiple files
+- Edits to one file are applied in a single pass over its content (in
+  order, one by one, whenever they overlap or depend on each other); every
+  file is written to a temp file first and only then moved into place
 
 Security: Uses Ag3ntumPathValidator to ensure all paths are within
 the session workspace. The validator translates agent-provided paths
 (like /workspace/foo.txt) to real Docker filesystem paths.
 """
+import asyncio
 import logging
 from pathlib import Path
 from typing import Any
 
 from claude_agent_sdk import create_sdk_mcp_server, tool
 
+from src.core.file_edit import FileEditError, PreparedEdit, Replacement, prepare_edits
 from src.core.path_validator import get_path_validator, PathValidationError
 
 logger = logging.getLogger(__name__)
@@ -44,11 +49,19 @@ Each edit specifies a file, old_string, and new_string.
 All edits are validated first, then applied together.
 If any edit fails validation, none are applied.
 
+Edits to the same file are matched against its current content (each
+replaces the first occurrence of its old_string). If any old_string
+overlaps another edit's old_string, or shares text with an earlier edit's
+new_string, the edits to that file are instead always applied one after
+the other in order, each to the previous one's output.
+
 Args:
     edits: List of edit objects, each with:
         - file_path: Path to edit
         - old_string: Text to find
         - new_string: Text to replace with
+        - expected_hash: Optional SHA-256 of the file content you last saw;
+          the call fails if the file has changed since
 
 Returns:
     Summary of all edits applied or error.
@@ -78,8 +91,8 @@ Example:
             logger.error(f"Ag3ntumMultiEdit: PathValidator not configured - {e}")
             return _error(f"Internal error: {e}")
 
-        # Phase 1: Validate all edits
-        validated_edits: list[dict[str, Any]] = []
+        # Phase 1: Validate all edits and group them by file (in order)
+        by_path: dict[Path, dict[str, Any]] = {}
         for i, edit in enumerate(edits):
             if not isinstance(edit, dict):
                 return _error(f"Edit {i}: must be an object with file_path, old_string, new_string")
@@ -108,51 +121,73 @@ Example:
             if path.is_dir():
                 return _error(f"Edit {i}: Cannot edit directory: {file_path}")
 
-            # Read content and verify old_string exists
-            try:
-                content = path.read_text(encoding="utf-8")
-            except Exception as e:
-                return _error(f"Edit {i}: Failed to read {file_path}: {e}")
-
-            if old_string not in content:
-                return _error(
-                    f"Edit {i} ({file_path}): String not found.\n"
-                    f"Searched for: {repr(old_string[:100])}"
-                )
-
-            validated_edits.append({
-                "index": i,
+            group = by_path.setdefault(path, {
                 "file_path": file_path,
-                "path": path,
-                "old_string": old_string,
-                "new_string": new_string,
-                "content": content,
+                "indexes": [],
+                "replacements": [],
+                "expected_hash": None,
             })
+            group["indexes"].append(i)
+            group["replacements"].append(
+                Replacement(old_string, new_string, require_unique=False)
+            )
+            group["expected_hash"] = group["expected_hash"] or edit.get("expected_hash") or None
+
+        # Phase 2: Compute every file's new content (nothing is modified yet)
+        prepared: list[tuple[dict[str, Any], PreparedEdit]] = []
+        try:
+            for path, group in by_path.items():
+                try:
+                    result = await asyncio.to_thread(
+                        prepare_edits, path, group["replacements"], group["expected_hash"]
+                    )
+                except FileEditError as e:
+                    if e.edit_index is None:
+                        return _error(f"{group['file_path']}: {e.reason}")
+                    i = group["indexes"][e.edit_index]
+                    old_string = group["replacements"][e.edit_index].old
+                    if e.overlaps is not None:
+                        return _error(
+                            f"Edit {i} ({group['file_path']}): String not found after "
+                            f"applying edit {group['indexes'][e.overlaps]}: edit {i} overlaps "
+                            f"edit {group['indexes'][e.overlaps]}.\n"
+                            f"Searched for: {repr(old_string[:100])}"
+                        )
+                    return _error(
+                        f"Edit {i} ({group['file_path']}): String not found.\n"
+                        f"Searched for: {repr(old_string[:100])}"
+                    )
+                except Exception as e:
+                    return _error(f"Failed to read {group['file_path']}: {e}")
+                prepared.append((group, result))
+
+            # Phase 3: Move all new contents into place
+            for committed, (group, result) in enumerate(prepared):
+                try:
+                    await asyncio.to_thread(result.commit)
+                except Exception as e:
+                    logger.error(f"Ag3ntumMultiEdit: Commit of {group['file_path']} failed - {e}")
+                    return _error(
+                        f"Failed to write {group['file_path']}: {e}"
+                        + (f"\n{committed} file(s) were already updated." if committed else "")
+                    )
+        finally:
+            for _, result in prepared:
+                result.discard()
 
-        # Phase 2: Apply all edits
         results: list[str] = []
-        for edit in validated_edits:
-            path = edit["path"]
-            old_string = edit["old_string"]
-            new_string = edit["new_string"]
-            content = edit["content"]
-            file_path = edit["file_path"]
-
-            # Replace first occurrence
-            new_content = content.replace(old_string, new_string, 1)
-
-            try:
-                path.write_text(new_content, encoding="utf-8")
-                results.append(f"✓ `{file_path}`: 1 replacement")
-            except Exception as e:
-                # This shouldn't happen after validation, but handle gracefully
-                results.append(f"✗ `{file_path}`: Failed to write: {e}")
+        for group, result in prepared:
+            count = len(group["replacements"])
+            results.append(
+                f"✓ `{group['file_path']}`: {count} replacement{'s' if count != 1 else ''} "
+                f"(sha256 `{result.sha256}`)"
+            )
 
-        logger.info(f"Ag3ntumMultiEdit: Applied {len(validated_edits)} edits")
+        logger.info(f"Ag3ntumMultiEdit: Applied {len(edits)} edits to {len(prepared)} files")
 
         return _result(
             f"**MultiEdit Complete**\n\n"
-            f"**Edits applied:** {len(validated_edits)}\n\n"
+            f"**Edits applied:** {len(edits)}\n\n"
             + "\n".join(results)
         )
 
@@ -12,13 +12,26 @@ the session workspace. The validator translates agent-provided paths
 
 Sensitive Data: Scans content for API keys, tokens, passwords when reading.
 Detected secrets are redacted with same-length placeholders to preserve formatting.
+Only the returned lines (plus SCAN_MARGIN_LINES around them, so secrets
+spanning the range boundary are still detected) are scanned. When that
+window holds PEM markers or base64-only lines, it is widened to the
+enclosing -----BEGIN/-----END lines, and the body of a private key block
+is redacted even when the range starts below its BEGIN line.
+
+Ranged reads: lines are located through the shared line-offset index
+service (src/core/line_index.py) and only the requested range is read, so
+paging through a multi-gigabyte log costs the same as reading a small file.
+Indexes of large files are persisted in the session directory.
 """
+import asyncio
 import logging
+import re
 from pathlib import Path
 from typing import Any
 
 from claude_agent_sdk import create_sdk_mcp_server, tool
 
+from src.core.line_index import LINE_INDEX_DIR, read_lines
 from src.core.path_validator import get_path_validator, PathValidationError
 from src.security import scan_and_redact, is_scanner_enabled
 
@@ -27,6 +40,16 @@ logger = logging.getLogger(__name__)
 # Tool name constant
 AG3NTUM_READ_TOOL: str = "mcp__ag3ntum__Read"
 
+# Lines scanned for secrets before and after the returned range
+SCAN_MARGIN_LINES: int = 5
+
+# Furthest the scan window is widened to reach a PEM block's BEGIN/END line
+PEM_MAX_LINES: int = 200
+
+_PEM_MARKER = re.compile(r"^-----(BEGIN|END) [A-Z0-9 ]+-----")
+_PRIVATE_KEY_BEGIN = re.compile(r"^-----BEGIN [A-Z0-9 ]*PRIVATE KEY-----")
+_BASE64_LINE = re.compile(r"^[A-Za-z0-9+/]{16,}={0,2}$")
+
 
 def create_read_tool(session_id: str):
     """
@@ -103,65 +126,199 @@ Examples:
         except Exception as e:
             return _error(f"Failed to read file: {e}")
 
-        # Read content
+        # Read the requested range (plus the scan margin)
+        start = max(1, offset or 1)
+        window_start = max(1, start - SCAN_MARGIN_LINES)
+        window_limit = None
+        if limit:
+            window_limit = (start - window_start) + limit + SCAN_MARGIN_LINES
         try:
-            content = path.read_text(encoding="utf-8", errors="replace")
-
-            # Scan content for sensitive data
-            secrets_redacted = 0
-            secret_types: list[str] = []
-
-            if is_scanner_enabled():
-                try:
-                    scan_result = scan_and_redact(content)
-                    if scan_result.has_secrets:
-                        content = scan_result.redacted_text
-                        secrets_redacted = scan_result.secret_count
-                        secret_types = list(scan_result.secret_types)
-                        logger.warning(
-                            f"Ag3ntumRead: Redacted {secrets_redacted} secrets "
-                            f"({', '.join(secret_types)}) when reading {file_path}"
-                        )
-                except Exception as e:
-                    logger.warning(f"Ag3ntumRead: Failed to scan content - {e}")
-
-            lines = content.splitlines()
-            total_lines = len(lines)
-
-            # Apply offset/limit
-            start_idx = max(0, offset - 1)
-            end_idx = start_idx + limit if limit else len(lines)
-            selected_lines = lines[start_idx:end_idx]
-
-            # Format with line numbers
-            numbered_lines = []
-            for i, line in enumerate(selected_lines, start=start_idx + 1):
-                numbered_lines.append(f"{i:6}|{line}")
-
-            output = "\n".join(numbered_lines)
-
-            # Add truncation notice
-            if limit and end_idx < total_lines:
-                output += f"\n\n... ({total_lines - end_idx} more lines)"
-
-            # Add security notice if secrets were redacted
-            if secrets_redacted > 0:
-                output += (
-                    f"\n\n**Security Notice:** {secrets_redacted} sensitive value(s) "
-                    f"({', '.join(secret_types)}) were redacted from display."
-                )
-
-            logger.info(
-                f"Ag3ntumRead: Read {len(selected_lines)} lines from {file_path}"
+            window = await asyncio.to_thread(
+                read_lines,
+                path,
+                window_start,
+                window_limit,
+                validator.workspace.parent / LINE_INDEX_DIR,
             )
-            return _result(output)
-
         except Exception as e:
             return _error(f"Failed to read file: {e}")
 
+        before = start - window_start
+        selected_lines = window.lines[before:before + limit] if limit else window.lines[before:]
+        end_idx = start - 1 + len(selected_lines)
+
+        # Scan content for sensitive data
+        secrets_redacted = 0
+        secret_types: list[str] = []
+
+        if is_scanner_enabled() and selected_lines:
+            try:
+                scan_lines, scan_before = window.lines, before
+                if _needs_pem_context(scan_lines):
+                    head, tail = await asyncio.to_thread(
+                        _pem_context,
+                        path,
+                        window_start,
+                        scan_lines,
+                        validator.workspace.parent / LINE_INDEX_DIR,
+                    )
+                    scan_lines = [*head, *scan_lines, *tail]
+                    scan_before += len(head)
+                selected_lines, secrets_redacted, secret_types = _redact_range(
+                    scan_lines, scan_before, len(selected_lines)
+                )
+                if secrets_redacted:
+                    logger.warning(
+                        f"Ag3ntumRead: Redacted {secrets_redacted} secrets "
+                        f"({', '.join(secret_types)}) when reading {file_path}"
+                    )
+            except Exception as e:
+                logger.warning(f"Ag3ntumRead: Failed to scan content - {e}")
+
+        # Format with line numbers
+        numbered_lines = []
+        for i, line in enumerate(selected_lines, start=start):
+            numbered_lines.append(f"{i:6}|{line}")
+
+        output = "\n".join(numbered_lines)
+
+        # Add truncation notice
+        if limit:
+            if window.total_lines is not None:
+                if end_idx < window.total_lines:
+                    output += f"\n\n... ({window.total_lines - end_idx} more lines)"
+            elif window.has_more or len(window.lines) > before + len(selected_lines):
+                output += "\n\n... (more lines follow; large file, total not counted)"
+
+        # Add security notice if secrets were redacted
+        if secrets_redacted > 0:
+            output += (
+                f"\n\n**Security Notice:** {secrets_redacted} sensitive value(s) "
+                f"({', '.join(secret_types)}) were redacted from display."
+            )
+
+        logger.info(
+            f"Ag3ntumRead: Read {len(selected_lines)} lines from {file_path}"
+        )
+        return _result(output)
+
     return read
 
 
+def _needs_pem_context(lines: list[str]) -> bool:
+    """Whether the scan window may cut through a PEM block."""
+    return any(_PEM_MARKER.match(line) or _BASE64_LINE.match(line.strip()) for line in lines)
+
+
+def _pem_context(
+    path: Path, window_start: int, lines: list[str], cache_dir: Path
+) -> tuple[list[str], list[str]]:
+    """
+    Lines to add around the scan window so it covers the enclosing PEM block.
+
+    Looks at most PEM_MAX_LINES above for the BEGIN line (unless the window
+    already starts a block) and below for the END line (unless it already
+    ends one).
+
+    Returns:
+        (lines before the window, lines after it); empty when no enclosing
+        marker is found on that side.
+    """
+    markers = [line for line in lines if _PEM_MARKER.match(line)]
+    head: list[str] = []
+    tail: list[str] = []
+
+    if not markers or markers[0].startswith("-----END"):
+        head_start = max(1, window_start - PEM_MAX_LINES)
+        above: list[str] = []
+        if head_start < window_start:
+            above = read_lines(path, head_start, window_start - head_start, cache_dir).lines
+        for i in range(len(above) - 1, -1, -1):
+            if _PEM_MARKER.match(above[i]):
+                if above[i].startswith("-----BEGIN"):
+                    head = above[i:]
+                break
+
+    if not markers or markers[-1].startswith("-----BEGIN"):
+        below = read_lines(path, window_start + len(lines), PEM_MAX_LINES, cache_dir).lines
+        for j, line in enumerate(below):
+            if _PEM_MARKER.match(line):
+                if line.startswith("-----END"):
+                    tail = below[:j + 1]
+                break
+
+    return head, tail
+
+
+def _mask_private_keys(window: list[str]) -> tuple[list[str], set[int]]:
+    """
+    Replace the body lines of private key blocks with same-length asterisks.
+
+    Returns:
+        (masked lines, indexes of the masked lines)
+    """
+    masked = list(window)
+    indexes: set[int] = set()
+    inside = False
+    for i, line in enumerate(window):
+        if _PRIVATE_KEY_BEGIN.match(line):
+            inside = True
+        elif inside and _PEM_MARKER.match(line):
+            inside = False
+        elif inside and line:
+            masked[i] = "*" * len(line)
+            indexes.add(i)
+    return masked, indexes
+
+
+def _redact_range(
+    window: list[str], before: int, count: int
+) -> tuple[list[str], int, list[str]]:
+    """
+    Secret-scan window and return the redacted lines window[before:before + count].
+
+    Private key bodies are masked first (the scanner only recognizes the
+    BEGIN line). Replacements keep the text length, so the range is cut
+    from the redacted window by character offset. If that does not hold
+    (line count changes), the range alone is scanned instead.
+
+    Returns:
+        (redacted lines, number of secrets in the range, secret types)
+    """
+    window, key_lines = _mask_private_keys(window)
+    key_in_range = any(before <= i < before + count for i in key_lines)
+
+    selected = window[before:before + count]
+    text = "\n".join(window)
+    range_start = sum(len(line) + 1 for line in window[:before])
+    range_text = "\n".join(selected)
+
+    scan_result = scan_and_redact(text)
+    if not scan_result.has_secrets:
+        if key_in_range:
+            return selected, 1, ["private_key"]
+        return selected, 0, []
+
+    redacted = scan_result.redacted_text[
+        range_start:range_start + len(range_text)
+    ].split("\n")
+    if len(scan_result.redacted_text) != len(text) or len(redacted) != len(selected):
+        # A replacement changed the layout: scan the range on its own
+        scan_result = scan_and_redact(range_text)
+        redacted = scan_result.redacted_text.split("\n")
+
+    # Secrets found only in the margin are not reported
+    secrets = [
+        secret for secret in scan_result.secrets
+        if any(part and part in range_text for part in secret.secret_value.split("\n"))
+    ]
+    if key_in_range and not secrets:
+        # Only the key body is in the range (its BEGIN line is in the margin)
+        return redacted, 1, ["private_key"]
+    secret_types = sorted({secret.secret_type for secret in secrets})
+    return redacted, len(secrets), secret_types
+
+
 def _result(text: str) -> dict[str, Any]:
     """Create a successful result response."""
     return {"content": [{"type": "text", "text": text}]}
@@ -3,21 +3,95 @@ Cache manager for ReadDocument tool.
 
 Provides file-based caching for expensive operations (PDF extraction, Office conversion).
 Uses content hash + params for cache keys.
+
+Entries are JSON files; an SQLite index (index.db) records the category,
+size and last access time of each one. The total size is kept up to date
+by triggers as entries are added and removed, so storing an entry never
+walks the cache directory, and eviction drops the least recently read
+entries first. Several processes can share one cache directory: index
+updates are transactions, serialized by SQLite's file lock.
+
+document_fingerprint() identifies a file by a hash of its full content
+(xxh3 when the optional xxhash package is installed, BLAKE2b otherwise);
+the PDF extractor keys its per-page entries on it.
 """
 import hashlib
 import json
 import logging
 import os
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from .config import CacheConfig, get_config
 from .exceptions import CacheError
 
+try:
+    import xxhash  # Optional: ~10x faster fingerprints than BLAKE2b
+except ImportError:
+    xxhash = None
+
 logger = logging.getLogger(__name__)
 
+INDEX_FILE = "index.db"
+LEGACY_INDEX_FILE = "index.json"  # JSON index rewritten on every put (before index.db)
+SCHEMA_VERSION = 1
+LOCK_TIMEOUT = 30.0  # Seconds to wait for another process's index transaction
+
+FINGERPRINT_CHUNK = 1024 * 1024
+FINGERPRINT_MEMO_SIZE = 256  # Files whose fingerprint is kept (per process)
+
+# Executed one by one (executescript() would commit the open transaction)
+_SCHEMA: tuple[str, ...] = (
+    """CREATE TABLE IF NOT EXISTS entries (
+        cache_key   TEXT NOT NULL,
+        category    TEXT NOT NULL,
+        size        INTEGER NOT NULL,
+        created_at  REAL NOT NULL,
+        accessed_at REAL NOT NULL,
+        PRIMARY KEY (category, cache_key)
+    )""",
+    "CREATE INDEX IF NOT EXISTS entries_by_access ON entries (accessed_at)",
+    """CREATE TABLE IF NOT EXISTS totals (
+        id      INTEGER PRIMARY KEY CHECK (id = 0),
+        entries INTEGER NOT NULL,
+        size    INTEGER NOT NULL
+    )""",
+    "INSERT OR IGNORE INTO totals (id, entries, size) VALUES (0, 0, 0)",
+    """CREATE TRIGGER IF NOT EXISTS entries_added AFTER INSERT ON entries BEGIN
+        UPDATE totals SET entries = entries + 1, size = size + NEW.size WHERE id = 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS entries_removed AFTER DELETE ON entries BEGIN
+        UPDATE totals SET entries = entries - 1, size = size - OLD.size WHERE id = 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS entries_resized AFTER UPDATE OF size ON entries BEGIN
+        UPDATE totals SET size = size + NEW.size - OLD.size WHERE id = 0;
+    END""",
+)
+
+_UPSERT = """
+    INSERT INTO entries (cache_key, category, size, created_at, accessed_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (category, cache_key) DO UPDATE SET
+        size = excluded.size,
+        created_at = excluded.created_at,
+        accessed_at = excluded.accessed_at
+"""
+
+# A read only refreshes the access time (the row is re-created when missing)
+_TOUCH = """
+    INSERT INTO entries (cache_key, category, size, created_at, accessed_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (category, cache_key) DO UPDATE SET accessed_at = excluded.accessed_at
+"""
+
+_DELETE = "DELETE FROM entries WHERE category = ? AND cache_key = ?"
+
 
 @dataclass
 class CacheEntry:
@@ -47,10 +121,10 @@ class CacheManager:
 
     Structure:
         {cache_dir}/
-        ├── index.json           # Quick lookup index
-        ├── pdfs/{hash_prefix}/{hash}.json
+        ├── index.db             # SQLite index: size, access time per entry
+        ├── pdf_pages/{hash_prefix}/{hash}.json   # One PDF page, or document info
         ├── office/{hash_prefix}/{hash}.json
-        └── archives/{hash_prefix}/{hash}.json
+        └── archive/{hash_prefix}/{hash}.json
     """
 
     def __init__(self, config: CacheConfig | None = None):
@@ -64,55 +138,111 @@ class CacheManager:
         self.cache_dir = self.config.directory_path
         self.hits = 0
         self.misses = 0
-        self._index: dict[str, dict] | None = None
+        self._conn: sqlite3.Connection | None = None
+        self._conn_pid: int | None = None
+        self._lock = threading.Lock()
 
         if self.config.enabled:
             self._ensure_directories()
 
+    @property
+    def max_size_bytes(self) -> int:
+        """Total size of the entry files above which entries are evicted."""
+        return self.config.max_size_mb * 1024 * 1024
+
     def _ensure_directories(self) -> None:
-        """Create cache directory structure."""
+        """Create cache directory."""
         try:
             self.cache_dir.mkdir(parents=True, exist_ok=True)
-            for subdir in ("pdfs", "office", "archives"):
-                (self.cache_dir / subdir).mkdir(exist_ok=True)
             logger.debug(f"Cache directory ready: {self.cache_dir}")
         except Exception as e:
             logger.warning(f"Failed to create cache directory: {e}")
 
-    def _get_index_path(self) -> Path:
-        """Get path to cache index file."""
-        return self.cache_dir / "index.json"
-
-    def _load_index(self) -> dict[str, dict]:
-        """Load cache index from disk."""
-        if self._index is not None:
-            return self._index
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Return this process's index connection (caller holds self._lock).
 
-        index_path = self._get_index_path()
-        if not index_path.exists():
-            self._index = {}
-            return self._index
+        Raises:
+            CacheError: If the index cannot be opened
+        """
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
 
+        # A connection inherited across fork() must not be used by the child
+        self._conn = None
         try:
-            with open(index_path) as f:
-                self._index = json.load(f)
-        except Exception as e:
-            logger.warning(f"Failed to load cache index: {e}")
-            self._index = {}
-
-        return self._index
-
-    def _save_index(self) -> None:
-        """Save cache index to disk."""
-        if self._index is None:
-            return
-
+            conn = sqlite3.connect(
+                self.cache_dir / INDEX_FILE,
+                timeout=LOCK_TIMEOUT,
+                isolation_level=None,  # Transactions are explicit (BEGIN IMMEDIATE)
+                check_same_thread=False,  # Guarded by self._lock
+            )
+        except sqlite3.Error as e:
+            raise CacheError("index open", str(e)) from e
         try:
-            index_path = self._get_index_path()
-            with open(index_path, "w") as f:
-                json.dump(self._index, f)
-        except Exception as e:
-            logger.warning(f"Failed to save cache index: {e}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._migrate(conn)
+        except sqlite3.Error as e:
+            conn.close()
+            raise CacheError("index open", str(e)) from e
+
+        self._conn = conn
+        self._conn_pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction on the index, exclusive across threads and processes."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Create the index schema; index entry files written before it existed."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                imported = self._import_entry_files(conn)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                if imported:
+                    logger.info(f"Cache index created: {imported} existing entries imported")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        try:
+            (self.cache_dir / LEGACY_INDEX_FILE).unlink(missing_ok=True)
+        except OSError as e:
+            logger.debug(f"Failed to remove legacy cache index: {e}")
+
+    def _import_entry_files(self, conn: sqlite3.Connection) -> int:
+        """Add rows for the entry files on disk (one directory walk, at index creation)."""
+        rows = []
+        for entry_file in self.cache_dir.glob("*/*/*.json"):
+            try:
+                stat = entry_file.stat()
+            except OSError:
+                continue
+            category = entry_file.relative_to(self.cache_dir).parts[0]
+            rows.append((entry_file.stem, category, stat.st_size, stat.st_mtime, stat.st_mtime))
+        conn.executemany(_UPSERT, rows)
+        return len(rows)
+
+    def close(self) -> None:
+        """Close the index connection (reopened on next use)."""
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
 
     def _get_cache_path(self, category: str, cache_key: str) -> Path:
         """Get path for a cache entry."""
@@ -175,39 +305,67 @@ class CacheManager:
         """
         Retrieve a cached entry.
 
+        A hit refreshes the entry's access time in the index.
+
         Args:
-            category: Cache category (pdfs, office, archives)
+            category: Cache category (pdf, office, archive)
             cache_key: Cache key from compute_cache_key()
 
         Returns:
             CacheEntry if found and valid, None otherwise
         """
-        if not self.config.enabled:
-            return None
+        return self.get_many(category, [cache_key]).get(cache_key)
+
+    def get_many(self, category: str, cache_keys: list[str]) -> dict[str, CacheEntry]:
+        """
+        Retrieve several cached entries with one index transaction.
 
-        cache_path = self._get_cache_path(category, cache_key)
+        Access times of the hits are refreshed, and expired entries removed,
+        in a single transaction however many keys are read. Blocking: async
+        callers run it in a thread.
 
-        if not cache_path.exists():
-            self.misses += 1
-            return None
+        Args:
+            category: Cache category (pdf, office, archive)
+            cache_keys: Cache keys from compute_cache_key()
 
-        try:
-            with open(cache_path) as f:
-                data = json.load(f)
+        Returns:
+            Valid entries by cache key (missing and expired keys are absent)
+        """
+        if not self.config.enabled:
+            return {}
+
+        entries: dict[str, CacheEntry] = {}
+        touched: list[tuple[str, str, int, float, float]] = []
+        expired: list[tuple[str, str]] = []
+        now = time.time()
+
+        for cache_key in cache_keys:
+            cache_path = self._get_cache_path(category, cache_key)
+            try:
+                with open(cache_path) as f:
+                    data = json.load(f)
+                    size = os.fstat(f.fileno()).st_size
+            except FileNotFoundError:
+                self.misses += 1
+                continue
+            except Exception as e:
+                logger.warning(f"Failed to read cache entry: {e}")
+                self.misses += 1
+                continue
 
             # Check TTL
             created_at = data.get("created_at", 0)
-            age_days = (time.time() - created_at) / 86400
+            age_days = (now - created_at) / 86400
             if age_days > self.config.ttl_days:
                 logger.debug(f"Cache entry expired: {cache_key} (age: {age_days:.1f} days)")
-                self._remove_entry(category, cache_key)
+                expired.append((category, cache_key))
                 self.misses += 1
-                return None
+                continue
 
+            touched.append((cache_key, category, size, created_at, now))
             self.hits += 1
             logger.debug(f"Cache hit: {category}/{cache_key}")
-
-            return CacheEntry(
+            entries[cache_key] = CacheEntry(
                 content=data["content"],
                 metadata=data.get("metadata", {}),
                 created_at=created_at,
@@ -215,10 +373,16 @@ class CacheManager:
                 params_hash=data.get("params_hash", ""),
             )
 
-        except Exception as e:
-            logger.warning(f"Failed to read cache entry: {e}")
-            self.misses += 1
-            return None
+        if touched or expired:
+            try:
+                with self._transaction() as conn:
+                    conn.executemany(_TOUCH, touched)
+                    conn.executemany(_DELETE, expired)
+                    self._unlink_entries(expired)
+            except (sqlite3.Error, CacheError) as e:
+                logger.warning(f"Failed to update cache index: {e}")
+
+        return entries
 
     def put(
         self,
@@ -230,116 +394,110 @@ class CacheManager:
         """
         Store an entry in the cache.
 
+        The entry file is replaced atomically (readers in other processes
+        never see a partial file); least recently read entries are evicted
+        when the cache grows above its size limit.
+
         Args:
             category: Cache category
             cache_key: Cache key
             content: Extracted content to cache
             metadata: Optional metadata to cache
         """
-        if not self.config.enabled:
-            return
+        self.put_many(category, [(cache_key, content, metadata)])
 
-        cache_path = self._get_cache_path(category, cache_key)
-
-        try:
-            # Ensure directory exists
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-
-            data = {
-                "content": content,
-                "metadata": metadata or {},
-                "created_at": time.time(),
-                "file_hash": cache_key[:32],
-                "params_hash": cache_key[32:],
-            }
-
-            with open(cache_path, "w") as f:
-                json.dump(data, f)
-
-            # Update index
-            index = self._load_index()
-            index[cache_key] = {
-                "category": category,
-                "created_at": data["created_at"],
-                "size": len(content),
-            }
-            self._save_index()
-
-            logger.debug(f"Cached: {category}/{cache_key} ({len(content)} chars)")
-
-            # Check if cleanup needed
-            self._maybe_cleanup()
-
-        except Exception as e:
-            logger.warning(f"Failed to write cache entry: {e}")
-
-    def _remove_entry(self, category: str, cache_key: str) -> None:
-        """Remove a cache entry."""
-        try:
-            cache_path = self._get_cache_path(category, cache_key)
-            if cache_path.exists():
-                cache_path.unlink()
+    def put_many(self, category: str, items: list[tuple[str, str, dict | None]]) -> None:
+        """
+        Store several entries with one index transaction.
 
-            index = self._load_index()
-            if cache_key in index:
-                del index[cache_key]
-                self._save_index()
+        Entry files are staged first; they replace the old files, and the
+        index rows and evictions are written, in a single transaction.
+        Blocking: async callers run it in a thread.
 
-        except Exception as e:
-            logger.warning(f"Failed to remove cache entry: {e}")
+        Args:
+            category: Cache category
+            items: (cache_key, content, metadata) of each entry
+        """
+        if not self.config.enabled or not items:
+            return
 
-    def _maybe_cleanup(self) -> None:
-        """Check cache size and cleanup if needed."""
+        # (temp path, entry path, index row) of each staged entry
+        staged: list[tuple[Path, Path, tuple[str, str, int, float, float]]] = []
         try:
-            # Calculate total size
-            total_size = sum(
-                f.stat().st_size
-                for f in self.cache_dir.rglob("*.json")
-                if f.is_file()
-            )
-
-            max_size = self.config.max_size_mb * 1024 * 1024
-
-            if total_size > max_size:
-                self._cleanup_lru(total_size - max_size)
+            for cache_key, content, metadata in items:
+                cache_path = self._get_cache_path(category, cache_key)
+                temp_path = cache_path.with_name(
+                    f".{cache_key}.{os.getpid()}.{threading.get_ident()}.tmp"
+                )
+                # Ensure directory exists
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+                now = time.time()
+                data = {
+                    "content": content,
+                    "metadata": metadata or {},
+                    "created_at": now,
+                    "file_hash": cache_key[:32],
+                    "params_hash": cache_key[32:],
+                }
+                payload = json.dumps(data).encode("utf-8")
+                staged.append((temp_path, cache_path, (cache_key, category, len(payload), now, now)))
+                temp_path.write_bytes(payload)
+
+            # Files change only inside index transactions, so rows and files agree
+            with self._transaction() as conn:
+                for temp_path, cache_path, row in staged:
+                    os.replace(temp_path, cache_path)
+                    conn.execute(_UPSERT, row)
+                self._evict(conn)
+
+            for _, _, row in staged:
+                logger.debug(f"Cached: {category}/{row[0]} ({row[2]} bytes)")
 
         except Exception as e:
-            logger.warning(f"Cache cleanup check failed: {e}")
-
-    def _cleanup_lru(self, bytes_to_free: int) -> None:
-        """Remove oldest entries until bytes_to_free is achieved."""
-        logger.info(f"Cache cleanup: need to free {bytes_to_free} bytes")
+            for temp_path, _, _ in staged:
+                temp_path.unlink(missing_ok=True)
+            logger.warning(f"Failed to write cache entry: {e}")
 
-        index = self._load_index()
-        if not index:
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Remove least recently read entries until the cache fits (inside a transaction)."""
+        total_size = conn.execute("SELECT size FROM totals WHERE id = 0").fetchone()[0]
+        bytes_to_free = total_size - self.max_size_bytes
+        if bytes_to_free <= 0:
             return
 
-        # Sort entries by creation time (oldest first)
-        sorted_entries = sorted(
-            index.items(),
-            key=lambda x: x[1].get("created_at", 0),
-        )
-
+        evicted: list[tuple[str, str]] = []
         freed = 0
-        removed_count = 0
-
-        for cache_key, entry_info in sorted_entries:
-            if freed >= bytes_to_free:
-                break
-
-            category = entry_info.get("category", "pdfs")
-            cache_path = self._get_cache_path(category, cache_key)
-
-            if cache_path.exists():
-                size = cache_path.stat().st_size
-                cache_path.unlink()
+        cursor = conn.execute("SELECT cache_key, category, size FROM entries ORDER BY accessed_at")
+        try:
+            for cache_key, category, size in cursor:
+                if freed >= bytes_to_free:
+                    break
+                evicted.append((category, cache_key))
                 freed += size
-                removed_count += 1
+        finally:
+            cursor.close()
+
+        conn.executemany(_DELETE, evicted)
+        self._unlink_entries(evicted)
+        logger.info(f"Cache cleanup: removed {len(evicted)} entries, freed {freed} bytes")
 
-            del index[cache_key]
+    def _unlink_entries(self, entries: list[tuple[str, str]]) -> None:
+        """Delete entry files (their index rows are removed in the same transaction)."""
+        for category, cache_key in entries:
+            try:
+                self._get_cache_path(category, cache_key).unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Failed to remove cache entry: {e}")
 
-        self._save_index()
-        logger.info(f"Cache cleanup: removed {removed_count} entries, freed {freed} bytes")
+    def _remove_entry(self, category: str, cache_key: str) -> None:
+        """Remove a cache entry."""
+        try:
+            with self._transaction() as conn:
+                conn.execute(_DELETE, (category, cache_key))
+                self._unlink_entries([(category, cache_key)])
+        except (sqlite3.Error, CacheError) as e:
+            logger.warning(f"Failed to remove cache entry: {e}")
 
     def clear(self) -> None:
         """Clear all cache entries."""
@@ -347,40 +505,30 @@ class CacheManager:
             return
 
         try:
-            for json_file in self.cache_dir.rglob("*.json"):
-                json_file.unlink()
-
-            self._index = {}
-            self._save_index()
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM entries")
+                for entry_file in self.cache_dir.glob("*/*/*.json"):
+                    entry_file.unlink(missing_ok=True)
             logger.info("Cache cleared")
 
         except Exception as e:
             logger.warning(f"Failed to clear cache: {e}")
 
     def get_stats(self) -> CacheStats:
-        """Get cache statistics."""
+        """Get cache statistics (from the index, no directory walk)."""
         total_entries = 0
         total_size = 0
         oldest_age = 0.0
 
-        now = time.time()
-
         try:
-            for json_file in self.cache_dir.rglob("*.json"):
-                if json_file.name == "index.json":
-                    continue
-                if json_file.is_file():
-                    total_entries += 1
-                    total_size += json_file.stat().st_size
-
-                    try:
-                        with open(json_file) as f:
-                            data = json.load(f)
-                        created_at = data.get("created_at", now)
-                        age_days = (now - created_at) / 86400
-                        oldest_age = max(oldest_age, age_days)
-                    except Exception:
-                        pass
+            with self._lock:
+                conn = self._connect()
+                total_entries, total_size = conn.execute(
+                    "SELECT entries, size FROM totals WHERE id = 0"
+                ).fetchone()
+                oldest = conn.execute("SELECT MIN(created_at) FROM entries").fetchone()[0]
+            if oldest is not None:
+                oldest_age = max(0.0, (time.time() - oldest) / 86400)
 
         except Exception as e:
             logger.warning(f"Failed to compute cache stats: {e}")
@@ -394,6 +542,52 @@ class CacheManager:
         )
 
 
+# (path, size, mtime_ns, inode) -> fingerprint; a changed file gets a new stat key
+_fingerprints: OrderedDict[tuple[str, int, int, int], str] = OrderedDict()
+_fingerprints_lock = threading.Lock()
+
+
+def document_fingerprint(path: Path) -> str:
+    """
+    Fingerprint of a file's full content.
+
+    Hashing is streamed (constant memory). The result is remembered for the
+    file's current size, mtime and inode, so repeated reads of an unchanged
+    file only stat it.
+
+    Args:
+        path: File to fingerprint
+
+    Returns:
+        Hex digest prefixed with the algorithm ("xxh3:" or "blake2b:").
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    stat = path.stat()
+    memo_key = (str(path), stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    with _fingerprints_lock:
+        fingerprint = _fingerprints.get(memo_key)
+        if fingerprint is not None:
+            _fingerprints.move_to_end(memo_key)
+            return fingerprint
+
+    if xxhash is not None:
+        algorithm, hasher = "xxh3", xxhash.xxh3_128()
+    else:
+        algorithm, hasher = "blake2b", hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(FINGERPRINT_CHUNK):
+            hasher.update(chunk)
+    fingerprint = f"{algorithm}:{hasher.hexdigest()}"
+
+    with _fingerprints_lock:
+        _fingerprints[memo_key] = fingerprint
+        while len(_fingerprints) > FINGERPRINT_MEMO_SIZE:
+            _fingerprints.popitem(last=False)
+    return fingerprint
+
+
 # Global cache manager instance
 _cache_manager: CacheManager | None = None
 
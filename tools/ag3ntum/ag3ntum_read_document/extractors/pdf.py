@@ -2,13 +2,16 @@
 PDF extractor for ReadDocument tool.
 
 Uses PyMuPDF for text extraction with automatic OCR for scanned pages.
+Extracted pages are cached individually (see PDFExtractor.extract).
 """
 import asyncio
+import hashlib
 import logging
 from pathlib import Path
 from typing import Any
 
-from ..config import get_config
+from ..cache import document_fingerprint, get_cache_manager
+from ..config import PDFConfig, get_config
 from ..exceptions import ExtractionTimeoutError
 from ..security import sanitize_metadata, sanitize_output
 from ..utils import check_dependency, parse_page_range
@@ -19,6 +22,20 @@ logger = logging.getLogger(__name__)
 # Required dependencies
 import fitz  # Required: PyMuPDF
 
+PAGE_CACHE_CATEGORY = "pdf_pages"
+
+
+def _document_key(fingerprint: str) -> str:
+    """Cache key of a document's page count and metadata."""
+    return hashlib.sha256(f"{fingerprint}:document".encode()).hexdigest()
+
+
+def _page_key(fingerprint: str, page_num: int, pdf_config: PDFConfig) -> str:
+    """Cache key of one page's text (the OCR threshold decides text vs OCR)."""
+    return hashlib.sha256(
+        f"{fingerprint}:page:{page_num}:{pdf_config.ocr_text_threshold}".encode()
+    ).hexdigest()
+
 
 class PDFExtractor(BaseExtractor):
     """Extractor for PDF files with automatic OCR support."""
@@ -33,6 +50,13 @@ class PDFExtractor(BaseExtractor):
         """
         Extract PDF content with automatic OCR for scanned pages.
 
+        Pages (text or OCR) are cached one by one, keyed by a fingerprint of
+        the whole file: only pages missing from the cache are extracted, and
+        a request served entirely from the cache does not open the document.
+        The cache is read and written in batches (one index transaction for
+        all the requested pages, one for the newly extracted ones), off the
+        event loop.
+
         Args:
             path: Path to the PDF file
             args:
@@ -49,16 +73,39 @@ class PDFExtractor(BaseExtractor):
         pages_spec = args.get("pages")
         include_metadata = args.get("include_metadata", True)
 
-        # Open document
-        try:
-            doc = fitz.open(path)
-        except Exception as e:
-            logger.error(f"Failed to open PDF {path}: {e}")
-            raise
+        cache = get_cache_manager()
+        fingerprint = None
+        if cache.config.enabled:
+            try:
+                fingerprint = await asyncio.to_thread(document_fingerprint, path)
+            except OSError as e:
+                logger.warning(f"Failed to fingerprint {path}: {e}")
+
+        document = None
+        if fingerprint:
+            document = await asyncio.to_thread(
+                cache.get, PAGE_CACHE_CATEGORY, _document_key(fingerprint)
+            )
+
+        doc = None
+        # (cache key, content, metadata) of entries to store after extraction
+        new_entries: list[tuple[str, str, dict]] = []
 
         # Use try/finally to ensure document is always closed (prevents resource leak)
         try:
-            total_pages = len(doc)
+            if document is not None:
+                total_pages = document.metadata["total_pages"]
+                doc_metadata = document.metadata.get("metadata", {})
+            else:
+                doc = self._open(path)
+                total_pages = len(doc)
+                doc_metadata = self._document_metadata(doc, config)
+                if fingerprint:
+                    new_entries.append((
+                        _document_key(fingerprint),
+                        "",
+                        {"total_pages": total_pages, "metadata": doc_metadata},
+                    ))
 
             # Parse page range
             pages_to_process = parse_page_range(pages_spec, total_pages)
@@ -68,21 +115,40 @@ class PDFExtractor(BaseExtractor):
                 pages_to_process = pages_to_process[: pdf_config.max_pages_text]
                 logger.warning(f"Page limit applied: {pdf_config.max_pages_text}")
 
-            # Extract content from each page
-            page_contents = []
-            ocr_pages_used = 0
-            ocr_page_numbers = []
-
-            for page_num in pages_to_process:
+            # Pages already extracted: page number -> (text, OCR applied)
+            pages: dict[int, tuple[str, bool]] = {}
+            if fingerprint:
+                keys = {
+                    page_num: _page_key(fingerprint, page_num, pdf_config)
+                    for page_num in pages_to_process
+                }
+                entries = await asyncio.to_thread(
+                    cache.get_many, PAGE_CACHE_CATEGORY, list(keys.values())
+                )
+                for page_num, key in keys.items():
+                    entry = entries.get(key)
+                    if entry is not None:
+                        pages[page_num] = (entry.content, bool(entry.metadata.get("ocr")))
+            cached_pages = len(pages)
+
+            # Extract content from each missing page
+            failed: dict[int, str] = {}
+            ocr_runs = 0
+            missing = [page_num for page_num in pages_to_process if page_num not in pages]
+            if missing and doc is None:
+                doc = self._open(path)
+
+            for page_num in missing:
                 try:
                     page = doc[page_num]
                     text = page.get_text()
+                    ocr = False
 
                     # Auto-detect scanned page: low text content
                     if len(text.strip()) < pdf_config.ocr_text_threshold:
                         # This page needs OCR
-                        if ocr_pages_used >= pdf_config.max_pages_ocr:
-                            page_contents.append(
+                        if ocr_runs >= pdf_config.max_pages_ocr:
+                            failed[page_num] = (
                                 f"\n--- Page {page_num + 1} ---\n"
                                 f"[Scanned page - OCR limit reached]\n"
                             )
@@ -91,59 +157,57 @@ class PDFExtractor(BaseExtractor):
                         # Apply OCR
                         try:
                             text = await self._ocr_page(page, pdf_config.ocr_per_page_timeout)
-                            ocr_pages_used += 1
-                            ocr_page_numbers.append(page_num + 1)
-                            page_contents.append(
-                                f"\n--- Page {page_num + 1} [OCR] ---\n{text}\n"
-                            )
+                            ocr_runs += 1
+                            ocr = True
                         except asyncio.TimeoutError:
-                            page_contents.append(
+                            failed[page_num] = (
                                 f"\n--- Page {page_num + 1} ---\n"
                                 f"[OCR timed out]\n"
                             )
-                    else:
-                        # Regular text extraction
-                        page_contents.append(f"\n--- Page {page_num + 1} ---\n{text}\n")
+                            continue
+
+                    pages[page_num] = (text, ocr)
+                    if fingerprint:
+                        new_entries.append(
+                            (_page_key(fingerprint, page_num, pdf_config), text, {"ocr": ocr})
+                        )
 
                 except Exception as e:
                     logger.warning(f"Failed to extract page {page_num + 1}: {e}")
-                    page_contents.append(
+                    failed[page_num] = (
                         f"\n--- Page {page_num + 1} ---\n[Extraction failed: {e}]\n"
                     )
 
-            # Combine content
+            if new_entries:
+                await asyncio.to_thread(cache.put_many, PAGE_CACHE_CATEGORY, new_entries)
+
+            # Combine content in page order
+            page_contents = []
+            ocr_page_numbers = []
+            for page_num in pages_to_process:
+                if page_num in failed:
+                    page_contents.append(failed[page_num])
+                    continue
+                text, ocr = pages[page_num]
+                if ocr:
+                    ocr_page_numbers.append(page_num + 1)
+                    page_contents.append(f"\n--- Page {page_num + 1} [OCR] ---\n{text}\n")
+                else:
+                    # Regular text extraction
+                    page_contents.append(f"\n--- Page {page_num + 1} ---\n{text}\n")
             content = "".join(page_contents)
 
             # Sanitize output
             sanitized = sanitize_output(content, config.output)
 
-            # Extract metadata
-            metadata = {}
-            if include_metadata:
-                raw_metadata = doc.metadata or {}
-                metadata = sanitize_metadata(
-                    {
-                        "title": raw_metadata.get("title", ""),
-                        "author": raw_metadata.get("author", ""),
-                        "subject": raw_metadata.get("subject", ""),
-                        "creator": raw_metadata.get("creator", ""),
-                        "producer": raw_metadata.get("producer", ""),
-                        "creation_date": raw_metadata.get("creationDate", ""),
-                        "modification_date": raw_metadata.get("modDate", ""),
-                    },
-                    config.output,
-                )
-                # Remove empty values
-                metadata = {k: v for k, v in metadata.items() if v}
-
             result = ExtractedContent(
                 content=sanitized.content,
                 format_type="PDF Document",
-                metadata=metadata,
+                metadata=doc_metadata if include_metadata else {},
                 total_pages=total_pages,
                 extracted_pages=pages_to_process,
                 was_truncated=sanitized.was_truncated,
-                ocr_pages_used=ocr_pages_used,
+                ocr_pages_used=len(ocr_page_numbers),
             )
 
             if ocr_page_numbers:
@@ -152,15 +216,45 @@ class PDFExtractor(BaseExtractor):
             if len(pages_to_process) < total_pages:
                 result.add_note(f"{total_pages - len(pages_to_process)} pages not extracted")
 
+            if cached_pages:
+                result.add_note(f"{cached_pages} of {len(pages_to_process)} pages from cache")
+
             logger.info(
                 f"Extracted {len(pages_to_process)} pages from {path.name} "
-                f"(OCR: {ocr_pages_used})"
+                f"(cached: {cached_pages}, OCR: {ocr_runs})"
             )
             return result
 
         finally:
             # Always close the document to prevent resource leak
-            doc.close()
+            if doc is not None:
+                doc.close()
+
+    def _open(self, path: Path) -> Any:
+        """Open a PDF with PyMuPDF."""
+        try:
+            return fitz.open(path)
+        except Exception as e:
+            logger.error(f"Failed to open PDF {path}: {e}")
+            raise
+
+    def _document_metadata(self, doc: Any, config: Any) -> dict[str, str]:
+        """Sanitized, non-empty document metadata."""
+        raw_metadata = doc.metadata or {}
+        metadata = sanitize_metadata(
+            {
+                "title": raw_metadata.get("title", ""),
+                "author": raw_metadata.get("author", ""),
+                "subject": raw_metadata.get("subject", ""),
+                "creator": raw_metadata.get("creator", ""),
+                "producer": raw_metadata.get("producer", ""),
+                "creation_date": raw_metadata.get("creationDate", ""),
+                "modification_date": raw_metadata.get("modDate", ""),
+            },
+            config.output,
+        )
+        # Remove empty values
+        return {k: v for k, v in metadata.items() if v}
 
     async def _ocr_page(self, page: Any, timeout: float) -> str:
         """
@@ -1,12 +1,17 @@
 """
 Text file extractor for ReadDocument tool.
 
-Handles plain text and source code files with line numbering.
+Handles plain text and source code files with line numbering. Line ranges
+are read through the shared line-offset index (src/core/line_index.py), so
+only the requested lines of a large file are read.
 """
+import asyncio
 import logging
 from pathlib import Path
 from typing import Any
 
+from src.core.line_index import read_lines
+
 from ..config import get_config
 from ..security import sanitize_output
 from .base import BaseExtractor, ExtractedContent
@@ -137,20 +142,18 @@ class TextExtractor(BaseExtractor):
         limit = args.get("limit")
         include_metadata = args.get("include_metadata", True)
 
-        # Read file content
+        # Read the requested line range
+        start_idx = max(0, (offset or 1) - 1)
         try:
-            content = path.read_text(encoding="utf-8", errors="replace")
+            line_range = await asyncio.to_thread(read_lines, path, start_idx + 1, limit)
         except Exception as e:
             logger.error(f"Failed to read text file {path}: {e}")
             raise
 
-        lines = content.splitlines()
-        total_lines = len(lines)
-
-        # Apply offset and limit
-        start_idx = max(0, offset - 1)
-        end_idx = start_idx + limit if limit else len(lines)
-        selected_lines = lines[start_idx:end_idx]
+        selected_lines = line_range.lines
+        end_idx = start_idx + len(selected_lines)
+        total_lines = line_range.total_lines
+        has_more = line_range.has_more
 
         # Format with line numbers
         numbered_lines = []
@@ -169,21 +172,25 @@ class TextExtractor(BaseExtractor):
             metadata = {
                 "filename": path.name,
                 "size_bytes": stat.st_size,
-                "total_lines": total_lines,
                 "encoding": "utf-8",
             }
+            if total_lines is not None:
+                metadata["total_lines"] = total_lines
 
         # Create result
         result = ExtractedContent(
             content=sanitized.content,
             format_type=f"Text ({path.suffix or 'plain'})",
             metadata=metadata,
-            was_truncated=sanitized.was_truncated or (limit and end_idx < total_lines),
+            was_truncated=sanitized.was_truncated or bool(limit and has_more),
         )
 
         # Add truncation note
-        if limit and end_idx < total_lines:
-            result.add_note(f"{total_lines - end_idx} more lines not shown")
+        if limit and has_more:
+            if total_lines is not None:
+                result.add_note(f"{total_lines - end_idx} more lines not shown")
+            else:
+                result.add_note("More lines not shown (large file, total not counted)")
 
         logger.info(f"Extracted {len(selected_lines)} lines from {path.name}")
         return result
@@ -321,9 +321,13 @@ def is_text_format(format_info: FormatInfo) -> bool:
 
 
 def is_cacheable(format_info: FormatInfo) -> bool:
-    """Check if format results should be cached."""
+    """
+    Check if format results should be cached.
+
+    PDFs are not: the PDF extractor caches each page, so overlapping page
+    ranges reuse the pages already extracted.
+    """
     return format_info.category in (
-        FormatCategory.PDF,
         FormatCategory.OFFICE,
         FormatCategory.ARCHIVE,
     )
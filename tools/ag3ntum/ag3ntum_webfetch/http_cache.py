@@ -0,0 +1,504 @@
+"""
+On-disk HTTP cache for Ag3ntumWebFetch (RFC 9111, shared cache).
+
+Agents refetch the same documentation pages many times in a session. GET
+responses are stored with their headers and served while fresh; stale
+entries with an ETag or Last-Modified are revalidated with a conditional
+request, and a 304 refreshes the stored entry instead of downloading the
+body again.
+
+The cache serves every session of the process, so it follows the rules for
+shared caches:
+- no-store (request or response), private and Vary: * are not stored
+- responses to requests with Authorization are stored only when the
+  response allows it (public, s-maxage, must-revalidate); requests with
+  Cookie are not stored
+- the tool bypasses the cache for requests with agent headers other than
+  Cache-Control (the key covers only the URL and Vary), see
+  CACHE_NEUTRAL_HEADERS in tool.py
+- s-maxage takes precedence over max-age, then Expires; without explicit
+  freshness, 10% of the time since Last-Modified (at most a day)
+- no-cache / must-revalidate entries are revalidated before use once stale
+  (no-cache: always)
+
+Structure:
+    {cache_dir}/{key[:2]}/{key}.json    # URL, status, headers, times, Vary values
+    {cache_dir}/{key[:2]}/{key}.body    # Raw response body
+
+Entries are evicted least recently used first when the total body size
+exceeds max_size_bytes. Access times are kept as the metadata file's mtime,
+so the LRU order survives restarts. Files removed by another process are
+treated as misses.
+"""
+import email.utils
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Mapping
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIRECTORY: str = "~/.tmp/webfetch-cache"
+DEFAULT_MAX_SIZE_BYTES: int = 256 * 1024 * 1024  # 256MB
+
+# Entries larger than this share of the cache are not stored
+MAX_ENTRY_FRACTION: float = 0.125
+
+# Heuristic freshness (RFC 9111 section 4.2.2)
+HEURISTIC_FRACTION: float = 0.1
+HEURISTIC_MAX_SECONDS: float = 86400.0
+
+# Statuses stored by this cache (bodies are kept only for complete 200s)
+CACHEABLE_STATUSES: frozenset[int] = frozenset({200})
+
+
+def parse_cache_control(value: str | None) -> dict[str, str | None]:
+    """Parse a Cache-Control header into {directive: argument or None}."""
+    directives: dict[str, str | None] = {}
+    if not value:
+        return directives
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip().strip('"') if argument else None
+    return directives
+
+
+def _seconds(directives: Mapping[str, str | None], name: str) -> float | None:
+    """Delta-seconds argument of a directive, None if absent or invalid."""
+    try:
+        return max(float(int(directives[name] or "")), 0.0)
+    except (KeyError, ValueError):
+        return None
+
+
+def _http_date(value: str | None) -> float | None:
+    """Parse an HTTP date into a timestamp, None if absent or invalid."""
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def cache_key(url: str) -> str:
+    """Cache key of a GET request URL."""
+    return hashlib.sha256(url.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    """A stored response."""
+
+    key: str
+    url: str
+    status: int
+    headers: dict[str, str]
+    request_time: float
+    response_time: float
+    size: int
+    vary: dict[str, str] = field(default_factory=dict)
+    body_path: Path | None = None
+
+    @property
+    def cache_control(self) -> dict[str, str | None]:
+        return parse_cache_control(self.headers.get("cache-control"))
+
+    def freshness_lifetime(self) -> float:
+        """Seconds the response is fresh for (RFC 9111 section 4.2.1)."""
+        directives = self.cache_control
+        for name in ("s-maxage", "max-age"):
+            lifetime = _seconds(directives, name)
+            if lifetime is not None:
+                return lifetime
+        date = _http_date(self.headers.get("date")) or self.response_time
+        if "expires" in self.headers:
+            expires = _http_date(self.headers["expires"])
+            return max(expires - date, 0.0) if expires is not None else 0.0
+        last_modified = _http_date(self.headers.get("last-modified"))
+        if last_modified is not None and date > last_modified:
+            return min((date - last_modified) * HEURISTIC_FRACTION, HEURISTIC_MAX_SECONDS)
+        return 0.0
+
+    def current_age(self, now: float | None = None) -> float:
+        """Age of the response in seconds (RFC 9111 section 4.2.3)."""
+        now = time.time() if now is None else now
+        try:
+            age_value = max(float(self.headers.get("age", 0)), 0.0)
+        except ValueError:
+            age_value = 0.0
+        date = _http_date(self.headers.get("date")) or self.response_time
+        apparent_age = max(0.0, self.response_time - date)
+        corrected_age = age_value + (self.response_time - self.request_time)
+        return max(apparent_age, corrected_age) + (now - self.response_time)
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        """Whether the response may be served without revalidation."""
+        if "no-cache" in self.cache_control:
+            return False
+        return self.freshness_lifetime() > self.current_age(now)
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidating this response."""
+        conditional = {}
+        if "etag" in self.headers:
+            conditional["If-None-Match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            conditional["If-Modified-Since"] = self.headers["last-modified"]
+        return conditional
+
+    def read_body(self) -> bytes:
+        """Read the stored body (OSError if it was removed)."""
+        if self.body_path is None:
+            raise FileNotFoundError(f"No body stored for {self.url}")
+        return self.body_path.read_bytes()
+
+
+def _lower_headers(headers: Mapping[str, str]) -> dict[str, str]:
+    return {key.lower(): value for key, value in headers.items()}
+
+
+def _vary_names(response_headers: Mapping[str, str]) -> list[str]:
+    vary = response_headers.get("vary", "")
+    return [name.strip().lower() for name in vary.split(",") if name.strip()]
+
+
+def is_storable(
+    method: str,
+    status: int,
+    request_headers: Mapping[str, str],
+    response_headers: Mapping[str, str],
+) -> bool:
+    """
+    Whether a shared cache may store the response (RFC 9111 section 3).
+
+    Only responses that can be reused (explicit freshness) or revalidated
+    (ETag / Last-Modified) are stored.
+    """
+    if method != "GET" or status not in CACHEABLE_STATUSES:
+        return False
+    request = _lower_headers(request_headers)
+    response = _lower_headers(response_headers)
+    request_cc = parse_cache_control(request.get("cache-control"))
+    response_cc = parse_cache_control(response.get("cache-control"))
+    if "no-store" in request_cc or "no-store" in response_cc or "private" in response_cc:
+        return False
+    if "*" in _vary_names(response):
+        return False
+    if "cookie" in request:
+        return False
+    if "authorization" in request and not (
+        {"public", "s-maxage", "must-revalidate"} & response_cc.keys()
+    ):
+        return False
+    explicit = (
+        "s-maxage" in response_cc or "max-age" in response_cc or "expires" in response
+    )
+    return explicit or "etag" in response or "last-modified" in response
+
+
+class HTTPCache:
+    """
+    Size-bounded on-disk HTTP response cache with LRU eviction.
+
+    Methods do blocking file I/O; call them from a worker thread inside the
+    event loop (asyncio.to_thread). Thread-safe.
+    """
+
+    def __init__(self, directory: str | Path, max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Cache directory (created if missing, ~ expanded)
+            max_size_bytes: Total body size kept before evicting entries
+        """
+        self.cache_dir = Path(directory).expanduser()
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        # key -> body size, least recently used first (loaded lazily)
+        self._index: OrderedDict[str, int] | None = None
+        self._total_size = 0
+        self._lock = threading.RLock()
+
+    # -- index --------------------------------------------------------------
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        directory = self.cache_dir / key[:2]
+        return directory / f"{key}.json", directory / f"{key}.body"
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        """Build the LRU index from metadata files (mtime = last access)."""
+        if self._index is not None:
+            return self._index
+        entries = []
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for meta_path in self.cache_dir.glob("??/*.json"):
+                try:
+                    accessed = meta_path.stat().st_mtime
+                    size = (meta_path.with_suffix(".body")).stat().st_size
+                except OSError:
+                    continue
+                entries.append((accessed, meta_path.stem, size))
+        except OSError as e:
+            logger.warning(f"WebFetch cache: failed to scan {self.cache_dir}: {e}")
+        entries.sort()
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+        self._total_size = sum(self._index.values())
+        return self._index
+
+    def _drop(self, key: str) -> None:
+        """Remove an entry's files and index record."""
+        index = self._load_index()
+        self._total_size -= index.pop(key, 0)
+        for path in self._paths(key):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"WebFetch cache: failed to remove {path}: {e}")
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until the size bound holds."""
+        index = self._load_index()
+        while self._total_size > self.max_size_bytes and index:
+            key = next(iter(index))
+            self._drop(key)
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _write_meta(self, entry: CachedResponse) -> None:
+        meta = {
+            "url": entry.url,
+            "status": entry.status,
+            "headers": entry.headers,
+            "request_time": entry.request_time,
+            "response_time": entry.response_time,
+            "size": entry.size,
+            "vary": entry.vary,
+        }
+        self._write_atomic(self._paths(entry.key)[0], json.dumps(meta).encode())
+
+    # -- public API ---------------------------------------------------------
+
+    def lookup(self, url: str, request_headers: Mapping[str, str]) -> CachedResponse | None:
+        """
+        Find the stored response for a GET request.
+
+        The entry is returned fresh or stale; check is_fresh() and
+        revalidate stale entries with validators(). A lookup counts as an
+        access for LRU eviction.
+
+        Args:
+            url: Request URL
+            request_headers: Headers the request will be sent with (Vary)
+
+        Returns:
+            CachedResponse, or None if nothing usable is stored.
+        """
+        key = cache_key(url)
+        meta_path, body_path = self._paths(key)
+        with self._lock:
+            index = self._load_index()
+            try:
+                meta = json.loads(meta_path.read_bytes())
+                entry = CachedResponse(
+                    key=key,
+                    url=meta["url"],
+                    status=meta["status"],
+                    headers=meta["headers"],
+                    request_time=meta["request_time"],
+                    response_time=meta["response_time"],
+                    size=meta["size"],
+                    vary=meta.get("vary", {}),
+                    body_path=body_path,
+                )
+            except FileNotFoundError:
+                self._total_size -= index.pop(key, 0)
+                self.misses += 1
+                return None
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"WebFetch cache: dropping unreadable entry for {url}: {e}")
+                self._drop(key)
+                self.misses += 1
+                return None
+
+            request = _lower_headers(request_headers)
+            if entry.url != url or any(
+                request.get(name, "") != value for name, value in entry.vary.items()
+            ):
+                self.misses += 1
+                return None
+
+            if key not in index:
+                # Stored by another process
+                index[key] = entry.size
+                self._total_size += entry.size
+            index.move_to_end(key)
+            try:
+                os.utime(meta_path)
+            except OSError:
+                pass
+            self.hits += 1
+            return entry
+
+    def store(
+        self,
+        url: str,
+        status: int,
+        request_headers: Mapping[str, str],
+        response_headers: Mapping[str, str],
+        body: bytes,
+        request_time: float,
+        response_time: float,
+    ) -> bool:
+        """
+        Store a complete response if it is storable.
+
+        Args:
+            url: Request URL
+            status: Response status
+            request_headers: Headers the request was sent with
+            response_headers: Response headers
+            body: Complete (decoded) response body
+            request_time: time.time() when the request was sent
+            response_time: time.time() when the response arrived
+
+        Returns:
+            True if the response was stored.
+        """
+        if not is_storable("GET", status, request_headers, response_headers):
+            return False
+        if len(body) > self.max_size_bytes * MAX_ENTRY_FRACTION:
+            return False
+
+        headers = _lower_headers(response_headers)
+        # The body is stored decoded; its framing headers no longer apply
+        for name in ("content-encoding", "content-length", "transfer-encoding"):
+            headers.pop(name, None)
+        request = _lower_headers(request_headers)
+        entry = CachedResponse(
+            key=cache_key(url),
+            url=url,
+            status=status,
+            headers=headers,
+            request_time=request_time,
+            response_time=response_time,
+            size=len(body),
+            vary={name: request.get(name, "") for name in _vary_names(headers)},
+        )
+        _, body_path = self._paths(entry.key)
+        with self._lock:
+            try:
+                self._drop(entry.key)
+                self._write_atomic(body_path, body)
+                self._write_meta(entry)
+            except OSError as e:
+                logger.warning(f"WebFetch cache: failed to store {url}: {e}")
+                self._drop(entry.key)
+                return False
+            self._load_index()[entry.key] = entry.size
+            self._total_size += entry.size
+            self._evict()
+        logger.debug(f"WebFetch cache: stored {url} ({entry.size} bytes)")
+        return True
+
+    def refresh(
+        self,
+        entry: CachedResponse,
+        response_headers: Mapping[str, str],
+        request_time: float,
+        response_time: float,
+    ) -> CachedResponse:
+        """
+        Update a stored response after a 304 (RFC 9111 section 4.3.4).
+
+        Args:
+            entry: Entry that was revalidated
+            response_headers: Headers of the 304 response
+            request_time: time.time() when the conditional request was sent
+            response_time: time.time() when the 304 arrived
+
+        Returns:
+            The updated entry.
+        """
+        headers = dict(entry.headers)
+        for name, value in _lower_headers(response_headers).items():
+            if name not in ("content-length", "content-encoding", "transfer-encoding"):
+                headers[name] = value
+        entry.headers = headers
+        entry.request_time = request_time
+        entry.response_time = response_time
+        with self._lock:
+            self.revalidations += 1
+            try:
+                self._write_meta(entry)
+            except OSError as e:
+                logger.warning(f"WebFetch cache: failed to refresh {entry.url}: {e}")
+        return entry
+
+    def invalidate(self, url: str) -> None:
+        """Remove the stored response for a URL."""
+        with self._lock:
+            self._drop(cache_key(url))
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            for key in list(self._load_index()):
+                self._drop(key)
+
+    @property
+    def total_size(self) -> int:
+        """Total stored body size in bytes."""
+        with self._lock:
+            self._load_index()
+            return self._total_size
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_index())
+
+
+_http_caches: dict[Path, HTTPCache] = {}
+_http_caches_lock = threading.Lock()
+
+
+def get_http_cache(
+    directory: str | Path = DEFAULT_CACHE_DIRECTORY,
+    max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+) -> HTTPCache:
+    """Return the process-wide cache for a directory (one index per directory)."""
+    path = Path(directory).expanduser().resolve()
+    with _http_caches_lock:
+        cache = _http_caches.get(path)
+        if cache is None:
+            cache = _http_caches[path] = HTTPCache(path, max_size_bytes)
+        else:
+            cache.max_size_bytes = max_size_bytes
+        return cache
@@ -0,0 +1,436 @@
+"""
+Single-pass HTML to Markdown conversion for Ag3ntumWebFetch.
+
+The previous converter ran about forty DOTALL regular expressions over the
+whole document, each one re-scanning a possibly multi-megabyte body, and
+nested or unbalanced tags made the non-greedy patterns backtrack further.
+
+MarkdownConverter is an html.parser.HTMLParser: the document is tokenized
+once, in chunks, and Markdown is emitted as tokens arrive. Whitespace is
+normalized while emitting (collapsed runs, no trailing spaces, at most one
+blank line), so the output length is known at all times and conversion
+stops as soon as the output budget is reached - the rest of the document
+is never parsed.
+
+Boilerplate subtrees are dropped: navigation, footers, scripts, styles and
+other non-content elements (SKIP_TAGS, plus role="navigation" and
+role="contentinfo").
+
+Output:
+    headings     # Title                  links     [text](href)
+    emphasis     **bold**, *italic*       images    ![alt](src)
+    inline code  `code`                   rules     ---
+    code blocks  ```...``` (verbatim)     quotes    > quoted lines
+    lists        - item / 1. item (nested lists indented)
+    tables       | a | b | rows (separator after a header row)
+
+Usage:
+    markdown = html_to_markdown(html)
+    markdown, truncated = convert_html(html, max_chars=10000)
+"""
+from html.parser import HTMLParser
+
+# Elements whose whole subtree is dropped
+SKIP_TAGS: frozenset[str] = frozenset({
+    "script", "style", "noscript", "template", "nav", "footer",
+    "iframe", "object", "svg", "canvas", "select", "button",
+})
+SKIP_ROLES: frozenset[str] = frozenset({"navigation", "contentinfo"})
+
+# Elements that never have an end tag (no skip/nesting bookkeeping)
+VOID_TAGS: frozenset[str] = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+})
+
+# Elements that start on a new line / after a blank line
+LINE_TAGS: frozenset[str] = frozenset({
+    "div", "section", "article", "main", "header", "aside", "figure",
+    "figcaption", "form", "fieldset", "details", "summary", "dl", "dt", "dd",
+    "address", "center",
+})
+PARAGRAPH_TAGS: frozenset[str] = frozenset({"p"})
+HEADING_LEVELS: dict[str, int] = {f"h{level}": level for level in range(1, 7)}
+INLINE_MARKERS: dict[str, str] = {
+    "strong": "**", "b": "**", "em": "*", "i": "*", "code": "`",
+}
+
+# Characters fed to the tokenizer per step (conversion stops between steps)
+FEED_CHUNK: int = 64 * 1024
+
+# Control characters removed from text (tabs and newlines are whitespace)
+_CONTROL_CHARS = {code: None for code in range(32) if chr(code) not in "\t\n\r\f"}
+_CONTROL_CHARS[0x7F] = None
+
+
+class _BudgetReached(Exception):
+    """Raised inside the tokenizer callbacks to stop conversion."""
+
+
+class _Buffer:
+    """
+    Output under construction, with whitespace normalized while writing.
+
+    Content is written with text(); breaks are requested with newline()
+    and only materialize before the next content, so output never ends
+    with whitespace and never has more than one blank line.
+    """
+
+    def __init__(self, tag: str = "", verbatim: bool = False):
+        self.tag = tag
+        self.verbatim = verbatim
+        self.parts: list[str] = []
+        self.length = 0
+        self._newlines = 0
+        self._space = False
+        self._glued = False
+        self._line_start = True
+        # Element-specific state (link target, table cells and rows)
+        self.data: dict = {}
+
+    def _put(self, text: str) -> None:
+        self.parts.append(text)
+        self.length += len(text)
+
+    def newline(self, count: int = 1) -> None:
+        """Request line breaks (1: new line, 2: blank line) before more content."""
+        if self.length:
+            self._newlines = min(max(self._newlines, count), 2)
+
+    def line_break(self) -> None:
+        """<br>: one more line break, at most a blank line."""
+        if self.length:
+            self._newlines = min(self._newlines + 1, 2)
+
+    def text(self, text: str) -> None:
+        """Write content (no leading/trailing whitespace handling inside)."""
+        if not text:
+            return
+        if self._newlines:
+            self._put("\n" * self._newlines)
+            self._line_start = True
+        elif self._space and not self._line_start and not self._glued:
+            self._put(" ")
+        self._newlines = 0
+        self._space = False
+        self._glued = False
+        self._put(text)
+        self._line_start = text.endswith("\n")
+
+    def prefix(self, text: str) -> None:
+        """Write a marker that sticks to the following content ("# ", "**")."""
+        self.text(text)
+        self._glued = True
+
+    def suffix(self, text: str) -> None:
+        """Write a marker that sticks to the preceding content (closing "**")."""
+        space = self._space
+        self._space = False
+        self.text(text)
+        self._space = space
+
+    def words(self, data: str) -> None:
+        """Write source text, collapsing whitespace runs to single spaces."""
+        if data[:1].isspace():
+            self._space = True
+        words = data.split()
+        if words:
+            self.text(" ".join(words))
+            if data[-1:].isspace():
+                self._space = True
+
+    def value(self) -> str:
+        return "".join(self.parts)
+
+
+class MarkdownConverter(HTMLParser):
+    """
+    Streaming HTML to Markdown converter.
+
+    Feed the document with convert(); the converter is single use.
+    """
+
+    def __init__(self, max_chars: int | None = None):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.truncated = False
+        self._stack: list[_Buffer] = [_Buffer()]
+        # Open buffer count per tag (unbalanced markup can nest deeply)
+        self._open_tags: dict[str, int] = {}
+        self._written = 0
+        self._skip_tag: str | None = None
+        self._skip_depth = 0
+        # Open lists: [tag, items so far]
+        self._lists: list[list] = []
+
+    # -- output -------------------------------------------------------------
+
+    @property
+    def _out(self) -> _Buffer:
+        return self._stack[-1]
+
+    def _text(self, text: str) -> None:
+        self._out.text(text)
+        self._account(len(text))
+
+    def _prefix(self, text: str) -> None:
+        self._out.prefix(text)
+        self._account(len(text))
+
+    def _account(self, length: int) -> None:
+        self._written += length
+        if self.max_chars is not None and self._written > self.max_chars:
+            self.truncated = True
+            raise _BudgetReached()
+
+    def _push(self, tag: str, verbatim: bool = False) -> _Buffer:
+        buffer = _Buffer(tag, verbatim)
+        self._stack.append(buffer)
+        self._open_tags[tag] = self._open_tags.get(tag, 0) + 1
+        return buffer
+
+    def _open(self, tag: str) -> bool:
+        return self._open_tags.get(tag, 0) > 0
+
+    def _close_top(self) -> _Buffer:
+        """Close the innermost buffer."""
+        buffer = self._stack.pop()
+        self._open_tags[buffer.tag] -= 1
+        self._close(buffer)
+        return buffer
+
+    def _pop(self, tag: str) -> None:
+        """Close the innermost open buffer for tag (and any unclosed inside it)."""
+        if not self._open(tag):
+            return
+        while self._close_top().tag != tag:
+            pass
+
+    def _close(self, buffer: _Buffer) -> None:
+        """Write a finished buffer into its parent."""
+        parent = self._out
+        content = buffer.value()
+        if buffer.tag == "a":
+            text = " ".join(content.split())
+            href = buffer.data.get("href")
+            if href and text:
+                parent.text(f"[{text}]({href})")
+            else:
+                parent.text(text)
+        elif buffer.tag == "pre":
+            code = content.strip("\n")
+            parent.newline(2)
+            parent.text(f"```\n{code}\n```")
+            parent.newline(2)
+        elif buffer.tag == "blockquote":
+            if content.strip():
+                parent.newline(2)
+                parent.text("\n".join(f"> {line}".rstrip() for line in content.split("\n")))
+                parent.newline(2)
+        elif buffer.tag in ("td", "th"):
+            cell = " ".join(content.replace("|", "\\|").split())
+            parent.data.setdefault("cells", []).append(cell)
+            if buffer.tag == "th":
+                parent.data["header"] = True
+        elif buffer.tag == "tr":
+            cells = buffer.data.get("cells", [])
+            if cells:
+                table = self._table()
+                parent.newline(1)
+                parent.text("| " + " | ".join(cells) + " |")
+                if table is not None and not table.data.get("rows"):
+                    if buffer.data.get("header"):
+                        parent.newline(1)
+                        parent.text("|" + " --- |" * len(cells))
+                if table is not None:
+                    table.data["rows"] = table.data.get("rows", 0) + 1
+        elif buffer.tag == "title":
+            title = " ".join(content.split())
+            if title:
+                parent.text(title)
+                parent.newline(2)
+        else:
+            parent.text(content)
+
+    def _close_cell(self, row: _Buffer) -> None:
+        """Close a cell whose end tag was omitted."""
+        while self._out is not row and self._out.tag in ("td", "th"):
+            self._close_top()
+
+    def _table(self) -> _Buffer | None:
+        for buffer in reversed(self._stack):
+            if buffer.tag == "table":
+                return buffer
+        return None
+
+    # -- tokenizer callbacks ------------------------------------------------
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        if tag in SKIP_TAGS or dict(attrs).get("role") in SKIP_ROLES:
+            if tag not in VOID_TAGS:
+                self._skip_tag = tag
+                self._skip_depth = 1
+            return
+
+        out = self._out
+        if out.verbatim:
+            if tag == "br":
+                self._text("\n")
+            return
+
+        if tag in PARAGRAPH_TAGS:
+            out.newline(2)
+        elif tag in LINE_TAGS:
+            out.newline(1)
+        elif tag in HEADING_LEVELS:
+            out.newline(2)
+            self._prefix("#" * HEADING_LEVELS[tag] + " ")
+        elif tag in INLINE_MARKERS:
+            self._prefix(INLINE_MARKERS[tag])
+        elif tag == "a":
+            # Links do not nest: a new link ends an unclosed one
+            self._pop("a")
+            self._push("a").data["href"] = dict(attrs).get("href")
+        elif tag == "img":
+            attributes = dict(attrs)
+            self._text(f"![{attributes.get('alt') or 'image'}]({attributes.get('src') or ''})")
+        elif tag == "br":
+            out.line_break()
+        elif tag == "hr":
+            out.newline(2)
+            self._text("---")
+            out.newline(2)
+        elif tag in ("ul", "ol"):
+            self._lists.append([tag, 0])
+            out.newline(1 if len(self._lists) > 1 else 2)
+        elif tag == "li":
+            # A new item ends the previous one, and any link left open in it
+            self._pop("a")
+            out = self._out
+            out.newline(1)
+            indent = "  " * max(len(self._lists) - 1, 0)
+            if self._lists and self._lists[-1][0] == "ol":
+                self._lists[-1][1] += 1
+                self._prefix(f"{indent}{self._lists[-1][1]}. ")
+            else:
+                self._prefix(f"{indent}- ")
+        elif tag == "pre":
+            self._push("pre", verbatim=True)
+        elif tag == "blockquote":
+            self._push("blockquote")
+        elif tag == "table":
+            out.newline(2)
+            self._push("table")
+        elif tag == "tr":
+            self._pop("a")
+            if self._out.tag in ("td", "th"):
+                self._close_cell(self._stack[-2])
+            if self._out.tag == "tr":
+                self._pop("tr")
+            self._push("tr")
+        elif tag in ("td", "th"):
+            self._pop("a")
+            if self._out.tag in ("td", "th"):
+                self._pop(self._out.tag)
+            if self._out.tag != "tr":
+                self._push("tr")
+            self._push(tag)
+        elif tag == "title" and not self._open("title"):
+            self._push("title")
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if self._skip_depth == 0:
+                    self._skip_tag = None
+            return
+
+        out = self._out
+        if out.verbatim and tag != "pre":
+            return
+
+        if tag in PARAGRAPH_TAGS:
+            out.newline(2)
+        elif tag in LINE_TAGS:
+            out.newline(1)
+        elif tag in HEADING_LEVELS:
+            out.newline(2)
+        elif tag in INLINE_MARKERS:
+            out.suffix(INLINE_MARKERS[tag])
+            self._account(len(INLINE_MARKERS[tag]))
+        elif tag in ("ul", "ol"):
+            if self._lists:
+                self._lists.pop()
+            out.newline(1 if self._lists else 2)
+        elif tag in ("a", "pre", "blockquote", "title", "td", "th", "tr"):
+            self._pop(tag)
+        elif tag == "table":
+            self._pop("table")
+            self._out.newline(2)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_tag is not None:
+            return
+        data = data.translate(_CONTROL_CHARS)
+        out = self._out
+        if out.verbatim:
+            out.text(data)
+            self._account(len(data))
+        else:
+            before = out.length
+            out.words(data)
+            self._account(out.length - before)
+
+    # -- conversion ---------------------------------------------------------
+
+    def convert(self, html: str) -> str:
+        """
+        Convert a document.
+
+        Returns:
+            Markdown, at most max_chars characters.
+        """
+        try:
+            for start in range(0, len(html), FEED_CHUNK):
+                self.feed(html[start:start + FEED_CHUNK])
+            self.close()
+        except _BudgetReached:
+            pass
+        while len(self._stack) > 1:
+            self._close_top()
+        markdown = self._stack[0].value()
+        if self.max_chars is not None and len(markdown) > self.max_chars:
+            self.truncated = True
+            markdown = markdown[:self.max_chars].rstrip()
+        return markdown
+
+
+def convert_html(html: str, max_chars: int | None = None) -> tuple[str, bool]:
+    """
+    Convert HTML to Markdown, stopping at an output budget.
+
+    Args:
+        html: HTML document or fragment
+        max_chars: Output budget in characters (None: whole document)
+
+    Returns:
+        (markdown, truncated) - truncated is True if content was cut.
+    """
+    converter = MarkdownConverter(max_chars)
+    markdown = converter.convert(html)
+    return markdown, converter.truncated
+
+
+def html_to_markdown(html: str, max_chars: int | None = None) -> str:
+    """Convert HTML to Markdown (see convert_html)."""
+    return convert_html(html, max_chars)[0]
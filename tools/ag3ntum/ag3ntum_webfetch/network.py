@@ -0,0 +1,199 @@
+"""
+Shared HTTP client and DNS cache for Ag3ntumWebFetch.
+
+A WebFetch call used to open its own httpx.AsyncClient (new TCP and TLS
+handshakes for every page) and resolved the target hostname with a blocking
+socket.getaddrinfo() on the event loop for its SSRF checks.
+
+- get_shared_client() returns one pooled client per event loop (keep-alive
+  connections are reused across calls and sessions). HTTP/2 is negotiated
+  when requested and the optional ``h2`` package is installed.
+  The shared client never stores cookies: cookies set during a call are
+  carried across that call's redirects only (see ``CallCookies``), so one
+  session cannot see another's cookies.
+- DNSCache resolves through loop.getaddrinfo() (worker thread, the loop is
+  not blocked) and keeps answers for a fixed TTL, so repeated fetches from
+  the same host do not re-resolve for their private-IP checks.
+"""
+import asyncio
+import importlib.util
+import logging
+import socket
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from http.cookiejar import CookieJar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+HTTP2_AVAILABLE: bool = importlib.util.find_spec("h2") is not None
+
+# Connection pool of the shared client
+POOL_MAX_CONNECTIONS: int = 100
+POOL_MAX_KEEPALIVE: int = 20
+POOL_KEEPALIVE_EXPIRY: float = 30.0
+
+# DNS cache: getaddrinfo() does not report record TTLs, so answers are kept
+# for a fixed time. Failed lookups are remembered briefly.
+DEFAULT_DNS_TTL: float = 60.0
+DNS_NEGATIVE_TTL: float = 5.0
+DNS_CACHE_SIZE: int = 1024
+
+
+class _NoCookieJar(CookieJar):
+    """Cookie jar that never stores cookies (the shared client's jar)."""
+
+    def extract_cookies(self, response, request) -> None:
+        return None
+
+    def set_cookie(self, cookie) -> None:
+        return None
+
+
+# Shared clients per event loop, one per HTTP/2 setting
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[bool, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_shared_client(http2: bool = False) -> httpx.AsyncClient:
+    """
+    Return the pooled client of the running event loop.
+
+    Redirects are not followed by the client: callers validate every hop
+    before sending it. Timeouts are set per request.
+
+    Args:
+        http2: Negotiate HTTP/2 (ignored when h2 is not installed)
+
+    Returns:
+        Shared httpx.AsyncClient for the current loop.
+    """
+    loop = asyncio.get_running_loop()
+    for other in [other for other in _clients if other.is_closed()]:
+        del _clients[other]
+
+    use_http2 = http2 and HTTP2_AVAILABLE
+    if http2 and not HTTP2_AVAILABLE:
+        logger.debug("WebFetch: HTTP/2 requested but h2 is not installed, using HTTP/1.1")
+
+    per_loop = _clients.setdefault(loop, {})
+    client = per_loop.get(use_http2)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=use_http2,
+            follow_redirects=False,
+            limits=httpx.Limits(
+                max_connections=POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=POOL_MAX_KEEPALIVE,
+                keepalive_expiry=POOL_KEEPALIVE_EXPIRY,
+            ),
+        )
+        # httpx copies cookie jars passed to the constructor; swap it in place
+        client.cookies.jar = _NoCookieJar()
+        per_loop[use_http2] = client
+        logger.debug(f"WebFetch: created shared HTTP client (http2={use_http2})")
+    return client
+
+
+async def close_shared_clients() -> None:
+    """Close the shared clients of the running event loop."""
+    per_loop = _clients.pop(asyncio.get_running_loop(), {})
+    for client in per_loop.values():
+        await client.aclose()
+
+
+class CallCookies:
+    """Cookies of a single WebFetch call, carried across its redirects."""
+
+    def __init__(self) -> None:
+        self._cookies = httpx.Cookies()
+
+    def extract(self, response: httpx.Response) -> None:
+        """Remember cookies the response sets."""
+        self._cookies.extract_cookies(response)
+
+    def apply(self, request: httpx.Request) -> None:
+        """Send the remembered cookies that match the request."""
+        if self._cookies:
+            self._cookies.set_cookie_header(request)
+
+
+class DNSCache:
+    """
+    Non-blocking hostname resolution with a TTL cache.
+
+    Thread-safe; a cache may be shared by several event loops.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_DNS_TTL, max_entries: int = DNS_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # (host, port) -> (expires_at, addresses or the lookup error)
+        self._entries: OrderedDict[tuple[str, int], tuple[float, list[str] | OSError]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def resolve(self, host: str, port: int) -> list[str]:
+        """
+        Resolve a hostname to its IP addresses.
+
+        Args:
+            host: Hostname to resolve
+            port: Port (part of the getaddrinfo query)
+
+        Returns:
+            Sorted list of distinct IP addresses.
+
+        Raises:
+            socket.gaierror: If resolution fails (also served from the cache)
+        """
+        key = (host.lower(), port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if isinstance(entry[1], OSError):
+                    raise entry[1]
+                return entry[1]
+            self.misses += 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            self._store(key, now + DNS_NEGATIVE_TTL, e)
+            raise
+        addresses = sorted({info[4][0] for info in infos})
+        self._store(key, now + self.ttl, addresses)
+        return addresses
+
+    def _store(self, key: tuple[str, int], expires_at: float, value: list[str] | OSError) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget all answers."""
+        with self._lock:
+            self._entries.clear()
+
+
+_dns_caches: dict[float, DNSCache] = {}
+
+
+def get_dns_cache(ttl: float = DEFAULT_DNS_TTL) -> DNSCache:
+    """Return the process-wide DNS cache for the given TTL."""
+    cache = _dns_caches.get(ttl)
+    if cache is None:
+        cache = _dns_caches.setdefault(ttl, DNSCache(ttl=ttl))
+    return cache
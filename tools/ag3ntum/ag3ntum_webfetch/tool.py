@@ -10,22 +10,52 @@ Provides controlled network access with:
 - Redirect validation
 - Streaming response with size limits
 - User-Agent spoofing
-- Multiple output modes (headers-only, HTML, Markdown)
+- Multiple output modes (headers-only, HTML, single-pass Markdown)
+- Shared keep-alive connection pool (optional HTTP/2) and cached DNS
+- On-disk HTTP cache with ETag/Last-Modified revalidation (http_cache.py),
+  used only for requests without agent-supplied headers
+- Multi-URL mode: concurrent fetches under global and per-host limits,
+  each URL validated on its own, results sharing one output budget and
+  optionally saved into the session workspace
 
 Security: Validates domains against configured blocklist to prevent
 access to internal services (metadata endpoints, localhost, etc.).
 """
+import asyncio
 import ipaddress
+import json
 import logging
+import os
 import re
 import socket
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
 
 import httpx
 from claude_agent_sdk import create_sdk_mcp_server, tool
 
+from src.core.path_validator import PathValidationError, get_path_validator, get_resolver_for_session
+
+from .http_cache import (
+    DEFAULT_MAX_SIZE_BYTES as DEFAULT_CACHE_MAX_SIZE,
+    CachedResponse,
+    HTTPCache,
+    get_http_cache,
+    parse_cache_control,
+)
+from .markdown import convert_html, html_to_markdown
+from .network import (
+    DEFAULT_DNS_TTL,
+    CallCookies,
+    DNSCache,
+    get_dns_cache,
+    get_shared_client,
+)
+
 logger = logging.getLogger(__name__)
 
 # Tool name constant
@@ -35,6 +65,24 @@ AG3NTUM_WEBFETCH_TOOL: str = "mcp__ag3ntum__WebFetch"
 DEFAULT_TIMEOUT: int = 30
 DEFAULT_MAX_SIZE: int = 10 * 1024 * 1024  # 10MB
 DEFAULT_MAX_REDIRECTS: int = 5
+DISPLAY_CHARS: int = 10000  # Content characters shown in the result
+
+# Multi-URL mode (urls=[...])
+MAX_URLS: int = 30
+DEFAULT_MAX_CONCURRENCY: int = 8  # Requests in flight per call
+DEFAULT_PER_HOST_CONCURRENCY: int = 2  # Requests in flight per host per call
+MULTI_DISPLAY_CHARS: int = 40000  # Content characters shared by all results
+PREVIEW_CHARS: int = 500  # Content characters shown for a saved body
+SAVED_SLUG_CHARS: int = 60
+SAVED_NAME_ATTEMPTS: int = 100  # Numbered names tried when a saved file exists
+
+# Agent headers that do not change the response; the cache is shared by all
+# sessions, so requests with any other header are neither served nor stored
+CACHE_NEUTRAL_HEADERS: frozenset[str] = frozenset({"cache-control"})
+# Content-Type marker -> extension of a saved body (first match wins)
+SAVED_EXTENSIONS: list[tuple[str, str]] = [
+    ("html", "html"), ("json", "json"), ("xml", "xml"), ("markdown", "md"), ("text/", "txt"),
+]
 DEFAULT_BLOCKED_DOMAINS: list[str] = [
     "localhost",
     "127.0.0.1",
@@ -169,103 +217,21 @@ CHROME_HEADERS: dict[str, str] = {
 def _html_to_markdown(html: str) -> str:
     """
     Convert HTML to Markdown format.
-    
+
     Preserves:
     - Links and images
     - Headings, lists, tables
     - Code blocks
     - Semantic structure
-    
+
     Removes:
-    - Scripts, styles
+    - Scripts, styles, navigation and footers
     - Non-printable characters
     - Extra whitespace
+
+    Single pass over the document (see markdown.py).
     """
-    # Remove script and style tags
-    html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
-    
-    # Convert common HTML tags to Markdown
-    
-    # Headings
-    html = re.sub(r'<h1[^>]*>(.*?)</h1>', r'\n# \1\n', html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<h2[^>]*>(.*?)</h2>', r'\n## \1\n', html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<h3[^>]*>(.*?)</h3>', r'\n### \1\n', html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<h4[^>]*>(.*?)</h4>', r'\n#### \1\n', html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<h5[^>]*>(.*?)</h5>', r'\n##### \1\n', html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<h6[^>]*>(.*?)</h6>', r'\n###### \1\n', html, flags=re.DOTALL | re.IGNORECASE)
-    
-    # Bold and italic
-    html = re.sub(r'<(?:strong|b)[^>]*>(.*?)</(?:strong|b)>', r'**\1**', html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<(?:em|i)[^>]*>(.*?)</(?:em|i)>', r'*\1*', html, flags=re.DOTALL | re.IGNORECASE)
-    
-    # Code
-    html = re.sub(r'<code[^>]*>(.*?)</code>', r'`\1`', html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<pre[^>]*>(.*?)</pre>', r'\n```\n\1\n```\n', html, flags=re.DOTALL | re.IGNORECASE)
-    
-    # Links - extract href and text
-    def replace_link(match):
-        full_tag = match.group(0)
-        href_match = re.search(r'href=["\'](.*?)["\']', full_tag, re.IGNORECASE)
-        text_match = re.search(r'>(.*?)<', full_tag, re.DOTALL)
-        href = href_match.group(1) if href_match else '#'
-        text = text_match.group(1) if text_match else href
-        return f'[{text.strip()}]({href})'
-    
-    html = re.sub(r'<a[^>]*>.*?</a>', replace_link, html, flags=re.DOTALL | re.IGNORECASE)
-    
-    # Images - extract src and alt
-    def replace_img(match):
-        full_tag = match.group(0)
-        src_match = re.search(r'src=["\'](.*?)["\']', full_tag, re.IGNORECASE)
-        alt_match = re.search(r'alt=["\'](.*?)["\']', full_tag, re.IGNORECASE)
-        src = src_match.group(1) if src_match else ''
-        alt = alt_match.group(1) if alt_match else 'image'
-        return f'![{alt}]({src})'
-    
-    html = re.sub(r'<img[^>]*/?>', replace_img, html, flags=re.IGNORECASE)
-    
-    # Lists
-    html = re.sub(r'<li[^>]*>(.*?)</li>', r'\n- \1', html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'</?(?:ul|ol)[^>]*>', '', html, flags=re.IGNORECASE)
-    
-    # Paragraphs and line breaks
-    html = re.sub(r'<br\s*/?>', '\n', html, flags=re.IGNORECASE)
-    html = re.sub(r'</?p[^>]*>', '\n\n', html, flags=re.IGNORECASE)
-    html = re.sub(r'</?div[^>]*>', '\n', html, flags=re.IGNORECASE)
-    
-    # Horizontal rules
-    html = re.sub(r'<hr[^>]*/?>', '\n---\n', html, flags=re.IGNORECASE)
-    
-    # Blockquotes
-    html = re.sub(r'<blockquote[^>]*>(.*?)</blockquote>', r'\n> \1\n', html, flags=re.DOTALL | re.IGNORECASE)
-    
-    # Remove all other HTML tags
-    html = re.sub(r'<[^>]+>', '', html)
-    
-    # Decode HTML entities
-    html = html.replace('&nbsp;', ' ')
-    html = html.replace('&lt;', '<')
-    html = html.replace('&gt;', '>')
-    html = html.replace('&amp;', '&')
-    html = html.replace('&quot;', '"')
-    html = html.replace('&#39;', "'")
-    html = html.replace('&apos;', "'")
-    
-    # Remove non-printable characters (except newlines and tabs)
-    html = re.sub(r'[^\x20-\x7E\n\t\u0080-\uFFFF]', '', html)
-    
-    # Clean up whitespace
-    # Remove trailing whitespace from lines
-    html = re.sub(r'[ \t]+$', '', html, flags=re.MULTILINE)
-    # Remove leading whitespace from lines (but preserve indentation for code)
-    html = re.sub(r'^[ \t]+', '', html, flags=re.MULTILINE)
-    # Collapse multiple blank lines into max 2
-    html = re.sub(r'\n{3,}', '\n\n', html)
-    # Remove spaces around newlines
-    html = re.sub(r' *\n *', '\n', html)
-    
-    return html.strip()
+    return html_to_markdown(html)
 
 
 def _format_headers(headers: httpx.Headers) -> str:
@@ -292,14 +258,18 @@ def _is_private_ip(ip_str: str) -> bool:
         return False
 
 
-def _validate_url_security(
+async def _validate_url_security(
     url: str,
     blocked_domains: list[str],
     allowed_domains: list[str] | None,
+    resolver: DNSCache | None = None,
 ) -> tuple[bool, str]:
     """
     Validate URL for security issues.
 
+    Hostnames are resolved without blocking the event loop; answers are
+    reused from the DNS cache for its TTL.
+
     Returns:
         (is_valid, error_message) - is_valid=True if safe, False with error message if blocked.
     """
@@ -341,9 +311,8 @@ def _validate_url_security(
 
     # Resolve DNS to check for DNS rebinding attacks
     try:
-        addr_info = socket.getaddrinfo(hostname, port, socket.AF_UNSPEC, socket.SOCK_STREAM)
-        for family, socktype, proto, canonname, sockaddr in addr_info:
-            resolved_ip = sockaddr[0]
+        resolved_ips = await (resolver or get_dns_cache()).resolve(hostname, port)
+        for resolved_ip in resolved_ips:
             if _is_private_ip(resolved_ip):
                 return False, f"Domain {hostname} resolves to private IP: {resolved_ip}"
     except socket.gaierror:
@@ -370,12 +339,255 @@ def _validate_url_security(
     return True, ""
 
 
+@dataclass
+class _Fetched:
+    """A downloaded (or cached) response of one URL."""
+
+    url: str
+    final_url: str
+    status: int
+    headers: httpx.Headers
+    body: bytes
+    size: int
+    truncated: bool = False
+    redirects: int = 0
+    cache_status: str | None = None
+    # Responses of every hop (http_headers mode)
+    chain: list[dict[str, Any]] = field(default_factory=list)
+
+
+class _FetchError(Exception):
+    """A URL could not be fetched; the message is shown to the agent."""
+
+
+def _content_text(fetched: _Fetched, output_mode: str, max_chars: int) -> tuple[str, bool]:
+    """
+    Decode a body for display.
+
+    Returns:
+        (text, truncated) - at most max_chars characters; truncated is True
+        when the content was longer.
+    """
+    try:
+        content = fetched.body.decode("utf-8", errors="replace")
+    except Exception:
+        content = fetched.body.decode("latin-1", errors="replace")
+
+    # Conversion to markdown stops at the display limit
+    if output_mode == "content_markdown":
+        return convert_html(content, max_chars=max_chars)
+    return content[:max_chars], len(content) > max_chars
+
+
+def _render_content(
+    fetched: _Fetched,
+    output_mode: str,
+    max_size: int,
+    content: str,
+    display_truncated: bool,
+    saved_path: str | None = None,
+    existing_path: str | None = None,
+) -> str:
+    """Format a fetched page and its display content as the tool result text."""
+    if output_mode == "content_markdown":
+        content_type = "text/markdown"
+    else:
+        content_type = fetched.headers.get('content-type', 'unknown')
+
+    # Build result with timestamp
+    fetch_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+    result = f"**URL:** `{fetched.url}`\n"
+    if fetched.final_url != fetched.url:
+        result += f"**Final URL:** `{fetched.final_url}`\n"
+    result += (
+        f"**Status:** {fetched.status}\n"
+        f"**Content-Type:** {content_type}\n"
+        f"**Size:** {fetched.size} bytes\n"
+        f"**Fetched:** {fetch_time}"
+    )
+    if fetched.truncated:
+        result += f" (truncated at {max_size} bytes)"
+    if fetched.cache_status:
+        result += f"\n**Cache:** {fetched.cache_status}"
+    if fetched.redirects > 0:
+        result += f"\n**Redirects:** {fetched.redirects}"
+    if saved_path:
+        result += f"\n**Saved:** `{saved_path}`"
+        if existing_path:
+            result += f" (`{existing_path}` already exists and was not overwritten)"
+
+    label = "Preview" if saved_path else "Content"
+    if output_mode == "content_markdown":
+        result += f"\n\n**{label} (Markdown):**\n\n{content}"
+    else:
+        result += f"\n\n**{label}:**\n```html\n{content}\n```"
+
+    if display_truncated:
+        result += "\n\n[Content truncated for display]"
+
+    return result
+
+
+def _render_headers(method: str, fetched: _Fetched) -> str:
+    """Format the response headers of every hop (http_headers mode)."""
+    result = f"**Request:** `{method} {fetched.url}`\n"
+    result += f"**Redirects:** {fetched.redirects}\n\n"
+
+    for idx, entry in enumerate(fetched.chain):
+        if idx == 0:
+            result += "### Initial Request\n\n"
+        else:
+            result += f"### Redirect {idx}\n\n"
+
+        result += f"**URL:** `{entry['url']}`\n"
+        result += f"**Status:** {entry['status']}\n\n"
+        result += "**Headers:**\n```\n"
+        result += _format_headers(httpx.Headers(entry['headers']))
+        result += "\n```\n\n"
+
+    return result
+
+
+def _share_budget(lengths: list[int], total: int) -> list[int]:
+    """
+    Split a character budget between results.
+
+    Short results keep their full length; what they leave unused is shared
+    equally by the longer ones.
+
+    Returns:
+        Characters allowed for each result (same order as lengths).
+    """
+    shares = [0] * len(lengths)
+    remaining = total
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    for position, index in enumerate(order):
+        share = min(lengths[index], remaining // (len(order) - position))
+        shares[index] = share
+        remaining -= share
+    return shares
+
+
+def _parse_urls(value: Any) -> list[str]:
+    """
+    Read the urls argument: a list, a JSON list, or whitespace-separated URLs.
+
+    Duplicates are dropped (first occurrence kept).
+
+    Raises:
+        ValueError: If the value is not a list of strings
+    """
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith("["):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid urls JSON: {e}") from e
+        else:
+            value = value.split()
+    if not isinstance(value, list) or not all(isinstance(u, str) for u in value):
+        raise ValueError("urls must be a list of URL strings")
+    return list(dict.fromkeys(u.strip() for u in value if u.strip()))
+
+
+def _saved_file_name(index: int, fetched: _Fetched, output_mode: str) -> str:
+    """File name of a saved body: position, a slug of the URL and a type extension."""
+    parsed = urlparse(fetched.url)
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", f"{parsed.hostname or ''}{parsed.path}").strip("-")
+    slug = slug[:SAVED_SLUG_CHARS].rstrip("-") or "page"
+    if output_mode == "content_markdown":
+        extension = "md"
+    else:
+        content_type = fetched.headers.get("content-type", "").lower()
+        extension = next(
+            (ext for marker, ext in SAVED_EXTENSIONS if marker in content_type), "txt"
+        )
+    return f"{index:02d}-{slug}.{extension}"
+
+
+def _fresh_for_request(cached: CachedResponse, request_cc: dict[str, str | None]) -> bool:
+    """Whether a cached response satisfies the request's Cache-Control."""
+    if "no-cache" in request_cc or not cached.is_fresh():
+        return False
+    max_age = request_cc.get("max-age")
+    if max_age is not None:
+        try:
+            return cached.current_age() <= int(max_age)
+        except ValueError:
+            return False
+    return True
+
+
+def _save_body(session_id: str | None, file_path: str, data: bytes) -> tuple[str, str | None]:
+    """
+    Write a fetched body into a new file in the session workspace.
+
+    Existing files are never overwritten: when file_path exists, the body
+    goes to the first free numbered name (page.md -> page-2.md, page-3.md).
+
+    Returns:
+        Display path of the saved file (sandbox format), and the display
+        path of the existing file it was renamed around (None if no clash).
+
+    Raises:
+        _FetchError: If the path is not writable or the write fails
+    """
+    if session_id is None:
+        raise _FetchError("save_dir is not available: no workspace is bound to this tool")
+    try:
+        validator = get_path_validator(session_id)
+    except RuntimeError as e:
+        logger.error(f"Ag3ntumWebFetch: PathValidator not configured - {e}")
+        raise _FetchError("Internal error: session not properly configured") from e
+
+    stem, extension = os.path.splitext(file_path)
+    for attempt in range(1, SAVED_NAME_ATTEMPTS + 1):
+        candidate = file_path if attempt == 1 else f"{stem}-{attempt}{extension}"
+        try:
+            path = validator.validate_path(candidate, operation="write").normalized
+        except PathValidationError as e:
+            logger.warning(f"Ag3ntumWebFetch: Path validation failed for '{candidate}' - {e.reason}")
+            raise _FetchError(f"Path validation failed: {e.reason}") from e
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_NOFOLLOW, 0o666)
+        except FileExistsError:
+            continue
+        except OSError as e:
+            raise _FetchError(f"Failed to save {candidate}: {e}") from e
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+        except OSError as e:
+            path.unlink(missing_ok=True)
+            raise _FetchError(f"Failed to save {candidate}: {e}") from e
+        break
+    else:
+        raise _FetchError(
+            f"Failed to save {file_path}: it and {SAVED_NAME_ATTEMPTS - 1} numbered names exist"
+        )
+
+    resolver = get_resolver_for_session(session_id)
+    display = resolver.normalize if resolver else str
+    return display(candidate), display(file_path) if candidate != file_path else None
+
+
 def create_webfetch_tool(
     blocked_domains: list[str] | None = None,
     allowed_domains: list[str] | None = None,
     timeout: int = DEFAULT_TIMEOUT,
     max_response_size: int = DEFAULT_MAX_SIZE,
     max_redirects: int = DEFAULT_MAX_REDIRECTS,
+    http2: bool = False,
+    dns_cache_ttl: float = DEFAULT_DNS_TTL,
+    cache_dir: str | Path | None = None,
+    cache_max_size: int = DEFAULT_CACHE_MAX_SIZE,
+    client: httpx.AsyncClient | None = None,
+    session_id: str | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    per_host_concurrency: int = DEFAULT_PER_HOST_CONCURRENCY,
 ):
     """
     Create Ag3ntumWebFetch tool with network configuration.
@@ -386,6 +598,14 @@ def create_webfetch_tool(
         timeout: Request timeout in seconds
         max_response_size: Maximum response size in bytes
         max_redirects: Maximum number of redirects to follow
+        http2: Negotiate HTTP/2 on the shared client (needs the h2 package)
+        dns_cache_ttl: Seconds to reuse DNS answers for the private-IP checks
+        cache_dir: Directory of the on-disk HTTP cache (None disables caching)
+        cache_max_size: Maximum total size of cached bodies in bytes
+        client: Client to use instead of the shared pool (custom transports)
+        session_id: Session whose workspace save_dir refers to (None disables saving)
+        max_concurrency: Requests in flight at once for one urls=[...] call
+        per_host_concurrency: Requests in flight at once to one host for one call
 
     Returns:
         Tool function decorated with @tool.
@@ -395,6 +615,314 @@ def create_webfetch_tool(
     bound_timeout = timeout
     bound_max_size = max_response_size
     bound_max_redirects = max_redirects
+    bound_http2 = http2
+    bound_resolver = get_dns_cache(dns_cache_ttl)
+    bound_cache: HTTPCache | None = (
+        get_http_cache(cache_dir, cache_max_size) if cache_dir is not None else None
+    )
+    bound_client = client
+    bound_session_id = session_id
+    bound_max_concurrency = max(1, max_concurrency)
+    bound_per_host = max(1, per_host_concurrency)
+
+    async def fetch(
+        url: str,
+        method: str,
+        user_headers: dict[str, str],
+        body: str | None,
+        output_mode: str,
+    ) -> _Fetched:
+        """
+        Fetch one URL: security checks, HTTP cache, validated redirects.
+
+        Raises:
+            _FetchError: If the URL is blocked or the request fails
+        """
+        # Validate initial URL
+        is_valid, error_msg = await _validate_url_security(
+            url, bound_blocked, bound_allowed, bound_resolver
+        )
+        if not is_valid:
+            logger.warning(f"Ag3ntumWebFetch: Blocked URL - {url}: {error_msg}")
+            raise _FetchError(error_msg)
+
+        # Merge Chrome headers with user headers (user headers take precedence)
+        headers = {**CHROME_HEADERS, **user_headers}
+
+        # For headers-only mode, use HEAD method to avoid downloading body
+        request_method = "HEAD" if output_mode == "http_headers" and method == "GET" else method
+
+        # HTTP cache: only the agent's own Cache-Control applies to lookups
+        # (the Chrome default "max-age=0" is browser mimicry). Other agent
+        # headers (API keys, X-Forwarded-Host, ...) may change the response,
+        # which must then not be shared with other sessions or users.
+        request_cc = parse_cache_control(
+            next((v for k, v in user_headers.items() if k.lower() == "cache-control"), None)
+        )
+        use_cache = (
+            bound_cache is not None
+            and request_method == "GET"
+            and "no-store" not in request_cc
+            and all(k.lower() in CACHE_NEUTRAL_HEADERS for k in user_headers)
+        )
+        cached: CachedResponse | None = None
+        cached_body = b""
+        if use_cache:
+            cached = await asyncio.to_thread(bound_cache.lookup, url, headers)
+            if cached is not None:
+                try:
+                    cached_body = await asyncio.to_thread(cached.read_body)
+                except OSError:
+                    cached = None
+            if cached is not None and _fresh_for_request(cached, request_cc):
+                logger.info(f"Ag3ntumWebFetch: {method} {url} -> cache hit ({cached.size} bytes)")
+                return _Fetched(
+                    url, url, cached.status, httpx.Headers(cached.headers), cached_body,
+                    cached.size, cache_status=f"hit (age {int(cached.current_age())}s)",
+                )
+            if cached is not None:
+                conditional = cached.validators()
+                if conditional:
+                    headers = {**headers, **conditional}
+                else:
+                    cached = None
+
+        # Track redirect chain for validation and headers
+        redirect_count = 0
+        redirect_chain: list[dict[str, Any]] = []
+        cookies = CallCookies()
+        http_client = bound_client or get_shared_client(bound_http2)
+
+        # Make request with streaming to prevent memory exhaustion
+        try:
+            request = http_client.build_request(
+                method=request_method,
+                url=url,
+                headers=headers,
+                content=body if method in ("POST", "PUT", "PATCH") else None,
+                timeout=bound_timeout,
+            )
+            request_time = time.time()
+            response = await http_client.send(request, stream=True, follow_redirects=False)
+            try:
+                # Follow redirects, validating each destination before it is requested
+                while response.is_redirect and response.next_request is not None:
+                    redirect_chain.append({
+                        "url": str(response.url),
+                        "status": response.status_code,
+                        "headers": dict(response.headers),
+                    })
+                    cookies.extract(response)
+                    next_request = response.next_request
+                    await response.aclose()
+
+                    redirect_count += 1
+                    if redirect_count > bound_max_redirects:
+                        raise httpx.TooManyRedirects(
+                            f"Exceeded maximum redirects: {bound_max_redirects}",
+                            request=next_request,
+                        )
+
+                    redirect_url = str(next_request.url)
+                    is_valid, error_msg = await _validate_url_security(
+                        redirect_url, bound_blocked, bound_allowed, bound_resolver
+                    )
+                    if not is_valid:
+                        logger.warning(
+                            f"Ag3ntumWebFetch: Blocked redirect to {redirect_url}: {error_msg}"
+                        )
+                        raise httpx.RequestError(
+                            f"Redirect blocked: {error_msg}", request=next_request
+                        )
+
+                    # Validators belong to the cached copy of the original URL
+                    next_request.headers.pop("If-None-Match", None)
+                    next_request.headers.pop("If-Modified-Since", None)
+                    cookies.apply(next_request)
+                    response = await http_client.send(
+                        next_request, stream=True, follow_redirects=False
+                    )
+                response_time = time.time()
+
+                # Handle http_headers mode
+                if output_mode == "http_headers":
+                    # Add final response to chain
+                    redirect_chain.append({
+                        "url": str(response.url),
+                        "status": response.status_code,
+                        "headers": dict(response.headers),
+                    })
+                    logger.info(
+                        f"Ag3ntumWebFetch: {method} {url} -> {response.status_code} "
+                        f"(headers only, {redirect_count} redirects)"
+                    )
+                    return _Fetched(
+                        url, str(response.url), response.status_code, response.headers, b"", 0,
+                        redirects=redirect_count, chain=redirect_chain,
+                    )
+
+                # Stored copy still valid: serve it with the refreshed headers
+                if cached is not None and response.status_code == 304 and redirect_count == 0:
+                    cached = await asyncio.to_thread(
+                        bound_cache.refresh, cached, response.headers, request_time, response_time
+                    )
+                    logger.info(
+                        f"Ag3ntumWebFetch: {method} {url} -> 304, served cached copy "
+                        f"({cached.size} bytes)"
+                    )
+                    return _Fetched(
+                        url, url, cached.status, httpx.Headers(cached.headers), cached_body,
+                        cached.size, cache_status="revalidated (304 Not Modified)",
+                    )
+
+                # For content modes, download the body
+
+                # Check response size from Content-Length header
+                content_length = response.headers.get("content-length")
+                if content_length:
+                    try:
+                        size = int(content_length)
+                    except ValueError:
+                        size = 0
+                    if size > bound_max_size:
+                        raise _FetchError(
+                            f"Response too large: {size} bytes (max: {bound_max_size})"
+                        )
+
+                # Read response in chunks to prevent memory exhaustion (zip bomb protection)
+                chunks: list[bytes] = []
+                total_size = 0
+                truncated = False
+
+                async for chunk in response.aiter_bytes(chunk_size=8192):
+                    total_size += len(chunk)
+                    if total_size > bound_max_size:
+                        truncated = True
+                        break
+                    chunks.append(chunk)
+                content_bytes = b"".join(chunks)
+
+                if use_cache and redirect_count == 0 and not truncated:
+                    await asyncio.to_thread(
+                        bound_cache.store, url, response.status_code, headers,
+                        response.headers, content_bytes, request_time, response_time,
+                    )
+
+                # Log successful request
+                logger.info(
+                    f"Ag3ntumWebFetch: {method} {url} -> {response.status_code} "
+                    f"({total_size} bytes, {redirect_count} redirects, mode={output_mode})"
+                )
+
+                return _Fetched(
+                    url, str(response.url), response.status_code, response.headers,
+                    content_bytes, total_size, truncated, redirect_count,
+                )
+            finally:
+                await response.aclose()
+
+        except _FetchError:
+            raise
+        except httpx.TooManyRedirects as e:
+            raise _FetchError(f"Too many redirects: {e}") from e
+        except httpx.TimeoutException as e:
+            raise _FetchError(f"Request timed out after {bound_timeout} seconds") from e
+        except httpx.ConnectError as e:
+            raise _FetchError(f"Connection failed: {e}") from e
+        except httpx.RequestError as e:
+            raise _FetchError(f"Request blocked: {e}") from e
+        except Exception as e:
+            logger.exception(f"Ag3ntumWebFetch: Unexpected error for {url}")
+            raise _FetchError(f"Request failed: {e}") from e
+
+    async def save(
+        fetched: _Fetched, index: int, save_dir: str, output_mode: str
+    ) -> tuple[str, str | None]:
+        """Save the full body under save_dir; returns the display paths (see _save_body)."""
+        data = fetched.body
+        if output_mode == "content_markdown":
+            markdown = await asyncio.to_thread(
+                html_to_markdown, fetched.body.decode("utf-8", errors="replace")
+            )
+            data = markdown.encode("utf-8")
+        file_path = f"{save_dir.rstrip('/')}/{_saved_file_name(index, fetched, output_mode)}"
+        return await asyncio.to_thread(_save_body, bound_session_id, file_path, data)
+
+    async def fetch_many(
+        urls: list[str],
+        user_headers: dict[str, str],
+        output_mode: str,
+        save_dir: str,
+    ) -> dict[str, Any]:
+        """Fetch several URLs concurrently and report each one."""
+        started = time.monotonic()
+        all_slots = asyncio.Semaphore(bound_max_concurrency)
+        host_slots: dict[str, asyncio.Semaphore] = {}
+
+        # Results share one display budget; saved bodies show a preview only
+        limit = PREVIEW_CHARS if save_dir else MULTI_DISPLAY_CHARS
+
+        async def fetch_one(
+            index: int, url: str
+        ) -> tuple[_Fetched | None, tuple[str, str | None] | None, tuple[str, bool], str]:
+            host = (urlparse(url).hostname or "").lower()
+            host_slot = host_slots.setdefault(host, asyncio.Semaphore(bound_per_host))
+            try:
+                # Host slot first: a request waiting for its host holds no global slot
+                async with host_slot, all_slots:
+                    fetched = await fetch(url, "GET", user_headers, None, output_mode)
+            except _FetchError as e:
+                return None, None, ("", False), str(e)
+            if output_mode == "http_headers":
+                return fetched, None, ("", False), ""
+            # A failed save or conversion only fails this URL, not the batch
+            try:
+                saved = None
+                if save_dir:
+                    saved = await save(fetched, index, save_dir, output_mode)
+                return fetched, saved, _content_text(fetched, output_mode, limit), ""
+            except Exception as e:
+                logger.exception(f"Ag3ntumWebFetch: Failed to process {url}")
+                return None, None, ("", False), f"Processing failed: {e}"
+
+        outcomes = await asyncio.gather(
+            *(fetch_one(index, url) for index, url in enumerate(urls, start=1))
+        )
+        shares = _share_budget([len(text) for _, _, (text, _), _ in outcomes], MULTI_DISPLAY_CHARS)
+
+        sections: list[str] = []
+        failed = cached = 0
+        for index, (url, (fetched, saved, (text, cut), error), share) in enumerate(
+            zip(urls, outcomes, shares), start=1
+        ):
+            if fetched is None:
+                failed += 1
+                sections.append(f"## {index}. {url}\n\n**Error:** {error}")
+                continue
+            if fetched.cache_status:
+                cached += 1
+            if output_mode == "http_headers":
+                sections.append(f"## {index}. {url}\n\n{_render_headers('GET', fetched)}".rstrip())
+                continue
+            if len(text) > share:
+                text, cut = text[:share], True
+            sections.append(f"## {index}. {url}\n\n" + _render_content(
+                fetched, output_mode, bound_max_size, text, cut, *(saved or ())
+            ))
+
+        elapsed = time.monotonic() - started
+        summary = f"**Fetched:** {len(urls) - failed} of {len(urls)} URLs in {elapsed:.1f}s"
+        if failed:
+            summary += f" ({failed} failed)"
+        if cached:
+            summary += f"\n**From cache:** {cached}"
+        logger.info(
+            f"Ag3ntumWebFetch: fetched {len(urls) - failed}/{len(urls)} URLs "
+            f"in {elapsed:.2f}s (mode={output_mode}, saved={bool(save_dir)})"
+        )
+
+        text = "\n\n".join([summary, *sections])
+        return _error(text) if failed == len(urls) else _result(text)
 
     @tool(
         "WebFetch",
@@ -402,6 +930,8 @@ def create_webfetch_tool(
 
 Args:
     url: The URL to fetch (http/https only)
+    urls: Several URLs to fetch concurrently in one call (instead of url,
+        GET only, at most 30)
     method: HTTP method (default: GET)
     headers: Optional headers dict (Chrome headers added automatically)
     body: Optional request body (for POST/PUT)
@@ -409,6 +939,9 @@ Args:
         - "http_headers": Fetch only headers (includes full redirect chain)
         - "content_html": Fetch HTML content (default)
         - "content_markdown": Convert HTML to Markdown format
+    save_dir: Optional workspace directory; full bodies are saved there
+        (one file per URL) and only a short preview is returned. Existing
+        files are not overwritten: a numbered name is used instead
 
 Returns:
     Response content and metadata, or error.
@@ -418,6 +951,18 @@ Output Modes:
     - content_html: Returns raw HTML content
     - content_markdown: Returns cleaned Markdown with links/images preserved
 
+Multiple URLs:
+    Each URL is validated and fetched on its own; a failure is reported in
+    that URL's section and does not stop the others. All results share one
+    output budget, so pass save_dir to keep complete pages for Read/Grep.
+
+Caching:
+    GET responses are cached following their Cache-Control, ETag and
+    Last-Modified headers; the result shows "Cache: hit" or "Cache:
+    revalidated" when a stored copy was used. Pass
+    headers={"Cache-Control": "no-cache"} to force revalidation. Requests
+    with any other header bypass the cache.
+
 Security:
     - Protocol validation (http/https only)
     - Private IP blocking (prevents SSRF)
@@ -432,16 +977,19 @@ Examples:
     WebFetch(url="https://example.com", output_mode="http_headers")
     WebFetch(url="https://en.wikipedia.org/wiki/Python", output_mode="content_markdown")
     WebFetch(url="https://httpbin.org/post", method="POST", body='{"key": "value"}')
+    WebFetch(urls=["https://a.example.com", "https://b.example.org/page"],
+             output_mode="content_markdown", save_dir="./research")
 """,
-        {"url": str, "method": str, "headers": dict, "body": str, "output_mode": str},
+        {
+            "url": str, "urls": list, "method": str, "headers": dict, "body": str,
+            "output_mode": str, "save_dir": str,
+        },
     )
     async def webfetch(args: dict[str, Any]) -> dict[str, Any]:
         """Fetch content from a URL with comprehensive security validation."""
-        import json
-        
         url = args.get("url", "")
         method = args.get("method", "GET").upper()
-        
+
         # Handle headers: SDK might pass as string or dict
         headers_arg = args.get("headers", {})
         if isinstance(headers_arg, str):
@@ -455,9 +1003,10 @@ Examples:
                 user_headers = {}
         else:
             user_headers = headers_arg
-        
+
         body = args.get("body")
         output_mode = args.get("output_mode", "content_html")
+        save_dir = (args.get("save_dir") or "").strip()
 
         # Validate output_mode
         valid_modes: set[str] = {"http_headers", "content_html", "content_markdown"}
@@ -467,191 +1016,45 @@ Examples:
                 f"Valid modes: {', '.join(sorted(valid_modes))}"
             )
 
+        try:
+            urls = _parse_urls(args.get("urls") or [])
+        except ValueError as e:
+            return _error(str(e))
+
+        if urls:
+            if url:
+                return _error("Pass either url or urls, not both")
+            if len(urls) > MAX_URLS:
+                return _error(f"Too many URLs: {len(urls)} (max: {MAX_URLS})")
+            if method != "GET":
+                return _error("urls supports GET requests only")
+            return await fetch_many(urls, user_headers, output_mode, save_dir)
+
         if not url:
             return _error("url is required")
 
-        # Validate initial URL
-        is_valid, error_msg = _validate_url_security(url, bound_blocked, bound_allowed)
-        if not is_valid:
-            logger.warning(f"Ag3ntumWebFetch: Blocked URL - {url}: {error_msg}")
-            return _error(error_msg)
-
-        # Merge Chrome headers with user headers (user headers take precedence)
-        headers = {**CHROME_HEADERS, **user_headers}
-
-        # Track redirect chain for validation and headers
-        redirect_count = 0
-        redirect_chain: list[dict[str, Any]] = []
-
-        async def check_redirect(request: httpx.Request) -> None:
-            """Validate each redirect destination."""
-            nonlocal redirect_count
-            redirect_count += 1
-
-            if redirect_count > bound_max_redirects:
-                raise httpx.TooManyRedirects(
-                    f"Exceeded maximum redirects: {bound_max_redirects}"
-                )
-
-            redirect_url = str(request.url)
-            is_valid, error_msg = _validate_url_security(
-                redirect_url, bound_blocked, bound_allowed
-            )
-            if not is_valid:
-                logger.warning(
-                    f"Ag3ntumWebFetch: Blocked redirect to {redirect_url}: {error_msg}"
-                )
-                raise httpx.RequestError(
-                    f"Redirect blocked: {error_msg}", request=request
-                )
-
-        async def track_response(response: httpx.Response) -> None:
-            """Track response headers in redirect chain."""
-            if output_mode == "http_headers":
-                redirect_chain.append({
-                    "url": str(response.url),
-                    "status": response.status_code,
-                    "headers": dict(response.headers),
-                })
-
-        # Make request with streaming to prevent memory exhaustion
         try:
-            # For headers-only mode, use HEAD method to avoid downloading body
-            request_method = "HEAD" if output_mode == "http_headers" and method == "GET" else method
-            
-            async with httpx.AsyncClient(
-                timeout=bound_timeout,
-                follow_redirects=True,
-                max_redirects=bound_max_redirects,
-                event_hooks={
-                    "request": [check_redirect],
-                    "response": [track_response],
-                },
-            ) as client:
-                async with client.stream(
-                    method=request_method,
-                    url=url,
-                    headers=headers,
-                    content=body if method in ("POST", "PUT", "PATCH") else None,
-                ) as response:
-                    # Handle http_headers mode
-                    if output_mode == "http_headers":
-                        # Add final response to chain
-                        redirect_chain.append({
-                            "url": str(response.url),
-                            "status": response.status_code,
-                            "headers": dict(response.headers),
-                        })
-                        
-                        # Build headers result
-                        result = f"**Request:** `{method} {url}`\n"
-                        result += f"**Redirects:** {redirect_count}\n\n"
-                        
-                        for idx, entry in enumerate(redirect_chain):
-                            if idx == 0:
-                                result += "### Initial Request\n\n"
-                            else:
-                                result += f"### Redirect {idx}\n\n"
-                            
-                            result += f"**URL:** `{entry['url']}`\n"
-                            result += f"**Status:** {entry['status']}\n\n"
-                            result += "**Headers:**\n```\n"
-                            result += _format_headers(httpx.Headers(entry['headers']))
-                            result += "\n```\n\n"
-                        
-                        logger.info(
-                            f"Ag3ntumWebFetch: {method} {url} -> {response.status_code} "
-                            f"(headers only, {redirect_count} redirects)"
-                        )
-                        
-                        return _result(result)
-                    
-                    # For content modes, download the body
-                    
-                    # Check response size from Content-Length header
-                    content_length = response.headers.get("content-length")
-                    if content_length:
-                        try:
-                            size = int(content_length)
-                            if size > bound_max_size:
-                                return _error(
-                                    f"Response too large: {size} bytes (max: {bound_max_size})"
-                                )
-                        except ValueError:
-                            pass
-
-                    # Read response in chunks to prevent memory exhaustion (zip bomb protection)
-                    chunks: list[bytes] = []
-                    total_size = 0
-                    truncated = False
-
-                    async for chunk in response.aiter_bytes(chunk_size=8192):
-                        total_size += len(chunk)
-                        if total_size > bound_max_size:
-                            truncated = True
-                            break
-                        chunks.append(chunk)
-
-                    # Decode content
-                    try:
-                        content = b"".join(chunks).decode("utf-8", errors="replace")
-                    except Exception:
-                        content = b"".join(chunks).decode("latin-1", errors="replace")
-
-                    # Convert to markdown if requested
-                    if output_mode == "content_markdown":
-                        content = _html_to_markdown(content)
-                        content_type = "text/markdown"
-                    else:
-                        content_type = response.headers.get('content-type', 'unknown')
-
-                    # Log successful request
-                    final_url = str(response.url)
-                    logger.info(
-                        f"Ag3ntumWebFetch: {method} {url} -> {response.status_code} "
-                        f"({total_size} bytes, {redirect_count} redirects, mode={output_mode})"
-                    )
+            fetched = await fetch(url, method, user_headers, body, output_mode)
+        except _FetchError as e:
+            return _error(str(e))
+        if output_mode == "http_headers":
+            return _result(_render_headers(method, fetched))
 
-                    # Build result with timestamp
-                    fetch_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
-                    result = f"**URL:** `{url}`\n"
-                    if final_url != url:
-                        result += f"**Final URL:** `{final_url}`\n"
-                    result += (
-                        f"**Status:** {response.status_code}\n"
-                        f"**Content-Type:** {content_type}\n"
-                        f"**Size:** {total_size} bytes\n"
-                        f"**Fetched:** {fetch_time}"
-                    )
-                    if truncated:
-                        result += f" (truncated at {bound_max_size} bytes)"
-                    if redirect_count > 0:
-                        result += f"\n**Redirects:** {redirect_count}"
-
-                    # Display content (limit to 10000 chars for readability)
-                    display_content = content[:10000]
-                    
-                    if output_mode == "content_markdown":
-                        result += f"\n\n**Content (Markdown):**\n\n{display_content}"
-                    else:
-                        result += f"\n\n**Content:**\n```html\n{display_content}\n```"
-                    
-                    if len(content) > 10000:
-                        result += "\n\n[Content truncated for display]"
-
-                    return _result(result)
-
-        except httpx.TooManyRedirects as e:
-            return _error(f"Too many redirects: {e}")
-        except httpx.TimeoutException:
-            return _error(f"Request timed out after {bound_timeout} seconds")
-        except httpx.ConnectError as e:
-            return _error(f"Connection failed: {e}")
-        except httpx.RequestError as e:
-            return _error(f"Request blocked: {e}")
+        # Save and conversion failures are reported like fetch_many() does
+        try:
+            if save_dir:
+                saved_path, existing_path = await save(fetched, 1, save_dir, output_mode)
+                content, cut = _content_text(fetched, output_mode, PREVIEW_CHARS)
+                return _result(_render_content(
+                    fetched, output_mode, bound_max_size, content, cut, saved_path, existing_path
+                ))
+            content, cut = _content_text(fetched, output_mode, DISPLAY_CHARS)
+        except _FetchError as e:
+            return _error(str(e))
         except Exception as e:
-            logger.exception(f"Ag3ntumWebFetch: Unexpected error for {url}")
-            return _error(f"Request failed: {e}")
+            logger.exception(f"Ag3ntumWebFetch: Failed to process {url}")
+            return _error(f"Processing failed: {e}")
+        return _result(_render_content(fetched, output_mode, bound_max_size, content, cut))
 
     return webfetch
 
@@ -1,4 +1,4 @@
 """Ag3ntumWrite tool - Sandboxed file writing with validation."""
-from .tool import create_write_tool, create_ag3ntum_write_mcp_server
+from .tool import create_write_tool, create_ag3ntum_write_mcp_server, discard_chunked_writes
 
-__all__ = ["create_write_tool", "create_ag3ntum_write_mcp_server"]
+__all__ = ["create_write_tool", "create_ag3ntum_write_mcp_server", "discard_chunked_writes"]
@@ -5,6 +5,13 @@ Full feature parity with Claude Code Write tool:
 - Create new files
 - Overwrite existing files (requires explicit flag)
 - Create parent directories
+- Append to a file (mode="append")
+- Chunked writes (mode="open" / "chunk" / "commit" / "abort"): content is
+  streamed into a staging file next to the target and moved into place
+  atomically on commit, so large files need neither one huge tool input
+  nor a rewrite of everything written so far. The staging file lives in
+  the agent-writable workspace, so it is only ever written through the
+  descriptor that created it, never reopened by path
 
 Security:
 - Uses Ag3ntumPathValidator to ensure all paths are within allowed mounts
@@ -16,10 +23,16 @@ Security:
 Sensitive Data:
 - Scans content for API keys, tokens, passwords before writing
 - Detected secrets are redacted with same-length placeholders to preserve formatting
+- Appended and chunked content is scanned per call; a secret split across
+  two calls is not detected
 """
+import asyncio
 import logging
 import os
 import stat
+import time
+import uuid
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional
 
@@ -33,6 +46,44 @@ logger = logging.getLogger(__name__)
 # Tool name constant
 AG3NTUM_WRITE_TOOL: str = "mcp__ag3ntum__Write"
 
+# Write modes
+MODE_WRITE = "write"
+MODE_APPEND = "append"
+MODE_OPEN = "open"
+MODE_CHUNK = "chunk"
+MODE_COMMIT = "commit"
+MODE_ABORT = "abort"
+WRITE_MODES = (MODE_WRITE, MODE_APPEND, MODE_OPEN, MODE_CHUNK, MODE_COMMIT, MODE_ABORT)
+
+# Chunked writes not touched for this long are discarded
+CHUNKED_WRITE_TTL_SECONDS = 3600
+MAX_CHUNKED_WRITES_PER_SESSION = 16
+
+
+@dataclass
+class ChunkedWrite:
+    """An open chunked write: content staged in tmp_path until commit."""
+    write_id: str
+    session_id: str
+    file_path: str
+    path: Path
+    tmp_path: Path
+    overwrite: bool
+    fd: int  # O_APPEND descriptor of the staging file, from its O_CREAT|O_EXCL open
+    key: tuple[int, int]  # (st_dev, st_ino) of the staging file
+    size: int = 0
+    lines: int = 0
+    chunks: int = 0
+    secrets_redacted: int = 0
+    secret_types: set[str] = field(default_factory=set)
+    last_used: float = field(default_factory=time.monotonic)
+    # The file ended without a newline: the next chunk continues that line
+    partial_line: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+_chunked_writes: dict[str, ChunkedWrite] = {}
+
 
 def _is_path_writable(path: Path) -> tuple[bool, str]:
     """
@@ -125,53 +176,41 @@ def _verify_file_written(path: Path, expected_content: str) -> tuple[bool, str]:
     return True, ""
 
 
-async def _write_impl(
-    session_id: str,
-    file_path: str,
-    content: str,
-    overwrite_existing: Any = None,
-) -> dict[str, Any]:
+def _normalize_flag(value: Any) -> bool:
+    """Interpret a boolean-ish tool argument; None and unknown strings are False."""
+    # Handle various falsy values: None, False, 0, "0", "false", ""
+    if value is None:
+        return False
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    if isinstance(value, str):
+        return value.lower() in ("true", "1", "yes")
+    return bool(value)
+
+
+def _validate_target(session_id: str, file_path: str) -> tuple[Optional[Path], str, Optional[dict[str, Any]]]:
     """
-    Core write implementation - testable without MCP tool wrapper.
-
-    Args:
-        session_id: The session ID (used to get the PathValidator)
-        file_path: Path to write (relative to workspace or /workspace/...)
-        content: Content to write to the file
-        overwrite_existing: Set to true to overwrite existing files (default: false)
+    Validate file_path for writing and build its display path.
 
     Returns:
-        Dict with result or error
+        Tuple of (path, display_path, error_response). error_response is
+        set (and path is None) when the path cannot be written.
     """
-    # Normalize overwrite flag - default to False
-    # Handle various falsy values: None, False, 0, "0", "false", ""
-    if overwrite_existing is None:
-        overwrite = False
-    elif isinstance(overwrite_existing, bool):
-        overwrite = overwrite_existing
-    elif isinstance(overwrite_existing, (int, float)):
-        overwrite = bool(overwrite_existing)
-    elif isinstance(overwrite_existing, str):
-        overwrite = overwrite_existing.lower() in ("true", "1", "yes")
-    else:
-        overwrite = bool(overwrite_existing)
-
-    if not file_path:
-        return _error("file_path is required")
-
     # Get validator for this session
     try:
         validator = get_path_validator(session_id)
     except RuntimeError as e:
         logger.error(f"Ag3ntumWrite: PathValidator not configured - {e}")
-        return _error("Internal error: session not properly configured")
+        return None, file_path, _error("Internal error: session not properly configured")
 
     # Validate path (security checks)
     try:
         validated = validator.validate_path(file_path, operation="write")
     except PathValidationError as e:
         logger.warning(f"Ag3ntumWrite: Path validation failed for '{file_path}' - {e.reason}")
-        return _error(f"Path validation failed: {e.reason}")
+        return None, file_path, _error(f"Path validation failed: {e.reason}")
 
     path = validated.normalized
 
@@ -186,6 +225,83 @@ async def _write_impl(
     except Exception:
         display_path = str(path)
 
+    return path, display_path, None
+
+
+def _redact_secrets(content: str, display_path: str) -> tuple[str, int, list[str]]:
+    """
+    Scan content for sensitive data.
+
+    Returns:
+        Tuple of (content_to_write, secrets_redacted, secret_types).
+    """
+    if not is_scanner_enabled():
+        return content, 0, []
+    try:
+        scan_result = scan_and_redact(content)
+    except Exception as e:
+        logger.warning(f"Ag3ntumWrite: Failed to scan content - {e}")
+        return content, 0, []
+    if not scan_result.has_secrets:
+        return content, 0, []
+    secret_types = list(scan_result.secret_types)
+    logger.warning(
+        f"Ag3ntumWrite: Redacted {scan_result.secret_count} secrets "
+        f"({', '.join(secret_types)}) in {display_path}"
+    )
+    return scan_result.redacted_text, scan_result.secret_count, secret_types
+
+
+def _security_notice(secrets_redacted: int, secret_types: Any) -> str:
+    if secrets_redacted <= 0:
+        return ""
+    return (
+        f"\n\n**Security Notice:** {secrets_redacted} sensitive value(s) "
+        f"({', '.join(sorted(secret_types))}) were automatically redacted."
+    )
+
+
+async def _write_impl(
+    session_id: str,
+    file_path: str,
+    content: str,
+    overwrite_existing: Any = None,
+    mode: Optional[str] = None,
+    write_id: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    Core write implementation - testable without MCP tool wrapper.
+
+    Args:
+        session_id: The session ID (used to get the PathValidator)
+        file_path: Path to write (relative to workspace or /workspace/...)
+        content: Content to write to the file
+        overwrite_existing: Set to true to overwrite existing files (default: false)
+        mode: One of WRITE_MODES (default: "write")
+        write_id: Chunked write ID returned by mode="open"
+
+    Returns:
+        Dict with result or error
+    """
+    mode = (mode or MODE_WRITE).strip().lower()
+    if mode not in WRITE_MODES:
+        return _error(f"Invalid mode '{mode}'. Use one of: {', '.join(WRITE_MODES)}")
+    if mode == MODE_APPEND:
+        return _append_impl(session_id, file_path, content)
+    if mode == MODE_OPEN:
+        return _open_impl(session_id, file_path, content, _normalize_flag(overwrite_existing))
+    if mode in (MODE_CHUNK, MODE_COMMIT, MODE_ABORT):
+        return await _chunk_impl(session_id, mode, write_id or "", content)
+
+    overwrite = _normalize_flag(overwrite_existing)
+
+    if not file_path:
+        return _error("file_path is required")
+
+    path, display_path, error = _validate_target(session_id, file_path)
+    if error:
+        return error
+
     # Check if path is writable (fail fast)
     is_writable, write_error = _is_path_writable(path)
     if not is_writable:
@@ -210,23 +326,7 @@ async def _write_impl(
         return _error(f"Failed to create directories: {e}")
 
     # Scan content for sensitive data before writing
-    secrets_redacted = 0
-    secret_types: list[str] = []
-    content_to_write = content
-
-    if is_scanner_enabled():
-        try:
-            scan_result = scan_and_redact(content)
-            if scan_result.has_secrets:
-                content_to_write = scan_result.redacted_text
-                secrets_redacted = scan_result.secret_count
-                secret_types = list(scan_result.secret_types)
-                logger.warning(
-                    f"Ag3ntumWrite: Redacted {secrets_redacted} secrets "
-                    f"({', '.join(secret_types)}) in {display_path}"
-                )
-        except Exception as e:
-            logger.warning(f"Ag3ntumWrite: Failed to scan content - {e}")
+    content_to_write, secrets_redacted, secret_types = _redact_secrets(content, display_path)
 
     # Write content
     try:
@@ -259,15 +359,319 @@ async def _write_impl(
     )
 
     # Add security notice if secrets were redacted
-    if secrets_redacted > 0:
-        result_msg += (
-            f"\n\n**Security Notice:** {secrets_redacted} sensitive value(s) "
-            f"({', '.join(secret_types)}) were automatically redacted."
-        )
+    result_msg += _security_notice(secrets_redacted, secret_types)
 
     return _result(result_msg)
 
 
+def _count_lines(text: str, partial_line: bool) -> tuple[int, bool]:
+    """
+    Count lines added by text, as str.splitlines() would for the whole file.
+
+    Returns:
+        Tuple of (new_lines, ends_with_partial_line).
+    """
+    if not text:
+        return 0, partial_line
+    lines = len(text.splitlines())
+    if partial_line:
+        lines -= 1  # First piece continues the previous unterminated line
+    return lines, not text.endswith(("\n", "\r"))
+
+
+def _append_impl(session_id: str, file_path: str, content: str) -> dict[str, Any]:
+    """Append content to a file, creating it (and its parents) if needed."""
+    if not file_path:
+        return _error("file_path is required")
+
+    path, display_path, error = _validate_target(session_id, file_path)
+    if error:
+        return error
+
+    is_writable, write_error = _is_path_writable(path)
+    if not is_writable:
+        logger.warning(f"Ag3ntumWrite: Path not writable '{display_path}' - {write_error}")
+        return _error(f"Cannot write to path: {write_error}")
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    except PermissionError:
+        return _error("Permission denied: cannot create parent directories")
+    except OSError as e:
+        return _error(f"Failed to create directories: {e}")
+
+    content_to_write, secrets_redacted, secret_types = _redact_secrets(content, display_path)
+    data = content_to_write.encode("utf-8")
+
+    try:
+        with open(path, "ab") as f:
+            start = f.tell()
+            f.write(data)
+            f.flush()
+            total = f.tell()
+    except PermissionError:
+        return _error("Permission denied: cannot write to file")
+    except OSError as e:
+        return _error(f"Failed to write file: {e}")
+
+    if total - start != len(data):
+        return _error(
+            f"Write verification failed: appended {total - start} of {len(data)} bytes"
+        )
+
+    logger.info(f"Ag3ntumWrite: Appended {len(data)} bytes to {display_path} ({total} bytes)")
+
+    return _result(
+        f"**Appended to file:** `{display_path}`\n"
+        f"**Appended:** {len(data)} bytes\n"
+        f"**Size:** {total} bytes"
+        + _security_notice(secrets_redacted, secret_types)
+    )
+
+
+def _expire_chunked_writes() -> None:
+    """Discard chunked writes that have not been used for the TTL."""
+    cutoff = time.monotonic() - CHUNKED_WRITE_TTL_SECONDS
+    for write_id, entry in list(_chunked_writes.items()):
+        if entry.last_used < cutoff and not entry.lock.locked():
+            logger.info(f"Ag3ntumWrite: Discarding expired chunked write {write_id} ({entry.file_path})")
+            _discard_chunked_write(entry)
+
+
+def _discard_chunked_write(entry: ChunkedWrite) -> None:
+    _chunked_writes.pop(entry.write_id, None)
+    _close_staging_fd(entry)
+    try:
+        entry.tmp_path.unlink()
+    except OSError:
+        pass
+
+
+def _close_staging_fd(entry: ChunkedWrite) -> None:
+    if entry.fd >= 0:
+        try:
+            os.close(entry.fd)
+        except OSError:
+            pass
+        entry.fd = -1
+
+
+def _staging_file_replaced(entry: ChunkedWrite) -> bool:
+    """Whether tmp_path no longer names the file behind entry.fd (e.g. swapped for a symlink)."""
+    try:
+        st = os.lstat(entry.tmp_path)
+    except OSError:
+        return True
+    return not stat.S_ISREG(st.st_mode) or (st.st_dev, st.st_ino) != entry.key
+
+
+def discard_chunked_writes(session_id: str) -> int:
+    """
+    Discard all open chunked writes of a session.
+
+    Called when the session's agent run ends and when the session is
+    deleted, so unfinished writes do not keep their descriptors and
+    staging files.
+
+    Returns:
+        Number of writes discarded.
+    """
+    entries = [e for e in _chunked_writes.values() if e.session_id == session_id]
+    for entry in entries:
+        _discard_chunked_write(entry)
+    return len(entries)
+
+
+def _open_impl(session_id: str, file_path: str, content: str, overwrite: bool) -> dict[str, Any]:
+    """Start a chunked write; content (if any) is the first chunk."""
+    if not file_path:
+        return _error("file_path is required")
+
+    _expire_chunked_writes()
+    open_writes = sum(1 for e in _chunked_writes.values() if e.session_id == session_id)
+    if open_writes >= MAX_CHUNKED_WRITES_PER_SESSION:
+        return _error(
+            f"Too many open chunked writes ({open_writes}). "
+            "Commit or abort some before opening more."
+        )
+
+    path, display_path, error = _validate_target(session_id, file_path)
+    if error:
+        return error
+
+    is_writable, write_error = _is_path_writable(path)
+    if not is_writable:
+        logger.warning(f"Ag3ntumWrite: Path not writable '{display_path}' - {write_error}")
+        return _error(f"Cannot write to path: {write_error}")
+
+    if path.exists() and not overwrite:
+        return _error(
+            f"File already exists: `{display_path}`. "
+            "To overwrite, set overwrite_existing=true."
+        )
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Staging file in the target directory so commit is a same-filesystem rename;
+        # created like a normal new file (0o666 minus umask)
+        write_id = uuid.uuid4().hex[:16]
+        tmp_path = path.parent / f".{path.name}.{write_id}.part"
+        fd = os.open(
+            tmp_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_EXCL | os.O_NOFOLLOW, 0o666
+        )
+        st = os.fstat(fd)
+    except PermissionError:
+        return _error("Permission denied: cannot create staging file")
+    except OSError as e:
+        return _error(f"Failed to create staging file: {e}")
+
+    entry = ChunkedWrite(
+        write_id=write_id,
+        session_id=session_id,
+        file_path=file_path,
+        path=path,
+        tmp_path=tmp_path,
+        overwrite=overwrite,
+        fd=fd,
+        key=(st.st_dev, st.st_ino),
+    )
+    _chunked_writes[entry.write_id] = entry
+
+    if content:
+        error = _append_chunk(entry, content, display_path)
+        if error:
+            _discard_chunked_write(entry)
+            return error
+
+    logger.info(f"Ag3ntumWrite: Opened chunked write {entry.write_id} for {display_path}")
+
+    return _result(
+        f"**Opened chunked write:** `{display_path}`\n"
+        f"**write_id:** `{entry.write_id}`\n"
+        f"**Staged:** {entry.size} bytes\n\n"
+        f'Send more content with mode="chunk" and this write_id, then mode="commit" '
+        f'to move the file into place (or mode="abort" to discard it).'
+        + _security_notice(entry.secrets_redacted, entry.secret_types)
+    )
+
+
+def _append_chunk(entry: ChunkedWrite, content: str, display_path: str) -> Optional[dict[str, Any]]:
+    """Scan and append one chunk to the staging file; returns an error response or None."""
+    content_to_write, secrets_redacted, secret_types = _redact_secrets(content, display_path)
+    data = memoryview(content_to_write.encode("utf-8"))
+    try:
+        written = 0
+        while written < len(data):
+            written += os.write(entry.fd, data[written:])
+    except OSError as e:
+        return _error(f"Failed to write chunk: {e}")
+    lines, entry.partial_line = _count_lines(content_to_write, entry.partial_line)
+    entry.size += len(data)
+    entry.lines += lines
+    entry.chunks += 1
+    entry.secrets_redacted += secrets_redacted
+    entry.secret_types.update(secret_types)
+    return None
+
+
+async def _chunk_impl(session_id: str, mode: str, write_id: str, content: str) -> dict[str, Any]:
+    """Add a chunk to, commit, or abort an open chunked write."""
+    if not write_id:
+        return _error(f'write_id is required for mode="{mode}" (returned by mode="open")')
+
+    _expire_chunked_writes()
+    entry = _chunked_writes.get(write_id)
+    if entry is None or entry.session_id != session_id:
+        return _error(f"Unknown or expired write_id: {write_id}")
+
+    async with entry.lock:
+        if write_id not in _chunked_writes:
+            return _error(f"Unknown or expired write_id: {write_id}")
+        entry.last_used = time.monotonic()
+
+        if mode == MODE_ABORT:
+            _discard_chunked_write(entry)
+            logger.info(f"Ag3ntumWrite: Aborted chunked write {write_id} ({entry.file_path})")
+            return _result(f"**Aborted chunked write:** `{entry.file_path}` ({entry.size} bytes discarded)")
+
+        # Path validation applies to every chunk (mounts or permissions may change)
+        path, display_path, error = _validate_target(session_id, entry.file_path)
+        if error:
+            _discard_chunked_write(entry)
+            return error
+        if path != entry.path:
+            _discard_chunked_write(entry)
+            return _error(f"Path of `{display_path}` changed since the write was opened")
+
+        if content:
+            error = _append_chunk(entry, content, display_path)
+            if error:
+                return error
+
+        if mode == MODE_CHUNK:
+            return _result(
+                f"**Chunk written:** `{display_path}`\n"
+                f"**Staged:** {entry.size} bytes in {entry.chunks} chunk(s)"
+                + _security_notice(entry.secrets_redacted, entry.secret_types)
+            )
+
+        return _commit_chunked_write(entry, display_path)
+
+
+def _commit_chunked_write(entry: ChunkedWrite, display_path: str) -> dict[str, Any]:
+    """Verify the staging file and move it over the target."""
+    path = entry.path
+    file_existed = path.exists()
+    if file_existed and not entry.overwrite:
+        _discard_chunked_write(entry)
+        return _error(
+            f"File already exists: `{display_path}` (created after the write was opened). "
+            "To overwrite, open with overwrite_existing=true."
+        )
+    is_writable, write_error = _is_path_writable(path)
+    if not is_writable:
+        _discard_chunked_write(entry)
+        return _error(f"Cannot write to path: {write_error}")
+
+    try:
+        staged_size = os.fstat(entry.fd).st_size
+        if staged_size != entry.size:
+            _discard_chunked_write(entry)
+            return _error(
+                f"Write verification failed: staged {staged_size} bytes, expected {entry.size}"
+            )
+        if file_existed:
+            os.fchmod(entry.fd, path.stat().st_mode & 0o7777)
+        os.fsync(entry.fd)
+        if _staging_file_replaced(entry):
+            logger.warning(f"Ag3ntumWrite: Staging file of {display_path} was replaced; discarding")
+            _discard_chunked_write(entry)
+            return _error("Write verification failed: the staging file was replaced")
+        os.replace(entry.tmp_path, path)
+    except PermissionError:
+        _discard_chunked_write(entry)
+        return _error("Permission denied: cannot write to file")
+    except OSError as e:
+        _discard_chunked_write(entry)
+        return _error(f"Failed to write file: {e}")
+    _chunked_writes.pop(entry.write_id, None)
+    _close_staging_fd(entry)
+
+    action = "Overwrote" if file_existed else "Created"
+    logger.info(
+        f"Ag3ntumWrite: {action} {display_path} from {entry.chunks} chunk(s) "
+        f"({entry.size} bytes, {entry.lines} lines)"
+    )
+
+    return _result(
+        f"**{action} file:** `{display_path}`\n"
+        f"**Size:** {entry.size} bytes\n"
+        f"**Lines:** {entry.lines}\n"
+        f"**Chunks:** {entry.chunks}"
+        + _security_notice(entry.secrets_redacted, entry.secret_types)
+    )
+
+
 def create_write_tool(session_id: str):
     """
     Create Ag3ntumWrite tool bound to a specific session's workspace.
@@ -289,10 +693,18 @@ you must explicitly set overwrite_existing=true.
 
 Parent directories are created automatically if they don't exist.
 
+For large files, avoid one huge content argument:
+- mode="append" appends content to the file (created if missing).
+- mode="open" starts a chunked write and returns a write_id; send the rest
+  with mode="chunk" (write_id + content), then mode="commit". The file
+  appears atomically on commit; mode="abort" discards it.
+
 Args:
     file_path: Path to write (relative to workspace or /workspace/...)
     content: Content to write to the file
     overwrite_existing: Set to true to overwrite existing files (default: false)
+    mode: "write" (default), "append", "open", "chunk", "commit" or "abort"
+    write_id: ID returned by mode="open" (for chunk/commit/abort)
 
 Returns:
     Confirmation message with actual path and size, or error.
@@ -301,8 +713,12 @@ Examples:
     Write(file_path="./output.txt", content="Hello, World!")
     Write(file_path="src/new_module.py", content="def hello(): pass")
     Write(file_path="/workspace/data.json", content='{"key": "value"}', overwrite_existing=true)
+    Write(file_path="report.csv", content="id,value\\n", mode="open")
+    Write(write_id="3f2a...", content="1,42\\n", mode="chunk")
+    Write(write_id="3f2a...", mode="commit")
 """,
-        {"file_path": str, "content": str, "overwrite_existing": Optional[bool]},
+        {"file_path": str, "content": str, "overwrite_existing": Optional[bool],
+         "mode": Optional[str], "write_id": Optional[str]},
     )
     async def write(args: dict[str, Any]) -> dict[str, Any]:
         """Write content to a file."""
@@ -311,6 +727,8 @@ Examples:
             file_path=args.get("file_path", ""),
             content=args.get("content", ""),
             overwrite_existing=args.get("overwrite_existing"),
+            mode=args.get("mode"),
+            write_id=args.get("write_id"),
         )
 
     return write